@@ -4,11 +4,37 @@ from flask_mail import Mail
 from src.utils.email_service import EmailService
 from src.utils.file_handler import FileHandler
 from src.database.db import get_db, init_app
+from src.middleware.rate_limit import init_rate_limiter
+from src.middleware.deadline import init_deadlines
 from config import get_config
 from datetime import datetime
 from flask.json.provider import DefaultJSONProvider 
+import importlib
 import os
 
+# Blueprints registrados bajo /api (módulo, fábrica). Se importan al crear la app,
+# no al importar este módulo (el blueprint de auth se registra aparte)
+BLUEPRINTS = [
+    ('src.routes.apiary', 'create_apiary_routes'),
+    ('src.routes.beehive', 'create_hive_routes'),
+    ('src.routes.inventory', 'create_inventory_routes'),
+    ('src.routes.question', 'create_question_routes'),
+    ('src.routes.users', 'create_user_routes'),
+    ('src.routes.monitoreo', 'create_monitoreo_routes'),
+    ('src.routes.reports', 'create_reports_routes'),
+    ('src.routes.health', 'create_health_routes'),
+    ('src.routes.sync', 'create_sync_routes'),
+    ('src.routes.jobs', 'create_job_routes'),
+]
+
+# Blueprints que solo se registran si su opción de configuración está activa
+OPTIONAL_BLUEPRINTS = [
+    ('src.routes.diagnostics', 'create_diagnostics_routes', 'ENABLE_DIAGNOSTICS'),
+]
+
+def _load_factory(module_name, factory_name):
+    return getattr(importlib.import_module(module_name), factory_name)
+
 class CustomJSONProvider(DefaultJSONProvider):
     def default(self, obj):
         if isinstance(obj, datetime):
@@ -33,34 +59,29 @@ def create_app(testing=False):
     file_handler.init_app(app)
     app.file_handler = file_handler
 
+    # Plazos por petición: antes de la base de datos para decidir el 504 después del commit
+    init_deadlines(app)
+
     # Inicializar base de datos y migraciones
     init_app(app)
 
-    from src.routes.apiary import create_apiary_routes
-    from src.routes.beehive import create_hive_routes
-    from src.routes.inventory import create_inventory_routes
-    from src.routes.question import create_question_routes
-    from src.routes.users import create_user_routes
-    from src.routes.auth import create_auth_routes
-    from src.routes.monitoreo import create_monitoreo_routes
-    from src.routes.reports import create_reports_routes
-    from src.routes.health import create_health_routes
+    # Cubetas del límite de peticiones (login, recuperación de contraseña, /api/test)
+    init_rate_limiter(app)
 
     mail = Mail(app)
     email_service = EmailService(mail)
+    app.email_service = email_service
 
     with app.app_context():
-        auth_bp = create_auth_routes(get_db_func=get_db, email_service=email_service)
+        auth_bp = _load_factory('src.routes.auth', 'create_auth_routes')(
+            get_db_func=get_db, email_service=email_service)
         app.register_blueprint(auth_bp, url_prefix='/api')
 
-    app.register_blueprint(create_apiary_routes(), url_prefix='/api')
-    app.register_blueprint(create_hive_routes(), url_prefix='/api')
-    app.register_blueprint(create_inventory_routes(), url_prefix='/api')
-    app.register_blueprint(create_question_routes(), url_prefix='/api')
-    app.register_blueprint(create_user_routes(), url_prefix='/api')
-    app.register_blueprint(create_monitoreo_routes(), url_prefix='/api')
-    app.register_blueprint(create_reports_routes(), url_prefix='/api')
-    app.register_blueprint(create_health_routes(), url_prefix='/api')
+    for module_name, factory_name in BLUEPRINTS:
+        app.register_blueprint(_load_factory(module_name, factory_name)(), url_prefix='/api')
 
+    for module_name, factory_name, flag in OPTIONAL_BLUEPRINTS:
+        if app.config.get(flag, False):
+            app.register_blueprint(_load_factory(module_name, factory_name)(), url_prefix='/api')
 
     return app
\ No newline at end of file
@@ -0,0 +1,11 @@
+"""
+Punto de entrada ASGI.
+
+Uso:
+   pip install -r requirements-async.txt
+   uvicorn asgi:app --host 0.0.0.0 --port 8000 --workers 1
+"""
+
+from src.asgi.app import create_asgi_app
+
+app = create_asgi_app()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+🔀 Comparación WSGI vs ASGI por núcleo
+Mide req/s y p95 de los endpoints de lectura asíncronos (stats, reports, questions)
+en ambos modos a varios niveles de concurrencia, con cada servidor limitado a un
+mismo núcleo de CPU para comparar la concurrencia que sostiene cada proceso.
+
+Uso:
+   pip install -r requirements-async.txt
+   python benchmarks/seed.py --scale small --reset
+   python benchmarks/asgi_vs_wsgi.py --spawn --cpu 0
+   python benchmarks/asgi_vs_wsgi.py --sync-url http://host:5000 --async-url http://host:8000
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import requests
+
+from load import RESULTS_DIR, RateLimitedError, VirtualUser, run_scenario
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ASYNC_SCENARIOS = ('stats', 'reports', 'questions')
+
+
+def spawn(mode, port, cpu):
+    """
+    Lanza un servidor de un solo proceso fijado al núcleo `cpu` (taskset), sin
+    límites de peticiones: todos los usuarios virtuales salen de la misma IP
+    """
+    if mode == 'wsgi':
+        command = [sys.executable, '-c',
+                   f"from app import create_app; create_app().run(port={port}, threaded=True)"]
+    else:
+        command = [sys.executable, '-m', 'uvicorn', 'asgi:app', '--port', str(port),
+                   '--workers', '1', '--log-level', 'warning']
+    if cpu is not None:
+        command = ['taskset', '-c', str(cpu)] + command
+    process = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.DEVNULL,
+                               env=dict(os.environ, RATE_LIMIT_ENABLED='false'))
+
+    base_url = f'http://127.0.0.1:{port}'
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            requests.get(f'{base_url}/api/health', timeout=1)
+            return process, base_url
+        except requests.RequestException:
+            time.sleep(0.5)
+    process.terminate()
+    raise RuntimeError(f"El servidor {mode} no respondió en el puerto {port}")
+
+
+def measure(base_url, levels, duration, warmup, timeout):
+    results = {}
+    users = [VirtualUser(base_url, i + 1, timeout) for i in range(max(levels))]
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        list(pool.map(lambda u: u.prepare(), users))
+    for name in ASYNC_SCENARIOS:
+        for level in levels:
+            print(f"   ⚡ {name} @ {level}")
+            results[f'{name}@{level}'] = run_scenario(name, users[:level], duration, warmup)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compara el modo WSGI y el modo ASGI por núcleo')
+    parser.add_argument('--sync-url', help='servidor WSGI ya en marcha')
+    parser.add_argument('--async-url', help='servidor ASGI ya en marcha')
+    parser.add_argument('--spawn', action='store_true', help='lanzar ambos servidores localmente')
+    parser.add_argument('--cpu', type=int, help='núcleo al que se fijan los servidores lanzados')
+    parser.add_argument('--levels', default='8,32,128', help='niveles de concurrencia')
+    parser.add_argument('--duration', type=float, default=15.0)
+    parser.add_argument('--warmup', type=float, default=3.0)
+    parser.add_argument('--timeout', type=float, default=30.0)
+    args = parser.parse_args()
+
+    if not args.spawn and not (args.sync_url and args.async_url):
+        parser.error('use --spawn o indique --sync-url y --async-url')
+    levels = [int(level) for level in args.levels.split(',')]
+
+    results = {}
+    for mode, url, port in (('wsgi', args.sync_url, 5051), ('asgi', args.async_url, 5052)):
+        process = None
+        if args.spawn:
+            process, url = spawn(mode, port, args.cpu)
+        print(f"🔀 {mode.upper()} en {url}")
+        try:
+            results[mode] = measure(url, levels, args.duration, args.warmup, args.timeout)
+        except RateLimitedError as e:
+            print(f"❌ {mode.upper()}: {e}")
+            sys.exit(2)
+        finally:
+            if process:
+                process.terminate()
+                process.wait()
+
+    print(f"\n{'escenario':<18}{'wsgi req/s':>12}{'asgi req/s':>12}{'wsgi p95':>10}{'asgi p95':>10}")
+    for key in results['wsgi']:
+        w, a = results['wsgi'][key], results['asgi'][key]
+        print(f"{key:<18}{w['rps']:>12}{a['rps']:>12}{w['p95_ms']:>10}{a['p95_ms']:>10}")
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    result_path = os.path.join(RESULTS_DIR, f"asgi_vs_wsgi_{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}.json")
+    with open(result_path, 'w', encoding='utf-8') as f:
+        json.dump({'timestamp': datetime.utcnow().isoformat(), 'levels': levels, 'cpu': args.cpu,
+                   'duration': args.duration, 'results': results}, f, indent=2)
+    print(f"\n💾 Resultados guardados en {os.path.relpath(result_path)}")
+
+
+if __name__ == '__main__':
+    main()
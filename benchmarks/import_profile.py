@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+🐢 Perfil de importación en el arranque
+Ejecuta `python -X importtime` importando app.py y todos los blueprints (lo que
+carga create_app) en un proceso limpio, muestra los módulos más costosos y falla
+si el arranque supera el presupuesto o si carga herramientas de migración
+(SQLAlchemy, Flask-Migrate, Alembic), que solo deben importarse bajo `flask db`.
+
+Uso:
+   python benchmarks/import_profile.py
+   python benchmarks/import_profile.py --budget-ms 300 --top 30
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+# Módulos que el servidor no debe importar al arrancar
+FORBIDDEN_PREFIXES = ('sqlalchemy', 'flask_sqlalchemy', 'flask_migrate', 'alembic', 'src.models.sqlalchemy_models')
+
+STARTUP_CODE = (
+    "import importlib, app; "
+    "[importlib.import_module(m) for m, _ in app.BLUEPRINTS]; "
+    "importlib.import_module('src.routes.auth')"
+)
+
+_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def profile():
+    """Retorna [(módulo, propio_us, acumulado_us, profundidad)] del proceso de arranque"""
+    env = dict(os.environ)
+    env.pop('ENABLE_MIGRATIONS', None)
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', STARTUP_CODE],
+                            cwd=ROOT, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    modules = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append((name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Perfil de importación del arranque de la API')
+    parser.add_argument('--budget-ms', type=float, default=float(os.getenv('IMPORT_BUDGET_MS', 400)),
+                        help='tiempo máximo de importación (suma de módulos de primer nivel)')
+    parser.add_argument('--top', type=int, default=20)
+    parser.add_argument('--runs', type=int, default=3, help='se toma la mejor de N ejecuciones')
+    args = parser.parse_args()
+
+    best = None
+    for _ in range(args.runs):
+        modules = profile()
+        total_ms = sum(cumulative for _, _, cumulative, depth in modules if depth == 0) / 1000
+        if best is None or total_ms < best[0]:
+            best = (total_ms, modules)
+    total_ms, modules = best
+
+    print(f"{'módulo':<50}{'propio ms':>12}{'acumulado ms':>14}")
+    for name, self_us, cumulative_us, _ in sorted(modules, key=lambda m: m[2], reverse=True)[:args.top]:
+        print(f"{name:<50}{self_us / 1000:>12.1f}{cumulative_us / 1000:>14.1f}")
+
+    forbidden = sorted({name for name, _, _, _ in modules if name.startswith(FORBIDDEN_PREFIXES)})
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    result_path = os.path.join(RESULTS_DIR, f"import_profile_{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}.json")
+    with open(result_path, 'w', encoding='utf-8') as f:
+        json.dump({'timestamp': datetime.utcnow().isoformat(), 'total_ms': round(total_ms, 1),
+                   'budget_ms': args.budget_ms, 'forbidden': forbidden,
+                   'modules': [{'module': n, 'self_us': s, 'cumulative_us': c} for n, s, c, _ in modules]},
+                  f, indent=2)
+    print(f"\n⏱️  Importación total: {total_ms:.1f} ms (presupuesto {args.budget_ms:.0f} ms)")
+    print(f"💾 Perfil guardado en {os.path.relpath(result_path)}")
+
+    failed = False
+    if forbidden:
+        print(f"❌ El arranque importa herramientas de migración: {', '.join(forbidden[:5])}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print("❌ El arranque supera el presupuesto de importación")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print("✅ Arranque dentro del presupuesto")
+
+
+if __name__ == '__main__':
+    main()
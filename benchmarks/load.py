@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+⚡ Benchmark de carga de la API
+Ejecuta cada escenario contra un servidor en marcha con N usuarios virtuales
+concurrentes (cada uno autenticado como un usuario bench_<n> distinto), reporta
+p50/p95/p99 y peticiones por segundo, y compara contra una línea base guardada.
+
+Uso:
+   python benchmarks/seed.py --scale small --reset
+   python benchmarks/load.py --base-url http://localhost:5000 --concurrency 16 --duration 30
+   python benchmarks/load.py ... --save-baseline          # guarda benchmarks/baseline.json
+   python benchmarks/load.py ... --baseline benchmarks/baseline.json --tolerance 0.15
+
+Termina con código 1 si algún escenario empeora más que la tolerancia
+(p95 mayor o req/s menor) respecto de la línea base, y con código 2 si el servidor
+responde 429: todos los usuarios virtuales salen de la misma IP, así que la API
+debe arrancarse con RATE_LIMIT_ENABLED=false.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import requests
+
+from seed import BENCH_PREFIX, BENCH_PASSWORD
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCHMARKS_DIR, 'baseline.json')
+RESULTS_DIR = os.path.join(BENCHMARKS_DIR, 'results')
+
+
+class RateLimitedError(RuntimeError):
+    """El servidor respondió 429: la medición no sería válida"""
+
+    def __init__(self, context):
+        super().__init__(f"{context}: el servidor limitó las peticiones (429). Todos los usuarios virtuales "
+                         f"salen de la misma IP; arranca la API con RATE_LIMIT_ENABLED=false")
+
+
+def check_rate_limit(response, context):
+    if response.status_code == 429:
+        raise RateLimitedError(context)
+    return response
+
+
+class VirtualUser:
+    """Sesión HTTP autenticada con los ids de sus apiarios, colmenas y preguntas"""
+
+    def __init__(self, base_url, number, timeout):
+        self.base_url = base_url.rstrip('/')
+        self.username = f'{BENCH_PREFIX}{number}'
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.rng = random.Random(number)
+        self.apiaries = []
+        self.hives = {}
+        self.questions = {}
+
+    def url(self, path):
+        return f'{self.base_url}/api{path}'
+
+    def login(self):
+        return self.session.post(self.url('/login'), json={
+            'username': self.username, 'password': BENCH_PASSWORD}, timeout=self.timeout)
+
+    def prepare(self):
+        response = check_rate_limit(self.login(), f"login de {self.username}")
+        response.raise_for_status()
+        self.session.headers['Authorization'] = f"Bearer {response.json()['token']}"
+
+        response = check_rate_limit(self.session.get(self.url('/apiaries'), timeout=self.timeout),
+                                    f"apiarios de {self.username}")
+        response.raise_for_status()
+        self.apiaries = [a['id'] for a in response.json()]
+        if not self.apiaries:
+            raise RuntimeError(f"{self.username} no tiene apiarios: ¿se ejecutó benchmarks/seed.py?")
+        for apiary_id in self.apiaries:
+            hives = self.session.get(self.url(f'/apiaries/{apiary_id}/hives'), timeout=self.timeout).json()
+            questions = self.session.get(self.url(f'/apiaries/{apiary_id}/questions'), timeout=self.timeout).json()
+            self.hives[apiary_id] = [h['id'] for h in hives]
+            self.questions[apiary_id] = questions
+
+    def pick_apiary(self):
+        return self.rng.choice(self.apiaries)
+
+    def monitoreo_payload(self):
+        apiary_id = self.pick_apiary()
+        respuestas = []
+        for q in self.questions[apiary_id]:
+            if q['question_type'] == 'opciones' and q.get('options'):
+                valor = self.rng.choice(q['options'])
+            elif q['question_type'] in ('numero', 'rango'):
+                valor = str(self.rng.randint(q.get('min_value') or 0, q.get('max_value') or 20))
+            else:
+                valor = 'Sin novedad'
+            respuestas.append({'pregunta_id': q['external_id'], 'respuesta': valor,
+                               'tipo_respuesta': q['question_type']})
+        return {
+            'id_colmena': self.rng.choice(self.hives[apiary_id]),
+            'id_apiario': apiary_id,
+            'fecha': (datetime.utcnow() - timedelta(minutes=self.rng.randint(0, 600))).isoformat(),
+            'respuestas': respuestas
+        }
+
+
+def _get(path_fn):
+    return lambda u: u.session.get(u.url(path_fn(u)), timeout=u.timeout)
+
+
+SCENARIOS = {
+    'login': lambda u: u.login(),
+    'stats': _get(lambda u: '/stats'),
+    'reports': _get(lambda u: '/reports/monitoring'),
+    'questions': _get(lambda u: f'/apiaries/{u.pick_apiary()}/questions'),
+    'question_bank': _get(lambda u: '/questions/bank'),
+    'inventory': _get(lambda u: f'/apiaries/{u.pick_apiary()}/inventory'),
+    'monitoreo_create': lambda u: u.session.post(u.url('/monitoreos'), json=u.monitoreo_payload(), timeout=u.timeout),
+}
+
+
+def percentile(sorted_values, pct):
+    """Percentil por rango más cercano"""
+    if not sorted_values:
+        return None
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def run_scenario(name, users, duration, warmup):
+    """
+    Cada usuario virtual repite la petición hasta agotar el tiempo; se descarta el
+    calentamiento. Un 429 detiene el escenario con RateLimitedError
+    """
+    action = SCENARIOS[name]
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+    rate_limited = threading.Event()
+    start = time.perf_counter()
+    measure_from = start + warmup
+    stop_at = measure_from + duration
+
+    def worker(user):
+        nonlocal errors
+        local_latencies = []
+        local_errors = 0
+        while True:
+            t0 = time.perf_counter()
+            if t0 >= stop_at or rate_limited.is_set():
+                break
+            try:
+                status = action(user).status_code
+            except requests.RequestException:
+                status = None
+            if status == 429:
+                rate_limited.set()
+                break
+            ok = status is not None and status < 400
+            t1 = time.perf_counter()
+            if t0 >= measure_from:
+                local_latencies.append((t1 - t0) * 1000)
+                local_errors += 0 if ok else 1
+        with lock:
+            latencies.extend(local_latencies)
+            errors += local_errors
+
+    with ThreadPoolExecutor(max_workers=len(users)) as pool:
+        list(pool.map(worker, users))
+    if rate_limited.is_set():
+        raise RateLimitedError(f"escenario {name}")
+
+    latencies.sort()
+    total = len(latencies)
+    return {
+        'requests': total,
+        'errors': errors,
+        'rps': round(total / duration, 1),
+        'p50_ms': round(percentile(latencies, 50) or 0, 2),
+        'p95_ms': round(percentile(latencies, 95) or 0, 2),
+        'p99_ms': round(percentile(latencies, 99) or 0, 2),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Retorna la lista de regresiones frente a la línea base"""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get('scenarios', {}).get(name)
+        if not previous:
+            continue
+        if previous['p95_ms'] and current['p95_ms'] > previous['p95_ms'] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {previous['p95_ms']} → {current['p95_ms']} ms")
+        if previous['rps'] and current['rps'] < previous['rps'] * (1 - tolerance):
+            regressions.append(f"{name}: {previous['rps']} → {current['rps']} req/s")
+        if current['errors'] > previous.get('errors', 0):
+            regressions.append(f"{name}: errores {previous.get('errors', 0)} → {current['errors']}")
+    return regressions
+
+
+def print_table(results, baseline):
+    print(f"\n{'escenario':<18}{'req':>8}{'err':>6}{'req/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'Δp95':>9}")
+    for name, r in results.items():
+        previous = baseline.get('scenarios', {}).get(name) if baseline else None
+        delta = ''
+        if previous and previous['p95_ms']:
+            delta = f"{(r['p95_ms'] / previous['p95_ms'] - 1) * 100:+.0f}%"
+        print(f"{name:<18}{r['requests']:>8}{r['errors']:>6}{r['rps']:>9}"
+              f"{r['p50_ms']:>9}{r['p95_ms']:>9}{r['p99_ms']:>9}{delta:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de carga de la API SoftBee')
+    parser.add_argument('--base-url', default=os.getenv('BENCH_BASE_URL', 'http://localhost:5000'))
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=20.0, help='segundos medidos por escenario')
+    parser.add_argument('--warmup', type=float, default=3.0, help='segundos de calentamiento descartados')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS),
+                        help=f"lista separada por comas ({', '.join(SCENARIOS)})")
+    parser.add_argument('--first-user', type=int, default=1, help='primer usuario bench_<n> a utilizar')
+    parser.add_argument('--timeout', type=float, default=30.0)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=0.10)
+    args = parser.parse_args()
+
+    names = [n.strip() for n in args.scenarios.split(',') if n.strip()]
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        print(f"❌ Escenarios desconocidos: {', '.join(unknown)}")
+        sys.exit(2)
+
+    print(f"🔐 Preparando {args.concurrency} usuarios virtuales contra {args.base_url}...")
+    users = [VirtualUser(args.base_url, args.first_user + i, args.timeout) for i in range(args.concurrency)]
+    results = {}
+    try:
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            list(pool.map(lambda u: u.prepare(), users))
+
+        for name in names:
+            print(f"⚡ {name}: {args.duration:.0f}s a concurrencia {args.concurrency}")
+            results[name] = run_scenario(name, users, args.duration, args.warmup)
+    except RateLimitedError as e:
+        print(f"❌ {e}")
+        sys.exit(2)
+
+    baseline = None
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_table(results, baseline)
+
+    report = {
+        'timestamp': datetime.utcnow().isoformat(),
+        'base_url': args.base_url,
+        'concurrency': args.concurrency,
+        'duration': args.duration,
+        'host': platform.node(),
+        'cpu_count': os.cpu_count(),
+        'scenarios': results,
+    }
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    result_path = os.path.join(RESULTS_DIR, f"{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}.json")
+    with open(result_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Resultados guardados en {os.path.relpath(result_path)}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"📌 Línea base actualizada: {os.path.relpath(args.baseline)}")
+        return
+
+    if baseline:
+        if baseline.get('concurrency') != args.concurrency:
+            print(f"⚠️  La línea base usó concurrencia {baseline.get('concurrency')}; la comparación es orientativa")
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"❌ Regresiones (tolerancia {args.tolerance:.0%}):")
+            for line in regressions:
+                print(f"   • {line}")
+            sys.exit(1)
+        print(f"✅ Sin regresiones frente a la línea base (tolerancia {args.tolerance:.0%})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+🌱 Siembra de datos para benchmarks
+Crea usuarios bench_<n> (contraseña BENCH_PASSWORD) con apiarios, colmenas, inventario,
+el cuestionario de config/preguntas_config.json ampliado a --questions preguntas y
+monitoreos del último año con una respuesta por pregunta.
+
+Todo se genera del lado del servidor con generate_series (una sentencia por tabla)
+y setseed(), de modo que dos siembras con los mismos parámetros son equivalentes.
+
+Uso:
+   BENCH_DATABASE_URL=postgresql://... python benchmarks/seed.py --scale small --reset
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import bcrypt
+import psycopg2
+import psycopg2.extras
+from dotenv import load_dotenv
+
+BENCH_PREFIX = 'bench_'
+BENCH_PASSWORD = 'bench-password'
+
+SCALES = {
+    # usuarios, apiarios por usuario, colmenas por apiario, monitoreos por colmena, ítems de inventario
+    'small': dict(users=1000, apiaries=2, hives=4, monitoreos=3, items=15),
+    'medium': dict(users=3000, apiaries=2, hives=6, monitoreos=6, items=20),
+    'large': dict(users=5000, apiaries=3, hives=8, monitoreos=12, items=25),
+}
+
+
+def get_connection():
+    load_dotenv(os.path.join(ROOT, '.env'))
+    database_url = os.getenv('BENCH_DATABASE_URL') or os.getenv('DATABASE_URL')
+    if not database_url:
+        print("❌ Error: define BENCH_DATABASE_URL (o DATABASE_URL)")
+        sys.exit(2)
+    return psycopg2.connect(database_url.replace('postgres://', 'postgresql://', 1))
+
+
+def question_catalog(total):
+    """Preguntas de preguntas_config.json más preguntas numéricas/texto hasta completar `total`"""
+    with open(os.path.join(ROOT, 'config', 'preguntas_config.json'), encoding='utf-8') as f:
+        preguntas = json.load(f)['preguntas']
+
+    catalog = []
+    for p in preguntas:
+        catalog.append((p['id'], p['pregunta'], p['tipo'], p.get('categoria'), p.get('obligatoria', False),
+                        p.get('min'), p.get('max'), json.dumps(p['opciones']) if p.get('opciones') else None))
+    n = 1
+    while len(catalog) < total:
+        if n % 3:
+            catalog.append((f'medida_{n}', f'Medida adicional {n}', 'numero', 'Mediciones', False, 0, 100, None))
+        else:
+            catalog.append((f'nota_{n}', f'Observación adicional {n}', 'texto', 'Notas', False, None, None, None))
+        n += 1
+    return catalog[:max(total, len(preguntas))]
+
+
+def timed(cursor, label, sql, params=None):
+    start = time.perf_counter()
+    cursor.execute(sql, params)
+    print(f"   {label:<24} {cursor.rowcount:>10} filas  {time.perf_counter() - start:6.1f}s")
+
+
+def seed(conn, users, apiaries, hives, monitoreos, items, questions, seed_value):
+    password_hash = bcrypt.hashpw(BENCH_PASSWORD.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    cursor = conn.cursor()
+    try:
+        cursor.execute('SELECT setseed(%s)', (seed_value,))
+
+        timed(cursor, 'users', '''
+            INSERT INTO users (nombre, username, email, phone, password)
+            SELECT 'Bench ' || g, %(prefix)s || g, %(prefix)s || g || '@bench.local', NULL, %(password)s
+            FROM generate_series(1, %(users)s) g
+        ''', {'prefix': BENCH_PREFIX, 'password': password_hash, 'users': users})
+
+        cursor.execute('''
+            CREATE TEMP TABLE bench_users ON COMMIT DROP AS
+            SELECT id FROM users WHERE username LIKE %s
+        ''', (BENCH_PREFIX.replace('_', r'\_') + '%',))
+
+        timed(cursor, 'apiaries', '''
+            INSERT INTO apiaries (user_id, name, location, beehives_count)
+            SELECT u.id, 'Apiario ' || a, 'Vereda ' || (1 + (random() * 40)::int), %(hives)s
+            FROM bench_users u CROSS JOIN generate_series(1, %(apiaries)s) a
+        ''', {'apiaries': apiaries, 'hives': hives})
+
+        cursor.execute('''
+            CREATE TEMP TABLE bench_apiaries ON COMMIT DROP AS
+            SELECT a.id FROM apiaries a JOIN bench_users u ON u.id = a.user_id
+        ''')
+
+        timed(cursor, 'hives', '''
+            INSERT INTO hives (apiary_id, hive_number, activity_level, bee_population, food_frames, brood_frames)
+            SELECT a.id, h,
+                   (ARRAY['Baja', 'Media', 'Alta'])[1 + floor(random() * 3)::int],
+                   (ARRAY['Baja', 'Media', 'Alta'])[1 + floor(random() * 3)::int],
+                   floor(random() * 10)::int, floor(random() * 10)::int
+            FROM bench_apiaries a CROSS JOIN generate_series(1, %(hives)s) h
+        ''', {'hives': hives})
+
+        timed(cursor, 'inventory', '''
+            INSERT INTO inventory (apiary_id, name, quantity, unit, description, minimum_stock)
+            SELECT a.id, 'Insumo ' || i, floor(random() * 60)::int, 'unidades', 'Material de trabajo',
+                   floor(random() * 15)::int
+            FROM bench_apiaries a CROSS JOIN generate_series(1, %(items)s) i
+        ''', {'items': items})
+
+        catalog = question_catalog(questions)
+        cursor.execute('''
+            CREATE TEMP TABLE bench_catalog (
+                position INTEGER, external_id TEXT, question_text TEXT, question_type TEXT,
+                category TEXT, is_required BOOLEAN, min_value INTEGER, max_value INTEGER, options JSONB
+            ) ON COMMIT DROP
+        ''')
+        psycopg2.extras.execute_values(cursor, 'INSERT INTO bench_catalog VALUES %s',
+                                       [(i + 1, *q) for i, q in enumerate(catalog)])
+
+        timed(cursor, 'questions', '''
+            INSERT INTO questions (apiary_id, external_id, question_text, question_type, category,
+                                   is_required, display_order, min_value, max_value, options)
+            SELECT a.id, c.external_id, c.question_text, c.question_type, c.category,
+                   c.is_required, c.position, c.min_value, c.max_value, c.options
+            FROM bench_apiaries a CROSS JOIN bench_catalog c
+        ''')
+
+        timed(cursor, 'question_versions', '''
+            INSERT INTO question_versions (question_id, question_type, question_text)
+            SELECT q.id, q.question_type, q.question_text
+            FROM questions q JOIN bench_apiaries a ON a.id = q.apiary_id
+            ON CONFLICT DO NOTHING
+        ''')
+
+        cursor.execute('''
+            SELECT monitoreos_ensure_partitions((LOCALTIMESTAMP - INTERVAL '366 days')::date, CURRENT_DATE)
+        ''')
+
+        timed(cursor, 'monitoreos', '''
+            INSERT INTO monitoreos (beehive_id, apiary_id, fecha, sincronizado)
+            SELECT h.id, h.apiary_id,
+                   date_trunc('second', LOCALTIMESTAMP - random() * INTERVAL '365 days'),
+                   random() < 0.9
+            FROM hives h
+            JOIN bench_apiaries a ON a.id = h.apiary_id
+            CROSS JOIN generate_series(1, %(monitoreos)s)
+        ''', {'monitoreos': monitoreos})
+
+        timed(cursor, 'respuestas_monitoreo', r'''
+            INSERT INTO respuestas_monitoreo
+                (monitoreo_id, fecha, pregunta_id, question_version_id, respuesta, respuesta_numero)
+            SELECT m.id, m.fecha, q.external_id, qv.id,
+                   CASE q.question_type
+                       WHEN 'opciones' THEN q.options ->> floor(random() * jsonb_array_length(q.options))::int
+                       WHEN 'texto' THEN 'Observación de la visita ' || m.id
+                   END,
+                   CASE WHEN q.question_type IN ('numero', 'rango') THEN
+                       COALESCE(q.min_value, 0)
+                       + floor(random() * (COALESCE(q.max_value, 20) - COALESCE(q.min_value, 0) + 1))
+                   END
+            FROM monitoreos m
+            JOIN bench_apiaries a ON a.id = m.apiary_id
+            JOIN questions q ON q.apiary_id = m.apiary_id
+            JOIN question_versions qv
+              ON qv.question_id = q.id
+             AND qv.question_type = q.question_type
+             AND md5(qv.question_text) = md5(q.question_text)
+        ''')
+
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+    cursor = conn.cursor()
+    conn.autocommit = True
+    try:
+        for table in ('users', 'apiaries', 'hives', 'inventory', 'questions', 'monitoreos', 'respuestas_monitoreo'):
+            cursor.execute(f'ANALYZE {table}')
+    finally:
+        conn.autocommit = False
+        cursor.close()
+
+
+def reset(conn):
+    """Elimina los usuarios de benchmark (en cascada sus apiarios y datos)"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute('DELETE FROM users WHERE username LIKE %s', (BENCH_PREFIX.replace('_', r'\_') + '%',))
+        print(f"🧹 Usuarios de benchmark eliminados: {cursor.rowcount}")
+        conn.commit()
+    finally:
+        cursor.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Siembra datos para los benchmarks de la API')
+    parser.add_argument('--scale', choices=sorted(SCALES), default='small')
+    parser.add_argument('--users', type=int)
+    parser.add_argument('--apiaries', type=int, help='apiarios por usuario')
+    parser.add_argument('--hives', type=int, help='colmenas por apiario')
+    parser.add_argument('--monitoreos', type=int, help='monitoreos por colmena')
+    parser.add_argument('--items', type=int, help='ítems de inventario por apiario')
+    parser.add_argument('--questions', type=int, default=32, help='preguntas por apiario (respuestas por monitoreo)')
+    parser.add_argument('--seed', type=float, default=0.42, help='semilla de random() en [-1, 1]')
+    parser.add_argument('--reset', action='store_true', help='eliminar antes los datos de benchmark existentes')
+    args = parser.parse_args()
+
+    volumes = dict(SCALES[args.scale])
+    for key in volumes:
+        if getattr(args, key) is not None:
+            volumes[key] = getattr(args, key)
+
+    conn = get_connection()
+    try:
+        if args.reset:
+            reset(conn)
+        print(f"🌱 Sembrando ({args.scale}): {volumes}, {args.questions} preguntas por apiario")
+        start = time.perf_counter()
+        seed(conn, questions=args.questions, seed_value=args.seed, **volumes)
+        print(f"✅ Siembra completa en {time.perf_counter() - start:.1f}s "
+              f"(usuarios {BENCH_PREFIX}1..{BENCH_PREFIX}{volumes['users']}, contraseña '{BENCH_PASSWORD}')")
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+🏭 SoftBee Data Generator
+Genera datos sintéticos a escala de producción para pruebas de rendimiento:
+users, apiaries, hives, inventory, questions, question_versions, monitoreos y
+respuestas_monitoreo, con distribuciones realistas:
+
+- apiarios por usuario con sesgo (log-normal: la mayoría tiene 1-2, unos pocos decenas)
+- fechas de monitoreo estacionales (más visitas en las temporadas de floración)
+- respuestas que respetan las opciones y rangos de config/preguntas_config.json
+
+Los datos se cargan con COPY desde varios procesos en paralelo; cada proceso genera
+bloques de usuarios completos y reserva rangos de ids en las secuencias, por lo que
+la base no debe recibir otras escrituras mientras se ejecuta.
+
+Uso:
+   python generate_data.py plan --users 100000
+   python generate_data.py run --users 100000 --workers 8
+   python generate_data.py purge
+"""
+
+import argparse
+import csv
+import io
+import json
+import math
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from multiprocessing import Pool
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import bcrypt
+import psycopg2
+from dotenv import load_dotenv
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PREFIX = 'gen_'
+GENERATED_PASSWORD = 'generated-password'
+ID_LOCK_KEY = 715_001
+
+# Peso relativo de visitas por mes (enero..diciembre): dos temporadas de floración
+SEASONAL_WEIGHTS = [0.6, 0.7, 1.1, 1.4, 1.2, 0.8, 0.7, 0.8, 1.1, 1.4, 1.2, 0.7]
+
+ACTIVITY_LEVELS = ['Baja', 'Media', 'Alta']
+HIVE_STATUSES = ['Cámara de cría', 'Cámara de cría y producción', 'Cámara de cría y doble alza de producción']
+HEALTH_STATUSES = ['Ninguno', 'Presencia barroa', 'Presencia de polilla', 'Presencia de curruncho',
+                   'Mortalidad- malformación en nodrizas']
+HEALTH_WEIGHTS = [70, 12, 8, 6, 4]
+
+INVENTORY_TEMPLATE = [
+    ('Marcos', 'unidades', 10), ('Cera estampada', 'láminas', 20), ('Ahumador', 'unidades', 1),
+    ('Overol', 'unidades', 1), ('Guantes', 'pares', 2), ('Alzas', 'unidades', 4),
+    ('Alimentadores', 'unidades', 5), ('Azúcar', 'kg', 25), ('Frascos', 'unidades', 100),
+    ('Excluidor de reinas', 'unidades', 2), ('Velo', 'unidades', 1), ('Palanca', 'unidades', 1),
+]
+
+TEXT_ANSWERS = ['Sin novedad', 'Se observa varroa leve', 'Presencia de polilla en marcos viejos',
+                'Cría salteada', 'Colmena fuerte', 'Se cambió marco dañado']
+
+TABLE_COLUMNS = {
+    'users': ('id', 'nombre', 'username', 'email', 'phone', 'password', 'profile_picture'),
+    'apiaries': ('id', 'user_id', 'name', 'location', 'beehives_count', 'treatments'),
+    'hives': ('id', 'apiary_id', 'hive_number', 'activity_level', 'bee_population', 'food_frames',
+              'brood_frames', 'hive_status', 'health_status', 'has_production_chamber'),
+    'inventory': ('id', 'apiary_id', 'name', 'quantity', 'unit', 'description', 'minimum_stock'),
+    'questions': ('id', 'apiary_id', 'external_id', 'question_text', 'question_type', 'category',
+                  'is_required', 'display_order', 'min_value', 'max_value', 'options'),
+    'question_versions': ('id', 'question_id', 'question_type', 'question_text'),
+    'monitoreos': ('id', 'beehive_id', 'apiary_id', 'fecha', 'datos_json', 'sincronizado'),
+    'respuestas_monitoreo': ('id', 'monitoreo_id', 'fecha', 'pregunta_id', 'question_version_id',
+                             'respuesta', 'respuesta_numero'),
+}
+
+# Orden de carga (respeta las claves foráneas)
+LOAD_ORDER = list(TABLE_COLUMNS)
+
+
+def get_database_url():
+    load_dotenv()
+    database_url = os.getenv('GENERATOR_DATABASE_URL') or os.getenv('DATABASE_URL')
+    if not database_url:
+        print("❌ Error: define GENERATOR_DATABASE_URL (o DATABASE_URL)")
+        sys.exit(2)
+    return database_url.replace('postgres://', 'postgresql://', 1)
+
+
+def load_questions():
+    with open(os.path.join(ROOT, 'config', 'preguntas_config.json'), encoding='utf-8') as f:
+        return json.load(f)['preguntas']
+
+
+def lognormal_count(rng, mean, sigma, cap):
+    """Entero >= 1 con distribución log-normal de media aproximada `mean`"""
+    mu = math.log(mean) - sigma ** 2 / 2
+    return max(1, min(cap, int(round(rng.lognormvariate(mu, sigma)))))
+
+
+def seasonal_datetime(rng, years):
+    """Fecha de visita en los últimos `years` años, sesgada por temporada y en horario diurno"""
+    today = date.today()
+    while True:
+        year = today.year - rng.randrange(years + 1)
+        month = rng.choices(range(1, 13), weights=SEASONAL_WEIGHTS)[0]
+        day = rng.randint(1, 28)
+        visit = datetime(year, month, day, rng.randint(7, 16), rng.randint(0, 59))
+        if visit.date() <= today and visit.date() > today - timedelta(days=365 * years):
+            return visit
+
+
+def answer_for(rng, question, hive_health):
+    """Respuesta coherente con el tipo y opciones de la pregunta; retorna (texto, número)"""
+    tipo = question['tipo']
+    if tipo == 'opciones':
+        opciones = question['opciones']
+        # Las primeras opciones (estados buenos) son las más frecuentes; colmenas enfermas se desplazan
+        bias = 2.5 if hive_health == 'Ninguno' else 1.2
+        weights = [bias ** (len(opciones) - i) for i in range(len(opciones))]
+        return rng.choices(opciones, weights=weights)[0], None
+    if tipo in ('numero', 'rango'):
+        low, high = question.get('min', 0), question.get('max', 20)
+        return None, int(round(rng.triangular(low, high, (low + high) / 2)))
+    return rng.choice(TEXT_ANSWERS), None
+
+
+class Chunk:
+    """Filas de un bloque de usuarios con ids locales (0..n) pendientes de reservar"""
+
+    def __init__(self):
+        self.rows = {table: [] for table in TABLE_COLUMNS}
+
+    def add(self, table, row):
+        self.rows[table].append(row)
+        return len(self.rows[table]) - 1
+
+
+def build_chunk(rng, first_index, count, options):
+    """Genera usuarios completos; las referencias usan índices locales que luego se desplazan"""
+    chunk = Chunk()
+    preguntas = options['questions']
+    prefix = options['prefix']
+    for n in range(first_index, first_index + count):
+        user = chunk.add('users', [f'Apicultor {n}', f'{prefix}{n}', f'{prefix}{n}@example.com',
+                                   f'3{rng.randint(100000000, 199999999)}', options['password_hash'],
+                                   'profile_picture.png'])
+        for a in range(lognormal_count(rng, options['apiaries_mean'], 0.9, 60)):
+            hives_count = lognormal_count(rng, options['hives_mean'], 0.6, 120)
+            apiary = chunk.add('apiaries', [('users', user), f'Apiario {a + 1}',
+                                            f'Vereda {rng.randint(1, 400)}', hives_count, rng.random() < 0.3])
+
+            for name, unit, minimum in INVENTORY_TEMPLATE[:rng.randint(5, len(INVENTORY_TEMPLATE))]:
+                chunk.add('inventory', [('apiaries', apiary), name, rng.randint(0, minimum * 3), unit,
+                                        'Material de trabajo', minimum])
+
+            versions = []
+            for order, q in enumerate(preguntas, 1):
+                question = chunk.add('questions', [
+                    ('apiaries', apiary), q['id'], q['pregunta'], q['tipo'], q.get('categoria'),
+                    q.get('obligatoria', False), order, q.get('min'), q.get('max'),
+                    json.dumps(q['opciones'], ensure_ascii=False) if q.get('opciones') else None])
+                versions.append(chunk.add('question_versions',
+                                          [('questions', question), q['tipo'], q['pregunta']]))
+
+            for h in range(hives_count):
+                health = rng.choices(HEALTH_STATUSES, weights=HEALTH_WEIGHTS)[0]
+                hive = chunk.add('hives', [
+                    ('apiaries', apiary), h + 1, rng.choice(ACTIVITY_LEVELS), rng.choice(ACTIVITY_LEVELS),
+                    rng.randint(0, 10), rng.randint(0, 10), rng.choice(HIVE_STATUSES), health,
+                    rng.choice(['Si', 'No'])])
+
+                visits = max(0, int(rng.gauss(options['visits_per_year'] * options['years'], 2)))
+                for _ in range(visits):
+                    fecha = seasonal_datetime(rng, options['years'])
+                    monitoreo = chunk.add('monitoreos', [('hives', hive), ('apiaries', apiary), fecha,
+                                                         None, rng.random() < 0.95])
+                    for q, version in zip(preguntas, versions):
+                        if not q.get('obligatoria', False) and rng.random() < 0.4:
+                            continue
+                        texto, numero = answer_for(rng, q, health)
+                        chunk.add('respuestas_monitoreo', [('monitoreos', monitoreo), fecha, q['id'],
+                                                           ('question_versions', version), texto, numero])
+    return chunk
+
+
+def reserve_ids(conn, counts):
+    """Reserva un rango contiguo de ids por tabla avanzando cada secuencia"""
+    starts = {}
+    cursor = conn.cursor()
+    try:
+        cursor.execute('SELECT pg_advisory_xact_lock(%s)', (ID_LOCK_KEY,))
+        for table, n in counts.items():
+            if n == 0:
+                starts[table] = 0
+                continue
+            cursor.execute("SELECT nextval(pg_get_serial_sequence(%s, 'id'))", (table,))
+            start = cursor.fetchone()[0]
+            cursor.execute("SELECT setval(pg_get_serial_sequence(%s, 'id'), %s)", (table, start + n - 1))
+            starts[table] = start
+        conn.commit()
+        return starts
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def copy_chunk(conn, chunk):
+    """Asigna ids definitivos y carga cada tabla con COPY en una sola transacción"""
+    starts = reserve_ids(conn, {t: len(rows) for t, rows in chunk.rows.items()})
+    cursor = conn.cursor()
+    try:
+        for table in LOAD_ORDER:
+            rows = chunk.rows[table]
+            if not rows:
+                continue
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            base = starts[table]
+            for local_id, row in enumerate(rows):
+                writer.writerow([base + local_id] + [
+                    starts[value[0]] + value[1] if isinstance(value, tuple) else value for value in row])
+            buffer.seek(0)
+            cursor.copy_expert(
+                f"COPY {table} ({', '.join(TABLE_COLUMNS[table])}) FROM STDIN WITH (FORMAT csv)", buffer)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+    return {table: len(rows) for table, rows in chunk.rows.items()}
+
+
+def _worker(task):
+    database_url, first_index, count, options = task
+    rng = random.Random(f"{options['seed']}:{first_index}")
+    chunk = build_chunk(rng, first_index, count, options)
+    conn = psycopg2.connect(database_url)
+    try:
+        return copy_chunk(conn, chunk)
+    finally:
+        conn.close()
+
+
+def estimate(args):
+    """Filas esperadas por tabla (aproximación por medias)"""
+    questions = len(load_questions())
+    answered = sum(1 if q.get('obligatoria') else 0.6 for q in load_questions())
+    apiaries = args.users * args.apiaries_mean
+    hives = apiaries * args.hives_mean
+    monitoreos = hives * args.visits_per_year * args.years
+    return {
+        'users': args.users,
+        'apiaries': int(apiaries),
+        'hives': int(hives),
+        'inventory': int(apiaries * 8.5),
+        'questions': int(apiaries * questions),
+        'question_versions': int(apiaries * questions),
+        'monitoreos': int(monitoreos),
+        'respuestas_monitoreo': int(monitoreos * answered),
+    }
+
+
+def print_plan(counts):
+    total = sum(counts.values())
+    for table, n in counts.items():
+        print(f"   {table:<22} ~{n:>12,}")
+    print(f"   {'total':<22} ~{total:>12,}")
+
+
+def ensure_partitions(database_url, years):
+    conn = psycopg2.connect(database_url)
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT monitoreos_ensure_partitions((CURRENT_DATE - %s * INTERVAL '1 year')::date, CURRENT_DATE)",
+            (years,))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def analyze(database_url):
+    conn = psycopg2.connect(database_url)
+    conn.autocommit = True
+    try:
+        cursor = conn.cursor()
+        for table in LOAD_ORDER:
+            cursor.execute(f'ANALYZE {table}')
+    finally:
+        conn.close()
+
+
+def run(args):
+    database_url = get_database_url()
+    counts = estimate(args)
+    print(f"🏭 Generando datos con {args.workers} procesos, bloques de {args.chunk_size} usuarios:")
+    print_plan(counts)
+
+    options = {
+        'prefix': args.prefix,
+        'seed': args.seed,
+        'apiaries_mean': args.apiaries_mean,
+        'hives_mean': args.hives_mean,
+        'visits_per_year': args.visits_per_year,
+        'years': args.years,
+        'questions': load_questions(),
+        'password_hash': bcrypt.hashpw(GENERATED_PASSWORD.encode('utf-8'), bcrypt.gensalt()).decode('utf-8'),
+    }
+    ensure_partitions(database_url, args.years)
+
+    tasks = [(database_url, first, min(args.chunk_size, args.users - first + 1), options)
+             for first in range(1, args.users + 1, args.chunk_size)]
+    loaded = {table: 0 for table in TABLE_COLUMNS}
+    start = time.perf_counter()
+    with Pool(args.workers) as pool:
+        for done, result in enumerate(pool.imap_unordered(_worker, tasks), 1):
+            for table, n in result.items():
+                loaded[table] += n
+            elapsed = time.perf_counter() - start
+            rows = sum(loaded.values())
+            print(f"   bloque {done}/{len(tasks)}: {rows:,} filas, {rows / elapsed:,.0f} filas/s", end='\r')
+
+    print()
+    print("📊 Actualizando estadísticas (ANALYZE)...")
+    analyze(database_url)
+    elapsed = time.perf_counter() - start
+    print(f"✅ {sum(loaded.values()):,} filas en {elapsed:.0f}s:")
+    print_plan(loaded)
+    print(f"   Usuarios {args.prefix}1..{args.prefix}{args.users}, contraseña '{GENERATED_PASSWORD}'")
+
+
+def purge(args):
+    conn = psycopg2.connect(get_database_url())
+    try:
+        cursor = conn.cursor()
+        cursor.execute('DELETE FROM users WHERE username LIKE %s', (args.prefix.replace('_', r'\_') + '%',))
+        conn.commit()
+        print(f"🧹 Usuarios generados eliminados (con sus datos en cascada): {cursor.rowcount:,}")
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generador de datos sintéticos de SoftBee')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    for name in ('plan', 'run'):
+        sub = subparsers.add_parser(name)
+        sub.add_argument('--users', type=int, default=2500)
+        sub.add_argument('--apiaries-mean', type=float, default=2.0, help='media de apiarios por usuario')
+        sub.add_argument('--hives-mean', type=float, default=8.0, help='media de colmenas por apiario')
+        sub.add_argument('--visits-per-year', type=float, default=12.0, help='monitoreos por colmena al año')
+        sub.add_argument('--years', type=int, default=2, help='años de historia')
+        sub.add_argument('--workers', type=int, default=os.cpu_count() or 2)
+        sub.add_argument('--chunk-size', type=int, default=100, help='usuarios por bloque/transacción')
+        sub.add_argument('--seed', default='softbee')
+        sub.add_argument('--prefix', default=DEFAULT_PREFIX)
+
+    sub = subparsers.add_parser('purge')
+    sub.add_argument('--prefix', default=DEFAULT_PREFIX)
+
+    args = parser.parse_args()
+    if args.command == 'plan':
+        print("📐 Filas estimadas:")
+        print_plan(estimate(args))
+    elif args.command == 'run':
+        run(args)
+    elif args.command == 'purge':
+        purge(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Configuración de gunicorn para producción.
+
+Uso:
+   gunicorn -c gunicorn.conf.py wsgi:app
+
+- preload_app: create_app() (configuración, blueprints, banners) se ejecuta una
+  sola vez en el proceso maestro y los workers la heredan al hacer fork.
+- Cada worker abre su propio pool de conexiones en post_fork; el maestro cierra
+  el suyo antes de crear workers, así ningún socket de psycopg2 se comparte.
+- max_requests (+ jitter) recicla los workers de forma escalonada.
+- WEB_CONCURRENCY fija el número de workers; si no se define se calcula con
+  src/utils/server_tuning.py a partir de los núcleos y la latencia de la BD.
+
+Recarga sin cortes:
+   kill -HUP <pid maestro>     reinicia los workers con la configuración actual
+   kill -USR2 <pid maestro>    nuevo maestro con el código desplegado; luego
+   kill -QUIT <pid anterior>   el maestro anterior termina sus peticiones y sale
+"""
+
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from src.utils.server_tuning import autotune_workers
+
+threads = int(os.getenv('WEB_THREADS', 4))
+
+# Un pool por worker con una conexión por hilo (leído por config.py al precargar la app).
+# getconn() no espera: con menos conexiones que hilos, una petición recibiría PoolError.
+# Solo los hilos de las peticiones toman conexiones del pool (el monitor de salud y los
+# trabajos abren las suyas). DB_POOL_MAX_SIZE=0 sigue desactivando el pool.
+_pool_max_size = int(os.getenv('DB_POOL_MAX_SIZE', threads))
+_pool_resized = 0 < _pool_max_size < threads
+if _pool_resized:
+    _pool_max_size = threads
+os.environ['DB_POOL_MAX_SIZE'] = str(_pool_max_size)
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+worker_class = 'gthread'
+workers = int(os.getenv('WEB_CONCURRENCY', 0))
+preload_app = True
+
+max_requests = int(os.getenv('WEB_MAX_REQUESTS', 2000))
+max_requests_jitter = int(os.getenv('WEB_MAX_REQUESTS_JITTER', 200))
+timeout = int(os.getenv('WEB_TIMEOUT', 60))
+graceful_timeout = int(os.getenv('WEB_GRACEFUL_TIMEOUT', 30))
+keepalive = 5
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.getenv('WEB_LOG_LEVEL', 'info')
+
+
+def _autotune():
+    from src.database.db import resolve_database_url
+
+    try:
+        database_url = resolve_database_url(os.getenv('DATABASE_URL'))
+    except ValueError:
+        database_url = None
+    return autotune_workers(database_url, threads=threads, logger=print)
+
+
+if not workers:
+    workers = _autotune()
+
+
+def when_ready(server):
+    # La app ya está precargada: cerrar las conexiones del maestro antes de crear workers
+    from src.database.db import close_pool
+
+    close_pool()
+    if _pool_resized:
+        server.log.warning(f"DB_POOL_MAX_SIZE es menor que WEB_THREADS: se usa {_pool_max_size}")
+    server.log.info(f"🚀 {workers} workers × {threads} hilos (pool de {os.environ['DB_POOL_MAX_SIZE']} por worker)")
+
+
+def post_fork(server, worker):
+    from src.database.db import init_pool, reset_pool_after_fork
+
+    reset_pool_after_fork()
+    init_pool(worker.app.wsgi())
+
+
+def worker_exit(server, worker):
+    from src.database.db import close_pool
+
+    close_pool()
+
+
+def on_reload(server):
+    server.log.info("🔄 Recarga solicitada (HUP): reiniciando workers")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+🐝 SoftBee Health Scores
+Recalcula las puntuaciones de salud de todas las colmenas (motor vectorizado de
+src/utils/health_scoring.py) y las guarda en hive_health_scores.
+Pensado para ejecutarse cada noche (cron); la API las recalcula al consultarlas
+si tienen más de 26 horas.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import psycopg2
+from dotenv import load_dotenv
+
+from src.controllers.hive_health import HiveHealthController
+
+
+def print_help():
+    print("""
+📋 Comandos disponibles:
+
+   refresh                  - Recalcular y guardar las puntuaciones de todas las colmenas
+   show [apiario_id]        - Mostrar las puntuaciones por apiario (recalculadas, sin guardar)
+
+📚 Ejemplos:
+   python health_scores.py refresh
+   0 3 * * * cd /app && python health_scores.py refresh
+""")
+
+
+def get_connection():
+    load_dotenv()
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        print("❌ Error: DATABASE_URL no está configurada")
+        sys.exit(1)
+    if database_url.startswith("postgres://"):
+        database_url = database_url.replace("postgres://", "postgresql://", 1)
+    return psycopg2.connect(database_url)
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] in ('help', '--help', '-h'):
+        print_help()
+        return
+
+    command = sys.argv[1].lower()
+    conn = get_connection()
+    try:
+        controller = HiveHealthController(conn)
+        if command == 'refresh':
+            started = time.perf_counter()
+            hives, apiaries = controller.compute()
+            elapsed = time.perf_counter() - started
+            at_risk = sum(1 for hive in hives if hive['flags'])
+            print(f"✅ {len(hives)} colmenas en {len(apiaries)} apiarios puntuadas en {elapsed:.2f}s "
+                  f"({at_risk} con algún riesgo)")
+
+        elif command == 'show':
+            apiary_id = int(sys.argv[2]) if len(sys.argv) > 2 else None
+            _, apiaries = controller.compute(save=False)
+            for apiary in apiaries:
+                if apiary_id is not None and apiary['apiary_id'] != apiary_id:
+                    continue
+                score = '—' if apiary['score'] is None else f"{apiary['score']:.1f}"
+                print(f"   Apiario {apiary['apiary_id']:<6} puntuación {score:>5}  "
+                      f"{apiary['hives']} colmenas, {apiary['at_risk']} en riesgo")
+
+        else:
+            print(f"❌ Comando desconocido: {command}")
+            print_help()
+            sys.exit(1)
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
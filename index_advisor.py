@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+🔎 SoftBee Index Advisor
+Siembra datos en una base PostgreSQL desechable, ejecuta cada consulta de los modelos
+y obtiene su plan con EXPLAIN. Termina con código 1 si alguna consulta recorre una
+tabla completa (Seq Scan), de modo que puede usarse como verificación en CI.
+
+Con enable_seqscan = off el planificador solo elige un Seq Scan cuando ningún índice
+puede servir la consulta, así que el resultado no depende del volumen sembrado.
+
+Uso:
+   INDEX_ADVISOR_DATABASE_URL=postgresql://... python index_advisor.py [--keep] [--verbose]
+"""
+
+import os
+import sys
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import psycopg2
+from dotenv import load_dotenv
+from flask import Flask
+
+from src.models.users import UserModel
+from src.models.password_reset_tokens import PasswordResetTokenModel
+from src.models.apiary import ApiaryModel
+from src.models.apiary_access import ApiaryAccessModel
+from src.models.hive import HiveModel
+from src.models.questions import QuestionModel
+from src.models.inventory import InventoryModel
+from src.models.monitoreo import MonitoreoModel
+from src.models.sync import SyncModel
+
+# Consultas que por diseño leen la tabla completa (listados administrativos)
+ALLOWED_FULL_SCANS = {
+    'UserModel.get_all',
+    'ApiaryAccessModel.get_all_raw',
+}
+
+EXPLAINABLE = ('SELECT', 'WITH', 'UPDATE', 'DELETE')
+
+
+class ExplainCursor:
+    """Cursor que obtiene el plan de cada consulta antes de ejecutarla"""
+
+    def __init__(self, cursor, advisor):
+        self._cursor = cursor
+        self._advisor = advisor
+
+    def execute(self, query, params=None):
+        self._advisor.explain(query, params)
+        return self._cursor.execute(query, params)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._cursor.close()
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class ExplainConnection:
+    """Conexión que entrega ExplainCursor a los modelos"""
+
+    def __init__(self, conn, advisor):
+        self._conn = conn
+        self._advisor = advisor
+
+    def cursor(self, *args, **kwargs):
+        return ExplainCursor(self._conn.cursor(*args, **kwargs), self._advisor)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+class IndexAdvisor:
+    def __init__(self, conn, verbose=False):
+        self.conn = conn
+        self.verbose = verbose
+        self.label = 'seed'
+        self.plans = []
+
+    def explain(self, query, params):
+        text = query.decode() if isinstance(query, bytes) else query
+        if not text.lstrip().upper().startswith(EXPLAINABLE):
+            return
+        cursor = self.conn.cursor()
+        try:
+            prefix = b'EXPLAIN (FORMAT JSON) ' if isinstance(query, bytes) else 'EXPLAIN (FORMAT JSON) '
+            cursor.execute(prefix + query, params)
+            plan = cursor.fetchone()[0][0]['Plan']
+        finally:
+            cursor.close()
+        self.plans.append((self.label, ' '.join(text.split()), plan))
+
+    @staticmethod
+    def seq_scans(plan):
+        found = []
+        if plan.get('Node Type') == 'Seq Scan':
+            found.append(plan.get('Relation Name'))
+        for child in plan.get('Plans', []):
+            found.extend(IndexAdvisor.seq_scans(child))
+        return found
+
+    def run(self, label, func, *args, **kwargs):
+        self.label = label
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.label = 'seed'
+
+    def report(self):
+        problems = []
+        for label, query, plan in self.plans:
+            tables = self.seq_scans(plan)
+            if self.verbose:
+                print(f"   {label:<40} {plan['Node Type']}")
+            if tables and label not in ALLOWED_FULL_SCANS:
+                problems.append((label, tables, query))
+
+        print(f"📊 Consultas analizadas: {len(self.plans)}")
+        if not problems:
+            print("✅ Ninguna consulta requiere un Seq Scan")
+            return True
+
+        print(f"❌ {len(problems)} consultas recorren tablas completas:")
+        for label, tables, query in problems:
+            print(f"   • {label}: Seq Scan en {', '.join(sorted(set(tables)))}")
+            print(f"     {query[:160]}")
+        return False
+
+
+def seed(db, tag, users=3, apiaries_per_user=2, hives_per_apiary=4, monitoreos_per_hive=3):
+    """Crea un conjunto pequeño pero completo de datos relacionados"""
+    data = {'users': [], 'apiaries': [], 'hives': [], 'items': [], 'questions': [], 'monitoreos': []}
+    for u in range(users):
+        user_id = UserModel.create(db, f'Advisor {u}', f'advisor_{tag}_{u}', f'advisor_{tag}_{u}@example.com',
+                                   None, 'x' * 60)
+        data['users'].append(user_id)
+        for a in range(apiaries_per_user):
+            apiary_id = ApiaryModel.create(db, user_id, f'Apiario {tag} {a}', 'Vereda')
+            data['apiaries'].append(apiary_id)
+            data['items'].extend(item['id'] for item in InventoryModel.get_all(db, apiary_id))
+            for q in range(3):
+                data['questions'].append(QuestionModel.create(
+                    db, apiary_id, f'Pregunta {q}', 'numero' if q else 'texto',
+                    display_order=q + 1, external_id=f'q{q}'))
+            for h in range(hives_per_apiary):
+                hive_id = HiveModel.create(db, apiary_id, h + 1, activity_level='Media')
+                data['hives'].append(hive_id)
+                for m in range(monitoreos_per_hive):
+                    fecha = datetime.utcnow() - timedelta(days=20 * m)
+                    data['monitoreos'].append(MonitoreoModel.create(
+                        db, hive_id, apiary_id, fecha.isoformat(),
+                        [{'pregunta_id': 'q0', 'respuesta': 'ok'}, {'pregunta_id': 'q1', 'respuesta': '12'}]))
+    return data
+
+
+def exercise(advisor, db, data, tag):
+    """Llama cada método de lectura/actualización de los modelos con datos sembrados"""
+    user_id, apiary_id, hive_id = data['users'][0], data['apiaries'][0], data['hives'][0]
+    item_id, question_id, monitoreo_id = data['items'][0], data['questions'][0], data['monitoreos'][0]
+    run = advisor.run
+
+    run('UserModel.get_by_id', UserModel.get_by_id, db, user_id)
+    run('UserModel.get_profile_version', UserModel.get_profile_version, db, user_id)
+    run('UserModel.get_by_username', UserModel.get_by_username, db, f'advisor_{tag}_0')
+    run('UserModel.get_by_email', UserModel.get_by_email, db, f'advisor_{tag}_0@example.com')
+    run('UserModel.update', UserModel.update, db, user_id, phone='3000000000')
+    run('UserModel.get_all', UserModel.get_all, db)
+
+    token = run('PasswordResetTokenModel.create_token', PasswordResetTokenModel.create_token, db, user_id)
+    run('PasswordResetTokenModel.validate_token', PasswordResetTokenModel.validate_token, db, token)
+    run('PasswordResetTokenModel.mark_as_used', PasswordResetTokenModel.mark_as_used, db, token)
+
+    run('ApiaryModel.get_by_id', ApiaryModel.get_by_id, db, apiary_id)
+    run('ApiaryModel.get_by_user', ApiaryModel.get_by_user, db, user_id)
+    run('ApiaryModel.get_version', ApiaryModel.get_version, db, apiary_id)
+    run('ApiaryModel.get_user_version', ApiaryModel.get_user_version, db, user_id)
+    run('ApiaryModel.update', ApiaryModel.update, db, apiary_id, location='Finca')
+
+    run('ApiaryAccessModel.create_raw', ApiaryAccessModel.create_raw, db, data['users'][1], apiary_id)
+    run('ApiaryAccessModel.get_by_user_id_raw', ApiaryAccessModel.get_by_user_id_raw, db, data['users'][1])
+    run('ApiaryAccessModel.get_by_apiary_id_raw', ApiaryAccessModel.get_by_apiary_id_raw, db, apiary_id)
+    run('ApiaryAccessModel.update_raw', ApiaryAccessModel.update_raw, db, data['users'][1], apiary_id, 2)
+    run('ApiaryAccessModel.get_all_raw', ApiaryAccessModel.get_all_raw, db)
+    run('ApiaryAccessModel.delete_raw', ApiaryAccessModel.delete_raw, db, data['users'][1], apiary_id)
+
+    run('HiveModel.get_by_id', HiveModel.get_by_id, db, hive_id)
+    run('HiveModel.get_version', HiveModel.get_version, db, hive_id)
+    run('HiveModel.get_by_apiary', HiveModel.get_by_apiary, db, apiary_id)
+    run('HiveModel.get_hive_number', HiveModel.get_hive_number, db, apiary_id, 1)
+    run('HiveModel.update', HiveModel.update, db, hive_id, food_frames=4)
+
+    run('QuestionModel.get_by_id', QuestionModel.get_by_id, db, question_id)
+    run('QuestionModel.get_by_apiary', QuestionModel.get_by_apiary, db, apiary_id)
+    run('QuestionModel.get_apiary_version', QuestionModel.get_apiary_version, db, apiary_id)
+    run('QuestionModel.get_hive_version', QuestionModel.get_hive_version, db, hive_id)
+    run('QuestionModel.get_by_external_id', QuestionModel.get_by_external_id, db, apiary_id, 'q1')
+    run('QuestionModel.update', QuestionModel.update, db, question_id, is_required=True)
+    run('QuestionModel.reorder', QuestionModel.reorder, db, apiary_id, list(reversed(data['questions'][:3])))
+
+    run('InventoryModel.get_all', InventoryModel.get_all, db, apiary_id)
+    run('InventoryModel.get_apiary_version', InventoryModel.get_apiary_version, db, apiary_id, user_id)
+    run('InventoryModel.get_by_id', InventoryModel.get_by_id, db, item_id)
+    run('InventoryModel.update', InventoryModel.update, db, item_id, quantity=5)
+    run('InventoryModel.search', InventoryModel.search, db, user_id, 'cera')
+    run('InventoryModel.search(apiario)', InventoryModel.search, db, user_id, 'ahumdor', apiary_id)
+    run('InventoryModel.adjust_quantity', InventoryModel.adjust_quantity, db, item_id, 2)
+    run('InventoryModel.get_by_user_id', InventoryModel.get_by_user_id, db, user_id)
+    run('InventoryModel.get_low_stock_items', InventoryModel.get_low_stock_items, db, apiary_id)
+    run('InventoryModel.get_apiary_summary', InventoryModel.get_apiary_summary, db, apiary_id)
+    run('InventoryModel.validate_apiary_access', InventoryModel.validate_apiary_access, db, item_id, user_id)
+    run('InventoryModel.get_item_with_apiary', InventoryModel.get_item_with_apiary, db, item_id)
+    run('InventoryModel.delete_by_name', InventoryModel.delete_by_name, db, apiary_id, 'Guantes')
+
+    run('MonitoreoModel.get_by_id', MonitoreoModel.get_by_id, db, monitoreo_id)
+    run('MonitoreoModel.get_all', MonitoreoModel.get_all, db)
+    run('MonitoreoModel.get_by_apiario', MonitoreoModel.get_by_apiario, db, apiary_id)
+    run('MonitoreoModel.get_by_apiario(rango)', MonitoreoModel.get_by_apiario, db, apiary_id,
+        datetime.utcnow() - timedelta(days=30), datetime.utcnow())
+    run('MonitoreoModel.get_by_colmena', MonitoreoModel.get_by_colmena, db, hive_id)
+    run('MonitoreoModel.get_all_with_details', MonitoreoModel.get_all_with_details, db, user_id)
+    run('MonitoreoModel.get_pending_sync', MonitoreoModel.get_pending_sync, db)
+    run('MonitoreoModel.mark_as_synced', MonitoreoModel.mark_as_synced, db, monitoreo_id)
+    run('MonitoreoModel.update', MonitoreoModel.update, db, monitoreo_id, sincronizado=False)
+    run('MonitoreoModel.delete', MonitoreoModel.delete, db, data['monitoreos'][-1])
+
+    run('SyncModel.get_changes(completo)', SyncModel.get_changes, db, user_id)
+    run('SyncModel.get_changes(delta)', SyncModel.get_changes, db, user_id,
+        datetime.utcnow() - timedelta(hours=1))
+
+    run('InventoryModel.delete', InventoryModel.delete, db, item_id)
+    run('QuestionModel.delete', QuestionModel.delete, db, question_id)
+    run('HiveModel.delete', HiveModel.delete, db, hive_id)
+
+
+def cleanup(db, data):
+    cursor = db.cursor()
+    try:
+        # Borrar los usuarios arrastra en cascada apiarios, colmenas, inventario y monitoreos.
+        # Solo se borran las lápidas de lo sembrado: los hijos borrados en cascada quedan
+        # con user_id NULL pero conservan su apiary_id
+        cursor.execute('DELETE FROM users WHERE id = ANY(%s)', (data['users'],))
+        cursor.execute('DELETE FROM sync_tombstones WHERE user_id = ANY(%s) OR apiary_id = ANY(%s)',
+                       (data['users'], data['apiaries']))
+        db.commit()
+    finally:
+        cursor.close()
+
+
+def main():
+    load_dotenv()
+    # Sin respaldo en DATABASE_URL: siembra, modifica y borra datos, nunca debe apuntar
+    # por accidente a la base de la aplicación
+    database_url = os.getenv('INDEX_ADVISOR_DATABASE_URL')
+    if not database_url:
+        print("❌ Error: define INDEX_ADVISOR_DATABASE_URL con una base desechable")
+        sys.exit(2)
+
+    keep = '--keep' in sys.argv
+    verbose = '--verbose' in sys.argv
+
+    conn = psycopg2.connect(database_url.replace('postgres://', 'postgresql://', 1))
+    app = Flask(__name__)
+    try:
+        with app.app_context():
+            cursor = conn.cursor()
+            cursor.execute('SET enable_seqscan = off')
+            cursor.close()
+
+            advisor = IndexAdvisor(conn, verbose=verbose)
+            db = ExplainConnection(conn, advisor)
+            tag = uuid.uuid4().hex[:8]
+
+            print("🌱 Sembrando datos de prueba...")
+            data = seed(db, tag)
+            conn.cursor().execute('ANALYZE')
+            conn.commit()
+
+            print("🔎 Analizando planes de consulta...")
+            try:
+                exercise(advisor, db, data, tag)
+            finally:
+                if not keep:
+                    cleanup(conn, data)
+
+            ok = advisor.report()
+    finally:
+        conn.close()
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
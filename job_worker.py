@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+⚙️ SoftBee Job Worker
+Ejecuta los trabajos en segundo plano de la tabla jobs (correos, notificaciones
+push programadas, carga de preguntas por defecto...). Se pueden lanzar varios
+procesos o hilos: cada trabajo lo reclama uno solo (FOR UPDATE SKIP LOCKED).
+"""
+
+import json
+import os
+import signal
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from dotenv import load_dotenv
+
+
+def print_help():
+    print("""
+📋 Comandos disponibles:
+
+   run [--threads N] [--kinds a,b] [--batch N]
+                            - Procesar trabajos hasta recibir SIGTERM/SIGINT (por defecto 1 hilo)
+   once                     - Procesar los trabajos listos y salir (útil en local y en cron)
+   stats [horas]            - Métricas por tipo de trabajo (ventana de 24 horas por defecto)
+   enqueue <tipo> [json]    - Encolar un trabajo a mano
+   purge [dias]             - Eliminar trabajos terminados hace más de N días (por defecto 7)
+
+📚 Ejemplos:
+   python job_worker.py run --threads 4
+   python job_worker.py enqueue load_default_questions '{"apiary_id": 1}'
+""")
+
+
+def get_app():
+    load_dotenv()
+    from app import create_app
+    return create_app()
+
+
+def option(name, default=None):
+    if name in sys.argv:
+        index = sys.argv.index(name)
+        if index + 1 < len(sys.argv):
+            return sys.argv[index + 1]
+    return default
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] in ('help', '--help', '-h'):
+        print_help()
+        return
+
+    command = sys.argv[1].lower()
+    if command not in ('run', 'once', 'stats', 'enqueue', 'purge'):
+        print(f"❌ Comando desconocido: {command}")
+        print_help()
+        sys.exit(1)
+
+    app = get_app()
+    from src.database.db import get_db
+    from src.models.jobs import JobModel
+    from src.utils.jobs import JobWorker, JOB_HANDLERS, enqueue
+
+    if command == 'run':
+        threads = int(option('--threads', 1))
+        kinds = option('--kinds')
+        kinds = kinds.split(',') if kinds else None
+        batch = int(option('--batch', 1))
+        workers = [JobWorker(app, name=f'{os.uname().nodename}:{os.getpid()}:{i}', kinds=kinds, batch_size=batch)
+                   for i in range(threads)]
+
+        def shutdown(signum, frame):
+            print("🛑 Deteniendo workers (terminan el trabajo en curso)...")
+            for worker in workers:
+                worker.stop()
+        signal.signal(signal.SIGTERM, shutdown)
+        signal.signal(signal.SIGINT, shutdown)
+
+        print(f"✅ {threads} worker(s) escuchando trabajos: {', '.join(kinds or sorted(JOB_HANDLERS))}")
+        pool = [threading.Thread(target=worker.run, name=worker.name) for worker in workers]
+        for thread in pool:
+            thread.start()
+        while any(thread.is_alive() for thread in pool):
+            for thread in pool:
+                thread.join(timeout=1)
+
+    elif command == 'once':
+        worker = JobWorker(app)
+        try:
+            succeeded, failed = worker.run_once()
+        finally:
+            worker.close()
+        print(f"✅ {succeeded} trabajos completados, {failed} fallidos")
+
+    elif command == 'stats':
+        hours = int(sys.argv[2]) if len(sys.argv) > 2 else 24
+        with app.app_context():
+            metrics = JobModel.metrics(get_db(), hours)
+        if not metrics:
+            print("ℹ️  No hay trabajos en la ventana indicada")
+        for row in metrics:
+            duration = '—' if row['avg_duration_ms'] is None else f"{row['avg_duration_ms']} ms"
+            waiting = '—' if row['oldest_ready_seconds'] is None else f"{row['oldest_ready_seconds']} s"
+            print(f"   {row['kind']:<28} listos {row['ready']:>4}  programados {row['scheduled']:>4}  "
+                  f"en curso {row['running']:>3}  reintentando {row['retrying']:>3}  "
+                  f"ok {row['done']:>5}  fallidos {row['failed']:>4}  espera máx {waiting}  duración media {duration}")
+
+    elif command == 'enqueue':
+        if len(sys.argv) < 3:
+            print("❌ Error: Debes indicar el tipo de trabajo")
+            sys.exit(1)
+        payload = json.loads(sys.argv[3]) if len(sys.argv) > 3 else {}
+        try:
+            with app.app_context():
+                job_id = enqueue(get_db(), sys.argv[2], payload)
+        except ValueError as e:
+            print(f"❌ Error: {e}")
+            sys.exit(1)
+        print(f"✅ Trabajo {job_id} encolado")
+
+    elif command == 'purge':
+        days = int(sys.argv[2]) if len(sys.argv) > 2 else 7
+        with app.app_context():
+            deleted = JobModel.purge(get_db(), days)
+        print(f"✅ {deleted} trabajos eliminados")
+
+
+if __name__ == '__main__':
+    main()
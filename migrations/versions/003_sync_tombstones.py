@@ -0,0 +1,86 @@
+"""Add sync tombstones and updated_at indexes for delta sync
+
+Revision ID: 003_sync_tombstones
+Revises: 002_add_special_observations
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003_sync_tombstones'
+down_revision = '002_add_special_observations'
+branch_labels = None
+depends_on = None
+
+SYNC_ENTITIES = ('apiaries', 'hives', 'inventory', 'questions', 'monitoreos')
+
+
+def upgrade():
+    """Create sync_tombstones, delete triggers and (owner, updated_at) indexes"""
+
+    op.create_table('sync_tombstones',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('entity', sa.String(length=30), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('apiary_id', sa.Integer(), nullable=True),
+        sa.Column('deleted_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_sync_tombstones_user', 'sync_tombstones', ['user_id', 'deleted_at'])
+    op.create_index('idx_sync_tombstones_apiary', 'sync_tombstones', ['apiary_id', 'deleted_at'])
+
+    # Registrar una lápida por cada fila borrada (incluye borrados en cascada)
+    op.execute('''
+        CREATE OR REPLACE FUNCTION sync_record_tombstone() RETURNS trigger AS $$
+        DECLARE
+            v_user_id INTEGER;
+            v_apiary_id INTEGER;
+        BEGIN
+            IF TG_TABLE_NAME = 'apiaries' THEN
+                v_apiary_id := OLD.id;
+                v_user_id := OLD.user_id;
+            ELSE
+                v_apiary_id := OLD.apiary_id;
+                SELECT user_id INTO v_user_id FROM apiaries WHERE id = OLD.apiary_id;
+            END IF;
+
+            INSERT INTO sync_tombstones (entity, entity_id, user_id, apiary_id)
+            VALUES (TG_TABLE_NAME, OLD.id, v_user_id, v_apiary_id);
+            RETURN OLD;
+        END;
+        $$ LANGUAGE plpgsql
+    ''')
+    for table in SYNC_ENTITIES:
+        op.execute(f'''
+            CREATE TRIGGER trg_{table}_tombstone
+            AFTER DELETE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION sync_record_tombstone()
+        ''')
+
+    # Índices por propietario y updated_at para las consultas "cambios desde"
+    op.create_index('idx_apiaries_user_updated', 'apiaries', ['user_id', 'updated_at'])
+    op.create_index('idx_hives_apiary_updated', 'hives', ['apiary_id', 'updated_at'])
+    op.create_index('idx_inventory_apiary_updated', 'inventory', ['apiary_id', 'updated_at'])
+    op.create_index('idx_questions_apiary_updated', 'questions', ['apiary_id', 'updated_at'])
+    op.create_index('idx_monitoreos_apiary_updated', 'monitoreos', ['apiary_id', 'updated_at'])
+
+
+def downgrade():
+    """Drop sync tombstones, triggers and indexes"""
+
+    op.drop_index('idx_monitoreos_apiary_updated', 'monitoreos')
+    op.drop_index('idx_questions_apiary_updated', 'questions')
+    op.drop_index('idx_inventory_apiary_updated', 'inventory')
+    op.drop_index('idx_hives_apiary_updated', 'hives')
+    op.drop_index('idx_apiaries_user_updated', 'apiaries')
+
+    for table in SYNC_ENTITIES:
+        op.execute(f'DROP TRIGGER IF EXISTS trg_{table}_tombstone ON {table}')
+    op.execute('DROP FUNCTION IF EXISTS sync_record_tombstone()')
+
+    op.drop_index('idx_sync_tombstones_apiary', 'sync_tombstones')
+    op.drop_index('idx_sync_tombstones_user', 'sync_tombstones')
+    op.drop_table('sync_tombstones')
@@ -0,0 +1,114 @@
+"""Normalize respuestas_monitoreo: question snapshots and typed numeric answers
+
+Revision ID: 004_normalize_respuestas
+Revises: 003_sync_tombstones
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004_normalize_respuestas'
+down_revision = '003_sync_tombstones'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Move question text/type out of every answer row into question_versions"""
+
+    # Instantáneas de preguntas (sin FK a questions: el historial sobrevive al borrado)
+    op.create_table('question_versions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('question_id', sa.Integer(), nullable=True),
+        sa.Column('question_text', sa.Text(), nullable=False),
+        sa.Column('question_type', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.execute('''
+        CREATE UNIQUE INDEX uq_question_versions_content
+        ON question_versions ((COALESCE(question_id, 0)), question_type, (md5(question_text)))
+    ''')
+    op.create_index('idx_question_versions_question', 'question_versions', ['question_id'])
+
+    op.add_column('respuestas_monitoreo', sa.Column('question_version_id', sa.Integer(), nullable=True))
+    op.add_column('respuestas_monitoreo', sa.Column('respuesta_numero', sa.Numeric(), nullable=True))
+
+    # Resolver la pregunta de cada respuesta (external_id primero, luego id numérico)
+    op.execute('''
+        CREATE TEMP TABLE respuesta_question_map ON COMMIT DROP AS
+        SELECT r.id AS respuesta_id, q.id AS question_id
+        FROM respuestas_monitoreo r
+        JOIN monitoreos m ON m.id = r.monitoreo_id
+        LEFT JOIN LATERAL (
+            SELECT q.id
+            FROM questions q
+            WHERE q.apiary_id = m.apiary_id
+              AND (q.external_id = r.pregunta_id OR q.id::text = r.pregunta_id)
+            ORDER BY (q.external_id = r.pregunta_id) DESC
+            LIMIT 1
+        ) q ON TRUE
+    ''')
+
+    op.execute('''
+        INSERT INTO question_versions (question_id, question_type, question_text)
+        SELECT DISTINCT mp.question_id, COALESCE(r.tipo_respuesta, 'texto'), r.pregunta_texto
+        FROM respuestas_monitoreo r
+        JOIN respuesta_question_map mp ON mp.respuesta_id = r.id
+        ON CONFLICT DO NOTHING
+    ''')
+
+    op.execute('''
+        UPDATE respuestas_monitoreo r
+        SET question_version_id = qv.id
+        FROM respuesta_question_map mp, question_versions qv
+        WHERE mp.respuesta_id = r.id
+          AND COALESCE(qv.question_id, 0) = COALESCE(mp.question_id, 0)
+          AND qv.question_type = COALESCE(r.tipo_respuesta, 'texto')
+          AND md5(qv.question_text) = md5(r.pregunta_texto)
+    ''')
+
+    # Respuestas numéricas a columna tipada, solo si el texto se reconstruye exactamente
+    op.execute(r'''
+        UPDATE respuestas_monitoreo
+        SET respuesta_numero = respuesta::numeric,
+            respuesta = NULL
+        WHERE tipo_respuesta IN ('numero', 'rango')
+          AND CASE WHEN respuesta ~ '^-?[0-9]+(\.[0-9]+)?$'
+                   THEN (respuesta::numeric)::text = respuesta
+                   ELSE FALSE
+              END
+    ''')
+
+    op.alter_column('respuestas_monitoreo', 'question_version_id', nullable=False)
+    op.create_foreign_key('fk_respuestas_question_version', 'respuestas_monitoreo', 'question_versions',
+                          ['question_version_id'], ['id'])
+    op.drop_column('respuestas_monitoreo', 'pregunta_texto')
+    op.drop_column('respuestas_monitoreo', 'tipo_respuesta')
+
+
+def downgrade():
+    """Restore denormalized pregunta_texto/tipo_respuesta columns"""
+
+    op.add_column('respuestas_monitoreo', sa.Column('pregunta_texto', sa.Text(), nullable=True))
+    op.add_column('respuestas_monitoreo', sa.Column('tipo_respuesta', sa.Text(), nullable=True))
+
+    op.execute('''
+        UPDATE respuestas_monitoreo r
+        SET pregunta_texto = qv.question_text,
+            tipo_respuesta = qv.question_type,
+            respuesta = COALESCE(r.respuesta, r.respuesta_numero::text)
+        FROM question_versions qv
+        WHERE qv.id = r.question_version_id
+    ''')
+    op.alter_column('respuestas_monitoreo', 'pregunta_texto', nullable=False)
+
+    op.drop_constraint('fk_respuestas_question_version', 'respuestas_monitoreo', type_='foreignkey')
+    op.drop_column('respuestas_monitoreo', 'respuesta_numero')
+    op.drop_column('respuestas_monitoreo', 'question_version_id')
+
+    op.drop_index('idx_question_versions_question', 'question_versions')
+    op.execute('DROP INDEX IF EXISTS uq_question_versions_content')
+    op.drop_table('question_versions')
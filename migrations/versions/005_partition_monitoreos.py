@@ -0,0 +1,269 @@
+"""Partition monitoreos and respuestas_monitoreo by month on fecha
+
+Revision ID: 005_partition_monitoreos
+Revises: 004_normalize_respuestas
+Create Date: 2026-10-19 11:00:00.000000
+
+Requiere PostgreSQL 13+ (FK hacia tablas particionadas y triggers por fila en la tabla
+padre). Mover un monitoreo a otro mes con UPDATE de fecha solo propaga la FK de sus
+respuestas correctamente desde PostgreSQL 15.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '005_partition_monitoreos'
+down_revision = '004_normalize_respuestas'
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 3
+
+PARTITION_FUNCTION_SQL = '''
+    CREATE OR REPLACE FUNCTION monitoreos_ensure_partitions(p_from DATE, p_to DATE)
+    RETURNS INTEGER AS $$
+    DECLARE
+        v_month DATE := date_trunc('month', p_from)::date;
+        v_next DATE;
+        v_suffix TEXT;
+        v_created INTEGER := 0;
+    BEGIN
+        PERFORM pg_advisory_xact_lock(hashtext('monitoreos_partitions'));
+        WHILE v_month <= p_to LOOP
+            v_next := (v_month + INTERVAL '1 month')::date;
+            v_suffix := to_char(v_month, 'YYYY_MM');
+            IF to_regclass('monitoreos_' || v_suffix) IS NULL THEN
+                EXECUTE format('CREATE TABLE %I PARTITION OF monitoreos FOR VALUES FROM (%L) TO (%L)',
+                               'monitoreos_' || v_suffix, v_month, v_next);
+                v_created := v_created + 1;
+            END IF;
+            IF to_regclass('respuestas_monitoreo_' || v_suffix) IS NULL THEN
+                EXECUTE format('CREATE TABLE %I PARTITION OF respuestas_monitoreo FOR VALUES FROM (%L) TO (%L)',
+                               'respuestas_monitoreo_' || v_suffix, v_month, v_next);
+                v_created := v_created + 1;
+            END IF;
+            v_month := v_next;
+        END LOOP;
+        RETURN v_created;
+    END;
+    $$ LANGUAGE plpgsql
+'''
+
+
+# El trigger de lápidas corre en cada partición: TG_TABLE_NAME sería monitoreos_AAAA_MM y
+# el cliente no reconocería la entidad. Se registra la tabla raíz (ver SyncModel.init_db)
+TOMBSTONE_FUNCTION_SQL = '''
+    CREATE OR REPLACE FUNCTION sync_record_tombstone() RETURNS trigger AS $$
+    DECLARE
+        v_user_id INTEGER;
+        v_apiary_id INTEGER;
+        v_entity TEXT := COALESCE(pg_partition_root(TG_RELID), TG_RELID)::regclass::text;
+    BEGIN
+        IF TG_TABLE_NAME = 'apiaries' THEN
+            v_apiary_id := OLD.id;
+            v_user_id := OLD.user_id;
+        ELSE
+            v_apiary_id := OLD.apiary_id;
+            SELECT user_id INTO v_user_id FROM apiaries WHERE id = OLD.apiary_id;
+        END IF;
+
+        INSERT INTO sync_tombstones (entity, entity_id, user_id, apiary_id)
+        VALUES (v_entity, OLD.id, v_user_id, v_apiary_id);
+        RETURN OLD;
+    END;
+    $$ LANGUAGE plpgsql
+'''
+
+
+def _retire_tables(suffix):
+    """
+    Renombra monitoreos/respuestas_monitoreo a <tabla><suffix> liberando los nombres de
+    restricciones, índices y secuencias para las tablas nuevas
+    """
+    op.execute(f'ALTER TABLE respuestas_monitoreo RENAME TO respuestas_monitoreo{suffix}')
+    op.execute(f'ALTER TABLE monitoreos RENAME TO monitoreos{suffix}')
+    op.execute(f'DROP TRIGGER IF EXISTS trg_monitoreos_tombstone ON monitoreos{suffix}')
+    op.execute(f'''
+        DO $$
+        DECLARE
+            r RECORD;
+            v_seq TEXT;
+        BEGIN
+            FOR r IN
+                SELECT conname, conrelid::regclass::text AS tbl
+                FROM pg_constraint
+                WHERE conrelid IN ('monitoreos{suffix}'::regclass, 'respuestas_monitoreo{suffix}'::regclass)
+                  AND contype IN ('p', 'u', 'f')
+            LOOP
+                EXECUTE format('ALTER TABLE %s RENAME CONSTRAINT %I TO %I', r.tbl, r.conname, r.conname || '{suffix}');
+            END LOOP;
+
+            FOR r IN
+                SELECT i.indexrelid::regclass::text AS idx
+                FROM pg_index i
+                WHERE i.indrelid IN ('monitoreos{suffix}'::regclass, 'respuestas_monitoreo{suffix}'::regclass)
+                  AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid)
+            LOOP
+                EXECUTE format('DROP INDEX %s', r.idx);
+            END LOOP;
+
+            FOREACH v_seq IN ARRAY ARRAY[
+                pg_get_serial_sequence('monitoreos{suffix}', 'id'),
+                pg_get_serial_sequence('respuestas_monitoreo{suffix}', 'id')]
+            LOOP
+                IF v_seq IS NOT NULL THEN
+                    EXECUTE format('ALTER SEQUENCE %s RENAME TO %I', v_seq,
+                                   split_part(replace(v_seq, '"', ''), '.', 2) || '{suffix}');
+                END IF;
+            END LOOP;
+        END $$
+    ''')
+
+
+def _create_indexes_and_trigger():
+    op.execute(TOMBSTONE_FUNCTION_SQL)
+    op.execute('CREATE INDEX idx_monitoreos_fecha ON monitoreos (fecha)')
+    op.execute('CREATE INDEX idx_monitoreos_apiario ON monitoreos (apiary_id)')
+    op.execute('CREATE INDEX idx_monitoreos_colmena ON monitoreos (beehive_id)')
+    op.execute('CREATE INDEX idx_monitoreos_apiary_updated ON monitoreos (apiary_id, updated_at)')
+    op.execute('CREATE INDEX idx_respuestas_monitoreo_id ON respuestas_monitoreo (monitoreo_id)')
+    op.execute('''
+        CREATE TRIGGER trg_monitoreos_tombstone
+        AFTER DELETE ON monitoreos
+        FOR EACH ROW EXECUTE FUNCTION sync_record_tombstone()
+    ''')
+
+
+def _reset_sequences():
+    for table in ('monitoreos', 'respuestas_monitoreo'):
+        op.execute(f'''
+            SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE(MAX(id), 0) + 1, false)
+            FROM {table}
+        ''')
+
+
+def upgrade():
+    """Rebuild both tables as monthly range partitions and copy the existing rows"""
+
+    _retire_tables('_old')
+
+    op.execute('''
+        CREATE TABLE monitoreos (
+            id SERIAL,
+            beehive_id INTEGER NOT NULL,
+            apiary_id INTEGER NOT NULL,
+            fecha TIMESTAMP NOT NULL,
+            datos_json JSONB,
+            sincronizado BOOLEAN DEFAULT FALSE,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (id, fecha),
+            FOREIGN KEY (beehive_id) REFERENCES hives(id) ON DELETE CASCADE,
+            FOREIGN KEY (apiary_id) REFERENCES apiaries(id) ON DELETE CASCADE
+        ) PARTITION BY RANGE (fecha)
+    ''')
+    op.execute('''
+        CREATE TABLE respuestas_monitoreo (
+            id SERIAL,
+            monitoreo_id INTEGER NOT NULL,
+            fecha TIMESTAMP NOT NULL,
+            pregunta_id TEXT NOT NULL,
+            question_version_id INTEGER NOT NULL,
+            respuesta TEXT,
+            respuesta_numero NUMERIC,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (id, fecha),
+            CONSTRAINT fk_respuestas_monitoreo FOREIGN KEY (monitoreo_id, fecha)
+                REFERENCES monitoreos(id, fecha) ON DELETE CASCADE ON UPDATE CASCADE,
+            CONSTRAINT fk_respuestas_question_version FOREIGN KEY (question_version_id)
+                REFERENCES question_versions(id)
+        ) PARTITION BY RANGE (fecha)
+    ''')
+
+    # Particiones desde el monitoreo más antiguo hasta unos meses adelante
+    op.execute(PARTITION_FUNCTION_SQL)
+    op.execute(f'''
+        SELECT monitoreos_ensure_partitions(
+            LEAST(COALESCE((SELECT MIN(fecha) FROM monitoreos_old)::date, CURRENT_DATE), CURRENT_DATE),
+            (CURRENT_DATE + {MONTHS_AHEAD} * INTERVAL '1 month')::date)
+    ''')
+    # Fechas más allá del horizonte (datos mal cargados) también necesitan partición
+    op.execute('''
+        SELECT monitoreos_ensure_partitions(MAX(fecha)::date, MAX(fecha)::date)
+        FROM monitoreos_old
+        HAVING MAX(fecha) IS NOT NULL
+    ''')
+
+    op.execute('''
+        INSERT INTO monitoreos (id, beehive_id, apiary_id, fecha, datos_json, sincronizado, created_at, updated_at)
+        SELECT id, beehive_id, apiary_id, fecha, datos_json, sincronizado, created_at, updated_at
+        FROM monitoreos_old
+    ''')
+    op.execute('''
+        INSERT INTO respuestas_monitoreo
+            (id, monitoreo_id, fecha, pregunta_id, question_version_id, respuesta, respuesta_numero, created_at)
+        SELECT r.id, r.monitoreo_id, m.fecha, r.pregunta_id, r.question_version_id,
+               r.respuesta, r.respuesta_numero, r.created_at
+        FROM respuestas_monitoreo_old r
+        JOIN monitoreos_old m ON m.id = r.monitoreo_id
+    ''')
+    _reset_sequences()
+
+    op.execute('DROP TABLE respuestas_monitoreo_old')
+    op.execute('DROP TABLE monitoreos_old')
+
+    _create_indexes_and_trigger()
+
+
+def downgrade():
+    """Rebuild plain (non-partitioned) tables and copy the rows back"""
+
+    _retire_tables('_part')
+
+    op.execute('''
+        CREATE TABLE monitoreos (
+            id SERIAL PRIMARY KEY,
+            beehive_id INTEGER NOT NULL,
+            apiary_id INTEGER NOT NULL,
+            fecha TIMESTAMP NOT NULL,
+            datos_json JSONB,
+            sincronizado BOOLEAN DEFAULT FALSE,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (beehive_id) REFERENCES hives(id) ON DELETE CASCADE,
+            FOREIGN KEY (apiary_id) REFERENCES apiaries(id) ON DELETE CASCADE
+        )
+    ''')
+    op.execute('''
+        CREATE TABLE respuestas_monitoreo (
+            id SERIAL PRIMARY KEY,
+            monitoreo_id INTEGER NOT NULL,
+            pregunta_id TEXT NOT NULL,
+            question_version_id INTEGER NOT NULL,
+            respuesta TEXT,
+            respuesta_numero NUMERIC,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (monitoreo_id) REFERENCES monitoreos(id) ON DELETE CASCADE,
+            CONSTRAINT fk_respuestas_question_version FOREIGN KEY (question_version_id)
+                REFERENCES question_versions(id)
+        )
+    ''')
+
+    op.execute('''
+        INSERT INTO monitoreos (id, beehive_id, apiary_id, fecha, datos_json, sincronizado, created_at, updated_at)
+        SELECT id, beehive_id, apiary_id, fecha, datos_json, sincronizado, created_at, updated_at
+        FROM monitoreos_part
+    ''')
+    op.execute('''
+        INSERT INTO respuestas_monitoreo
+            (id, monitoreo_id, pregunta_id, question_version_id, respuesta, respuesta_numero, created_at)
+        SELECT id, monitoreo_id, pregunta_id, question_version_id, respuesta, respuesta_numero, created_at
+        FROM respuestas_monitoreo_part
+    ''')
+    _reset_sequences()
+
+    # Elimina también todas las particiones; las archivadas (separadas) no se tocan
+    op.execute('DROP TABLE respuestas_monitoreo_part')
+    op.execute('DROP TABLE monitoreos_part')
+    op.execute('DROP FUNCTION IF EXISTS monitoreos_ensure_partitions(DATE, DATE)')
+
+    _create_indexes_and_trigger()
@@ -0,0 +1,65 @@
+"""Composite, partial, covering and trigram indexes for the hot queries
+
+Revision ID: 006_hot_query_indexes
+Revises: 005_partition_monitoreos
+Create Date: 2026-10-19 12:00:00.000000
+
+Los índices de tablas normales se crean con CONCURRENTLY (fuera de la transacción)
+para no bloquear escrituras. Las tablas particionadas no lo admiten.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '006_hot_query_indexes'
+down_revision = '005_partition_monitoreos'
+branch_labels = None
+depends_on = None
+
+CONCURRENT_INDEXES = {
+    'idx_apiaries_user_name': 'ON apiaries (user_id, name)',
+    'idx_questions_apiary_active_order': 'ON questions (apiary_id, display_order) WHERE is_active = TRUE',
+    'idx_questions_apiary_external': 'ON questions (apiary_id, external_id) WHERE external_id IS NOT NULL',
+    'idx_inventory_apiary_stock': 'ON inventory (apiary_id) INCLUDE (quantity, minimum_stock)',
+    'idx_inventory_low_stock': 'ON inventory (apiary_id, name) WHERE quantity <= minimum_stock',
+    'idx_inventory_name_trgm': 'ON inventory USING gin (name gin_trgm_ops)',
+}
+
+# Reemplazados por índices compuestos con el mismo prefijo
+REDUNDANT_INDEXES = ('idx_inventory_apiary_id', 'idx_inventory_name')
+
+
+def upgrade():
+    """Create the indexes and drop the ones made redundant"""
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    op.execute('CREATE INDEX IF NOT EXISTS idx_monitoreos_apiary_fecha ON monitoreos (apiary_id, fecha DESC)')
+    op.execute('CREATE INDEX IF NOT EXISTS idx_monitoreos_colmena_fecha ON monitoreos (beehive_id, fecha DESC)')
+    op.execute('''
+        CREATE INDEX IF NOT EXISTS idx_monitoreos_pending
+        ON monitoreos (apiary_id, fecha) WHERE sincronizado = FALSE
+    ''')
+    op.execute('DROP INDEX IF EXISTS idx_monitoreos_apiario')
+    op.execute('DROP INDEX IF EXISTS idx_monitoreos_colmena')
+
+    with op.get_context().autocommit_block():
+        for name, definition in CONCURRENT_INDEXES.items():
+            op.execute(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} {definition}')
+        for name in REDUNDANT_INDEXES:
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+
+
+def downgrade():
+    """Restore the previous index set"""
+
+    with op.get_context().autocommit_block():
+        op.execute('CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_inventory_apiary_id ON inventory (apiary_id)')
+        op.execute('CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_inventory_name ON inventory (apiary_id, name)')
+        for name in CONCURRENT_INDEXES:
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+
+    op.execute('CREATE INDEX IF NOT EXISTS idx_monitoreos_apiario ON monitoreos (apiary_id)')
+    op.execute('CREATE INDEX IF NOT EXISTS idx_monitoreos_colmena ON monitoreos (beehive_id)')
+    op.execute('DROP INDEX IF EXISTS idx_monitoreos_pending')
+    op.execute('DROP INDEX IF EXISTS idx_monitoreos_colmena_fecha')
+    op.execute('DROP INDEX IF EXISTS idx_monitoreos_apiary_fecha')
@@ -0,0 +1,57 @@
+"""Add the append-only inventory movements ledger
+
+Revision ID: 007_inventory_movements
+Revises: 006_hot_query_indexes
+Create Date: 2026-10-19 13:00:00.000000
+
+Cada ajuste de cantidad (individual o por lotes) inserta una fila con el delta y la
+cantidad resultante. Un trigger rechaza los UPDATE sobre el libro.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '007_inventory_movements'
+down_revision = '006_hot_query_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create inventory_movements, its indexes and the append-only trigger"""
+
+    op.execute('''
+        CREATE TABLE IF NOT EXISTS inventory_movements (
+            id BIGSERIAL PRIMARY KEY,
+            item_id INTEGER NOT NULL,
+            apiary_id INTEGER NOT NULL,
+            item_name VARCHAR(100) NOT NULL,
+            delta INTEGER NOT NULL,
+            quantity_after INTEGER NOT NULL,
+            reason VARCHAR(255),
+            user_id INTEGER,
+            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (apiary_id) REFERENCES apiaries(id) ON DELETE CASCADE
+        )
+    ''')
+    op.execute('CREATE INDEX IF NOT EXISTS idx_inventory_movements_item ON inventory_movements (item_id, created_at DESC)')
+    op.execute('CREATE INDEX IF NOT EXISTS idx_inventory_movements_apiary ON inventory_movements (apiary_id, created_at DESC)')
+
+    op.execute('''
+        CREATE OR REPLACE FUNCTION inventory_movements_append_only() RETURNS trigger AS $$
+        BEGIN
+            RAISE EXCEPTION 'inventory_movements es de solo inserción';
+        END;
+        $$ LANGUAGE plpgsql
+    ''')
+    op.execute('''
+        CREATE TRIGGER trg_inventory_movements_append_only
+        BEFORE UPDATE ON inventory_movements
+        FOR EACH ROW EXECUTE FUNCTION inventory_movements_append_only()
+    ''')
+
+
+def downgrade():
+    """Drop the ledger"""
+
+    op.execute('DROP TABLE IF EXISTS inventory_movements')
+    op.execute('DROP FUNCTION IF EXISTS inventory_movements_append_only()')
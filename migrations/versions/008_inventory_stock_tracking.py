@@ -0,0 +1,125 @@
+"""Maintain per-apiary stock counters and low-stock alerts on every inventory write
+
+Revision ID: 008_inventory_stock_tracking
+Revises: 007_inventory_movements
+Create Date: 2026-10-19 13:30:00.000000
+
+Un trigger por fila en inventory mantiene inventory_stock_summary (total de ítems,
+cantidad total y ítems en stock bajo por apiario) y registra en inventory_stock_alerts
+cada ítem que entra o sale de stock bajo, notificándolo por pg_notify('inventory_stock').
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '008_inventory_stock_tracking'
+down_revision = '007_inventory_movements'
+branch_labels = None
+depends_on = None
+
+STOCK_TRACKING_FUNCTION_SQL = '''
+    CREATE OR REPLACE FUNCTION inventory_track_stock() RETURNS trigger AS $$
+    DECLARE
+        v_old_low INTEGER := 0;
+        v_new_low INTEGER := 0;
+        v_event TEXT;
+    BEGIN
+        IF TG_OP <> 'INSERT' THEN
+            v_old_low := COALESCE(OLD.quantity <= OLD.minimum_stock, false)::integer;
+        END IF;
+        IF TG_OP <> 'DELETE' THEN
+            v_new_low := COALESCE(NEW.quantity <= NEW.minimum_stock, false)::integer;
+        END IF;
+
+        IF TG_OP = 'UPDATE' AND OLD.apiary_id = NEW.apiary_id THEN
+            UPDATE inventory_stock_summary
+            SET total_quantity = total_quantity + NEW.quantity - OLD.quantity,
+                low_stock_items = low_stock_items + v_new_low - v_old_low,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE apiary_id = NEW.apiary_id;
+        ELSE
+            IF TG_OP <> 'INSERT' THEN
+                UPDATE inventory_stock_summary
+                SET total_items = total_items - 1,
+                    total_quantity = total_quantity - OLD.quantity,
+                    low_stock_items = low_stock_items - v_old_low,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE apiary_id = OLD.apiary_id;
+            END IF;
+            IF TG_OP <> 'DELETE' THEN
+                INSERT INTO inventory_stock_summary (apiary_id, total_items, total_quantity, low_stock_items)
+                VALUES (NEW.apiary_id, 1, NEW.quantity, v_new_low)
+                ON CONFLICT (apiary_id) DO UPDATE
+                SET total_items = inventory_stock_summary.total_items + 1,
+                    total_quantity = inventory_stock_summary.total_quantity + EXCLUDED.total_quantity,
+                    low_stock_items = inventory_stock_summary.low_stock_items + EXCLUDED.low_stock_items,
+                    updated_at = CURRENT_TIMESTAMP;
+            END IF;
+        END IF;
+
+        -- Solo los cambios de cantidad o mínimo generan alertas (no las altas ni las bajas)
+        IF TG_OP = 'UPDATE' AND v_old_low <> v_new_low THEN
+            v_event := CASE WHEN v_new_low = 1 THEN 'low_stock' ELSE 'restocked' END;
+            INSERT INTO inventory_stock_alerts (apiary_id, item_id, item_name, event, quantity, minimum_stock)
+            VALUES (NEW.apiary_id, NEW.id, NEW.name, v_event, NEW.quantity, NEW.minimum_stock);
+            PERFORM pg_notify('inventory_stock', json_build_object(
+                'event', v_event, 'apiary_id', NEW.apiary_id, 'item_id', NEW.id, 'name', NEW.name,
+                'quantity', NEW.quantity, 'minimum_stock', NEW.minimum_stock)::text);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+'''
+
+
+def upgrade():
+    """Create the summary and alert tables, the trigger, and backfill the counters"""
+
+    op.execute('''
+        CREATE TABLE IF NOT EXISTS inventory_stock_summary (
+            apiary_id INTEGER PRIMARY KEY,
+            total_items INTEGER NOT NULL DEFAULT 0,
+            total_quantity BIGINT NOT NULL DEFAULT 0,
+            low_stock_items INTEGER NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (apiary_id) REFERENCES apiaries(id) ON DELETE CASCADE
+        )
+    ''')
+    op.execute('''
+        CREATE TABLE IF NOT EXISTS inventory_stock_alerts (
+            id BIGSERIAL PRIMARY KEY,
+            apiary_id INTEGER NOT NULL,
+            item_id INTEGER NOT NULL,
+            item_name VARCHAR(100) NOT NULL,
+            event VARCHAR(20) NOT NULL,
+            quantity INTEGER NOT NULL,
+            minimum_stock INTEGER,
+            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (apiary_id) REFERENCES apiaries(id) ON DELETE CASCADE
+        )
+    ''')
+    op.execute('CREATE INDEX IF NOT EXISTS idx_inventory_stock_alerts_apiary ON inventory_stock_alerts (apiary_id, created_at DESC)')
+
+    # El bloqueo evita escrituras entre la creación del trigger y el recuento inicial
+    op.execute('LOCK TABLE inventory IN SHARE ROW EXCLUSIVE MODE')
+    op.execute(STOCK_TRACKING_FUNCTION_SQL)
+    op.execute('''
+        CREATE TRIGGER trg_inventory_track_stock
+        AFTER INSERT OR DELETE OR UPDATE OF apiary_id, quantity, minimum_stock ON inventory
+        FOR EACH ROW EXECUTE FUNCTION inventory_track_stock()
+    ''')
+    op.execute('''
+        INSERT INTO inventory_stock_summary (apiary_id, total_items, total_quantity, low_stock_items)
+        SELECT apiary_id, COUNT(*), SUM(quantity), COUNT(*) FILTER (WHERE quantity <= minimum_stock)
+        FROM inventory
+        GROUP BY apiary_id
+        ON CONFLICT (apiary_id) DO NOTHING
+    ''')
+
+
+def downgrade():
+    """Drop the trigger, its function and the tracking tables"""
+
+    op.execute('DROP TRIGGER IF EXISTS trg_inventory_track_stock ON inventory')
+    op.execute('DROP FUNCTION IF EXISTS inventory_track_stock()')
+    op.execute('DROP TABLE IF EXISTS inventory_stock_alerts')
+    op.execute('DROP TABLE IF EXISTS inventory_stock_summary')
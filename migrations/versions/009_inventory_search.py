@@ -0,0 +1,47 @@
+"""Accent- and case-insensitive trigram search over inventory name and description
+
+Revision ID: 009_inventory_search
+Revises: 008_inventory_stock_tracking
+Create Date: 2026-10-19 14:00:00.000000
+
+search_normalize() fija el diccionario de unaccent para poder declararse IMMUTABLE y
+usarse en el índice. El índice se crea con CONCURRENTLY para no bloquear escrituras.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '009_inventory_search'
+down_revision = '008_inventory_stock_tracking'
+branch_labels = None
+depends_on = None
+
+SEARCH_NORMALIZE_FUNCTION_SQL = '''
+    CREATE OR REPLACE FUNCTION search_normalize(p_text TEXT) RETURNS TEXT AS $$
+        SELECT public.unaccent('public.unaccent'::regdictionary, lower(p_text))
+    $$ LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+'''
+
+
+def upgrade():
+    """Create the normalization function and the search index; drop the name-only index"""
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.execute('CREATE EXTENSION IF NOT EXISTS unaccent')
+    op.execute(SEARCH_NORMALIZE_FUNCTION_SQL)
+
+    with op.get_context().autocommit_block():
+        op.execute('''
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_inventory_search_trgm ON inventory
+            USING gin (search_normalize(name || ' ' || COALESCE(description, '')) gin_trgm_ops)
+        ''')
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS idx_inventory_name_trgm')
+
+
+def downgrade():
+    """Restore the name-only trigram index"""
+
+    with op.get_context().autocommit_block():
+        op.execute('CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_inventory_name_trgm ON inventory USING gin (name gin_trgm_ops)')
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS idx_inventory_search_trgm')
+
+    op.execute('DROP FUNCTION IF EXISTS search_normalize(TEXT)')
@@ -0,0 +1,40 @@
+"""Add the per-hive analytics cache
+
+Revision ID: 010_hive_analytics_cache
+Revises: 009_inventory_search
+Create Date: 2026-10-19 14:30:00.000000
+
+Una fila por (colmena, granularidad, periodo) con los agregados ya calculados y la
+huella de los monitoreos del periodo con la que se validan al leerlos.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '010_hive_analytics_cache'
+down_revision = '009_inventory_search'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create hive_analytics_cache"""
+
+    op.execute('''
+        CREATE TABLE IF NOT EXISTS hive_analytics_cache (
+            hive_id INTEGER NOT NULL,
+            granularity VARCHAR(10) NOT NULL,
+            bucket_start DATE NOT NULL,
+            fingerprint VARCHAR(32) NOT NULL,
+            monitoreos INTEGER NOT NULL,
+            questions JSONB NOT NULL,
+            computed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (hive_id, granularity, bucket_start),
+            FOREIGN KEY (hive_id) REFERENCES hives(id) ON DELETE CASCADE
+        )
+    ''')
+
+
+def downgrade():
+    """Drop hive_analytics_cache"""
+
+    op.execute('DROP TABLE IF EXISTS hive_analytics_cache')
@@ -0,0 +1,42 @@
+"""Add precomputed hive health scores
+
+Revision ID: 011_hive_health_scores
+Revises: 010_hive_analytics_cache
+Create Date: 2026-10-19 16:00:00.000000
+
+Una fila por colmena con la puntuación, los riesgos marcados y los componentes
+calculados por health_scores.py (cada noche) o por la API al consultarlos.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '011_hive_health_scores'
+down_revision = '010_hive_analytics_cache'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create hive_health_scores"""
+
+    op.execute('''
+        CREATE TABLE IF NOT EXISTS hive_health_scores (
+            hive_id INTEGER PRIMARY KEY,
+            apiary_id INTEGER NOT NULL,
+            score NUMERIC(4, 1),
+            flags TEXT[] NOT NULL DEFAULT '{}',
+            components JSONB NOT NULL,
+            computed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (hive_id) REFERENCES hives(id) ON DELETE CASCADE
+        )
+    ''')
+    op.execute('''
+        CREATE INDEX IF NOT EXISTS idx_hive_health_scores_apiary
+        ON hive_health_scores (apiary_id)
+    ''')
+
+
+def downgrade():
+    """Drop hive_health_scores"""
+
+    op.execute('DROP TABLE IF EXISTS hive_health_scores')
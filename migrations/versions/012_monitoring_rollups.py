@@ -0,0 +1,67 @@
+"""Add daily monitoring rollups
+
+Revision ID: 012_monitoring_rollups
+Revises: 011_hive_health_scores
+Create Date: 2026-10-19 17:00:00.000000
+
+Resúmenes diarios por colmena y por apiario (monitoreos, pendientes de sincronizar y
+distribución de respuestas) que rollups.py mantiene desde una marca de agua. Se
+llenan con `python rollups.py backfill <desde>` tras migrar.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '012_monitoring_rollups'
+down_revision = '011_hive_health_scores'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create rollup tables, rollup_state and the monitoreos updated_at index"""
+
+    op.execute('''
+        CREATE TABLE IF NOT EXISTS monitoring_rollup_hive_daily (
+            hive_id INTEGER NOT NULL,
+            day DATE NOT NULL,
+            apiary_id INTEGER NOT NULL,
+            inspections INTEGER NOT NULL,
+            pending_sync INTEGER NOT NULL,
+            answers JSONB NOT NULL DEFAULT '{}',
+            PRIMARY KEY (hive_id, day),
+            FOREIGN KEY (hive_id) REFERENCES hives(id) ON DELETE CASCADE
+        )
+    ''')
+    op.execute('''
+        CREATE INDEX IF NOT EXISTS idx_rollup_hive_daily_apiary
+        ON monitoring_rollup_hive_daily (apiary_id, day)
+    ''')
+    op.execute('''
+        CREATE TABLE IF NOT EXISTS monitoring_rollup_apiary_daily (
+            apiary_id INTEGER NOT NULL,
+            day DATE NOT NULL,
+            inspections INTEGER NOT NULL,
+            hives_inspected INTEGER NOT NULL,
+            pending_sync INTEGER NOT NULL,
+            answers JSONB NOT NULL DEFAULT '{}',
+            PRIMARY KEY (apiary_id, day),
+            FOREIGN KEY (apiary_id) REFERENCES apiaries(id) ON DELETE CASCADE
+        )
+    ''')
+    op.execute('''
+        CREATE TABLE IF NOT EXISTS rollup_state (
+            name VARCHAR(50) PRIMARY KEY,
+            high_water TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    op.execute('CREATE INDEX IF NOT EXISTS idx_monitoreos_updated ON monitoreos (updated_at)')
+
+
+def downgrade():
+    """Drop rollup tables and state"""
+
+    op.execute('DROP INDEX IF EXISTS idx_monitoreos_updated')
+    op.execute('DROP TABLE IF EXISTS rollup_state')
+    op.execute('DROP TABLE IF EXISTS monitoring_rollup_apiary_daily')
+    op.execute('DROP TABLE IF EXISTS monitoring_rollup_hive_daily')
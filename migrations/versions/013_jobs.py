@@ -0,0 +1,61 @@
+"""Add the background jobs table
+
+Revision ID: 013_jobs
+Revises: 012_monitoring_rollups
+Create Date: 2026-10-19 18:00:00.000000
+
+Cola de trabajos en segundo plano: job_worker.py reclama las filas pendientes con
+FOR UPDATE SKIP LOCKED en el orden del índice parcial idx_jobs_ready.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '013_jobs'
+down_revision = '012_monitoring_rollups'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create jobs and its partial indexes"""
+
+    op.execute('''
+        CREATE TABLE IF NOT EXISTS jobs (
+            id BIGSERIAL PRIMARY KEY,
+            kind VARCHAR(100) NOT NULL,
+            payload JSONB NOT NULL DEFAULT '{}',
+            priority SMALLINT NOT NULL DEFAULT 0,
+            status VARCHAR(10) NOT NULL DEFAULT 'pending'
+                CHECK (status IN ('pending', 'running', 'done', 'failed')),
+            attempts INTEGER NOT NULL DEFAULT 0,
+            max_attempts INTEGER NOT NULL DEFAULT 5,
+            run_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            user_id INTEGER,
+            locked_by VARCHAR(100),
+            locked_at TIMESTAMP,
+            started_at TIMESTAMP,
+            finished_at TIMESTAMP,
+            last_error TEXT,
+            result JSONB,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE SET NULL
+        )
+    ''')
+    op.execute('''
+        CREATE INDEX IF NOT EXISTS idx_jobs_ready
+        ON jobs (priority DESC, run_at, id) WHERE status = 'pending'
+    ''')
+    op.execute('''
+        CREATE INDEX IF NOT EXISTS idx_jobs_running
+        ON jobs (locked_at) WHERE status = 'running'
+    ''')
+    op.execute('''
+        CREATE INDEX IF NOT EXISTS idx_jobs_finished
+        ON jobs (finished_at) WHERE status IN ('done', 'failed')
+    ''')
+
+
+def downgrade():
+    """Drop jobs"""
+
+    op.execute('DROP TABLE IF EXISTS jobs')
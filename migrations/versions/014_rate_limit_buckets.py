@@ -0,0 +1,39 @@
+"""Add the shared rate limit buckets table
+
+Revision ID: 014_rate_limit_buckets
+Revises: 013_jobs
+Create Date: 2026-10-19 19:00:00.000000
+
+Cubetas de tokens del límite de peticiones con RATE_LIMIT_STORAGE=postgresql.
+UNLOGGED: son datos efímeros, no vale la pena escribirlos en el WAL.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '014_rate_limit_buckets'
+down_revision = '013_jobs'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create rate_limit_buckets"""
+
+    op.execute('''
+        CREATE UNLOGGED TABLE IF NOT EXISTS rate_limit_buckets (
+            key VARCHAR(255) PRIMARY KEY,
+            tokens DOUBLE PRECISION NOT NULL,
+            allowed BOOLEAN NOT NULL,
+            updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    op.execute('''
+        CREATE INDEX IF NOT EXISTS idx_rate_limit_buckets_updated
+        ON rate_limit_buckets (updated_at)
+    ''')
+
+
+def downgrade():
+    """Drop rate_limit_buckets"""
+
+    op.execute('DROP TABLE IF EXISTS rate_limit_buckets')
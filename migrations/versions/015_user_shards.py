@@ -0,0 +1,41 @@
+"""Add the user shard directory
+
+Revision ID: 015_user_shards
+Revises: 014_rate_limit_buckets
+Create Date: 2026-10-19 21:00:00.000000
+
+Directorio usuario -> fragmento para DATABASE_SHARDS. Solo se usa en el fragmento
+'default'; los usuarios sin fila siguen en 'default'.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '015_user_shards'
+down_revision = '014_rate_limit_buckets'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create user_shards"""
+
+    op.execute('''
+        CREATE TABLE IF NOT EXISTS user_shards (
+            user_id INTEGER PRIMARY KEY,
+            shard VARCHAR(50) NOT NULL,
+            status VARCHAR(10) NOT NULL DEFAULT 'active'
+                CHECK (status IN ('active', 'frozen')),
+            updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+        )
+    ''')
+    op.execute('''
+        CREATE INDEX IF NOT EXISTS idx_user_shards_shard
+        ON user_shards (shard)
+    ''')
+
+
+def downgrade():
+    """Drop user_shards"""
+
+    op.execute('DROP TABLE IF EXISTS user_shards')
@@ -0,0 +1,85 @@
+"""Treat inventory items without a minimum stock as not low in the stock trigger
+
+Revision ID: 016_inventory_null_minimum_stock
+Revises: 015_user_shards
+Create Date: 2026-10-20 09:00:00.000000
+
+inventory.minimum_stock admite NULL y (quantity <= NULL) es NULL: el trigger de 008
+escribía NULL en inventory_stock_summary.low_stock_items (NOT NULL) y el INSERT o
+UPDATE del ítem fallaba. Un ítem sin mínimo nunca está en stock bajo, igual que en
+el recuento inicial de 008. Las escrituras fallidas se revertían, así que los
+contadores existentes no necesitan recalcularse.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '016_inventory_null_minimum_stock'
+down_revision = '015_user_shards'
+branch_labels = None
+depends_on = None
+
+STOCK_TRACKING_FUNCTION_SQL = '''
+    CREATE OR REPLACE FUNCTION inventory_track_stock() RETURNS trigger AS $$
+    DECLARE
+        v_old_low INTEGER := 0;
+        v_new_low INTEGER := 0;
+        v_event TEXT;
+    BEGIN
+        IF TG_OP <> 'INSERT' THEN
+            v_old_low := COALESCE(OLD.quantity <= OLD.minimum_stock, false)::integer;
+        END IF;
+        IF TG_OP <> 'DELETE' THEN
+            v_new_low := COALESCE(NEW.quantity <= NEW.minimum_stock, false)::integer;
+        END IF;
+
+        IF TG_OP = 'UPDATE' AND OLD.apiary_id = NEW.apiary_id THEN
+            UPDATE inventory_stock_summary
+            SET total_quantity = total_quantity + NEW.quantity - OLD.quantity,
+                low_stock_items = low_stock_items + v_new_low - v_old_low,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE apiary_id = NEW.apiary_id;
+        ELSE
+            IF TG_OP <> 'INSERT' THEN
+                UPDATE inventory_stock_summary
+                SET total_items = total_items - 1,
+                    total_quantity = total_quantity - OLD.quantity,
+                    low_stock_items = low_stock_items - v_old_low,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE apiary_id = OLD.apiary_id;
+            END IF;
+            IF TG_OP <> 'DELETE' THEN
+                INSERT INTO inventory_stock_summary (apiary_id, total_items, total_quantity, low_stock_items)
+                VALUES (NEW.apiary_id, 1, NEW.quantity, v_new_low)
+                ON CONFLICT (apiary_id) DO UPDATE
+                SET total_items = inventory_stock_summary.total_items + 1,
+                    total_quantity = inventory_stock_summary.total_quantity + EXCLUDED.total_quantity,
+                    low_stock_items = inventory_stock_summary.low_stock_items + EXCLUDED.low_stock_items,
+                    updated_at = CURRENT_TIMESTAMP;
+            END IF;
+        END IF;
+
+        -- Solo los cambios de cantidad o mínimo generan alertas (no las altas ni las bajas)
+        IF TG_OP = 'UPDATE' AND v_old_low <> v_new_low THEN
+            v_event := CASE WHEN v_new_low = 1 THEN 'low_stock' ELSE 'restocked' END;
+            INSERT INTO inventory_stock_alerts (apiary_id, item_id, item_name, event, quantity, minimum_stock)
+            VALUES (NEW.apiary_id, NEW.id, NEW.name, v_event, NEW.quantity, NEW.minimum_stock);
+            PERFORM pg_notify('inventory_stock', json_build_object(
+                'event', v_event, 'apiary_id', NEW.apiary_id, 'item_id', NEW.id, 'name', NEW.name,
+                'quantity', NEW.quantity, 'minimum_stock', NEW.minimum_stock)::text);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+'''
+
+
+def upgrade():
+    """Replace the stock tracking function"""
+
+    op.execute(STOCK_TRACKING_FUNCTION_SQL)
+
+
+def downgrade():
+    """The fixed function is compatible with 008; nothing to revert"""
+
+    pass
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+🗂️ SoftBee Partition Manager
+Mantiene las particiones mensuales de monitoreos y respuestas_monitoreo:
+crea los meses futuros y archiva los antiguos separando sus particiones.
+Pensado para ejecutarse periódicamente (cron) además de al desplegar.
+"""
+
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import psycopg2
+from dotenv import load_dotenv
+
+from src.models.monitoreo import MonitoreoModel, PARTITION_MONTHS_AHEAD
+
+
+def print_help():
+    print(f"""
+📋 Comandos disponibles:
+
+   ensure [meses]           - Crear particiones desde el mes actual hasta N meses adelante (por defecto {PARTITION_MONTHS_AHEAD})
+   list                     - Listar particiones con su rango y filas estimadas
+   archive <AAAA-MM> [--drop]
+                            - Separar las particiones anteriores a ese mes
+                              (--drop las elimina en lugar de conservarlas como tablas sueltas)
+
+📚 Ejemplos:
+   python partition_manager.py ensure 6
+   python partition_manager.py archive 2024-01
+""")
+
+
+def get_connection():
+    load_dotenv()
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        print("❌ Error: DATABASE_URL no está configurada")
+        sys.exit(1)
+    if database_url.startswith("postgres://"):
+        database_url = database_url.replace("postgres://", "postgresql://", 1)
+    return psycopg2.connect(database_url)
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] in ('help', '--help', '-h'):
+        print_help()
+        return
+
+    command = sys.argv[1].lower()
+    conn = get_connection()
+    try:
+        if command == 'ensure':
+            months = int(sys.argv[2]) if len(sys.argv) > 2 else PARTITION_MONTHS_AHEAD
+            created = MonitoreoModel.ensure_partitions(conn, months_ahead=months)
+            print(f"✅ Particiones al día ({created} tablas nuevas, {months} meses adelante)")
+
+        elif command == 'list':
+            for partition in MonitoreoModel.list_partitions(conn):
+                print(f"   {partition['nombre']:<28} {partition['rango']}  ~{partition['filas_estimadas']} filas")
+
+        elif command == 'archive':
+            if len(sys.argv) < 3:
+                print("❌ Error: Debes indicar el mes límite (AAAA-MM)")
+                sys.exit(1)
+            cutoff = datetime.strptime(sys.argv[2], '%Y-%m').date()
+            drop = '--drop' in sys.argv[3:]
+            archived = MonitoreoModel.detach_partitions_before(conn, cutoff, drop=drop)
+            if archived:
+                action = "eliminadas" if drop else "separadas"
+                print(f"✅ Particiones {action}: {', '.join(archived)}")
+            else:
+                print("ℹ️  No hay particiones anteriores a ese mes")
+
+        else:
+            print(f"❌ Comando desconocido: {command}")
+            print_help()
+            sys.exit(1)
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+📊 SoftBee Rollups
+Mantiene los resúmenes diarios de monitoreos (monitoring_rollup_hive_daily y
+monitoring_rollup_apiary_daily) que leen /api/stats y /api/reports/monitoring/summary.
+Pensado para ejecutarse cada noche (cron); lo posterior a la última ejecución se
+calcula en vivo al consultar.
+"""
+
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import psycopg2
+from dotenv import load_dotenv
+
+from src.models.monitoring_rollups import MonitoringRollupModel
+
+
+def print_help():
+    print("""
+📋 Comandos disponibles:
+
+   refresh                  - Recalcular los días con cambios desde la última ejecución
+   backfill <desde> [hasta] - Recalcular todos los días del rango (AAAA-MM-DD, hasta hoy por defecto),
+                              un mes por transacción
+   status                   - Mostrar la marca de agua actual
+
+📚 Ejemplos:
+   python rollups.py backfill 2024-01-01
+   30 2 * * * cd /app && python rollups.py refresh
+""")
+
+
+def get_connection():
+    load_dotenv()
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        print("❌ Error: DATABASE_URL no está configurada")
+        sys.exit(1)
+    if database_url.startswith("postgres://"):
+        database_url = database_url.replace("postgres://", "postgresql://", 1)
+    return psycopg2.connect(database_url)
+
+
+def month_ranges(desde, hasta):
+    """Divide [desde, hasta) en tramos que no cruzan de mes"""
+    start = desde
+    while start < hasta:
+        next_month = (start.replace(day=1) + timedelta(days=32)).replace(day=1)
+        end = min(next_month, hasta)
+        yield start, end
+        start = end
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] in ('help', '--help', '-h'):
+        print_help()
+        return
+
+    command = sys.argv[1].lower()
+    conn = get_connection()
+    try:
+        if command == 'refresh':
+            started = time.perf_counter()
+            recomputed, high_water = MonitoringRollupModel.refresh(conn)
+            print(f"✅ {recomputed} días de apiario recalculados en {time.perf_counter() - started:.2f}s "
+                  f"(marca de agua {high_water:%Y-%m-%d %H:%M:%S})")
+
+        elif command == 'backfill':
+            if len(sys.argv) < 3:
+                print("❌ Error: Debes indicar la fecha inicial (AAAA-MM-DD)")
+                sys.exit(1)
+            desde = datetime.strptime(sys.argv[2], '%Y-%m-%d').date()
+            hasta = (datetime.strptime(sys.argv[3], '%Y-%m-%d').date() if len(sys.argv) > 3
+                     else date.today()) + timedelta(days=1)
+            total = 0
+            for start, end in month_ranges(desde, hasta):
+                recomputed = MonitoringRollupModel.backfill(conn, start, end)
+                total += recomputed
+                print(f"   {start} → {end - timedelta(days=1)}: {recomputed} días de apiario")
+            print(f"✅ Backfill completado ({total} días de apiario)")
+
+        elif command == 'status':
+            high_water = MonitoringRollupModel.get_high_water(conn)
+            if high_water is None:
+                print("ℹ️  Los resúmenes nunca se han calculado; los reportes leen las tablas base")
+            else:
+                print(f"📌 Marca de agua: {high_water:%Y-%m-%d %H:%M:%S}")
+
+        else:
+            print(f"❌ Comando desconocido: {command}")
+            print_help()
+            sys.exit(1)
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+🧩 SoftBee Shard Manager
+Administra la fragmentación por usuario (DATABASE_SHARDS, ver src/database/sharding.py):
+prepara fragmentos nuevos y mueve usuarios entre fragmentos sin detener la aplicación.
+Durante un movimiento las escrituras del usuario reciben 503 con Retry-After; sus
+lecturas y el resto de usuarios no se ven afectados.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import psycopg2
+import psycopg2.extensions
+from dotenv import load_dotenv
+
+from src.database.sharding import (
+    DEFAULT_SHARD, SHARD_ID_BLOCK, SHARD_LOCK_NAMESPACE,
+    copy_tenant, delete_tenant, lock_tenant_rows, tenant_counts
+)
+from src.models.user_shards import UserShardModel
+
+
+def print_help():
+    print("""
+📋 Comandos disponibles:
+
+   status                   - Usuarios por fragmento y usuarios congelados
+   init-shard <fragmento>   - Reservar el bloque de ids del fragmento (tras aplicar el esquema)
+   move <user_id> <fragmento>
+                            - Mover un usuario y todos sus datos a otro fragmento
+   verify <user_id>         - Contar las filas del usuario en cada fragmento
+   cleanup <user_id> <fragmento>
+                            - Borrar restos del usuario en un fragmento que no es el suyo
+                              (movimiento interrumpido después de cambiar el directorio)
+   unfreeze <user_id>       - Descongelar un usuario si un movimiento se interrumpió
+
+🛠️ Un fragmento nuevo necesita el esquema y las particiones antes de init-shard:
+   DATABASE_URL=<url del fragmento> flask db upgrade
+   DATABASE_URL=<url del fragmento> python partition_manager.py ensure
+
+📚 Ejemplos:
+   python shard_manager.py init-shard eu1
+   python shard_manager.py move 42 eu1
+""")
+
+
+def shard_urls():
+    """'default' (DATABASE_URL) y los fragmentos de DATABASE_SHARDS ("nombre=url,..."), en orden"""
+    load_dotenv()
+    urls = {DEFAULT_SHARD: os.getenv("DATABASE_URL")}
+    for item in os.getenv("DATABASE_SHARDS", "").split(","):
+        name, _, url = item.partition("=")
+        if name.strip() and url.strip():
+            urls[name.strip()] = url.strip()
+    return urls
+
+
+def setting(name, default):
+    return float(os.getenv(name, default))
+
+
+def get_connection(shard=DEFAULT_SHARD):
+    database_url = shard_urls().get(shard)
+    if not database_url:
+        print(f"❌ Error: el fragmento '{shard}' no está configurado (DATABASE_URL / DATABASE_SHARDS)")
+        sys.exit(1)
+    if database_url.startswith("postgres://"):
+        database_url = database_url.replace("postgres://", "postgresql://", 1)
+    return psycopg2.connect(database_url)
+
+
+def current_shard(directory, user_id):
+    return UserShardModel.get(directory, user_id) or (DEFAULT_SHARD, 'active')
+
+
+def print_counts(counts_by_shard):
+    shards = list(counts_by_shard)
+    print(f"   {'tabla':<32}" + ''.join(f"{shard:>12}" for shard in shards))
+    for table in next(iter(counts_by_shard.values())):
+        print(f"   {table:<32}" + ''.join(f"{counts_by_shard[shard][table]:>12}" for shard in shards))
+
+
+def init_shard(shard):
+    """Adelanta las secuencias del fragmento a su bloque de ids (nunca las retrocede)"""
+    names = list(shard_urls())
+    if shard == DEFAULT_SHARD or shard not in names:
+        print(f"❌ Error: '{shard}' debe ser un fragmento de DATABASE_SHARDS distinto de '{DEFAULT_SHARD}'")
+        sys.exit(1)
+    block_start = names.index(shard) * SHARD_ID_BLOCK
+    conn = get_connection(shard)
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT to_regclass('apiaries') IS NOT NULL")
+        if not cursor.fetchone()[0]:
+            print("❌ Error: el fragmento no tiene el esquema; aplica las migraciones primero")
+            sys.exit(1)
+        cursor.execute('''
+            SELECT format('%I.%I', schemaname, sequencename), COALESCE(last_value, 0), max_value
+            FROM pg_sequences WHERE schemaname = current_schema()
+        ''')
+        for sequence, last_value, max_value in cursor.fetchall():
+            if block_start + SHARD_ID_BLOCK - 1 > max_value:
+                print(f"⚠️  {sequence}: el bloque {block_start} excede su máximo ({max_value}), se omite")
+            elif last_value < block_start:
+                cursor.execute('SELECT setval(%s, %s, false)', (sequence, block_start))
+                print(f"   {sequence:<45} -> {block_start}")
+        conn.commit()
+        print(f"✅ Fragmento '{shard}' numera desde {block_start}")
+    finally:
+        conn.close()
+
+
+def move(user_id, target):
+    directory = get_connection()
+    try:
+        source, status = current_shard(directory, user_id)
+        directory.commit()
+        if target not in shard_urls():
+            print(f"❌ Error: el fragmento '{target}' no está configurado")
+            sys.exit(1)
+        if source == target:
+            print(f"ℹ️  El usuario {user_id} ya está en '{target}'")
+            return
+        if status == 'frozen':
+            print(f"⚠️  El usuario {user_id} estaba congelado (movimiento interrumpido), se reintenta")
+
+        source_conn, target_conn = get_connection(source), get_connection(target)
+        lock_conn = get_connection(source)
+        lock_conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        # Tiene bloqueadas las filas del usuario en el origen desde la copia hasta borrarlas
+        rows_conn = get_connection(source)
+        # La copia lee una sola instantánea del origen
+        source_conn.set_session(isolation_level='REPEATABLE READ', readonly=True)
+        moved = False
+        try:
+            # 1. Ensayo sin congelar: detecta esquema, particiones o ids en conflicto
+            print(f"🔎 Ensayando la copia {source} -> {target}...")
+            delete_tenant(target_conn, user_id)
+            copy_tenant(source_conn, target_conn, user_id)
+            target_conn.rollback()
+            source_conn.rollback()
+
+            # 2. Congelar: las peticiones que escriben reciben 503 en cuanto vence la caché
+            UserShardModel.assign(directory, user_id, source, 'frozen')
+            cache_seconds = setting("SHARD_MAP_CACHE_SECONDS", 5)
+            print(f"❄️  Usuario {user_id} congelado, esperando {cache_seconds:g}s de caché...")
+            time.sleep(cache_seconds + 1)
+
+            # 3. Esperar a las escrituras en curso (tienen el lock compartido)
+            lock_timeout = f'{setting("SHARD_MOVE_LOCK_TIMEOUT_SECONDS", 30):g}s'
+            cursor = lock_conn.cursor()
+            cursor.execute('SET lock_timeout = %s', (lock_timeout,))
+            cursor.execute('SELECT pg_advisory_lock(%s, %s)', (SHARD_LOCK_NAMESPACE, user_id))
+            # Y a las que no lo toman (rutas o scripts fuera de @tenant_db): lo que
+            # intenten escribir en el origen a partir de aquí espera y luego falla
+            rows_cursor = rows_conn.cursor()
+            rows_cursor.execute('SET lock_timeout = %s', (lock_timeout,))
+            rows_cursor.close()
+            lock_tenant_rows(rows_conn, user_id)
+
+            # 4. Copiar y verificar dentro de una transacción del destino
+            started = time.monotonic()
+            delete_tenant(target_conn, user_id)
+            copied = copy_tenant(source_conn, target_conn, user_id)
+            expected, actual = tenant_counts(source_conn, user_id), tenant_counts(target_conn, user_id)
+            if expected != actual:
+                print_counts({source: expected, target: actual})
+                raise RuntimeError("Los conteos del origen y del destino no coinciden")
+            target_conn.commit()
+            source_conn.rollback()
+
+            # 5. Cambiar el directorio y liberar al usuario
+            UserShardModel.assign(directory, user_id, target, 'active')
+            moved = True
+            cursor.execute('SELECT pg_advisory_unlock(%s, %s)', (SHARD_LOCK_NAMESPACE, user_id))
+            print(f"✅ Usuario {user_id} movido a '{target}' ({sum(copied.values())} filas, "
+                  f"{time.monotonic() - started:.1f}s congelado tras la espera)")
+        except Exception:
+            if moved:
+                raise
+            target_conn.rollback()
+            source_conn.rollback()
+            UserShardModel.assign(directory, user_id, source, 'active')
+            print(f"↩️  Movimiento cancelado, el usuario {user_id} sigue en '{source}'")
+            raise
+        finally:
+            lock_conn.close()
+            target_conn.close()
+            source_conn.close()
+            if not moved:
+                rows_conn.close()
+
+        # 6. Borrar el origen (el usuario ya se sirve desde el destino) sin soltar sus filas
+        cleanup(user_id, source, directory, rows_conn)
+    finally:
+        directory.close()
+
+
+def cleanup(user_id, shard, directory=None, conn=None):
+    own_directory = directory is None
+    directory = directory or get_connection()
+    conn = conn or get_connection(shard)
+    try:
+        current, status = current_shard(directory, user_id)
+        directory.commit()
+        if current == shard or status != 'active':
+            print(f"❌ Error: el usuario {user_id} está en '{current}' ({status}), no se borra '{shard}'")
+            sys.exit(1)
+        deleted = delete_tenant(conn, user_id)
+        conn.commit()
+        print(f"🧹 '{shard}': {deleted} apiarios del usuario {user_id} borrados con sus datos")
+    finally:
+        conn.close()
+        if own_directory:
+            directory.close()
+
+
+def verify(user_id):
+    directory = get_connection()
+    try:
+        shard, status = current_shard(directory, user_id)
+    finally:
+        directory.close()
+    print(f"🔎 Usuario {user_id}: fragmento '{shard}' ({status})")
+    counts = {}
+    for name in shard_urls():
+        conn = get_connection(name)
+        try:
+            counts[name] = tenant_counts(conn, user_id)
+        finally:
+            conn.close()
+    print_counts(counts)
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] in ('help', '--help', '-h'):
+        print_help()
+        return
+
+    command = sys.argv[1].lower()
+    args = sys.argv[2:]
+    if command == 'status':
+        conn = get_connection()
+        try:
+            for row in UserShardModel.summary(conn):
+                frozen = f"  congelados: {row['frozen']}" if row['frozen'] else ''
+                print(f"   {row['shard']:<20} {row['status']:<8} {row['users']:>8} usuarios{frozen}")
+        finally:
+            conn.close()
+
+    elif command == 'init-shard' and len(args) == 1:
+        init_shard(args[0])
+
+    elif command == 'move' and len(args) == 2:
+        move(int(args[0]), args[1])
+
+    elif command == 'verify' and len(args) == 1:
+        verify(int(args[0]))
+
+    elif command == 'cleanup' and len(args) == 2:
+        cleanup(int(args[0]), args[1])
+
+    elif command == 'unfreeze' and len(args) == 1:
+        conn = get_connection()
+        try:
+            shard, _ = current_shard(conn, int(args[0]))
+            UserShardModel.assign(conn, int(args[0]), shard, 'active')
+            print(f"✅ Usuario {args[0]} activo en '{shard}'")
+        finally:
+            conn.close()
+
+    else:
+        print(f"❌ Comando desconocido o argumentos incorrectos: {' '.join(sys.argv[1:])}")
+        print_help()
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,205 @@
+"""
+Aplicación ASGI: atiende de forma asíncrona los endpoints de lectura con más
+espera de E/S y delega todo lo demás en la aplicación Flask existente.
+
+Las rutas asíncronas devuelven exactamente el mismo JSON que sus equivalentes
+WSGI (se serializa con el proveedor JSON de Flask), y validan el token JWT con la
+misma configuración y los mismos mensajes de error que @jwt_required.
+
+Cada ruta tiene el mismo plazo que su vista WSGI (REQUEST_DEADLINES o
+REQUEST_DEADLINE_MS): al vencer, o si el cliente se desconecta, se cancela la tarea
+del manejador y asyncpg cancela la consulta en curso en el servidor.
+
+Con DATABASE_SHARDS o DATABASE_REPLICA_URLS las rutas asíncronas se desactivan y
+todo se atiende con Flask: el pool asyncpg solo conoce DATABASE_URL, así que no
+resuelve el fragmento del usuario ni lee de las réplicas.
+"""
+
+import asyncio
+import logging
+import re
+from datetime import datetime
+
+import jwt
+
+from app import create_app
+from src.asgi import handlers
+from src.asgi.pool import AsyncDatabase
+
+logger = logging.getLogger(__name__)
+
+# (patrón de ruta, manejador, requiere JWT, alcance del plazo en REQUEST_DEADLINES)
+ASYNC_ROUTES = [
+    (re.compile(r'^/api/stats$'), handlers.get_stats, True, 'analytics'),
+    (re.compile(r'^/api/reports/monitoring$'), handlers.get_monitoring_reports, True, 'reports'),
+    (re.compile(r'^/api/apiaries/(?P<apiary_id>\d+)/questions$'), handlers.get_apiary_questions, False, None),
+    (re.compile(r'^/api/apiarios/(?P<apiario_id>\d+)/monitoreos$'), handlers.get_monitoreos_by_apiario, False, None),
+    (re.compile(r'^/api/colmenas/(?P<colmena_id>\d+)/monitoreos$'), handlers.get_monitoreos_by_colmena, False, None),
+]
+
+
+def _authenticate(request, config):
+    """Replica @jwt_required; retorna None si el token es válido o (status, cuerpo) si no"""
+    auth_header = request.headers.get('authorization')
+    token = auth_header.split(" ")[1] if auth_header and auth_header.startswith('Bearer ') else None
+    if not token:
+        return 401, {'success': False, 'error': 'Token de autorización requerido', 'code': 'token_missing'}
+
+    try:
+        payload = jwt.decode(token, config['JWT_SECRET_KEY'], algorithms=[config['JWT_ALGORITHM']])
+    except jwt.ExpiredSignatureError:
+        return 401, {'success': False, 'error': 'Token expirado', 'code': 'token_expired'}
+    except jwt.InvalidTokenError as e:
+        return 401, {'success': False, 'error': 'Token inválido', 'code': 'token_invalid', 'details': str(e)}
+
+    now = datetime.utcnow().timestamp()
+    if 'exp' not in payload or payload['exp'] < now:
+        return 401, {'success': False, 'error': 'Token expirado', 'code': 'token_expired',
+                     'expired_at': payload.get('exp'), 'current_time': now}
+    if 'sub' not in payload:
+        return 401, {'success': False, 'error': 'Token inválido', 'code': 'token_invalid',
+                     'details': "Falta campo 'sub' en el token"}
+
+    request.current_user_id = int(payload['sub'])
+    return None
+
+
+class AsyncApp:
+    """Enrutador ASGI: rutas asíncronas propias y el resto hacia Flask (WsgiToAsgi)"""
+
+    def __init__(self, flask_app, database, wsgi_fallback, routes=ASYNC_ROUTES):
+        self.flask_app = flask_app
+        self.database = database
+        self.wsgi_fallback = wsgi_fallback
+        self.routes = routes
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+
+        if scope['type'] == 'http' and scope['method'] in ('GET', 'HEAD'):
+            for pattern, handler, auth, deadline_scope in self.routes:
+                match = pattern.match(scope['path'])
+                if match:
+                    await self._dispatch(scope, receive, send, handler, auth, deadline_scope, match.groupdict())
+                    return
+
+        await self.wsgi_fallback(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                if self.database is None:
+                    await send({'type': 'lifespan.startup.complete'})
+                    continue
+                try:
+                    await self.database.open()
+                except Exception as e:
+                    await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+                    return
+                logger.info(f"Pool asyncpg abierto (máximo {self.database.max_size} conexiones)")
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                if self.database is not None:
+                    await self.database.close()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _dispatch(self, scope, receive, send, handler, auth, deadline_scope, path_params):
+        request = handlers.AsyncRequest(scope, path_params)
+        headers = {}
+
+        error = _authenticate(request, self.flask_app.config) if auth else None
+        if error:
+            status, body = error
+        else:
+            try:
+                result = await self._run_with_deadline(scope, receive, self._handle(handler, request),
+                                                       self._budget_ms(deadline_scope))
+                if result is None:
+                    return
+                status, body, headers = result
+            except ValueError as e:
+                status, body = 400, {'error': str(e)}
+            except Exception as e:
+                logger.error(f"Error en {scope['path']}: {str(e)}")
+                status, body = 500, {'error': str(e)}
+
+        await self._send_json(scope, send, status, body, headers)
+
+    async def _handle(self, handler, request):
+        async with self.database.acquire() as conn:
+            return await handler(request, conn)
+
+    def _budget_ms(self, deadline_scope):
+        config = self.flask_app.config
+        return config.get('REQUEST_DEADLINES', {}).get(deadline_scope) or config.get('REQUEST_DEADLINE_MS', 0)
+
+    async def _run_with_deadline(self, scope, receive, coro, budget_ms):
+        """
+        Ejecuta el manejador hasta su plazo o hasta que el cliente se desconecte;
+        retorna su resultado, la respuesta 504 o None si ya no hay a quién responder
+        """
+        task = asyncio.ensure_future(coro)
+        watcher = None
+        if self.flask_app.config.get('REQUEST_CANCEL_ON_DISCONNECT', True):
+            watcher = asyncio.ensure_future(_wait_disconnect(receive))
+        try:
+            await asyncio.wait([t for t in (task, watcher) if t is not None],
+                               timeout=budget_ms / 1000.0 if budget_ms else None,
+                               return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            if watcher is not None:
+                watcher.cancel()
+        if task.done():
+            return task.result()
+
+        # Al cancelar la tarea asyncpg cancela la consulta en curso en el servidor
+        task.cancel()
+        try:
+            await task
+        except (asyncio.CancelledError, Exception):
+            pass
+        if watcher is not None and watcher.done() and not watcher.cancelled():
+            logger.warning(f"Cliente desconectado, consulta cancelada: {scope['method']} {scope['path']}")
+            return None
+        logger.warning(f"Plazo de {budget_ms} ms vencido: {scope['method']} {scope['path']}")
+        return 504, {'error': 'Request deadline exceeded', 'code': 'deadline_exceeded', 'deadline_ms': budget_ms}, {}
+
+    async def _send_json(self, scope, send, status, body, headers):
+        payload = b'' if body is None else (self.flask_app.json.dumps(body) + '\n').encode('utf-8')
+        raw_headers = [(b'access-control-allow-origin', b'*')]
+        if body is not None:
+            raw_headers += [(b'content-type', b'application/json'),
+                            (b'content-length', str(len(payload)).encode('latin-1'))]
+        raw_headers += [(k.lower().encode('latin-1'), v.encode('latin-1')) for k, v in headers.items()]
+
+        await send({'type': 'http.response.start', 'status': status, 'headers': raw_headers})
+        await send({'type': 'http.response.body', 'body': b'' if scope['method'] == 'HEAD' else payload})
+
+
+async def _wait_disconnect(receive):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+
+def create_asgi_app():
+    try:
+        from asgiref.wsgi import WsgiToAsgi
+    except ImportError:
+        raise RuntimeError("El modo ASGI requiere asgiref: pip install -r requirements-async.txt")
+
+    flask_app = create_app()
+    for option in ('DATABASE_SHARDS', 'DATABASE_REPLICA_URLS'):
+        if flask_app.config.get(option):
+            logger.warning(f"{option} configurado: las rutas asíncronas se atienden con Flask")
+            return AsyncApp(flask_app, None, WsgiToAsgi(flask_app), routes=[])
+
+    database = AsyncDatabase(
+        flask_app.config['DATABASE_URL'],
+        min_size=flask_app.config['ASYNC_DB_POOL_MIN_SIZE'],
+        max_size=flask_app.config['ASYNC_DB_POOL_MAX_SIZE']
+    )
+    return AsyncApp(flask_app, database, WsgiToAsgi(flask_app))
@@ -0,0 +1,167 @@
+"""
+Versiones asíncronas de los endpoints de lectura más usados.
+
+Reproducen exactamente las respuestas de sus equivalentes Flask (mismo JSON,
+mismos códigos de estado) pero consultan PostgreSQL con asyncpg, de modo que un
+solo proceso atiende muchas peticiones mientras espera a la base de datos. Las
+consultas son las mismas constantes de los modelos, con sus parámetros con
+nombre de psycopg2 traducidos a los posicionales de asyncpg.
+"""
+
+import re
+from datetime import datetime, timedelta
+from urllib.parse import parse_qsl
+
+from werkzeug.datastructures import MultiDict
+from werkzeug.http import http_date, parse_date, parse_etags
+
+from src.middleware.conditional import build_etag, _as_utc
+from src.models.monitoreo import (
+    MonitoreoModel, RESPUESTAS_BY_MONITOREOS_SQL, MONITOREOS_WITH_DETAILS_SQL,
+    MONITOREOS_BY_APIARIO_SQL, MONITOREOS_BY_COLMENA_SQL, USER_COUNTS_SQL, LIVE_APIARY_TOTALS_SQL
+)
+from src.models.monitoring_rollups import ROLLUP_NAME, HIGH_WATER_SQL, APIARY_TOTALS_SQL, apiary_totals_params
+from src.models.questions import QUESTIONS_BY_APIARY_SQL, APIARY_VERSION_SQL, active_filter
+
+_NAMED_PARAM = re.compile(r'%\((\w+)\)s|%%')
+
+
+class AsyncRequest:
+    """Datos mínimos de la petición ASGI que usan los manejadores"""
+
+    def __init__(self, scope, path_params):
+        self.method = scope['method']
+        self.path = scope['path']
+        self.path_params = path_params
+        self.headers = {k.decode('latin-1').lower(): v.decode('latin-1') for k, v in scope.get('headers', [])}
+        # Igual que request.args de Flask: conserva los parámetros repetidos
+        self.args = MultiDict(parse_qsl(scope.get('query_string', b'').decode('latin-1'), keep_blank_values=True))
+        self.current_user_id = None
+
+
+def _bind(sql, params):
+    """Traduce %(nombre)s de psycopg2 a $1, $2... de asyncpg; retorna (sql, argumentos)"""
+    names = []
+
+    def placeholder(match):
+        if match.group(0) == '%%':
+            return '%'
+        if match.group(1) not in names:
+            names.append(match.group(1))
+        return f'${names.index(match.group(1)) + 1}'
+
+    sql = _NAMED_PARAM.sub(placeholder, sql)
+    return sql, [params[name] for name in names]
+
+
+async def _fetch(conn, sql, params):
+    return await conn.fetch(*_bind(sql, params))
+
+
+async def _fetchrow(conn, sql, params):
+    return await conn.fetchrow(*_bind(sql, params))
+
+
+def _parse_date_range(args):
+    bounds = []
+    for name in ('desde', 'hasta'):
+        value = args.get(name)
+        if not value:
+            bounds.append(None)
+            continue
+        try:
+            bounds.append(datetime.fromisoformat(value))
+        except ValueError:
+            raise ValueError(f"Parámetro '{name}' inválido, use formato ISO 8601")
+    return bounds
+
+
+async def get_stats(request, conn):
+    """GET /api/stats (equivalente a MonitoreoController.get_system_stats)"""
+    user_id = request.current_user_id
+    counts = await _fetchrow(conn, USER_COUNTS_SQL, {'user_id': user_id})
+
+    thirty_days_ago = datetime.utcnow() - timedelta(days=30)
+    high_water = await conn.fetchval(*_bind(HIGH_WATER_SQL, {'name': ROLLUP_NAME}))
+    if high_water is not None:
+        por_apiario = await _fetch(conn, APIARY_TOTALS_SQL, apiary_totals_params(user_id, high_water, thirty_days_ago))
+    else:
+        por_apiario = await _fetch(conn, LIVE_APIARY_TOTALS_SQL, {'user_id': user_id, 'since': thirty_days_ago})
+
+    return 200, {
+        'total_apiarios': counts['total_apiarios'],
+        'total_colmenas': counts['total_colmenas'],
+        'total_monitoreos': sum(a['total'] for a in por_apiario),
+        'monitoreos_pendientes': sum(a['pending'] for a in por_apiario),
+        'monitoreos_ultimo_mes': sum(a['recent'] for a in por_apiario),
+        'monitoreos_por_apiario': [{'apiario': a['name'], 'total': a['total']} for a in por_apiario],
+        'timestamp': datetime.utcnow().isoformat()
+    }, {}
+
+
+async def get_monitoring_reports(request, conn):
+    """GET /api/reports/monitoring (equivalente a MonitoreoModel.get_all_with_details)"""
+    monitoreos = [dict(row) for row in await _fetch(conn, MONITOREOS_WITH_DETAILS_SQL, {
+        'user_id': request.current_user_id, 'limit': 100, 'offset': 0
+    })]
+    if not monitoreos:
+        return 200, [], {}
+
+    fechas = [m['fecha'] for m in monitoreos]
+    respuestas_map = {}
+    for row in await _fetch(conn, RESPUESTAS_BY_MONITOREOS_SQL, {
+        'monitoreo_ids': [m['id'] for m in monitoreos], 'desde': min(fechas), 'hasta': max(fechas)
+    }):
+        respuestas_map.setdefault(row['monitoreo_id'], []).append(dict(row))
+    for monitoreo in monitoreos:
+        monitoreo['respuestas'] = respuestas_map.get(monitoreo['id'], [])
+    return 200, monitoreos, {}
+
+
+async def get_apiary_questions(request, conn):
+    """GET /api/apiaries/<id>/questions con la misma validación condicional (ETag) que Flask"""
+    apiary_id = int(request.path_params['apiary_id'])
+    version = await _fetchrow(conn, APIARY_VERSION_SQL, {'apiary_id': apiary_id})
+
+    headers = {}
+    if version:
+        # Mismo alcance que _request_scope(): ruta, argumentos y usuario (vacío, la ruta es pública)
+        args = '&'.join(f"{k}={v}" for k, v in sorted(request.args.items(multi=True)))
+        etag = build_etag(f"{request.path}?{args}#", dict(version))
+        last_modified = _as_utc(version['last_modified'])
+        headers = {'ETag': f'W/"{etag}"', 'Cache-Control': 'private, no-cache'}
+        if last_modified is not None:
+            headers['Last-Modified'] = http_date(last_modified)
+
+        if_none_match = request.headers.get('if-none-match')
+        if_modified_since = parse_date(request.headers.get('if-modified-since'))
+        if if_none_match:
+            not_modified = parse_etags(if_none_match).contains_weak(etag)
+        else:
+            not_modified = (last_modified is not None and if_modified_since is not None
+                            and last_modified.replace(microsecond=0) <= if_modified_since)
+        if not_modified:
+            return 304, None, headers
+
+    active_only = request.args.get('active_only', 'true').lower() == 'true'
+    rows = await _fetch(conn, QUESTIONS_BY_APIARY_SQL.format(active_filter=active_filter(active_only)),
+                        {'apiary_id': apiary_id})
+    return 200, [dict(row) for row in rows], headers
+
+
+async def get_monitoreos_by_apiario(request, conn):
+    """GET /api/apiarios/<id>/monitoreos"""
+    desde, hasta = _parse_date_range(request.args)
+    date_clause, params = MonitoreoModel.date_range_clause(desde, hasta)
+    rows = await _fetch(conn, MONITOREOS_BY_APIARIO_SQL.format(date_clause=date_clause),
+                        {'apiary_id': int(request.path_params['apiario_id']), **params})
+    return 200, [dict(row) for row in rows], {}
+
+
+async def get_monitoreos_by_colmena(request, conn):
+    """GET /api/colmenas/<id>/monitoreos"""
+    desde, hasta = _parse_date_range(request.args)
+    date_clause, params = MonitoreoModel.date_range_clause(desde, hasta)
+    rows = await _fetch(conn, MONITOREOS_BY_COLMENA_SQL.format(date_clause=date_clause),
+                        {'beehive_id': int(request.path_params['colmena_id']), **params})
+    return 200, [dict(row) for row in rows], {}
@@ -0,0 +1,54 @@
+"""
+Pool asíncrono de PostgreSQL (asyncpg) para el modo ASGI.
+
+asyncpg es una dependencia opcional (requirements-async.txt): solo se importa al
+abrir el pool, de modo que el modo WSGI no la necesita.
+"""
+
+import json
+
+
+async def _init_connection(conn):
+    # JSON/JSONB como objetos de Python, igual que psycopg2
+    for type_name in ('json', 'jsonb'):
+        await conn.set_type_codec(type_name, encoder=json.dumps, decoder=json.loads, schema='pg_catalog')
+
+
+class AsyncDatabase:
+    """Ciclo de vida del pool: se abre en el arranque (lifespan) y se cierra al apagar"""
+
+    def __init__(self, database_url, min_size=2, max_size=20, command_timeout=30):
+        if database_url.startswith('postgres://'):
+            database_url = database_url.replace('postgres://', 'postgresql://', 1)
+        self.database_url = database_url
+        self.min_size = min_size
+        self.max_size = max_size
+        self.command_timeout = command_timeout
+        self.pool = None
+
+    async def open(self):
+        try:
+            import asyncpg
+        except ImportError:
+            raise RuntimeError("El modo ASGI requiere asyncpg: pip install -r requirements-async.txt")
+
+        self.pool = await asyncpg.create_pool(
+            self.database_url,
+            min_size=self.min_size,
+            max_size=self.max_size,
+            command_timeout=self.command_timeout,
+            init=_init_connection
+        )
+
+    async def close(self):
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+
+    def acquire(self):
+        return self.pool.acquire()
+
+    def stats(self):
+        if self.pool is None:
+            return {'size': 0, 'idle': 0, 'max_size': self.max_size}
+        return {'size': self.pool.get_size(), 'idle': self.pool.get_idle_size(), 'max_size': self.max_size}
@@ -8,14 +8,9 @@ class ApiaryController:
         self.model = ApiaryModel
     
     def create_apiary(self, user_id, name, location=None):
-        # Verifica que el usuario exista antes de crear el apiario
-        user = UserModel.get_by_id(self.db, user_id)
-        if not user:
-            return None
-        apiary_id = self.model.create(self.db, user_id, name, location)
-        # Crear inventario vacío (no agrega items, solo asegura que el apiario tiene inventario asociado)
-        # No es necesario crear registros en la tabla inventory, ya que el inventario se asocia por apiary_id
-        return apiary_id
+        # El modelo verifica que el usuario exista y crea el inventario inicial
+        # en la misma sentencia; retorna None si el usuario no existe
+        return self.model.create(self.db, user_id, name, location)
 
     def get_apiary(self, apiary_id):
         apiary = self.model.get_by_id(self.db, apiary_id)
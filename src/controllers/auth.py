@@ -78,24 +78,24 @@ class AuthController:
             except ValueError:
                 expires_minutes = 15
                     
-            # Generar token
-            token = PasswordResetTokenModel.create_token(
-                self.db, 
-                user['id'],
-                expires_minutes=expires_minutes
-            )
+        # Generar token
+        token = PasswordResetTokenModel.create_token(
+            self.db, 
+            user['id'],
+            expires_minutes=expires_minutes
+        )
 
-            
-            # Enviar correo
-            if self.mail_service:
-                reset_url = f"{current_app.config['FRONTEND_URL']}/reset-password?token={token}"
-                self.mail_service.send_password_reset(
-                    email=email,
-                    token=token,
-                    reset_url=reset_url
-                )
-            
-            return token
+        
+        # Enviar correo
+        if self.mail_service:
+            reset_url = f"{current_app.config['FRONTEND_URL']}/reset-password?token={token}"
+            self.mail_service.send_password_reset(
+                email=email,
+                token=token,
+                reset_url=reset_url
+            )
+        
+        return token
                 
     def complete_password_reset(self, token, new_password):
         """Completa el proceso de recuperación de contraseña"""
@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta
+from src.models.hive_health import HiveHealthModel
+from src.utils.health_scoring import score_hives, hive_records, apiary_records, COMPONENTS
+
+# Las puntuaciones se precalculan cada noche (health_scores.py); pasado este margen
+# se recalculan al consultarlas
+SCORES_MAX_AGE = timedelta(hours=26)
+
+
+class HiveHealthController:
+    def __init__(self, db):
+        self.db = db
+        self.model = HiveHealthModel
+
+    def compute(self, user_id=None, save=True):
+        """Calcula las puntuaciones (de un usuario o de todas las colmenas) y las guarda"""
+        hives = self.model.load_hives(self.db, user_id)
+        signals = self.model.load_signals(self.db, user_id)
+        result = score_hives(hives, signals)
+        records = hive_records(hives, result)
+        if save:
+            self.model.save_scores(self.db, records)
+        return records, apiary_records(result)
+
+    def get_user_health(self, user_id, refresh=False, apiary_id=None):
+        """Puntuaciones de las colmenas del usuario, precalculadas salvo que falten o estén viejas"""
+        rows = None if refresh else self.model.get_scores(self.db, user_id)
+        if rows and datetime.utcnow() - min(row['computed_at'] for row in rows) > SCORES_MAX_AGE:
+            rows = None
+
+        if rows is None:
+            hives, _ = self.compute(user_id)
+            computed_at = datetime.utcnow()
+        else:
+            hives = [{k: row[k] for k in ('hive_id', 'apiary_id', 'hive_number', 'score', 'flags', 'components')}
+                     for row in rows]
+            computed_at = min((row['computed_at'] for row in rows), default=None)
+
+        if apiary_id is not None:
+            hives = [h for h in hives if h['apiary_id'] == apiary_id]
+
+        return {
+            'computed_at': computed_at.isoformat() if computed_at else None,
+            'components': list(COMPONENTS),
+            'hives': hives,
+            'apiaries': self._apiary_summary(hives)
+        }
+
+    @staticmethod
+    def _apiary_summary(hives):
+        """Promedio por apiario de las colmenas con puntuación"""
+        summary = {}
+        for hive in hives:
+            entry = summary.setdefault(hive['apiary_id'], {'apiary_id': hive['apiary_id'], 'scores': [],
+                                                           'hives': 0, 'at_risk': 0})
+            entry['hives'] += 1
+            entry['at_risk'] += bool(hive['flags'])
+            if hive['score'] is not None:
+                entry['scores'].append(hive['score'])
+        for entry in summary.values():
+            scores = entry.pop('scores')
+            entry['score'] = round(sum(scores) / len(scores), 1) if scores else None
+        return sorted(summary.values(), key=lambda e: e['apiary_id'])
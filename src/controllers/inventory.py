@@ -1,5 +1,8 @@
 from ..models.inventory import InventoryModel
 
+# Máximo de ajustes por lote (una sola sentencia)
+MAX_BATCH_ADJUSTMENTS = 500
+
 class InventoryController:
     def __init__(self, db):
         self.db = db
@@ -33,13 +36,47 @@ class InventoryController:
         """Deletes inventory item(s) by name for an apiary"""
         self.model.delete_by_name(self.db, apiary_id, name)
 
-    def search_items(self, apiary_id, name):
-        """Searches inventory items by name for an apiary"""
-        return self.model.get_by_name(self.db, apiary_id, name)
+    def search_items(self, user_id, query, apiary_id=None, limit=20):
+        """Searches the user's inventory items by name and description, ranked by relevance"""
+        query = query.strip()
+        if not query:
+            raise ValueError("Search query is required")
+        if len(query) > 100:
+            raise ValueError("Search query is too long")
+        return self.model.search(self.db, user_id, query, apiary_id, limit)
+
+    def adjust_quantity(self, item_id, amount, user_id=None, reason=None):
+        """Adjusts inventory quantity by amount and records the movement"""
+        self.model.adjust_quantity(self.db, item_id, amount, user_id, reason)
+
+    def adjust_quantities(self, user_id, adjustments, reason=None):
+        """
+        Applies a batch of {'item_id', 'amount', 'reason'?} adjustments atomically.
+        Returns the adjusted items and the resulting low-stock items, or None if
+        any item does not exist or does not belong to the user.
+        """
+        if not isinstance(adjustments, list) or not adjustments:
+            raise ValueError("Adjustments must be a non-empty list")
+        if len(adjustments) > MAX_BATCH_ADJUSTMENTS:
+            raise ValueError(f"At most {MAX_BATCH_ADJUSTMENTS} adjustments per request")
 
-    def adjust_quantity(self, item_id, amount):
-        """Adjusts inventory quantity by amount"""
-        self.model.adjust_quantity(self.db, item_id, amount)
+        rows = []
+        for adjustment in adjustments:
+            if not isinstance(adjustment, dict) or 'item_id' not in adjustment or 'amount' not in adjustment:
+                raise ValueError("Each adjustment requires item_id and amount")
+            try:
+                rows.append((int(adjustment['item_id']), int(adjustment['amount']),
+                             adjustment.get('reason') or reason))
+            except (TypeError, ValueError):
+                raise ValueError("item_id and amount must be integers")
+        if len({item_id for item_id, _, _ in rows}) != len(rows):
+            raise ValueError("Duplicate item IDs in adjustments")
+
+        return self.model.adjust_quantities(self.db, user_id, rows)
+
+    def get_movements(self, item_id, limit=50):
+        """Gets the stock movement history of an inventory item"""
+        return self.model.get_movements(self.db, item_id, limit)
 
     def get_user_inventory(self, user_id):
         """Gets all inventory items from all apiaries belonging to a user"""
@@ -53,6 +90,10 @@ class InventoryController:
         """Gets inventory summary for an apiary"""
         return self.model.get_apiary_summary(self.db, apiary_id)
 
+    def get_stock_alerts(self, apiary_id, limit=50):
+        """Gets the latest low-stock transitions for an apiary"""
+        return self.model.get_stock_alerts(self.db, apiary_id, limit)
+
     def validate_user_access(self, item_id, user_id):
         """Validates that user has access to the inventory item through their apiary"""
         return self.model.validate_apiary_access(self.db, item_id, user_id)
\ No newline at end of file
@@ -1,5 +1,8 @@
 from datetime import datetime, timedelta
-from src.models.monitoreo import MonitoreoModel
+import psycopg2.extras
+from src.models.monitoreo import MonitoreoModel, USER_COUNTS_SQL, LIVE_APIARY_TOTALS_SQL
+from src.models.hive_analytics import HiveAnalyticsModel, GRANULARITIES
+from src.models.monitoring_rollups import MonitoringRollupModel
 from flask import current_app
 
 class MonitoreoController:
@@ -12,16 +15,18 @@ class MonitoreoController:
         if fecha is None:
             fecha = datetime.utcnow().isoformat()
         
-        # Validar que la colmena existe
+        # Validar que el apiario y la colmena existen y que la colmena pertenece al apiario
         cursor = self.db.cursor()
-        cursor.execute("SELECT id FROM colmenas WHERE id = %s", (id_colmena,))
-        if not cursor.fetchone():
-            raise ValueError("Colmena no encontrada")
-        
-        # Validar que el apiario existe
-        cursor.execute("SELECT id FROM apiarios WHERE id = %s", (id_apiario,))
-        if not cursor.fetchone():
-            raise ValueError("Apiario no encontrado")
+        try:
+            cursor.execute("SELECT id FROM apiaries WHERE id = %s", (id_apiario,))
+            if not cursor.fetchone():
+                raise ValueError("Apiario no encontrado")
+
+            cursor.execute("SELECT id FROM hives WHERE id = %s AND apiary_id = %s", (id_colmena, id_apiario))
+            if not cursor.fetchone():
+                raise ValueError("Colmena no encontrada")
+        finally:
+            cursor.close()
         
         return self.model.create(
             self.db, 
@@ -40,13 +45,44 @@ class MonitoreoController:
         """Obtiene todos los monitoreos"""
         return self.model.get_all(self.db)
 
-    def get_monitoreos_by_apiario(self, apiario_id):
+    def get_monitoreos_by_apiario(self, apiario_id, desde=None, hasta=None):
         """Obtiene monitoreos por apiario"""
-        return self.model.get_by_apiario(self.db, apiario_id)
+        return self.model.get_by_apiario(self.db, apiario_id, desde, hasta)
 
-    def get_monitoreos_by_colmena(self, colmena_id):
+    def get_monitoreos_by_colmena(self, colmena_id, desde=None, hasta=None):
         """Obtiene monitoreos por colmena"""
-        return self.model.get_by_colmena(self.db, colmena_id)
+        return self.model.get_by_colmena(self.db, colmena_id, desde, hasta)
+
+    def get_hive_analytics(self, colmena_id, user_id, granularity='week', desde=None, hasta=None):
+        """
+        Series semanales o mensuales de una colmena con su tendencia. Por defecto cubre
+        las últimas 26 semanas o 24 meses. Retorna None si la colmena no es del usuario.
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Granularidad inválida, use: {', '.join(GRANULARITIES)}")
+        if not HiveAnalyticsModel.user_owns_hive(self.db, colmena_id, user_id):
+            return None
+
+        if hasta is None:
+            hasta = datetime.utcnow() + timedelta(days=1)
+        if desde is None:
+            desde = hasta - (timedelta(weeks=26) if granularity == 'week' else timedelta(days=730))
+        # Empezar en el inicio de un periodo para no devolver el primero incompleto
+        desde = datetime(desde.year, desde.month, desde.day)
+        desde = desde - timedelta(days=desde.weekday()) if granularity == 'week' else desde.replace(day=1)
+        if desde >= hasta:
+            raise ValueError("'desde' debe ser anterior a 'hasta'")
+
+        buckets, recomputed = HiveAnalyticsModel.get_series(self.db, colmena_id, granularity, desde, hasta)
+        return {
+            'colmena_id': colmena_id,
+            'granularity': granularity,
+            'desde': desde.isoformat(),
+            'hasta': hasta.isoformat(),
+            'buckets': [{**b, 'bucket_start': b['bucket_start'].isoformat()} for b in buckets],
+            'trends': HiveAnalyticsModel.trends(buckets, granularity),
+            'recomputed_buckets': recomputed
+        }
 
     def update_monitoreo(self, monitoreo_id, **kwargs):
         """Actualiza un monitoreo"""
@@ -59,60 +95,31 @@ class MonitoreoController:
     def get_system_stats(self, user_id):
         """Obtiene estadísticas del sistema para un usuario específico"""
         current_app.logger.info(f"Getting system stats for user_id: {user_id}")
-        cursor = self.db.cursor()
+        cursor = self.db.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
 
         try:
-            # Total de apiarios para el usuario
-            current_app.logger.debug("Executing total_apiarios query")
-            cursor.execute("SELECT COUNT(*) FROM apiaries WHERE user_id = %s", (user_id,))
-            total_apiarios = cursor.fetchone()[0]
-            current_app.logger.debug(f"total_apiarios: {total_apiarios}")
-
-            # Total de colmenas para el usuario
-            current_app.logger.debug("Executing total_colmenas query")
-            cursor.execute("SELECT COUNT(*) FROM hives WHERE apiary_id IN (SELECT id FROM apiaries WHERE user_id = %s)", (user_id,))
-            total_colmenas = cursor.fetchone()[0]
-            current_app.logger.debug(f"total_colmenas: {total_colmenas}")
-
-            # Total de monitoreos para el usuario
-            current_app.logger.debug("Executing total_monitoreos query")
-            cursor.execute("SELECT COUNT(*) FROM monitoreos WHERE apiary_id IN (SELECT id FROM apiaries WHERE user_id = %s)", (user_id,))
-            total_monitoreos = cursor.fetchone()[0]
-            current_app.logger.debug(f"total_monitoreos: {total_monitoreos}")
-
-            # Monitoreos pendientes para el usuario
-            current_app.logger.debug("Executing monitoreos_pendientes query")
-            cursor.execute("SELECT COUNT(*) FROM monitoreos WHERE sincronizado = FALSE AND apiary_id IN (SELECT id FROM apiaries WHERE user_id = %s)", (user_id,))
-            monitoreos_pendientes = cursor.fetchone()[0]
-            current_app.logger.debug(f"monitoreos_pendientes: {monitoreos_pendientes}")
-
-            # Monitoreos del último mes para el usuario
-            current_app.logger.debug("Executing monitoreos_mes query")
+            # Total de apiarios y colmenas para el usuario
+            current_app.logger.debug("Executing user counts query")
+            cursor.execute(USER_COUNTS_SQL, {'user_id': user_id})
+            counts = cursor.fetchone()
+            total_apiarios, total_colmenas = counts['total_apiarios'], counts['total_colmenas']
+
             thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-            cursor.execute("""
-                SELECT COUNT(*) FROM monitoreos 
-                WHERE fecha >= %s AND apiary_id IN (SELECT id FROM apiaries WHERE user_id = %s)
-            """, (thirty_days_ago, user_id,))
-            monitoreos_mes = cursor.fetchone()[0]
-            current_app.logger.debug(f"monitoreos_mes: {monitoreos_mes}")
-
-            # Monitoreos por apiario para el usuario
-            current_app.logger.debug("Executing monitoreos_por_apiario query")
-            cursor.execute("""
-                SELECT
-                    a.name,
-                    (SELECT COUNT(*) FROM monitoreos m WHERE m.apiary_id = a.id) as total
-                FROM
-                    apiaries a
-                WHERE
-                    a.user_id = %s
-                ORDER BY
-                    total DESC
-            """, (user_id,))
-            monitoreos_por_apiario = [
-                {'apiario': row[0], 'total': row[1]} 
-                for row in cursor.fetchall()
-            ]
+            high_water = MonitoringRollupModel.get_high_water(self.db)
+            if high_water is not None:
+                # Días ya resumidos desde monitoring_rollup_apiary_daily y el resto en vivo
+                current_app.logger.debug("Reading monitoreo counts from daily rollups")
+                por_apiario = MonitoringRollupModel.get_user_totals(
+                    self.db, user_id, high_water, thirty_days_ago)
+            else:
+                # Monitoreos totales, pendientes y del último mes por apiario, en vivo
+                current_app.logger.debug("Executing live monitoreo counts query")
+                cursor.execute(LIVE_APIARY_TOTALS_SQL, {'user_id': user_id, 'since': thirty_days_ago})
+                por_apiario = cursor.fetchall()
+            total_monitoreos = sum(a['total'] for a in por_apiario)
+            monitoreos_pendientes = sum(a['pending'] for a in por_apiario)
+            monitoreos_mes = sum(a['recent'] for a in por_apiario)
+            monitoreos_por_apiario = [{'apiario': a['name'], 'total': a['total']} for a in por_apiario]
             current_app.logger.debug(f"monitoreos_por_apiario: {monitoreos_por_apiario}")
 
             stats = {
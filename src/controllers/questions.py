@@ -79,8 +79,12 @@
 #             'opciones': raw_question['opciones'].split(',') if raw_question['opciones'] else None,
 #             'id_externo': raw_question['id_externo']
 #         }import json
+import json
+import os
+from flask import current_app
 from ..models.questions import QuestionModel
 from ..models.apiary import ApiaryModel
+from ..database.unit_of_work import unit_of_work
 
 class QuestionController:
     def __init__(self, db):
@@ -126,7 +130,80 @@ class QuestionController:
     def reorder_questions(self, apiary_id, new_order):
         if len(new_order) != len(set(new_order)):
             raise ValueError("Duplicate question IDs in order list")
-        current_questions = {q['id'] for q in self.get_apiary_questions(apiary_id, False)}
-        if set(new_order) != current_questions:
-            raise ValueError("Order list doesn't match apiary's questions")
-        self.model.reorder(self.db, apiary_id, new_order)
\ No newline at end of file
+        # Validación y actualización en la misma transacción
+        with unit_of_work(self.db):
+            current_questions = {q['id'] for q in self.get_apiary_questions(apiary_id, False)}
+            if set(new_order) != current_questions:
+                raise ValueError("Order list doesn't match apiary's questions")
+            self.model.reorder(self.db, apiary_id, new_order)
+
+    def default_questions_path(self):
+        """Ruta de config/preguntas_config.json"""
+        return os.path.join(current_app.root_path, 'config', 'preguntas_config.json')
+
+    def load_default_questions(self, apiary_id):
+        """
+        Crea en el apiario las preguntas de config/preguntas_config.json que aún no
+        tiene (por id externo). Retorna los ids creados.
+        """
+        config_path = self.default_questions_path()
+        if not os.path.exists(config_path):
+            raise FileNotFoundError(config_path)
+
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+
+        preguntas = config.get("preguntas", [])
+        if not isinstance(preguntas, list):
+            raise ValueError('Formato inválido en el archivo JSON')
+
+        preguntas_cargadas = []
+
+        for i, pregunta_data in enumerate(preguntas):
+            external_id = pregunta_data.get('id')
+            if not external_id:
+                continue
+
+            existing = self.model.get_by_external_id(self.db, apiary_id, external_id)
+            if existing:
+                continue
+
+            question_text = pregunta_data.get('pregunta')
+            question_type = pregunta_data.get('tipo')
+            category = pregunta_data.get('categoria')
+            is_required = pregunta_data.get('obligatoria', False)
+            display_order = i + 1
+            depends_on = pregunta_data.get('depende_de')
+
+            # Validación y limpieza de opciones
+            opciones = pregunta_data.get('opciones')
+            if question_type == 'opciones':
+                if not opciones or not isinstance(opciones, list):
+                    raise ValueError(f"❌ Opciones inválidas en '{external_id}'")
+                opciones = [str(op) for op in opciones]
+
+            # Validación para tipo número
+            min_value = pregunta_data.get("min")
+            max_value = pregunta_data.get("max")
+            if question_type == 'numero':
+                if min_value is None or max_value is None:
+                    raise ValueError(f"❌ Pregunta '{external_id}' tipo número necesita min y max")
+
+            # Crear pregunta
+            question_id = self.create_question(
+                apiary_id=apiary_id,
+                external_id=external_id,
+                question_text=question_text,
+                question_type=question_type,
+                category=category,
+                is_required=is_required,
+                display_order=display_order,
+                min_value=min_value,
+                max_value=max_value,
+                options=opciones,
+                depends_on=depends_on,
+                is_active=True
+            )
+            preguntas_cargadas.append(question_id)
+
+        return preguntas_cargadas
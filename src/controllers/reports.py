@@ -1,9 +1,16 @@
+from datetime import date, datetime, time, timedelta
 from src.models.monitoreo import MonitoreoModel
+from src.models.monitoring_rollups import MonitoringRollupModel
+
+# Rango por defecto del resumen diario y máximo permitido
+SUMMARY_DEFAULT_DAYS = 30
+SUMMARY_MAX_DAYS = 366
 
 class ReportsController:
     def __init__(self, db):
         self.db = db
         self.monitoreo_model = MonitoreoModel
+        self.rollup_model = MonitoringRollupModel
 
     def get_monitoring_reports(self, user_id):
         """Obtiene todos los monitoreos para un usuario con un formato para reportes."""
@@ -15,3 +22,39 @@ class ReportsController:
             print(f"Error en ReportsController: {e}")
             raise e
 
+    def get_monitoring_summary(self, user_id, desde=None, hasta=None):
+        """
+        Resumen diario por apiario en [desde, hasta] (fechas): monitoreos, colmenas
+        inspeccionadas, pendientes de sincronizar y distribución de respuestas.
+        Lee los resúmenes nocturnos y calcula en vivo lo que aún no reflejan.
+        """
+        hasta = (hasta or date.today()) + timedelta(days=1)
+        desde = desde or hasta - timedelta(days=SUMMARY_DEFAULT_DAYS)
+        if desde >= hasta:
+            raise ValueError("'desde' debe ser anterior o igual a 'hasta'")
+        if (hasta - desde).days > SUMMARY_MAX_DAYS:
+            raise ValueError(f"El rango máximo es de {SUMMARY_MAX_DAYS} días")
+
+        # Sin resúmenes calculados todo el rango se lee en vivo
+        high_water = self.rollup_model.get_high_water(self.db) or datetime.combine(desde, time.min)
+        days = self.rollup_model.get_apiary_daily(self.db, user_id, desde, hasta, high_water)
+
+        totals = {}
+        for row in days:
+            total = totals.setdefault(row['apiary_id'], {
+                'apiary_id': row['apiary_id'], 'inspections': 0, 'pending_sync': 0, 'answers': {}})
+            total['inspections'] += row['inspections']
+            total['pending_sync'] += row['pending_sync']
+            for pregunta_id, options in row['answers'].items():
+                merged = total['answers'].setdefault(pregunta_id, {})
+                for opcion, count in options.items():
+                    merged[opcion] = merged.get(opcion, 0) + count
+            row['day'] = row['day'].isoformat()
+
+        return {
+            'desde': desde.isoformat(),
+            'hasta': (hasta - timedelta(days=1)).isoformat(),
+            'rollup_high_water': high_water.isoformat(),
+            'days': days,
+            'apiaries': sorted(totals.values(), key=lambda t: t['apiary_id'])
+        }
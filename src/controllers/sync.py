@@ -0,0 +1,29 @@
+from datetime import datetime, timedelta
+from ..models.sync import SyncModel
+
+class SyncController:
+    def __init__(self, db, retention_days=90, max_transaction_seconds=60):
+        self.db = db
+        self.model = SyncModel
+        self.retention_days = retention_days
+        self.max_transaction_seconds = max_transaction_seconds
+
+    def get_changes(self, user_id, token=None):
+        """Obtiene los cambios desde el token recibido y el token para la próxima sincronización"""
+        since = self.model.decode_token(token) if token else None
+
+        # Un token más antiguo que la retención de lápidas podría perder borrados:
+        # se responde con una instantánea completa para que el cliente la reemplace
+        full_resync = since is None
+        if since is not None and since < datetime.utcnow() - timedelta(days=self.retention_days):
+            since = None
+            full_resync = True
+
+        result = self.model.get_changes(self.db, user_id, since,
+                                        max_transaction_seconds=self.max_transaction_seconds)
+        return {
+            'full_resync': full_resync,
+            'next_token': self.model.encode_token(result['watermark']),
+            'changes': result['changes'],
+            'deleted': result['deleted']
+        }
@@ -9,14 +9,15 @@ class UserController:
         self.model = UserModel
 
     def create_user(self, nombre, username, email, phone, password, profile_picture=None):
-        """Creates a new user, apiary and empty inventory"""
-        from ..controllers.apiary import ApiaryController
+        """Creates a new user, apiary and starter inventory in a single atomic statement"""
         hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-        user_id = self.model.create(self.db, nombre, username, email, phone, hashed_password, profile_picture)
         # Crear apiario automáticamente con el nombre del usuario
-        apiary_controller = ApiaryController(self.db)
-        apiary_controller.create_apiary(user_id, nombre)
-        return user_id
+        result = self.model.create_with_apiaries(
+            self.db, nombre, username, email, phone, hashed_password,
+            apiaries=[{'name': nombre}], profile_picture=profile_picture)
+        if result is None:
+            raise ValueError('El nombre de usuario o el email ya están registrados')
+        return result['user_id']
 
 
     def get_user(self, user_id):
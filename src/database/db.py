@@ -4,73 +4,412 @@ Este archivo mantiene la compatibilidad con el sistema actual pero agrega soport
 """
 
 import os
-from flask import g, current_app
+import sys
+import threading
+from flask import g, current_app, request, has_request_context
 import psycopg2
+from psycopg2 import pool as pg_pool
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
 from urllib.parse import quote_plus
-from flask_sqlalchemy import SQLAlchemy
+from src.database.unit_of_work import UnitOfWorkConnection
+from src.database.replicas import ReplicaSet
+from src.database.sharding import ShardMap, ShardUnavailableError, DEFAULT_SHARD, SHARD_LOCK_NAMESPACE
+from src.middleware.read_replica import required_lsn, remember_write_lsn
+from src.middleware.deadline import apply_deadline
 
-from flask_migrate import Migrate
+# Instancias de SQLAlchemy y Flask-Migrate: solo se crean bajo `flask db`
+# (ver init_migrations); el servidor no necesita cargar SQLAlchemy ni Alembic
+db = None
+migrate = None
 
-# Instancia global de SQLAlchemy para migraciones
-db = SQLAlchemy()
-migrate = Migrate()
+# Pool de conexiones del proceso. Con workers pre-fork (gunicorn.conf.py) cada
+# worker crea el suyo después del fork: los sockets de psycopg2 nunca se comparten
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
 
-def get_db():
+# Veces que una petición encontró el pool agotado (PoolError), para /health/ready
+_pool_stats = {'exhausted': 0}
+_pool_stats_lock = threading.Lock()
+
+# Réplicas de lectura del proceso (DATABASE_REPLICA_URLS), ver src/database/replicas.py
+_replicas = None
+
+# Fragmentos por usuario del proceso (DATABASE_SHARDS), ver src/database/sharding.py
+_shards = None
+
+# Métodos que nunca escriben: solo ellos pueden ir a una réplica
+READ_ONLY_METHODS = ('GET', 'HEAD')
+
+def resolve_database_url(database_url):
+    """Normaliza DATABASE_URL (esquema postgres:// y SSL_MODE)"""
+    if not database_url:
+        raise ValueError("DATABASE_URL no está configurada")
+    
+    # Detectar tipo de base de datos
+    if not (database_url.startswith('postgresql') or database_url.startswith('postgres')):
+        raise ValueError(f"Tipo de base de datos no soportado: {database_url}")
+    
+    # Configuración para PostgreSQL
+    if database_url.startswith("postgres://"):
+        database_url = database_url.replace("postgres://", "postgresql://", 1)
+    
+    # Agregar SSL si es necesario
+    sslmode_require = os.getenv('SSL_MODE', '') == 'require'
+    if sslmode_require and 'sslmode=' not in database_url:
+        separator = '?' if '?' not in database_url else '&'
+        database_url += f"{separator}sslmode=require"
+    return database_url
+
+def init_pool(app):
+    """Crea el pool del proceso actual si DB_POOL_MAX_SIZE > 0 (post_fork de cada worker)"""
+    global _pool, _pool_pid
+    max_size = app.config.get('DB_POOL_MAX_SIZE', 0)
+    if not max_size:
+        return None
+    
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            return _pool
+        _pool = pg_pool.ThreadedConnectionPool(
+            min(app.config.get('DB_POOL_MIN_SIZE', 1), max_size),
+            max_size,
+            resolve_database_url(app.config.get('DATABASE_URL')),
+            connection_factory=UnitOfWorkConnection
+        )
+        _pool_pid = os.getpid()
+    return _pool
+
+def reset_pool_after_fork():
+    """Olvida el pool heredado del proceso padre sin cerrar sus conexiones (siguen siendo del padre)"""
+    global _pool, _pool_pid
+    with _pool_lock:
+        _pool = None
+        _pool_pid = None
+
+def close_pool():
+    """Cierra las conexiones del pool (y de réplicas y fragmentos) si pertenecen a este proceso"""
+    global _pool, _pool_pid, _replicas, _shards
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.closeall()
+        if _replicas is not None and _replicas.pid == os.getpid():
+            _replicas.close()
+        if _shards is not None and _shards.pid == os.getpid():
+            _shards.close()
+        _pool = None
+        _pool_pid = None
+        _replicas = None
+        _shards = None
+
+def pool_status():
+    """Ocupación del pool del proceso (None si no hay pool: una conexión por petición)"""
+    pool = _pool if _pool_pid == os.getpid() else None
+    if pool is None:
+        return None
+    with pool._lock:
+        idle, in_use = len(pool._pool), len(pool._used)
+    with _pool_stats_lock:
+        exhausted = _pool_stats['exhausted']
+    return {
+        'closed': pool.closed, 'idle': idle, 'in_use': in_use, 'max_size': pool.maxconn,
+        'utilization': round(in_use / pool.maxconn, 2), 'exhausted_total': exhausted
+    }
+
+def _current_pool():
+    if _pool is not None and _pool_pid != os.getpid():
+        # Proceso hijo sin post_fork (p.ej. otro servidor pre-fork): nunca reutilizar sockets del padre
+        reset_pool_after_fork()
+    if _pool is None:
+        return init_pool(current_app)
+    return _pool
+
+def _current_replicas():
+    """Réplicas del proceso actual (None si no hay DATABASE_REPLICA_URLS)"""
+    global _replicas
+    urls = current_app.config.get('DATABASE_REPLICA_URLS')
+    if not urls:
+        return None
+    with _pool_lock:
+        # Tras un fork las réplicas del padre se olvidan sin cerrarlas, como el pool
+        if _replicas is None or _replicas.pid != os.getpid():
+            _replicas = ReplicaSet(
+                [resolve_database_url(url) for url in urls],
+                min_size=current_app.config.get('DB_POOL_MIN_SIZE', 1),
+                max_size=current_app.config.get('DB_POOL_MAX_SIZE', 0),
+                max_lag=current_app.config.get('REPLICA_MAX_LAG_SECONDS', 5),
+                lag_check_interval=current_app.config.get('REPLICA_LAG_CHECK_SECONDS', 1),
+                retry_seconds=current_app.config.get('REPLICA_RETRY_SECONDS', 30)
+            )
+    return _replicas
+
+def _read_replica():
+    """(réplica, conexión) para una vista @read_replica en GET/HEAD, o (None, None) para el primario"""
+    if not g.get('db_read_replica') or request.method not in READ_ONLY_METHODS:
+        return None, None
+    replicas = _current_replicas()
+    if replicas is None:
+        return None, None
+    return replicas.acquire(required_lsn())
+
+def current_shard_map():
+    """Directorio y fragmentos del proceso actual (None si no hay DATABASE_SHARDS)"""
+    global _shards
+    shard_urls = current_app.config.get('DATABASE_SHARDS')
+    if not shard_urls:
+        return None
+    with _pool_lock:
+        if _shards is None or _shards.pid != os.getpid():
+            _shards = ShardMap(
+                resolve_database_url(current_app.config.get('DATABASE_URL')),
+                {name: resolve_database_url(url) for name, url in shard_urls.items()},
+                cache_seconds=current_app.config.get('SHARD_MAP_CACHE_SECONDS', 5),
+                min_size=current_app.config.get('DB_POOL_MIN_SIZE', 1),
+                max_size=current_app.config.get('DB_POOL_MAX_SIZE', 0)
+            )
+    return _shards
+
+def resolve_tenant(user_id):
+    """
+    (usuario, fragmento, escribe) para enrutar get_db, o None sin fragmentación.
+    Un usuario congelado (moviéndose) solo admite lecturas, en su fragmento de origen
+    """
+    shards = current_shard_map()
+    if shards is None:
+        return None
+    shard, status = shards.lookup(user_id)
+    writes = not has_request_context() or request.method not in READ_ONLY_METHODS
+    if status != 'active' and writes:
+        raise ShardUnavailableError(user_id, shard, current_app.config.get('SHARD_RETRY_AFTER_SECONDS', 5))
+    return user_id, shard, writes
+
+def _lock_tenant(conn, user_id, shard):
+    """
+    Bloqueo compartido del usuario hasta el fin de la transacción: shard_manager.py
+    move lo toma en exclusiva antes de copiar. Si hay que esperarlo, el usuario se
+    estaba moviendo y se vuelve a consultar el directorio
+    """
+    locks = g.setdefault('db_tenant_locks', set())
+    if (id(conn), user_id) in locks:
+        return
+    cursor = conn.unit_cursor()
+    try:
+        cursor.execute('SELECT pg_try_advisory_xact_lock_shared(%s, %s)', (SHARD_LOCK_NAMESPACE, user_id))
+        if not cursor.fetchone()[0]:
+            cursor.execute('SELECT pg_advisory_xact_lock_shared(%s, %s)', (SHARD_LOCK_NAMESPACE, user_id))
+            if current_shard_map().lookup(user_id, cached=False) != (shard, 'active'):
+                raise ShardUnavailableError(user_id, shard, current_app.config.get('SHARD_RETRY_AFTER_SECONDS', 5))
+    finally:
+        cursor.close()
+    locks.add((id(conn), user_id))
+
+def _shard_db(user_id, shard, writes):
+    """Conexión de la petición al fragmento (una por fragmento, con su unidad de trabajo)"""
+    connections = g.setdefault('db_shards', {})
+    if shard not in connections:
+        endpoint = current_shard_map().shard(shard)
+        conn = endpoint.connect()
+        connections[shard] = (endpoint, conn)
+        if current_app.config.get('DB_UNIT_OF_WORK', True):
+            conn.begin_unit()
+    conn = connections[shard][1]
+    apply_deadline(conn)
+    if writes:
+        _lock_tenant(conn, user_id, shard)
+    return conn
+
+def get_db(shard_for=None):
+    """
+    Conexión de la petición. Con DATABASE_SHARDS, en las vistas @tenant_db o con
+    shard_for=user_id es la del fragmento del usuario
+    """
+    tenant = resolve_tenant(shard_for) if shard_for is not None else g.get('db_tenant')
+    if tenant is not None and tenant[1] != DEFAULT_SHARD:
+        return _shard_db(*tenant)
+
+    conn = get_default_db()
+    if tenant is not None and tenant[2] and g.get('db_replica') is None:
+        _lock_tenant(conn, tenant[0], tenant[1])
+    return conn
+
+def get_default_db():
+    """
+    Conexión de la petición a 'default' (o a la réplica en las vistas @read_replica),
+    donde viven el directorio y la cola de trabajos, también en vistas @tenant_db
+    """
     if 'db' not in g:
-        database_url = current_app.config.get('DATABASE_URL')
-        
-        if not database_url:
-            raise ValueError("DATABASE_URL no está configurada")
-        
-        # Detectar tipo de base de datos
-        if database_url.startswith('postgresql') or database_url.startswith('postgres'):
-            # Configuración para PostgreSQL
-            if database_url.startswith("postgres://"):
-                database_url = database_url.replace("postgres://", "postgresql://", 1)
-            
-            # Agregar SSL si es necesario
-            sslmode_require = os.getenv('SSL_MODE', '') == 'require'
-            if sslmode_require and 'sslmode=' not in database_url:
-                separator = '?' if '?' not in database_url else '&'
-                database_url += f"{separator}sslmode=require"
-            
-            g.db = psycopg2.connect(database_url)
-            g.db_type = 'postgresql'
+        replica, conn = _read_replica()
+        pool = _current_pool() if replica is None else None
+        if replica is not None:
+            g.db = conn
+            g.db_replica = replica
+        elif pool is not None:
+            try:
+                # getconn() no espera: con el pool lleno lanza PoolError
+                g.db = pool.getconn()
+            except pg_pool.PoolError:
+                with _pool_stats_lock:
+                    _pool_stats['exhausted'] += 1
+                raise
+            g.db_pool = pool
         else:
-            raise ValueError(f"Tipo de base de datos no soportado: {database_url}")
+            g.db = psycopg2.connect(resolve_database_url(current_app.config.get('DATABASE_URL')),
+                                    connection_factory=UnitOfWorkConnection)
+        g.db_type = 'postgresql'
+        
+        # Unidad de trabajo de la petición: los commit() de los modelos se agrupan
+        # y se confirman una sola vez en finish_request_unit
+        if current_app.config.get('DB_UNIT_OF_WORK', True):
+            g.db.begin_unit()
+            g.db_unit = True
     
+    # Plazo restante de la petición como statement_timeout (ver src/middleware/deadline.py)
+    apply_deadline(g.db)
     return g.db
 
+def finish_request_unit(success=True):
+    """Confirma (o revierte) la unidad de trabajo de la petición; retorna si se confirmó"""
+    # Primero los fragmentos: si uno falla, el resto (y 'default') se revierte
+    error = None
+    for _, conn in g.get('db_shards', {}).values():
+        if conn.closed or not conn.in_unit_of_work:
+            continue
+        try:
+            while conn.unit_depth > 1:
+                conn.end_unit(success=False)
+            success = conn.end_unit(success=success) and success
+        except psycopg2.Error as e:
+            error, success = e, False
+    
+    db = g.get('db')
+    if g.pop('db_unit', False) and db is not None and not db.closed:
+        # Unidades anidadas que quedaron abiertas por error: se descartan
+        while db.unit_depth > 1:
+            db.end_unit(success=False)
+        success = db.end_unit(success=success)
+    if error is not None:
+        raise error
+    return success
+
+def _commit_request_unit(response):
+    """after_request: confirma antes de enviar la respuesta para poder reportar fallos del commit"""
+    if 'db_unit' not in g and 'db_shards' not in g:
+        return response
+    try:
+        committed = finish_request_unit(success=response.status_code < 500)
+    except psycopg2.Error as e:
+        current_app.logger.error(f"Error al confirmar la transacción de la petición: {str(e)}")
+        committed = False
+    if not committed and response.status_code < 500:
+        # Las escrituras se revirtieron: la respuesta no puede anunciar éxito
+        current_app.logger.error("La unidad de trabajo de la petición se revirtió; se responde 500")
+        response = current_app.response_class(
+            current_app.json.dumps({'error': 'Database operation failed'}),
+            status=500, mimetype='application/json')
+    return response
+
 def close_db(e=None):
+    if 'db_unit' in g or 'db_shards' in g:
+        try:
+            finish_request_unit(success=e is None)
+        except psycopg2.Error:
+            pass
+    
+    for endpoint, conn in g.pop('db_shards', {}).values():
+        try:
+            if not conn.closed and conn.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+            endpoint.release(conn)
+        except psycopg2.Error:
+            endpoint.release(conn, close=True)
+    
     db = g.pop('db', None)
-    if db is not None:
+    pool = g.pop('db_pool', None)
+    replica = g.pop('db_replica', None)
+    if db is None:
+        return
+    
+    if replica is not None:
+        try:
+            if not db.closed and db.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+                db.rollback()
+            replica.release(db)
+        except psycopg2.Error:
+            replica.release(db, close=True)
+        return
+    
+    if pool is None or pool is not _pool:
         db.close()
+        return
+    
+    # Devolver la conexión al pool sin transacciones abiertas
+    try:
+        if not db.closed and db.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+            db.rollback()
+        pool.putconn(db, close=bool(db.closed))
+    except psycopg2.Error:
+        pool.putconn(db, close=True)
 
-def init_app(app):
-    """Inicializa la base de datos con la aplicación Flask"""
+# Opciones globales de `flask` que llevan un valor (`flask --app app db upgrade`)
+FLASK_CLI_VALUE_OPTIONS = ('-A', '--app', '-e', '--env-file')
+
+def _flask_cli_command(args):
+    """Subcomando de `flask` tras las opciones globales (None si no hay)"""
+    args = iter(args)
+    for arg in args:
+        if arg in FLASK_CLI_VALUE_OPTIONS:
+            next(args, None)
+        elif not arg.startswith('-'):
+            return arg
+    return None
+
+def migrations_requested():
+    """True al ejecutar `flask db ...` (también `flask --app app db ...`) o con ENABLE_MIGRATIONS=1"""
+    if os.getenv('ENABLE_MIGRATIONS', '').lower() in ('1', 'true'):
+        return True
+    return os.getenv('FLASK_RUN_FROM_CLI') == 'true' and _flask_cli_command(sys.argv[1:]) == 'db'
+
+def init_migrations(app):
+    """Configura SQLAlchemy y Flask-Migrate (herramientas de migración)"""
+    global db, migrate
+    from flask_sqlalchemy import SQLAlchemy
+    from flask_migrate import Migrate
     
     # Configurar SQLAlchemy para migraciones
     app.config['SQLALCHEMY_DATABASE_URI'] = app.config.get('DATABASE_URL')
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
     
     # Inicializar SQLAlchemy y Flask-Migrate
+    if db is None:
+        db = SQLAlchemy()
+        migrate = Migrate()
     db.init_app(app)
     migrate.init_app(app, db)
     
-    # Mantener el sistema actual para compatibilidad
-    app.teardown_appcontext(close_db)
-
     with app.app_context():
         # Importar modelos para que Flask-Migrate los detecte
         from src.models.sqlalchemy_models import (
             User, PasswordResetToken, Apiary, ApiaryAccess, 
             Hive, Inspection, Inventory, Question, Monitoreo
         )
-        
+
+def init_app(app):
+    """Inicializa la base de datos con la aplicación Flask"""
+    
+    if migrations_requested():
+        init_migrations(app)
+    
+    # Mantener el sistema actual para compatibilidad. Los after_request corren en orden
+    # inverso: la posición del WAL se lee después de confirmar la unidad de trabajo
+    app.after_request(remember_write_lsn)
+    app.after_request(_commit_request_unit)
+    app.teardown_appcontext(close_db)
+
+    with app.app_context():
         # Mostrar información del entorno y base de datos
         env = os.getenv('FLASK_ENV', 'local')
         config_name = app.config.__class__.__name__
-        db_uri = app.config.get('SQLALCHEMY_DATABASE_URI', '')
+        db_uri = app.config.get('DATABASE_URL') or ''
         
         print(f"🚀 Iniciando aplicación en entorno: {env}")
         print(f"⚙️  Configuración activa: {config_name}")
@@ -106,6 +445,13 @@ def init_app(app):
                 from src.models.questions import QuestionModel
                 from src.models.inventory import InventoryModel
                 from src.models.monitoreo import MonitoreoModel
+                from src.models.hive_analytics import HiveAnalyticsModel
+                from src.models.hive_health import HiveHealthModel
+                from src.models.sync import SyncModel
+                from src.models.monitoring_rollups import MonitoringRollupModel
+                from src.models.jobs import JobModel
+                from src.models.rate_limit import RateLimitModel
+                from src.models.user_shards import UserShardModel
                 
                 UserModel.init_db(db_connection)
                 PasswordResetTokenModel.init_db(db_connection)
@@ -115,6 +461,13 @@ def init_app(app):
                 HiveModel.init_db(db_connection)
                 ApiaryAccessModel.init_db(db_connection)
                 MonitoreoModel.init_db(db_connection)
+                HiveAnalyticsModel.init_db(db_connection)
+                HiveHealthModel.init_db(db_connection)
+                SyncModel.init_db(db_connection)
+                MonitoringRollupModel.init_db(db_connection)
+                JobModel.init_db(db_connection)
+                RateLimitModel.init_db(db_connection)
+                UserShardModel.init_db(db_connection)
                 print("✅ Tablas de base de datos inicializadas correctamente")
             except Exception as e:
                 print(f"❌ Error al inicializar tablas: {e}")
@@ -0,0 +1,126 @@
+"""
+Réplicas de lectura (DATABASE_REPLICA_URLS, separadas por comas).
+
+Las vistas marcadas con @read_replica (src/middleware/read_replica.py) obtienen en
+get_db una conexión a una réplica en las peticiones GET/HEAD. La réplica se descarta
+y se usa el primario cuando:
+
+- su retraso supera REPLICA_MAX_LAG_SECONDS (se mide como mucho cada
+  REPLICA_LAG_CHECK_SECONDS con la misma conexión que se va a usar);
+- el cliente escribió hace poco y la réplica aún no aplicó esa escritura: tras cada
+  escritura se entrega la posición del WAL del primario (cookie db_lsn durante
+  REPLICA_STICKY_SECONDS y cabecera X-DB-LSN, que el cliente puede reenviar) y la
+  réplica debe haberla alcanzado (lectura de las propias escrituras);
+- no responde: queda fuera de la rotación durante REPLICA_RETRY_SECONDS.
+"""
+
+import itertools
+import os
+import threading
+import time
+
+import psycopg2
+from psycopg2 import pool as pg_pool
+
+from src.database.unit_of_work import UnitOfWorkConnection
+
+# Retraso de la réplica (0 si aplicó todo lo recibido) y si ya alcanzó la posición pedida.
+# Contra un servidor que no está en recuperación ambas condiciones se cumplen
+REPLICA_CHECK_SQL = '''
+    SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END,
+           NOT pg_is_in_recovery() OR pg_last_wal_replay_lsn() >= %s::pg_lsn
+'''
+
+
+class Replica:
+    """Una réplica con su pool (o conexiones sueltas) y su último retraso medido"""
+
+    def __init__(self, url, min_size, max_size):
+        self.url = url
+        self.name = url.split('@')[-1]
+        self.min_size, self.max_size = min(min_size, max_size), max_size
+        self.pool = None
+        self._pool_lock = threading.Lock()
+        self.lag = None
+        self.lag_checked = 0.0
+        self.down_until = 0.0
+
+    def connect(self):
+        if self.max_size and self.pool is None:
+            # Se crea al primer uso: una réplica caída no impide arrancar
+            with self._pool_lock:
+                if self.pool is None:
+                    self.pool = pg_pool.ThreadedConnectionPool(self.min_size, self.max_size, self.url,
+                                                               connection_factory=UnitOfWorkConnection)
+        if self.pool is not None:
+            return self.pool.getconn()
+        return psycopg2.connect(self.url, connection_factory=UnitOfWorkConnection)
+
+    def release(self, conn, close=False):
+        if self.pool is not None and not self.pool.closed:
+            self.pool.putconn(conn, close=close or bool(conn.closed))
+        elif not conn.closed:
+            conn.close()
+
+    def close(self):
+        if self.pool is not None and not self.pool.closed:
+            self.pool.closeall()
+
+
+class ReplicaSet:
+    """Elige una réplica al día (en rotación) o None para usar el primario"""
+
+    def __init__(self, urls, min_size=1, max_size=0, max_lag=5, lag_check_interval=1, retry_seconds=30):
+        self.replicas = [Replica(url, min_size, max_size) for url in urls]
+        self.max_lag = max_lag
+        self.lag_check_interval = lag_check_interval
+        self.retry_seconds = retry_seconds
+        self.pid = os.getpid()
+        self._next = itertools.count()
+        self._lock = threading.Lock()
+
+    def _usable(self, replica, conn, min_lsn):
+        """Mide el retraso si hace falta y comprueba la posición pedida"""
+        now = time.monotonic()
+        if min_lsn is None and now - replica.lag_checked < self.lag_check_interval:
+            return replica.lag <= self.max_lag
+        cursor = conn.cursor()
+        try:
+            cursor.execute(REPLICA_CHECK_SQL, (min_lsn or '0/0',))
+            lag, caught_up = cursor.fetchone()
+        finally:
+            cursor.close()
+            conn.rollback()
+        with self._lock:
+            replica.lag, replica.lag_checked = float(lag), now
+        return replica.lag <= self.max_lag and caught_up
+
+    def acquire(self, min_lsn=None):
+        """Retorna (réplica, conexión) de la primera réplica utilizable, o (None, None)"""
+        if not self.replicas:
+            return None, None
+        start = next(self._next)
+        for offset in range(len(self.replicas)):
+            replica = self.replicas[(start + offset) % len(self.replicas)]
+            if replica.down_until > time.monotonic():
+                continue
+            conn = None
+            try:
+                conn = replica.connect()
+                if self._usable(replica, conn, min_lsn):
+                    return replica, conn
+                replica.release(conn)
+            except (psycopg2.Error, pg_pool.PoolError):
+                replica.down_until = time.monotonic() + self.retry_seconds
+                if conn is not None:
+                    replica.release(conn, close=True)
+        return None, None
+
+    def status(self):
+        now = time.monotonic()
+        return [{'name': r.name, 'lag_seconds': r.lag, 'down': r.down_until > now} for r in self.replicas]
+
+    def close(self):
+        for replica in self.replicas:
+            replica.close()
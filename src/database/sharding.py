@@ -0,0 +1,279 @@
+"""
+Fragmentación por usuario (DATABASE_SHARDS, "nombre=url,...").
+
+Cada usuario vive con todos sus datos (sus apiarios y todo lo que cuelga de ellos)
+en un único fragmento. 'default' es DATABASE_URL y guarda además el directorio
+user_shards (usuario -> fragmento) y las tablas globales: users, jobs,
+password_reset_tokens, rate_limit_buckets. Los usuarios sin fila en el directorio
+están en 'default'.
+
+- Las vistas @tenant_db (src/middleware/tenant.py) resuelven el fragmento del
+  usuario autenticado antes de ejecutarse y get_db() devuelve la conexión de ese
+  fragmento; fuera de esas vistas se pide con get_db(shard_for=user_id).
+- Cada fragmento guarda una copia de las filas de users que sus datos referencian
+  (dueño y usuarios con acceso compartido): los perfiles se leen y modifican en
+  'default'.
+- Las escrituras de un usuario toman pg_advisory_xact_lock_shared(SHARD_LOCK_NAMESPACE,
+  user_id) en su fragmento hasta el commit de la petición. shard_manager.py move
+  congela al usuario en el directorio, espera a que venza la caché, toma ese lock en
+  exclusiva (espera a las escrituras en curso), copia, verifica y cambia el
+  directorio. Mientras dura, sus escrituras reciben 503 con Retry-After y sus
+  lecturas siguen en el fragmento de origen. Además bloquea con FOR UPDATE sus filas
+  en el origen (lock_tenant_rows) desde antes de copiar hasta borrarlas: una
+  escritura que no pase por @tenant_db / get_db(shard_for=...) espera y termina
+  fallando en lugar de perderse con el borrado.
+
+Los identificadores se conservan al mover: shard_manager.py init-shard adelanta las
+secuencias de cada fragmento a su propio bloque de SHARD_ID_BLOCK ids.
+"""
+
+import os
+import tempfile
+import threading
+import time
+
+import psycopg2
+import psycopg2.extensions
+
+from src.database.replicas import Replica
+from src.models.user_shards import UserShardModel
+
+DEFAULT_SHARD = 'default'
+
+# Primer argumento de los advisory locks de usuario (el segundo es el user_id)
+SHARD_LOCK_NAMESPACE = 4049
+
+# Ids reservados por fragmento: el fragmento N (posición en DATABASE_SHARDS, desde 1)
+# numera a partir de N * SHARD_ID_BLOCK
+SHARD_ID_BLOCK = 100_000_000
+
+_APIARY = 'apiary_id = ANY(%(apiaries)s)'
+_HIVE = 'hive_id IN (SELECT id FROM hives WHERE apiary_id = ANY(%(apiaries)s))'
+_ANSWERS = '(monitoreo_id, fecha) IN (SELECT id, fecha FROM monitoreos WHERE apiary_id = ANY(%(apiaries)s))'
+_VERSIONS = ('question_id IN (SELECT id FROM questions WHERE apiary_id = ANY(%(apiaries)s)) '
+             f'OR id IN (SELECT question_version_id FROM respuestas_monitoreo WHERE {_ANSWERS})')
+
+# Datos de un usuario, en orden de copia (padres antes que hijos)
+TENANT_TABLES = [
+    ('users', 'id = %(user_id)s OR id IN (SELECT user_id FROM apiary_access WHERE apiary_id = ANY(%(apiaries)s))'),
+    ('apiaries', 'user_id = %(user_id)s'),
+    ('hives', _APIARY),
+    ('questions', _APIARY),
+    ('question_versions', _VERSIONS),
+    ('inventory', _APIARY),
+    ('inventory_movements', _APIARY),
+    ('inventory_stock_alerts', _APIARY),
+    ('apiary_access', _APIARY),
+    ('monitoreos', _APIARY),
+    ('respuestas_monitoreo', _ANSWERS),
+    ('hive_analytics_cache', _HIVE),
+    ('hive_health_scores', _HIVE),
+    ('monitoring_rollup_hive_daily', _HIVE),
+    ('monitoring_rollup_apiary_daily', _APIARY),
+    ('sync_tombstones', 'user_id = %(user_id)s OR apiary_id = ANY(%(apiaries)s)'),
+]
+
+# Se reconstruyen con triggers al copiar: solo se comparan al verificar
+DERIVED_TABLES = [
+    ('inventory_stock_summary', _APIARY),
+]
+
+# Tamaño del búfer de copia en memoria antes de pasar a un archivo temporal
+COPY_BUFFER_BYTES = 64 * 1024 * 1024
+
+# Columnas que no se copian (el destino les asigna valor)
+SKIP_COLUMNS = {'sync_tombstones': {'id'}}
+
+# Filas que pueden referenciar varios usuarios (users como copia de referencia y
+# versiones de preguntas sin pregunta): si el destino ya las tiene se conservan y
+# solo se borran cuando nada las referencia
+SHARED_TABLES = {'users', 'question_versions'}
+
+
+class ShardUnavailableError(Exception):
+    """El usuario se está moviendo de fragmento: reintentar pasados `retry_after` segundos"""
+
+    def __init__(self, user_id, shard, retry_after):
+        super().__init__(f"El usuario {user_id} se está moviendo desde el fragmento '{shard}'")
+        self.user_id = user_id
+        self.shard = shard
+        self.retry_after = retry_after
+
+
+class ShardMap:
+    """Directorio cacheado y conexiones de los fragmentos distintos de 'default'"""
+
+    def __init__(self, directory_url, shard_urls, cache_seconds=5, min_size=1, max_size=0):
+        self.directory_url = directory_url
+        # Mismo manejo de conexiones que las réplicas: pool perezoso o conexiones sueltas
+        self.shards = {name: Replica(url, min_size, max_size)
+                       for name, url in shard_urls.items() if name != DEFAULT_SHARD}
+        self.cache_seconds = cache_seconds
+        self.pid = os.getpid()
+        self._cache = {}
+        self._cache_lock = threading.Lock()
+        self._local = threading.local()
+
+    def _connection(self):
+        """Conexión propia por hilo en autocommit: la consulta no entra en la transacción de la petición"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or conn.closed or self._local.pid != os.getpid():
+            conn = psycopg2.connect(self.directory_url)
+            conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def lookup(self, user_id, cached=True):
+        """(fragmento, estado) del usuario; las entradas congeladas nunca se cachean"""
+        now = time.monotonic()
+        if cached:
+            with self._cache_lock:
+                entry = self._cache.get(user_id)
+            if entry is not None and entry[0] > now:
+                return entry[1]
+
+        conn = self._connection()
+        try:
+            row = UserShardModel.get(conn, user_id)
+        except psycopg2.Error:
+            conn.close()
+            raise
+        shard, status = row or (DEFAULT_SHARD, 'active')
+
+        with self._cache_lock:
+            if status == 'active':
+                if len(self._cache) >= 100000:
+                    self._cache.clear()
+                self._cache[user_id] = (now + self.cache_seconds, (shard, status))
+            else:
+                self._cache.pop(user_id, None)
+        return shard, status
+
+    def shard(self, name):
+        """Conexiones del fragmento (Replica); falla si el directorio apunta a uno no configurado"""
+        try:
+            return self.shards[name]
+        except KeyError:
+            raise LookupError(f"El fragmento '{name}' no está en DATABASE_SHARDS") from None
+
+    def close(self):
+        for shard in self.shards.values():
+            shard.close()
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and not conn.closed and self._local.pid == os.getpid():
+            conn.close()
+
+
+def tenant_apiaries(conn, user_id):
+    """Ids de los apiarios del usuario en esa conexión"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute('SELECT id FROM apiaries WHERE user_id = %s ORDER BY id', (user_id,))
+        return [row[0] for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
+def lock_tenant_rows(conn, user_id):
+    """
+    FOR UPDATE sobre el usuario, sus apiarios, colmenas y preguntas, sin confirmar:
+    hasta que la transacción termine, cualquier escritura que no tome el lock de
+    usuario y añada filas colgando de ellas o las modifique espera (ver shard_manager.py move)
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute('SELECT 1 FROM users WHERE id = %s FOR UPDATE', (user_id,))
+        cursor.execute('SELECT 1 FROM apiaries WHERE user_id = %s FOR UPDATE', (user_id,))
+        for table in ('hives', 'questions'):
+            cursor.execute(f'SELECT 1 FROM {table} WHERE apiary_id IN '
+                           f'(SELECT id FROM apiaries WHERE user_id = %s) FOR UPDATE OF {table}', (user_id,))
+    finally:
+        cursor.close()
+
+
+def _copy_columns(conn, table):
+    cursor = conn.cursor()
+    try:
+        cursor.execute('''
+            SELECT column_name FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = %s AND is_generated = 'NEVER'
+            ORDER BY ordinal_position
+        ''', (table,))
+        skip = SKIP_COLUMNS.get(table, set())
+        return [row[0] for row in cursor.fetchall() if row[0] not in skip]
+    finally:
+        cursor.close()
+
+
+def _copy_table(source, target, table, condition, params):
+    """COPY del origen al destino (tipos exactos, jsonb incluido) a través de un búfer que se vuelca a disco si crece"""
+    column_list = ', '.join(_copy_columns(source, table))
+    reader, writer = source.cursor(), target.cursor()
+    try:
+        query = reader.mogrify(f'SELECT {column_list} FROM {table} WHERE {condition}', params).decode()
+        with tempfile.SpooledTemporaryFile(max_size=COPY_BUFFER_BYTES) as buffer:
+            reader.copy_expert(f'COPY ({query}) TO STDOUT', buffer)
+            buffer.seek(0)
+            if table not in SHARED_TABLES:
+                writer.copy_expert(f'COPY {table} ({column_list}) FROM STDIN', buffer)
+                return writer.rowcount
+            writer.execute(f'CREATE TEMP TABLE copy_{table} (LIKE {table}) ON COMMIT DROP')
+            writer.copy_expert(f'COPY copy_{table} ({column_list}) FROM STDIN', buffer)
+            writer.execute(f'INSERT INTO {table} ({column_list}) SELECT {column_list} FROM copy_{table} '
+                           f'ON CONFLICT (id) DO NOTHING')
+            copied = writer.rowcount
+            writer.execute(f'DROP TABLE copy_{table}')
+            return copied
+    finally:
+        reader.close()
+        writer.close()
+
+
+def copy_tenant(source, target, user_id):
+    """
+    Copia los datos del usuario de `source` a `target` conservando los ids, sin
+    confirmar. `target` no debe tener ya esos datos (ver delete_tenant): una colisión
+    de ids aborta la copia. Retorna las filas copiadas por tabla.
+    """
+    params = {'user_id': user_id, 'apiaries': tenant_apiaries(source, user_id)}
+    return {table: _copy_table(source, target, table, condition, params) for table, condition in TENANT_TABLES}
+
+
+def delete_tenant(conn, user_id):
+    """
+    Borra los datos del usuario en esa conexión, sin confirmar (las filas de users se
+    conservan). Los borrados en cascada dejan lápidas de sincronización que también
+    se eliminan: el usuario no borró nada, sus datos viven en otro fragmento.
+    """
+    apiaries = tenant_apiaries(conn, user_id)
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f'SELECT id FROM question_versions WHERE {_VERSIONS}', {'apiaries': apiaries})
+        versions = [row[0] for row in cursor.fetchall()]
+        cursor.execute('DELETE FROM apiaries WHERE user_id = %s', (user_id,))
+        deleted = cursor.rowcount
+        cursor.execute('''
+            DELETE FROM question_versions v
+            WHERE v.id = ANY(%s)
+              AND NOT EXISTS (SELECT 1 FROM respuestas_monitoreo r WHERE r.question_version_id = v.id)
+              AND NOT EXISTS (SELECT 1 FROM questions q WHERE q.id = v.question_id)
+        ''', (versions,))
+        cursor.execute('DELETE FROM sync_tombstones WHERE user_id = %s OR apiary_id = ANY(%s)',
+                       (user_id, apiaries))
+        return deleted
+    finally:
+        cursor.close()
+
+
+def tenant_counts(conn, user_id):
+    """Filas del usuario por tabla, para comparar origen y destino"""
+    params = {'user_id': user_id, 'apiaries': tenant_apiaries(conn, user_id)}
+    cursor = conn.cursor()
+    try:
+        counts = {}
+        for table, condition in TENANT_TABLES + DERIVED_TABLES:
+            cursor.execute(f'SELECT COUNT(*) FROM {table} WHERE {condition}', params)
+            counts[table] = cursor.fetchone()[0]
+        return counts
+    finally:
+        cursor.close()
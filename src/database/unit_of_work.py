@@ -0,0 +1,266 @@
+"""
+Unidad de trabajo ligada a la conexión de la petición.
+
+Los modelos siguen llamando a db.commit() / db.rollback() tras cada sentencia, pero
+mientras la conexión tiene una unidad de trabajo abierta esas llamadas no
+confirman: todas las escrituras se agrupan y se confirman una sola vez al cerrar
+la unidad más externa (get_db abre una por petición y close_db la cierra en el
+teardown). Las unidades anidadas usan SAVEPOINT, de modo que un error dentro de
+ellas se puede capturar sin perder el resto de la transacción.
+
+Cada llamada de un modelo (desde su primera sentencia hasta su commit() o
+rollback()) corre además en su propio SAVEPOINT: rollback() descarta solo lo que
+hizo esa llamada, igual en la unidad externa que en las anidadas, y lo que la
+petición escriba después se conserva, como cuando cada modelo confirmaba por su
+cuenta. El SAVEPOINT (y la liberación del anterior) viaja delante de la propia
+sentencia, sin idas y vueltas adicionales al servidor.
+
+Uso explícito para operaciones de varios pasos:
+
+    with unit_of_work(db):
+        QuestionModel.reorder(db, apiary_id, order)
+        QuestionModel.update(db, question_id, is_active=False)
+"""
+
+from contextlib import contextmanager
+
+import psycopg2
+import psycopg2.extensions
+import psycopg2.sql
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_INERROR
+
+# Estado del SAVEPOINT de la llamada en curso de cada nivel
+STATEMENT_OPEN = 'open'
+# La llamada terminó bien: el SAVEPOINT se libera junto con la siguiente sentencia
+STATEMENT_DONE = 'done'
+
+_statement_cursors = {}
+
+
+def _statement_cursor(factory):
+    """Subclase de `factory` cuyas sentencias abren el SAVEPOINT de la llamada del modelo"""
+    cursor_class = _statement_cursors.get(factory)
+    if cursor_class is not None:
+        return cursor_class
+
+    class StatementCursor(factory):
+        def execute(self, query, vars=None):
+            try:
+                if self.name is None and not isinstance(query, psycopg2.sql.Composable):
+                    if self.connection._statement_pending():
+                        # mogrify primero: si los parámetros fallan no se envía nada
+                        query = self.mogrify(query, vars)
+                        return super().execute(self.connection._open_statement(inline=True) + query)
+                else:
+                    self.connection._open_statement()
+                return super().execute(query, vars)
+            except psycopg2.Error as e:
+                self.connection.unit_error = e
+                raise
+
+        def executemany(self, query, vars_list):
+            self.connection._open_statement()
+            try:
+                return super().executemany(query, vars_list)
+            except psycopg2.Error as e:
+                self.connection.unit_error = e
+                raise
+
+        def callproc(self, procname, parameters=None):
+            self.connection._open_statement()
+            return super().callproc(procname, parameters)
+
+        def copy_expert(self, sql, file, size=8192):
+            self.connection._open_statement()
+            return super().copy_expert(sql, file, size)
+
+        def copy_from(self, *args, **kwargs):
+            self.connection._open_statement()
+            return super().copy_from(*args, **kwargs)
+
+        def copy_to(self, *args, **kwargs):
+            self.connection._open_statement()
+            return super().copy_to(*args, **kwargs)
+
+    cursor_class = _statement_cursors.setdefault(factory, StatementCursor)
+    return cursor_class
+
+
+class UnitOfWorkConnection(psycopg2.extensions.connection):
+    """Conexión psycopg2 cuyo commit()/rollback() respetan la unidad de trabajo abierta"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Un nivel por unidad abierta: {'savepoint': nombre o None, 'failed': bool,
+        # 'statement': None, STATEMENT_OPEN o STATEMENT_DONE}
+        self._uow_levels = []
+        # Último error de una sentencia que ningún rollback() descartó: la causa si la unidad no se confirma
+        self.unit_error = None
+
+    @property
+    def in_unit_of_work(self):
+        return bool(self._uow_levels)
+
+    @property
+    def unit_depth(self):
+        return len(self._uow_levels)
+
+    def cursor(self, *args, **kwargs):
+        factory = kwargs.pop('cursor_factory', None) or self.cursor_factory or psycopg2.extensions.cursor
+        return super().cursor(*args, cursor_factory=_statement_cursor(factory), **kwargs)
+
+    def unit_cursor(self, *args, **kwargs):
+        """
+        Cursor para sentencias de la petición (ajustes locales, advisory locks) que
+        deben durar hasta el final de la unidad: no entran en el SAVEPOINT de ningún
+        modelo, así que un rollback() posterior no las deshace
+        """
+        if self._uow_levels and self._uow_levels[-1]['statement'] == STATEMENT_OPEN:
+            self._uow_levels[-1]['statement'] = STATEMENT_DONE
+        return super().cursor(*args, **kwargs)
+
+    def commit(self):
+        if self._uow_levels:
+            # Lo confirma la unidad más externa al cerrarse; la llamada del modelo terminó
+            level = self._uow_levels[-1]
+            if level['statement'] == STATEMENT_OPEN:
+                if self.info.transaction_status == TRANSACTION_STATUS_INERROR:
+                    # Igual que un COMMIT de una transacción abortada: se revierte
+                    self._rollback_statement(level)
+                else:
+                    level['statement'] = STATEMENT_DONE
+            return
+        super().commit()
+
+    def rollback(self):
+        if not self._uow_levels:
+            super().rollback()
+            return
+        # Un modelo falló: se descarta solo lo que hizo esa llamada
+        level = self._uow_levels[-1]
+        if level['statement'] == STATEMENT_OPEN:
+            self._rollback_statement(level)
+        elif self.info.transaction_status == TRANSACTION_STATUS_INERROR:
+            # Falló una sentencia fuera de cualquier llamada: se pierde la unidad
+            self._discard(level)
+            level['failed'] = True
+
+    def _execute(self, sql):
+        cursor = super().cursor()
+        try:
+            cursor.execute(sql)
+        finally:
+            cursor.close()
+
+    def _statement_pending(self):
+        return bool(self._uow_levels) and self._uow_levels[-1]['statement'] != STATEMENT_OPEN
+
+    def _statement_savepoint(self):
+        return f'uow_stmt_{len(self._uow_levels) - 1}'
+
+    def _open_statement(self, inline=False):
+        """
+        Abre el SAVEPOINT de la llamada del modelo si no hay uno abierto. Con inline
+        retorna el SQL para enviarlo delante de la sentencia; si no, lo ejecuta
+        """
+        if not self._statement_pending():
+            return b'' if inline else ''
+        level = self._uow_levels[-1]
+        savepoint = self._statement_savepoint()
+        sql = f'SAVEPOINT {savepoint}; '
+        if level['statement'] == STATEMENT_DONE:
+            sql = f'RELEASE SAVEPOINT {savepoint}; ' + sql
+        if inline:
+            level['statement'] = STATEMENT_OPEN
+            return sql.encode()
+        self._execute(sql)
+        level['statement'] = STATEMENT_OPEN
+        return ''
+
+    def _rollback_statement(self, level):
+        try:
+            self._execute(f'ROLLBACK TO SAVEPOINT {self._statement_savepoint()}')
+            level['statement'] = STATEMENT_DONE
+            self.unit_error = None
+        except psycopg2.Error:
+            # No se pudo volver al savepoint: se pierde toda la transacción
+            super().rollback()
+            for outer in self._uow_levels:
+                outer['failed'] = True
+                outer['statement'] = None
+
+    def _discard(self, level):
+        level['statement'] = None
+        if level['savepoint'] is None:
+            super().rollback()
+            return
+        try:
+            self._execute(f"ROLLBACK TO SAVEPOINT {level['savepoint']}")
+        except psycopg2.Error:
+            # No se pudo volver al savepoint: se pierde toda la transacción
+            super().rollback()
+            for outer in self._uow_levels:
+                outer['failed'] = True
+                outer['statement'] = None
+
+    def begin_unit(self):
+        depth = len(self._uow_levels)
+        savepoint = f'uow_{depth}' if depth else None
+        if not depth:
+            self.unit_error = None
+        if savepoint:
+            # Lo que la unidad exterior ya ejecutó queda fuera de la nueva
+            self.unit_cursor().close()
+            self._execute(f'SAVEPOINT {savepoint}')
+        self._uow_levels.append({'savepoint': savepoint, 'failed': False, 'statement': None})
+
+    def end_unit(self, success=True):
+        """Cierra la unidad actual: confirma (o libera el savepoint) o revierte. Retorna si se confirmó"""
+        level = self._uow_levels[-1]
+        if self.closed:
+            self._uow_levels.pop()
+            return False
+
+        # Una sentencia falló y nadie llamó a rollback(): la transacción está abortada
+        failed = (level['failed'] or not success
+                  or self.info.transaction_status == TRANSACTION_STATUS_INERROR)
+        if level['savepoint'] is None:
+            self._uow_levels.pop()
+            if failed:
+                super().rollback()
+            else:
+                super().commit()
+        else:
+            if failed and not level['failed'] and self.info.transaction_status != TRANSACTION_STATUS_IDLE:
+                self._discard(level)
+            self._uow_levels.pop()
+            # RELEASE también libera el SAVEPOINT de la última llamada de la unidad
+            if self.info.transaction_status != TRANSACTION_STATUS_IDLE and (
+                    not self._uow_levels or not self._uow_levels[-1]['failed']):
+                self._execute(f"RELEASE SAVEPOINT {level['savepoint']}")
+        return not failed
+
+
+@contextmanager
+def unit_of_work(db):
+    """
+    Agrupa las escrituras del bloque en una transacción (o en un SAVEPOINT si ya
+    hay una abierta). Con conexiones psycopg2 normales (scripts) se comporta
+    como una transacción simple y los modelos siguen confirmando por su cuenta.
+    """
+    if not isinstance(db, UnitOfWorkConnection):
+        try:
+            yield db
+            db.commit()
+        except BaseException:
+            db.rollback()
+            raise
+        return
+
+    db.begin_unit()
+    try:
+        yield db
+    except BaseException:
+        db.end_unit(success=False)
+        raise
+    db.end_unit(success=True)
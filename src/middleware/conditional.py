@@ -0,0 +1,96 @@
+"""
+Respuestas condicionales (ETag / Last-Modified) para endpoints de lectura.
+
+Cada endpoint declara una función "validadora" que obtiene la versión del recurso
+con una consulta agregada barata (MAX(updated_at) y conteo de filas), sin construir
+el cuerpo de la respuesta. Si la copia del cliente sigue vigente se responde
+304 Not Modified y la vista nunca se ejecuta.
+"""
+
+import hashlib
+from datetime import timezone
+from functools import wraps
+
+from flask import request, current_app, g, make_response
+
+
+def build_etag(scope, version):
+    """Genera un ETag débil a partir del alcance de la petición y la versión del recurso"""
+    parts = [scope]
+    for key in sorted(version):
+        value = version[key]
+        parts.append(f"{key}={value.isoformat() if hasattr(value, 'isoformat') else value}")
+    return hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()
+
+
+def _request_scope():
+    """Identifica la representación: ruta, argumentos y usuario autenticado"""
+    args = '&'.join(f"{k}={v}" for k, v in sorted(request.args.items(multi=True)))
+    user_id = getattr(g, 'current_user_id', '')
+    return f"{request.path}?{args}#{user_id}"
+
+
+def _as_utc(value):
+    """Convierte timestamps sin zona horaria (columnas TIMESTAMP) a UTC"""
+    if value is None or not hasattr(value, 'tzinfo'):
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _is_not_modified(etag, last_modified):
+    """Evalúa If-None-Match y, solo si no viene, If-Modified-Since (RFC 9110)"""
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if last_modified is not None and request.if_modified_since is not None:
+        return last_modified.replace(microsecond=0) <= request.if_modified_since
+    return False
+
+
+def _set_validators(response, etag, last_modified):
+    response.set_etag(etag, weak=True)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    # Respuestas privadas: el cliente puede guardarlas pero debe revalidar siempre
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def conditional_get(validator):
+    """
+    Decorador para GET condicionales.
+
+    `validator` recibe los mismos argumentos que la vista y retorna un diccionario
+    con la versión del recurso (por ejemplo {'last_modified': ..., 'total': ...})
+    o None si no puede determinarse (la vista se ejecuta normalmente, p.ej. 404).
+    Debe aplicarse después de @jwt_required para que el usuario forme parte del ETag.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return f(*args, **kwargs)
+
+            try:
+                version = validator(*args, **kwargs)
+            except Exception as e:
+                current_app.logger.warning(f"No se pudo calcular la versión del recurso: {str(e)}")
+                version = None
+
+            if not version:
+                return f(*args, **kwargs)
+
+            etag = build_etag(_request_scope(), version)
+            last_modified = _as_utc(version.get('last_modified'))
+
+            if _is_not_modified(etag, last_modified):
+                return _set_validators(make_response('', 304), etag, last_modified)
+
+            response = make_response(f(*args, **kwargs))
+            if response.status_code == 200:
+                _set_validators(response, etag, last_modified)
+            return response
+
+        return decorated_function
+    return decorator
@@ -0,0 +1,234 @@
+"""
+Plazos por petición (deadlines).
+
+Cada petición dispone de REQUEST_DEADLINE_MS desde que llega; las vistas con
+@deadline('<alcance>') usan el presupuesto de config.REQUEST_DEADLINES. El plazo es
+cooperativo:
+
+- get_db propaga lo que queda del plazo a PostgreSQL como statement_timeout local
+  a la transacción de la petición, y falla con DeadlineExceeded si ya venció.
+- Un hilo vigía por proceso cancela en el servidor (conn.cancel()) la consulta en
+  curso de las peticiones vencidas y, con REQUEST_CANCEL_ON_DISCONNECT, la de las
+  peticiones cuyo cliente cerró la conexión.
+- La vista recibe la cancelación como cualquier error de base de datos. Al
+  responder, un 5xx con el plazo vencido se convierte en 504 (deadline_exceeded)
+  y uno tras la desconexión del cliente en 503 (client_disconnected).
+
+Así una consulta desbocada no retiene un hilo ni una conexión del pool más allá
+de su presupuesto.
+"""
+
+import os
+import socket
+import threading
+import time
+from functools import wraps
+
+from flask import request, current_app, g, jsonify
+from psycopg2.extensions import TRANSACTION_STATUS_ACTIVE, TRANSACTION_STATUS_IDLE
+
+# Variables del entorno WSGI con el socket del cliente (gunicorn y el servidor de desarrollo)
+CLIENT_SOCKET_KEYS = ('gunicorn.socket', 'werkzeug.socket')
+
+
+class DeadlineExceeded(Exception):
+    """El plazo de la petición venció antes de terminar"""
+
+
+class RequestDeadline:
+    """Plazo de una petición y las conexiones que usa"""
+
+    def __init__(self, budget_ms, client_socket=None):
+        self.started = time.monotonic()
+        self.budget_ms = budget_ms
+        self.client_socket = client_socket
+        self.connections = []
+        self.applied = {}
+        self.disconnected = False
+
+    @property
+    def expires(self):
+        return self.started + self.budget_ms / 1000.0
+
+    def remaining_ms(self, now=None):
+        return int((self.expires - (now or time.monotonic())) * 1000)
+
+    def expired(self, now=None):
+        return self.remaining_ms(now) <= 0
+
+    def cancel_active(self):
+        """Cancela en el servidor las consultas en curso de la petición"""
+        for conn in self.connections:
+            if not conn.closed and conn.info.transaction_status == TRANSACTION_STATUS_ACTIVE:
+                conn.cancel()
+
+
+def _client_gone(client_socket):
+    """True si el cliente cerró la conexión (lectura sin consumir ni bloquear)"""
+    try:
+        return client_socket.recv(1, socket.MSG_PEEK | socket.MSG_DONTWAIT) == b''
+    except (BlockingIOError, InterruptedError, ValueError, AttributeError):
+        # Sin datos pendientes, o socket que no admite MSG_PEEK (TLS): se da por vivo
+        return False
+    except OSError:
+        return True
+
+
+class DeadlineWatchdog:
+    """Hilo que vigila las peticiones en curso del proceso"""
+
+    def __init__(self, interval, cancel_on_disconnect=True, logger=None):
+        self.interval = interval
+        self.cancel_on_disconnect = cancel_on_disconnect
+        self.logger = logger
+        self.pid = os.getpid()
+        # El mismo lock protege el registro y las cancelaciones: una conexión nunca se
+        # cancela después de que su petición terminó (y volvió al pool)
+        self._lock = threading.Lock()
+        self._requests = set()
+        self._thread = threading.Thread(target=self._run, name='deadline-watchdog', daemon=True)
+        self._thread.start()
+
+    def register(self, state):
+        with self._lock:
+            self._requests.add(state)
+
+    def unregister(self, state):
+        with self._lock:
+            self._requests.discard(state)
+
+    def watch(self, state, conn):
+        with self._lock:
+            if conn not in state.connections:
+                state.connections.append(conn)
+
+    def check(self):
+        now = time.monotonic()
+        with self._lock:
+            for state in self._requests:
+                if not state.disconnected and self.cancel_on_disconnect and state.client_socket is not None:
+                    state.disconnected = _client_gone(state.client_socket)
+                if state.disconnected or state.expired(now):
+                    try:
+                        state.cancel_active()
+                    except Exception as e:
+                        if self.logger:
+                            self.logger.warning(f"No se pudo cancelar la consulta de la petición: {str(e)}")
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.check()
+            except Exception as e:
+                if self.logger:
+                    self.logger.error(f"Vigía de plazos: {str(e)}")
+
+
+_watchdog = None
+_watchdog_lock = threading.Lock()
+
+
+def get_watchdog(app):
+    """Vigía del proceso actual (tras un fork cada worker crea el suyo)"""
+    global _watchdog
+    with _watchdog_lock:
+        if _watchdog is None or _watchdog.pid != os.getpid():
+            _watchdog = DeadlineWatchdog(app.config.get('REQUEST_DEADLINE_CHECK_MS', 250) / 1000.0,
+                                         app.config.get('REQUEST_CANCEL_ON_DISCONNECT', True), app.logger)
+    return _watchdog
+
+
+def _start_deadline():
+    """before_request: abre el plazo por defecto de la petición"""
+    budget = current_app.config.get('REQUEST_DEADLINE_MS', 0)
+    if not budget:
+        return
+    client_socket = next((request.environ[key] for key in CLIENT_SOCKET_KEYS if key in request.environ), None)
+    g.deadline = RequestDeadline(budget, client_socket)
+    get_watchdog(current_app).register(g.deadline)
+
+
+def _finish_deadline(e=None):
+    """teardown_request: deja de vigilar la petición antes de devolver sus conexiones al pool"""
+    state = g.pop('deadline', None)
+    if state is not None:
+        get_watchdog(current_app).unregister(state)
+
+
+def _error_response(status, error, code, **extra):
+    response = jsonify({'error': error, 'code': code, **extra})
+    response.status_code = status
+    return response
+
+
+def _deadline_response(response):
+    """after_request (corre después del commit de la petición): 5xx por plazo vencido o cliente desconectado"""
+    state = g.get('deadline')
+    if state is None or response.status_code < 500:
+        return response
+    if state.disconnected:
+        current_app.logger.warning(f"Cliente desconectado, consulta cancelada: {request.method} {request.path}")
+        return _error_response(503, 'Client disconnected', 'client_disconnected')
+    if state.expired():
+        current_app.logger.warning(
+            f"Plazo de {state.budget_ms} ms vencido: {request.method} {request.path}")
+        response = _error_response(504, 'Request deadline exceeded', 'deadline_exceeded',
+                                   deadline_ms=state.budget_ms)
+    return response
+
+
+def _deadline_exceeded(e):
+    return _error_response(504, 'Request deadline exceeded', 'deadline_exceeded',
+                           deadline_ms=g.deadline.budget_ms if g.get('deadline') else None)
+
+
+def init_deadlines(app):
+    """
+    Registra los plazos por petición. Debe llamarse antes de init_app de la base de
+    datos: los after_request corren en orden inverso y la respuesta 504 debe decidirse
+    después del commit de la petición
+    """
+    app.before_request(_start_deadline)
+    app.after_request(_deadline_response)
+    app.teardown_request(_finish_deadline)
+    app.register_error_handler(DeadlineExceeded, _deadline_exceeded)
+
+
+def apply_deadline(conn):
+    """
+    Propaga el plazo restante a la transacción de la petición (statement_timeout
+    local) y deja la conexión bajo el vigía. Dentro de la misma transacción solo se
+    repite si el plazo restante bajó más de un segundo
+    """
+    state = g.get('deadline')
+    if state is None:
+        return
+    remaining = state.remaining_ms()
+    if remaining <= 0:
+        raise DeadlineExceeded(f"Plazo de {state.budget_ms} ms vencido")
+
+    get_watchdog(current_app).watch(state, conn)
+    last = state.applied.get(id(conn))
+    if last is not None and last - remaining < 1000 and conn.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+        return
+    cursor = conn.unit_cursor()
+    try:
+        cursor.execute("SELECT set_config('statement_timeout', %s, true)", (f'{remaining}ms',))
+    finally:
+        cursor.close()
+    state.applied[id(conn)] = remaining
+
+
+def deadline(scope):
+    """Decorador: usa el presupuesto de config.REQUEST_DEADLINES[scope]. Va justo debajo de @route"""
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            state = g.get('deadline')
+            budget = current_app.config.get('REQUEST_DEADLINES', {}).get(scope)
+            if state is not None and budget:
+                state.budget_ms = budget
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
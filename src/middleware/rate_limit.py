@@ -0,0 +1,200 @@
+"""
+Límite de peticiones con cubetas de tokens (token bucket).
+
+Cada regla de config.RATE_LIMITS asigna a un alcance ('login', 'forgot_password',
+'test') hasta tres cubetas con el formato "capacidad/segundos" (ráfaga de
+`capacidad` peticiones que se recarga por completo en `segundos`):
+
+- ip: por dirección del cliente.
+- identifier: por usuario o email enviado en el cuerpo JSON (frena ataques de
+  fuerza bruta contra una cuenta desde muchas IPs).
+- route: total de la ruta, acota el CPU que puede consumir bcrypt.
+
+La comprobación ocurre antes de la vista, así que una petición rechazada no abre
+conexión a la base de datos ni verifica contraseñas. Las cubetas viven en memoria
+del proceso (repartidas en fragmentos con su propio lock para no serializar los
+hilos) o, con RATE_LIMIT_STORAGE=postgresql, en la tabla rate_limit_buckets
+compartida por todos los workers. Si el almacén compartido falla se deja pasar
+la petición: el límite nunca debe tumbar el login.
+"""
+
+import hashlib
+import os
+import random
+import threading
+import time
+from functools import wraps
+
+import psycopg2
+import psycopg2.extensions
+from flask import request, current_app, jsonify
+
+
+def parse_limit(value):
+    """'10/60' -> (capacidad 10, recarga de 10/60 tokens por segundo); None o '' desactiva la cubeta"""
+    if not value:
+        return None
+    capacity, _, seconds = str(value).partition('/')
+    capacity, seconds = float(capacity), float(seconds or 1)
+    if capacity <= 0 or seconds <= 0:
+        return None
+    return capacity, capacity / seconds
+
+
+class MemoryRateLimitStore:
+    """Cubetas en memoria del proceso, repartidas en fragmentos con su propio lock"""
+
+    def __init__(self, shards=16, max_keys=100000):
+        self.shards = [({}, threading.Lock()) for _ in range(max(1, shards))]
+        self.max_keys_per_shard = max(1, max_keys // len(self.shards))
+
+    def consume(self, key, capacity, rate, cost=1):
+        buckets, lock = self.shards[hash(key) % len(self.shards)]
+        now = time.monotonic()
+        with lock:
+            tokens, updated = buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            buckets[key] = (tokens, now)
+            if len(buckets) > self.max_keys_per_shard:
+                self._evict(buckets, now)
+        return allowed, tokens
+
+    @staticmethod
+    def _evict(buckets, now):
+        """Descarta la mitad más antigua del fragmento (las cubetas sin uso reciente ya se recargaron)"""
+        oldest = sorted(buckets, key=lambda k: buckets[k][1])[:len(buckets) // 2]
+        for key in oldest:
+            del buckets[key]
+
+    def reset(self):
+        for buckets, lock in self.shards:
+            with lock:
+                buckets.clear()
+
+
+class PostgresRateLimitStore:
+    """Cubetas en la tabla rate_limit_buckets, compartidas por todos los workers"""
+
+    # Probabilidad por consulta de purgar cubetas viejas (evita un proceso aparte)
+    PURGE_PROBABILITY = 0.001
+    PURGE_IDLE_SECONDS = 86400
+
+    def __init__(self, database_url):
+        self.database_url = database_url
+        self._local = threading.local()
+
+    def _connection(self):
+        """Conexión propia por hilo en autocommit: la cubeta no espera al commit de la petición"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or conn.closed or self._local.pid != os.getpid():
+            conn = psycopg2.connect(self.database_url)
+            conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def consume(self, key, capacity, rate, cost=1):
+        from src.models.rate_limit import RateLimitModel
+        conn = self._connection()
+        try:
+            result = RateLimitModel.consume(conn, key, capacity, rate, cost)
+            if random.random() < self.PURGE_PROBABILITY:
+                RateLimitModel.purge(conn, self.PURGE_IDLE_SECONDS)
+            return result
+        except psycopg2.Error:
+            conn.close()
+            raise
+
+    def reset(self):
+        from src.models.rate_limit import RateLimitModel
+        RateLimitModel.purge(self._connection(), 0)
+
+
+def init_rate_limiter(app):
+    """Crea el almacén de cubetas según RATE_LIMIT_STORAGE y lo deja en app.rate_limit_store"""
+    if app.config.get('RATE_LIMIT_STORAGE', 'memory') == 'postgresql':
+        from src.database.db import resolve_database_url
+        store = PostgresRateLimitStore(resolve_database_url(app.config.get('DATABASE_URL')))
+    else:
+        store = MemoryRateLimitStore(app.config.get('RATE_LIMIT_SHARDS', 16),
+                                     app.config.get('RATE_LIMIT_MAX_KEYS', 100000))
+    app.rate_limit_store = store
+    return store
+
+
+def client_ip():
+    """IP del cliente; con RATE_LIMIT_TRUSTED_PROXIES=N se toma la N-ésima desde el final de X-Forwarded-For"""
+    trusted = current_app.config.get('RATE_LIMIT_TRUSTED_PROXIES', 0)
+    if trusted:
+        forwarded = [ip.strip() for ip in request.headers.get('X-Forwarded-For', '').split(',') if ip.strip()]
+        if len(forwarded) >= trusted:
+            return forwarded[-trusted]
+    return request.remote_addr or 'unknown'
+
+
+def _request_identifier(fields):
+    """Primer campo no vacío del cuerpo JSON, normalizado y resumido (no se guardan emails en claro)"""
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return None
+    for field in fields:
+        value = data.get(field)
+        if isinstance(value, str) and value.strip():
+            return hashlib.sha1(value.strip().lower().encode('utf-8')).hexdigest()
+    return None
+
+
+def check_rate_limit(scope, identifier_fields=('username', 'email')):
+    """
+    Consume un token de cada cubeta del alcance. Retorna None si la petición puede
+    seguir o la respuesta 429 (con Retry-After) si alguna cubeta está vacía.
+    """
+    if not current_app.config.get('RATE_LIMIT_ENABLED', True):
+        return None
+    rules = current_app.config.get('RATE_LIMITS', {}).get(scope)
+    if not rules:
+        return None
+
+    keys = {'ip': client_ip(), 'route': ''}
+    if rules.get('identifier'):
+        keys['identifier'] = _request_identifier(identifier_fields)
+
+    store = current_app.rate_limit_store
+    for bucket in ('ip', 'identifier', 'route'):
+        limit = parse_limit(rules.get(bucket))
+        if limit is None or keys.get(bucket) is None:
+            continue
+        capacity, rate = limit
+        try:
+            allowed, tokens = store.consume(f'{scope}:{bucket}:{keys[bucket]}', capacity, rate)
+        except Exception as e:
+            current_app.logger.warning(f"Límite de peticiones no disponible ({scope}/{bucket}): {str(e)}")
+            return None
+        if not allowed:
+            retry_after = max(1, int((1 - tokens) / rate + 0.999))
+            current_app.logger.warning(
+                f"Límite de peticiones excedido: {scope}/{bucket} desde {keys['ip']} ({request.path})")
+            response = jsonify({
+                'error': 'Too many requests',
+                'code': 'rate_limited',
+                'retry_after': retry_after
+            })
+            response.status_code = 429
+            response.headers['Retry-After'] = str(retry_after)
+            return response
+    return None
+
+
+def rate_limit(scope, identifier_fields=('username', 'email')):
+    """Decorador: aplica las cubetas de config.RATE_LIMITS[scope] antes de ejecutar la vista"""
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            rejected = check_rate_limit(scope, identifier_fields)
+            if rejected is not None:
+                return rejected
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
@@ -0,0 +1,95 @@
+"""
+Enrutado de lecturas a réplicas (ver src/database/replicas.py).
+
+@read_replica marca las vistas de solo lectura que pueden servirse desde una réplica;
+las que escriben aunque sean GET (p.ej. cálculos que guardan caché) no deben usarlo.
+Debe ir justo debajo de @route, antes de @jwt_required y @conditional_get, para que
+el validador de conditional_get también lea de la réplica.
+
+Lectura de las propias escrituras: tras una petición que escribe, el primario
+informa su posición del WAL (cabecera X-DB-LSN y cookie db_lsn durante
+REPLICA_STICKY_SECONDS). Mientras esa posición esté vigente, una réplica solo se usa
+si ya la alcanzó. El proceso recuerda además la última escritura de cada usuario
+autenticado, para clientes que no guardan cookies ni reenvían la cabecera.
+"""
+
+import threading
+import time
+from functools import wraps
+
+import psycopg2
+from flask import request, current_app, g
+
+LSN_HEADER = 'X-DB-LSN'
+LSN_COOKIE = 'db_lsn'
+
+# usuario -> (vence, lsn) de su última escritura en este proceso
+_recent_writes = {}
+_recent_writes_lock = threading.Lock()
+_RECENT_WRITES_MAX = 10000
+
+
+def read_replica(f):
+    """Permite que la vista lea de una réplica en GET/HEAD"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        g.db_read_replica = True
+        return f(*args, **kwargs)
+    return decorated_function
+
+
+def _lsn_value(lsn):
+    """'16/B374D848' -> entero comparable (None si no es una posición válida)"""
+    try:
+        high, low = lsn.strip().split('/')
+        return (int(high, 16) << 32) + int(low, 16)
+    except (AttributeError, ValueError):
+        return None
+
+
+def required_lsn():
+    """Posición del WAL que la réplica debe haber alcanzado para esta petición (o None)"""
+    candidates = [request.headers.get(LSN_HEADER), request.cookies.get(LSN_COOKIE)]
+    user_id = g.get('current_user_id')
+    if user_id is not None:
+        with _recent_writes_lock:
+            entry = _recent_writes.get(user_id)
+        if entry and entry[0] > time.monotonic():
+            candidates.append(entry[1])
+    valid = [lsn for lsn in candidates if _lsn_value(lsn) is not None]
+    return max(valid, key=_lsn_value).strip() if valid else None
+
+
+def remember_write_lsn(response):
+    """
+    after_request (registrado antes del commit de la petición, así corre después):
+    entrega la posición del WAL del primario tras una escritura confirmada
+    """
+    if (not current_app.config.get('DATABASE_REPLICA_URLS') or request.method in ('GET', 'HEAD', 'OPTIONS')
+            or response.status_code >= 400 or g.get('db') is None or g.get('db_replica') is not None):
+        return response
+
+    try:
+        cursor = g.db.cursor()
+        cursor.execute('SELECT pg_current_wal_lsn()::text')
+        lsn = cursor.fetchone()[0]
+        cursor.close()
+    except psycopg2.Error as e:
+        current_app.logger.warning(f"No se pudo obtener la posición del WAL: {str(e)}")
+        return response
+
+    sticky = current_app.config.get('REPLICA_STICKY_SECONDS', 10)
+    response.headers[LSN_HEADER] = lsn
+    response.set_cookie(LSN_COOKIE, lsn, max_age=int(sticky), httponly=True, samesite='Lax')
+
+    user_id = g.get('current_user_id')
+    if user_id is not None:
+        with _recent_writes_lock:
+            if len(_recent_writes) >= _RECENT_WRITES_MAX:
+                now = time.monotonic()
+                for key in [k for k, (expires, _) in _recent_writes.items() if expires <= now]:
+                    del _recent_writes[key]
+                if len(_recent_writes) >= _RECENT_WRITES_MAX:
+                    _recent_writes.clear()
+            _recent_writes[user_id] = (time.monotonic() + sticky, lsn)
+    return response
@@ -0,0 +1,43 @@
+"""
+Enrutado por fragmento del usuario autenticado (ver src/database/sharding.py).
+
+@tenant_db hace que get_db() devuelva la conexión del fragmento del usuario. Va
+debajo de @jwt_required (necesita g.current_user_id) y encima de @conditional_get,
+cuyo validador también debe leer del fragmento. Sin DATABASE_SHARDS no hace nada.
+"""
+
+from functools import wraps
+
+import psycopg2
+from flask import current_app, g, jsonify
+
+from src.database.db import resolve_tenant
+from src.database.sharding import ShardUnavailableError
+
+
+def _unavailable(code, retry_after):
+    response = jsonify({
+        'error': 'Service temporarily unavailable',
+        'code': code,
+        'retry_after': retry_after
+    })
+    response.status_code = 503
+    response.headers['Retry-After'] = str(retry_after)
+    return response
+
+
+def tenant_db(f):
+    """Resuelve el fragmento del usuario antes de la vista (503 si se está moviendo y la petición escribe)"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        try:
+            g.db_tenant = resolve_tenant(g.current_user_id)
+        except ShardUnavailableError as e:
+            current_app.logger.info(str(e))
+            return _unavailable('tenant_moving', e.retry_after)
+        except psycopg2.Error as e:
+            current_app.logger.error(f"Directorio de fragmentos no disponible: {str(e)}")
+            return _unavailable('shard_directory_unavailable',
+                                current_app.config.get('SHARD_RETRY_AFTER_SECONDS', 5))
+        return f(*args, **kwargs)
+    return decorated_function
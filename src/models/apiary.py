@@ -1,6 +1,8 @@
 import psycopg2
 import psycopg2.extras
 
+from .inventory import InventoryModel, STARTER_INVENTORY_ROWS
+
 class ApiaryModel:
     @staticmethod
     def init_db(db):
@@ -19,6 +21,8 @@ class ApiaryModel:
                     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
                 )
             ''')
+            # Sirve los JOIN por user_id y el listado del usuario ordenado por nombre
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_apiaries_user_name ON apiaries (user_id, name)')
             db.commit()
         except Exception as e:
             db.rollback()
@@ -43,21 +47,27 @@ class ApiaryModel:
     
     @staticmethod
     def create(db, user_id, name, location=None, beehives_count=0, treatments=False):
+        """
+        Crea el apiario con su inventario inicial en una sola sentencia (y una sola
+        transacción). Retorna None si el usuario no existe.
+        """
+        cursor = db.cursor()
         try:
-            from .inventory import InventoryModel
-            
-            cursor = db.cursor()
-            # Crear el apiario
-            cursor.execute(
-                'INSERT INTO apiaries (user_id, name, location, beehives_count, treatments) VALUES (%s, %s, %s, %s, %s) RETURNING id',
-                (user_id, name, location, beehives_count, treatments))
-            apiary_id = cursor.fetchone()[0]
-            
-            # Crear el inventario inicial para el apiario
-            InventoryModel.create_initial_inventory(db, apiary_id)
-            
+            cursor.execute(f'''
+                WITH new_apiary AS (
+                    INSERT INTO apiaries (user_id, name, location, beehives_count, treatments)
+                    SELECT u.id, %s::text, %s::text, %s::integer, %s::boolean FROM users u WHERE u.id = %s
+                    RETURNING id
+                ), starter AS (
+                    INSERT INTO inventory (apiary_id, name, quantity, unit, description, minimum_stock)
+                    SELECT a.id, t.name, t.quantity, t.unit, t.description, t.minimum_stock
+                    FROM new_apiary a CROSS JOIN {STARTER_INVENTORY_ROWS}
+                )
+                SELECT id FROM new_apiary
+            ''', (name, location, beehives_count, treatments, user_id, InventoryModel.starter_inventory()))
+            row = cursor.fetchone()
             db.commit()
-            return apiary_id
+            return row[0] if row else None
         except Exception as e:
             db.rollback()
             raise e
@@ -74,6 +84,32 @@ class ApiaryModel:
         rows = ApiaryModel._execute_query(db, 'SELECT * FROM apiaries WHERE user_id = %s ORDER BY name', (user_id,))
         return [dict(row) for row in rows]
     
+    @staticmethod
+    def get_version(db, apiary_id):
+        """Versión del apiario y su inventario para respuestas condicionales"""
+        result = ApiaryModel._execute_query(db, '''
+            SELECT GREATEST(a.updated_at, MAX(i.updated_at)) AS last_modified,
+                   COUNT(i.id) AS total
+            FROM apiaries a
+            LEFT JOIN inventory i ON i.apiary_id = a.id
+            WHERE a.id = %s
+            GROUP BY a.id
+        ''', (apiary_id,))
+        return dict(result[0]) if result else None
+
+    @staticmethod
+    def get_user_version(db, user_id):
+        """Versión de los apiarios (con inventario) de un usuario para respuestas condicionales"""
+        result = ApiaryModel._execute_query(db, '''
+            SELECT GREATEST(MAX(a.updated_at), MAX(i.updated_at)) AS last_modified,
+                   COUNT(DISTINCT a.id) AS apiaries,
+                   COUNT(i.id) AS total
+            FROM apiaries a
+            LEFT JOIN inventory i ON i.apiary_id = a.id
+            WHERE a.user_id = %s
+        ''', (user_id,))
+        return dict(result[0]) if result else None
+
     @staticmethod
     def update(db, apiary_id, name=None, location=None):
         fields = []
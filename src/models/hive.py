@@ -97,6 +97,13 @@ class HiveModel:
         except Exception as e:
             raise e
 
+    @staticmethod
+    def get_version(db, hive_id):
+        """Versión de la colmena para respuestas condicionales"""
+        result = HiveModel._execute_query(
+            db, 'SELECT updated_at AS last_modified, id FROM hives WHERE id = %s', (hive_id,))
+        return dict(result[0]) if result else None
+
     @staticmethod
     def get_by_apiary(db, apiary_id):
         try:
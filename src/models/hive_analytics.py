@@ -0,0 +1,190 @@
+import json
+import psycopg2.extras
+
+GRANULARITIES = ('week', 'month')
+
+# Huella de cada periodo: cambia con cualquier monitoreo nuevo, editado o borrado en él.
+# Solo lee monitoreos (índice beehive_id, fecha), nunca las respuestas
+BUCKET_FINGERPRINTS_SQL = '''
+    SELECT date_trunc(%(granularity)s, m.fecha)::date AS bucket_start,
+           COUNT(*) AS monitoreos,
+           md5(string_agg(m.id::text || ':' || m.updated_at::text, ',' ORDER BY m.id)) AS fingerprint
+    FROM monitoreos m
+    WHERE m.beehive_id = %(hive_id)s AND m.fecha >= %(desde)s AND m.fecha < %(hasta)s
+    GROUP BY 1
+'''
+
+# Agregados por periodo y pregunta: avg/min/max para numero y rango, conteo por opción
+# para opciones. Las fechas literales permiten descartar particiones al planificar
+BUCKET_AGGREGATES_SQL = '''
+    WITH r AS (
+        SELECT date_trunc(%(granularity)s, r.fecha)::date AS bucket_start,
+               r.pregunta_id, qv.question_type, qv.question_text, r.respuesta, r.respuesta_numero
+        FROM respuestas_monitoreo r
+        JOIN monitoreos m ON m.id = r.monitoreo_id AND m.fecha = r.fecha
+        JOIN question_versions qv ON qv.id = r.question_version_id
+        WHERE m.beehive_id = %(hive_id)s
+          AND m.fecha >= %(desde)s AND m.fecha < %(hasta)s
+          AND r.fecha >= %(desde)s AND r.fecha < %(hasta)s
+          AND qv.question_type IN ('numero', 'rango', 'opciones')
+          AND date_trunc(%(granularity)s, r.fecha)::date = ANY(%(buckets)s::date[])
+    ),
+    numeric_stats AS (
+        SELECT bucket_start, pregunta_id,
+               json_build_object(
+                   'pregunta_id', pregunta_id, 'pregunta', MAX(question_text), 'tipo', MAX(question_type),
+                   'count', COUNT(*), 'avg', ROUND(AVG(respuesta_numero), 2),
+                   'min', MIN(respuesta_numero), 'max', MAX(respuesta_numero)
+               ) AS stats
+        FROM r
+        WHERE question_type IN ('numero', 'rango') AND respuesta_numero IS NOT NULL
+        GROUP BY bucket_start, pregunta_id
+    ),
+    option_counts AS (
+        SELECT bucket_start, pregunta_id, MAX(question_text) AS question_text,
+               COALESCE(respuesta, '') AS opcion, COUNT(*) AS total
+        FROM r
+        WHERE question_type = 'opciones'
+        GROUP BY bucket_start, pregunta_id, COALESCE(respuesta, '')
+    ),
+    option_stats AS (
+        SELECT bucket_start, pregunta_id,
+               json_build_object(
+                   'pregunta_id', pregunta_id, 'pregunta', MAX(question_text), 'tipo', 'opciones',
+                   'count', SUM(total), 'options', json_object_agg(opcion, total ORDER BY opcion)
+               ) AS stats
+        FROM option_counts
+        GROUP BY bucket_start, pregunta_id
+    )
+    SELECT bucket_start, json_agg(stats ORDER BY pregunta_id) AS questions
+    FROM (
+        SELECT bucket_start, pregunta_id, stats FROM numeric_stats
+        UNION ALL
+        SELECT bucket_start, pregunta_id, stats FROM option_stats
+    ) s
+    GROUP BY bucket_start
+'''
+
+
+class HiveAnalyticsModel:
+    """Series temporales por colmena (semanales o mensuales) con caché por periodo"""
+
+    @staticmethod
+    def init_db(db):
+        """Crea la caché de agregados por (colmena, granularidad, periodo)"""
+        cursor = db.cursor()
+        try:
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS hive_analytics_cache (
+                    hive_id INTEGER NOT NULL,
+                    granularity VARCHAR(10) NOT NULL,
+                    bucket_start DATE NOT NULL,
+                    fingerprint VARCHAR(32) NOT NULL,
+                    monitoreos INTEGER NOT NULL,
+                    questions JSONB NOT NULL,
+                    computed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (hive_id, granularity, bucket_start),
+                    FOREIGN KEY (hive_id) REFERENCES hives(id) ON DELETE CASCADE
+                )
+            ''')
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise e
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def user_owns_hive(db, hive_id, user_id):
+        """Verifica que la colmena pertenezca a un apiario del usuario"""
+        cursor = db.cursor()
+        try:
+            cursor.execute('''
+                SELECT 1 FROM hives h
+                JOIN apiaries a ON a.id = h.apiary_id
+                WHERE h.id = %s AND a.user_id = %s
+            ''', (hive_id, user_id))
+            return cursor.fetchone() is not None
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def get_series(db, hive_id, granularity, desde, hasta):
+        """
+        Agregados por periodo en [desde, hasta). Los periodos cuya huella coincide con la
+        caché se leen de ella; el resto se calcula en una sola consulta y se guarda.
+        Retorna (buckets, recalculados).
+        """
+        params = {'hive_id': hive_id, 'granularity': granularity, 'desde': desde, 'hasta': hasta}
+        cursor = db.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+        try:
+            cursor.execute(f'''
+                WITH buckets AS ({BUCKET_FINGERPRINTS_SQL})
+                SELECT b.bucket_start, b.monitoreos, b.fingerprint, c.questions
+                FROM buckets b
+                LEFT JOIN hive_analytics_cache c
+                  ON c.hive_id = %(hive_id)s AND c.granularity = %(granularity)s
+                 AND c.bucket_start = b.bucket_start AND c.fingerprint = b.fingerprint
+                ORDER BY b.bucket_start
+            ''', params)
+            buckets = [dict(row) for row in cursor.fetchall()]
+
+            stale = [b for b in buckets if b['questions'] is None]
+            if stale:
+                cursor.execute(BUCKET_AGGREGATES_SQL, {**params, 'buckets': [b['bucket_start'] for b in stale]})
+                computed = {row['bucket_start']: row['questions'] for row in cursor.fetchall()}
+                for bucket in stale:
+                    bucket['questions'] = computed.get(bucket['bucket_start'], [])
+
+                psycopg2.extras.execute_values(cursor, '''
+                    INSERT INTO hive_analytics_cache
+                    (hive_id, granularity, bucket_start, fingerprint, monitoreos, questions)
+                    VALUES %s
+                    ON CONFLICT (hive_id, granularity, bucket_start) DO UPDATE
+                    SET fingerprint = EXCLUDED.fingerprint, monitoreos = EXCLUDED.monitoreos,
+                        questions = EXCLUDED.questions, computed_at = CURRENT_TIMESTAMP
+                ''', [(hive_id, granularity, b['bucket_start'], b['fingerprint'], b['monitoreos'],
+                       json.dumps(b['questions'])) for b in stale],
+                    template='(%s, %s, %s, %s, %s, %s::jsonb)', page_size=len(stale))
+                db.commit()
+
+            for bucket in buckets:
+                bucket.pop('fingerprint')
+            return buckets, len(stale)
+        except Exception as e:
+            db.rollback()
+            raise e
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def trends(buckets, granularity):
+        """
+        Pendiente (mínimos cuadrados) del promedio de cada pregunta numérica, en
+        unidades por semana o por mes. Requiere al menos dos periodos con datos.
+        """
+        points = {}
+        labels = {}
+        for bucket in buckets:
+            start = bucket['bucket_start']
+            x = (start.toordinal() / 7) if granularity == 'week' else (start.year * 12 + start.month)
+            for question in bucket['questions']:
+                if question.get('avg') is None:
+                    continue
+                points.setdefault(question['pregunta_id'], []).append((x, float(question['avg'])))
+                labels[question['pregunta_id']] = question['pregunta']
+
+        trends = []
+        for pregunta_id, values in points.items():
+            if len(values) < 2:
+                continue
+            n = len(values)
+            mean_x = sum(x for x, _ in values) / n
+            mean_y = sum(y for _, y in values) / n
+            var_x = sum((x - mean_x) ** 2 for x, _ in values)
+            if not var_x:
+                continue
+            slope = sum((x - mean_x) * (y - mean_y) for x, y in values) / var_x
+            trends.append({'pregunta_id': pregunta_id, 'pregunta': labels[pregunta_id],
+                           'slope': round(slope, 4), 'periods': n})
+        return sorted(trends, key=lambda t: t['pregunta_id'])
@@ -0,0 +1,175 @@
+import json
+from datetime import datetime, timedelta
+import psycopg2.extras
+from src.utils.health_scoring import (
+    OPTION_SIGNALS, NUMERIC_SIGNALS, TEXT_SIGNALS, SIGNAL_INDEX, LEVELS, HEALTH_STATUSES, WINDOW_DAYS
+)
+
+# Señales codificadas fila a fila en SQL (sin agregar) y entregadas como una fila de
+# arreglos, una columna por arreglo: la agregación la hace NumPy
+SIGNALS_SQL = '''
+    WITH option_signals AS (
+        SELECT * FROM jsonb_to_recordset(%(options)s::jsonb)
+            AS o(pregunta_id TEXT, respuesta TEXT, signal INTEGER, value DOUBLE PRECISION)
+    ), numeric_signals AS (
+        SELECT * FROM jsonb_to_recordset(%(numeric)s::jsonb)
+            AS n(pregunta_id TEXT, signal INTEGER, scale DOUBLE PRECISION)
+    ), text_signals AS (
+        SELECT * FROM jsonb_to_recordset(%(text)s::jsonb)
+            AS t(pregunta_id TEXT, signal INTEGER, pattern TEXT)
+    ), answers AS (
+        SELECT m.beehive_id AS hive_id, r.pregunta_id, r.respuesta, r.respuesta_numero,
+               EXTRACT(EPOCH FROM (LOCALTIMESTAMP - m.fecha)) / 86400 AS age_days
+        FROM respuestas_monitoreo r
+        JOIN monitoreos m ON m.id = r.monitoreo_id AND m.fecha = r.fecha
+        {scope_join}
+        WHERE m.fecha >= %(since)s AND r.fecha >= %(since)s
+          AND r.pregunta_id = ANY(%(preguntas)s) {scope_filter}
+    ), encoded AS (
+        SELECT a.hive_id, o.signal, o.value, a.age_days
+        FROM answers a JOIN option_signals o ON o.pregunta_id = a.pregunta_id AND o.respuesta = a.respuesta
+        UNION ALL
+        SELECT a.hive_id, n.signal, LEAST(a.respuesta_numero / n.scale, 1), a.age_days
+        FROM answers a JOIN numeric_signals n ON n.pregunta_id = a.pregunta_id
+        WHERE a.respuesta_numero IS NOT NULL
+        UNION ALL
+        SELECT a.hive_id, t.signal, 1, a.age_days
+        FROM answers a JOIN text_signals t ON t.pregunta_id = a.pregunta_id AND a.respuesta ~* t.pattern
+    )
+    SELECT COALESCE(array_agg(hive_id), '{{}}') AS hive_id,
+           COALESCE(array_agg(signal), '{{}}') AS signal,
+           COALESCE(array_agg(value), '{{}}') AS value,
+           COALESCE(array_agg(age_days::double precision), '{{}}') AS age_days
+    FROM encoded
+'''
+
+HIVES_SQL = '''
+    SELECT COALESCE(array_agg(h.id ORDER BY h.id), '{{}}') AS hive_id,
+           COALESCE(array_agg(h.apiary_id ORDER BY h.id), '{{}}') AS apiary_id,
+           COALESCE(array_agg(h.hive_number ORDER BY h.id), '{{}}') AS hive_number,
+           COALESCE(array_agg(COALESCE(array_position(%(levels)s, h.activity_level), 0) ORDER BY h.id), '{{}}') AS activity,
+           COALESCE(array_agg(COALESCE(array_position(%(levels)s, h.bee_population), 0) ORDER BY h.id), '{{}}') AS population,
+           COALESCE(array_agg(COALESCE(array_position(%(statuses)s, h.health_status), 0) ORDER BY h.id), '{{}}') AS health,
+           COALESCE(array_agg(h.food_frames::double precision ORDER BY h.id), '{{}}') AS food_frames,
+           COALESCE(array_agg(h.brood_frames::double precision ORDER BY h.id), '{{}}') AS brood_frames
+    FROM hives h
+    {scope_join}
+    {scope_where}
+'''
+
+
+class HiveHealthModel:
+    """Entradas por columnas para el motor de puntuación y puntuaciones precalculadas"""
+
+    @staticmethod
+    def init_db(db):
+        """Crea la tabla de puntuaciones precalculadas (una fila por colmena)"""
+        cursor = db.cursor()
+        try:
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS hive_health_scores (
+                    hive_id INTEGER PRIMARY KEY,
+                    apiary_id INTEGER NOT NULL,
+                    score NUMERIC(4, 1),
+                    flags TEXT[] NOT NULL DEFAULT '{}',
+                    components JSONB NOT NULL,
+                    computed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (hive_id) REFERENCES hives(id) ON DELETE CASCADE
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_hive_health_scores_apiary
+                ON hive_health_scores (apiary_id)
+            ''')
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise e
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def _scope(user_id):
+        """Filtro por usuario (None = todas las colmenas, para el cálculo nocturno)"""
+        if user_id is None:
+            return '', ''
+        return 'JOIN apiaries a ON a.id = h.apiary_id', 'a.user_id = %(user_id)s'
+
+    @staticmethod
+    def load_hives(db, user_id=None):
+        """Columnas de las colmenas, ordenadas por id, con los categóricos ya codificados"""
+        join, condition = HiveHealthModel._scope(user_id)
+        cursor = db.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+        try:
+            cursor.execute(HIVES_SQL.format(scope_join=join, scope_where=f'WHERE {condition}' if condition else ''),
+                           {'levels': list(LEVELS), 'statuses': list(HEALTH_STATUSES), 'user_id': user_id})
+            return dict(cursor.fetchone())
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def load_signals(db, user_id=None, window_days=WINDOW_DAYS):
+        """Columnas de señales (colmena, señal, valor, antigüedad) de las inspecciones recientes"""
+        join, condition = HiveHealthModel._scope(user_id)
+        options = [{'pregunta_id': p, 'respuesta': r, 'signal': SIGNAL_INDEX[c], 'value': v}
+                   for (p, r), (c, v) in OPTION_SIGNALS.items()]
+        numeric = [{'pregunta_id': p, 'signal': SIGNAL_INDEX[c], 'scale': s} for p, (c, s) in NUMERIC_SIGNALS.items()]
+        text = [{'pregunta_id': p, 'signal': SIGNAL_INDEX[c], 'pattern': pattern} for p, c, pattern in TEXT_SIGNALS]
+        preguntas = sorted({o['pregunta_id'] for o in options} | set(NUMERIC_SIGNALS) | {t['pregunta_id'] for t in text})
+
+        cursor = db.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+        try:
+            cursor.execute(SIGNALS_SQL.format(
+                scope_join=f'JOIN hives h ON h.id = m.beehive_id {join}' if join else '',
+                scope_filter=f'AND {condition}' if condition else ''
+            ), {
+                'options': json.dumps(options), 'numeric': json.dumps(numeric), 'text': json.dumps(text),
+                'preguntas': preguntas, 'since': datetime.utcnow() - timedelta(days=window_days),
+                'user_id': user_id
+            })
+            return dict(cursor.fetchone())
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def save_scores(db, records):
+        """Guarda (o reemplaza) las puntuaciones calculadas"""
+        if not records:
+            return
+        cursor = db.cursor()
+        try:
+            psycopg2.extras.execute_values(cursor, '''
+                INSERT INTO hive_health_scores (hive_id, apiary_id, score, flags, components)
+                VALUES %s
+                ON CONFLICT (hive_id) DO UPDATE
+                SET apiary_id = EXCLUDED.apiary_id, score = EXCLUDED.score, flags = EXCLUDED.flags,
+                    components = EXCLUDED.components, computed_at = CURRENT_TIMESTAMP
+            ''', [(r['hive_id'], r['apiary_id'], r['score'], r['flags'], json.dumps(r['components']))
+                  for r in records], template='(%s, %s, %s, %s::text[], %s::jsonb)', page_size=1000)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise e
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def get_scores(db, user_id):
+        """Puntuaciones precalculadas de las colmenas del usuario (None si falta alguna colmena)"""
+        cursor = db.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+        try:
+            cursor.execute('''
+                SELECT h.id AS hive_id, h.apiary_id, h.hive_number,
+                       s.score::float AS score, s.flags, s.components, s.computed_at
+                FROM hives h
+                JOIN apiaries a ON a.id = h.apiary_id
+                LEFT JOIN hive_health_scores s ON s.hive_id = h.id
+                WHERE a.user_id = %s
+                ORDER BY h.id
+            ''', (user_id,))
+            rows = [dict(row) for row in cursor.fetchall()]
+            if any(row['computed_at'] is None for row in rows):
+                return None
+            return rows
+        finally:
+            cursor.close()
@@ -1,6 +1,90 @@
+import json
+import os
 import psycopg2
 import psycopg2.extras
 
+# Plantilla declarativa del inventario con el que nace cada apiario
+STARTER_INVENTORY_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', '..', 'config', 'inventario_inicial.json')
+
+# Filas de la plantilla como conjunto de registros (parámetro JSONB)
+STARTER_INVENTORY_ROWS = '''
+    jsonb_to_recordset(%s::jsonb)
+        AS t(name TEXT, quantity INTEGER, unit TEXT, description TEXT, minimum_stock INTEGER)
+'''
+
+# Mantiene inventory_stock_summary fila a fila y registra cada ítem que entra o sale de
+# stock bajo en inventory_stock_alerts, notificándolo también por el canal
+# 'inventory_stock' de pg_notify (se entrega al confirmar la transacción). Los borrados solo restan: si el apiario ya se eliminó
+# (borrado en cascada) su fila de resumen tampoco existe y no se vuelve a crear. Un ítem sin
+# mínimo (minimum_stock NULL) nunca está en stock bajo, igual que en el recuento inicial
+STOCK_TRACKING_FUNCTION_SQL = '''
+    CREATE OR REPLACE FUNCTION inventory_track_stock() RETURNS trigger AS $$
+    DECLARE
+        v_old_low INTEGER := 0;
+        v_new_low INTEGER := 0;
+        v_event TEXT;
+    BEGIN
+        IF TG_OP <> 'INSERT' THEN
+            v_old_low := COALESCE(OLD.quantity <= OLD.minimum_stock, false)::integer;
+        END IF;
+        IF TG_OP <> 'DELETE' THEN
+            v_new_low := COALESCE(NEW.quantity <= NEW.minimum_stock, false)::integer;
+        END IF;
+
+        IF TG_OP = 'UPDATE' AND OLD.apiary_id = NEW.apiary_id THEN
+            UPDATE inventory_stock_summary
+            SET total_quantity = total_quantity + NEW.quantity - OLD.quantity,
+                low_stock_items = low_stock_items + v_new_low - v_old_low,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE apiary_id = NEW.apiary_id;
+        ELSE
+            IF TG_OP <> 'INSERT' THEN
+                UPDATE inventory_stock_summary
+                SET total_items = total_items - 1,
+                    total_quantity = total_quantity - OLD.quantity,
+                    low_stock_items = low_stock_items - v_old_low,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE apiary_id = OLD.apiary_id;
+            END IF;
+            IF TG_OP <> 'DELETE' THEN
+                INSERT INTO inventory_stock_summary (apiary_id, total_items, total_quantity, low_stock_items)
+                VALUES (NEW.apiary_id, 1, NEW.quantity, v_new_low)
+                ON CONFLICT (apiary_id) DO UPDATE
+                SET total_items = inventory_stock_summary.total_items + 1,
+                    total_quantity = inventory_stock_summary.total_quantity + EXCLUDED.total_quantity,
+                    low_stock_items = inventory_stock_summary.low_stock_items + EXCLUDED.low_stock_items,
+                    updated_at = CURRENT_TIMESTAMP;
+            END IF;
+        END IF;
+
+        -- Solo los cambios de cantidad o mínimo generan alertas (no las altas ni las bajas)
+        IF TG_OP = 'UPDATE' AND v_old_low <> v_new_low THEN
+            v_event := CASE WHEN v_new_low = 1 THEN 'low_stock' ELSE 'restocked' END;
+            INSERT INTO inventory_stock_alerts (apiary_id, item_id, item_name, event, quantity, minimum_stock)
+            VALUES (NEW.apiary_id, NEW.id, NEW.name, v_event, NEW.quantity, NEW.minimum_stock);
+            PERFORM pg_notify('inventory_stock', json_build_object(
+                'event', v_event, 'apiary_id', NEW.apiary_id, 'item_id', NEW.id, 'name', NEW.name,
+                'quantity', NEW.quantity, 'minimum_stock', NEW.minimum_stock)::text);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+'''
+
+# Normaliza texto para la búsqueda (minúsculas y sin tildes). Se declara IMMUTABLE
+# fijando el diccionario de unaccent para poder usarla en el índice de trigramas
+SEARCH_NORMALIZE_FUNCTION_SQL = '''
+    CREATE OR REPLACE FUNCTION search_normalize(p_text TEXT) RETURNS TEXT AS $$
+        SELECT public.unaccent('public.unaccent'::regdictionary, lower(p_text))
+    $$ LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+'''
+
+# Umbral de word_similarity: tolera una o dos letras erradas en nombres cortos ("ahumdor")
+SEARCH_SIMILARITY_THRESHOLD = 0.4
+
+_starter_inventory = None
+
 class InventoryModel:
     @staticmethod
     def init_db(db):
@@ -22,9 +106,107 @@ class InventoryModel:
                 )
             ''')
             
-            # Crear índices para mejorar el rendimiento
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_inventory_apiary_id ON inventory(apiary_id)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_inventory_name ON inventory(apiary_id, name)')
+            # Libro de movimientos de stock (solo inserciones). Conserva item_id y el nombre
+            # del ítem aunque este se elimine; se borra en cascada con el apiario
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS inventory_movements (
+                    id BIGSERIAL PRIMARY KEY,
+                    item_id INTEGER NOT NULL,
+                    apiary_id INTEGER NOT NULL,
+                    item_name VARCHAR(100) NOT NULL,
+                    delta INTEGER NOT NULL,
+                    quantity_after INTEGER NOT NULL,
+                    reason VARCHAR(255),
+                    user_id INTEGER,
+                    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (apiary_id) REFERENCES apiaries(id) ON DELETE CASCADE
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_inventory_movements_item
+                ON inventory_movements (item_id, created_at DESC)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_inventory_movements_apiary
+                ON inventory_movements (apiary_id, created_at DESC)
+            ''')
+            cursor.execute('''
+                CREATE OR REPLACE FUNCTION inventory_movements_append_only() RETURNS trigger AS $$
+                BEGIN
+                    RAISE EXCEPTION 'inventory_movements es de solo inserción';
+                END;
+                $$ LANGUAGE plpgsql
+            ''')
+            cursor.execute('DROP TRIGGER IF EXISTS trg_inventory_movements_append_only ON inventory_movements')
+            cursor.execute('''
+                CREATE TRIGGER trg_inventory_movements_append_only
+                BEFORE UPDATE ON inventory_movements
+                FOR EACH ROW EXECUTE FUNCTION inventory_movements_append_only()
+            ''')
+            
+            # Crear índices para mejorar el rendimiento. UNIQUE(apiary_id, name) ya cubre
+            # las búsquedas exactas por nombre; el resumen se resuelve solo con el índice
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_inventory_apiary_stock
+                ON inventory (apiary_id) INCLUDE (quantity, minimum_stock)
+            ''')
+            # Ítems bajo el mínimo (comparación entre columnas: solo un índice parcial la sirve)
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_inventory_low_stock
+                ON inventory (apiary_id, name) WHERE quantity <= minimum_stock
+            ''')
+            # Búsqueda sin tildes ni mayúsculas sobre nombre y descripción (trigramas)
+            cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+            cursor.execute('CREATE EXTENSION IF NOT EXISTS unaccent')
+            cursor.execute(SEARCH_NORMALIZE_FUNCTION_SQL)
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_inventory_search_trgm ON inventory
+                USING gin (search_normalize(name || ' ' || COALESCE(description, '')) gin_trgm_ops)
+            ''')
+
+            # Resumen por apiario y alertas de stock bajo, mantenidos por trigger en cada escritura
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS inventory_stock_summary (
+                    apiary_id INTEGER PRIMARY KEY,
+                    total_items INTEGER NOT NULL DEFAULT 0,
+                    total_quantity BIGINT NOT NULL DEFAULT 0,
+                    low_stock_items INTEGER NOT NULL DEFAULT 0,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (apiary_id) REFERENCES apiaries(id) ON DELETE CASCADE
+                )
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS inventory_stock_alerts (
+                    id BIGSERIAL PRIMARY KEY,
+                    apiary_id INTEGER NOT NULL,
+                    item_id INTEGER NOT NULL,
+                    item_name VARCHAR(100) NOT NULL,
+                    event VARCHAR(20) NOT NULL,
+                    quantity INTEGER NOT NULL,
+                    minimum_stock INTEGER,
+                    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (apiary_id) REFERENCES apiaries(id) ON DELETE CASCADE
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_inventory_stock_alerts_apiary
+                ON inventory_stock_alerts (apiary_id, created_at DESC)
+            ''')
+            cursor.execute(STOCK_TRACKING_FUNCTION_SQL)
+            cursor.execute('DROP TRIGGER IF EXISTS trg_inventory_track_stock ON inventory')
+            cursor.execute('''
+                CREATE TRIGGER trg_inventory_track_stock
+                AFTER INSERT OR DELETE OR UPDATE OF apiary_id, quantity, minimum_stock ON inventory
+                FOR EACH ROW EXECUTE FUNCTION inventory_track_stock()
+            ''')
+            # Apiarios con inventario anterior al trigger
+            cursor.execute('''
+                INSERT INTO inventory_stock_summary (apiary_id, total_items, total_quantity, low_stock_items)
+                SELECT apiary_id, COUNT(*), SUM(quantity), COUNT(*) FILTER (WHERE quantity <= minimum_stock)
+                FROM inventory
+                GROUP BY apiary_id
+                ON CONFLICT (apiary_id) DO NOTHING
+            ''')
             
             db.commit()
         except Exception as e:
@@ -49,34 +231,39 @@ class InventoryModel:
         cursor.close()
         return dict(row) if row else None
 
+    @staticmethod
+    def starter_inventory():
+        """Ítems de config/inventario_inicial.json en JSON, listos para STARTER_INVENTORY_ROWS"""
+        global _starter_inventory
+        if _starter_inventory is None:
+            with open(STARTER_INVENTORY_PATH, encoding='utf-8') as f:
+                items = json.load(f)['items']
+            for item in items:
+                if not item.get('name'):
+                    raise ValueError("Cada ítem de inventario_inicial.json requiere 'name'")
+                item.setdefault('quantity', 0)
+                item.setdefault('unit', 'unit')
+                item.setdefault('description', None)
+                item.setdefault('minimum_stock', 0)
+            _starter_inventory = json.dumps(items)
+        return _starter_inventory
+
     @staticmethod
     def create_initial_inventory(db, apiary_id):
         """
-        Crea el inventario inicial para un nuevo apiario
+        Crea el inventario inicial de un apiario existente en una sola sentencia.
+        Es idempotente (conserva los ítems que ya existan) y no confirma la
+        transacción: la confirma quien llama.
         """
+        cursor = db.cursor()
         try:
-            cursor = db.cursor()
-            # Lista de items iniciales básicos que todo apiario debería tener
-            initial_items = [
-                ("Marcos", 0, "unidades", "Marcos para las colmenas", 10),
-                ("Cera estampada", 0, "láminas", "Láminas de cera para los marcos", 20),
-                ("Ahumador", 0, "unidades", "Herramienta para manejo de abejas", 1),
-                ("Overol", 0, "unidades", "Equipo de protección", 1),
-                ("Guantes", 0, "pares", "Equipo de protección", 2)
-            ]
-            
-            for item in initial_items:
-                cursor.execute('''
-                    INSERT INTO inventory 
-                    (apiary_id, name, quantity, unit, description, minimum_stock)
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                ''', (apiary_id, *item))
-            
-            db.commit()
-            return True
-        except Exception as e:
-            db.rollback()
-            raise e
+            cursor.execute(f'''
+                INSERT INTO inventory (apiary_id, name, quantity, unit, description, minimum_stock)
+                SELECT %s, t.name, t.quantity, t.unit, t.description, t.minimum_stock
+                FROM {STARTER_INVENTORY_ROWS}
+                ON CONFLICT (apiary_id, name) DO NOTHING
+            ''', (apiary_id, InventoryModel.starter_inventory()))
+            return cursor.rowcount
         finally:
             cursor.close()
 
@@ -95,6 +282,19 @@ class InventoryModel:
             (apiary_id,)
         )
 
+    @staticmethod
+    def get_apiary_version(db, apiary_id, user_id):
+        """Versión del inventario de un apiario del usuario para respuestas condicionales"""
+        return InventoryModel._execute_single_query(
+            db,
+            '''SELECT MAX(i.updated_at) AS last_modified, COUNT(i.id) AS total
+            FROM apiaries a
+            LEFT JOIN inventory i ON i.apiary_id = a.id
+            WHERE a.id = %s AND a.user_id = %s
+            GROUP BY a.id''',
+            (apiary_id, user_id)
+        )
+
     @staticmethod
     def get_by_id(db, item_id):
         return InventoryModel._execute_single_query(
@@ -183,19 +383,156 @@ class InventoryModel:
         )
 
     @staticmethod
-    def get_by_name(db, apiary_id, name):
-        return InventoryModel._execute_query(
+    def search(db, user_id, term, apiary_id=None, limit=20):
+        """
+        Busca en nombre y descripción de los ítems de los apiarios del usuario, sin
+        distinguir tildes ni mayúsculas. Acepta subcadenas ("cera" -> "Cera estampada")
+        y errores de tipeo (similitud de trigramas por palabra). Ordena primero los
+        nombres que empiezan por el término y luego por similitud.
+        """
+        escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        params = {
+            'term': term,
+            'pattern': f'%{escaped}%',
+            'prefix': f'{escaped}%',
+            'user_id': user_id,
+            'apiary_id': apiary_id,
+            'limit': limit
+        }
+        apiary_filter = 'AND i.apiary_id = %(apiary_id)s' if apiary_id is not None else ''
+
+        cursor = db.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+        try:
+            cursor.execute('SET LOCAL pg_trgm.word_similarity_threshold = %s', (SEARCH_SIMILARITY_THRESHOLD,))
+            # El término se normaliza en la consulta con la misma función del índice
+            cursor.execute(f'''
+                SELECT i.*, a.name AS apiary_name,
+                       word_similarity(search_normalize(%(term)s),
+                                       search_normalize(i.name || ' ' || COALESCE(i.description, ''))) AS score
+                FROM inventory i
+                JOIN apiaries a ON a.id = i.apiary_id
+                WHERE a.user_id = %(user_id)s {apiary_filter}
+                  AND (search_normalize(i.name || ' ' || COALESCE(i.description, '')) LIKE search_normalize(%(pattern)s)
+                       OR search_normalize(%(term)s) <%% search_normalize(i.name || ' ' || COALESCE(i.description, '')))
+                ORDER BY search_normalize(i.name) LIKE search_normalize(%(prefix)s) DESC, score DESC, i.name, i.id
+                LIMIT %(limit)s
+            ''', params)
+            return [dict(row) for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def adjust_quantity(db, item_id, amount, user_id=None, reason=None):
+        """Ajusta la cantidad de un ítem y registra el movimiento en la misma sentencia"""
+        InventoryModel._execute_update(
             db,
-            'SELECT * FROM inventory WHERE apiary_id = %s AND name LIKE %s',
-            (apiary_id, f"%{name}%")
+            '''WITH adjusted AS (
+                UPDATE inventory SET quantity = quantity + %s, updated_at = CURRENT_TIMESTAMP
+                WHERE id = %s
+                RETURNING id, apiary_id, name, quantity
+            )
+            INSERT INTO inventory_movements (item_id, apiary_id, item_name, delta, quantity_after, reason, user_id)
+            SELECT id, apiary_id, name, %s, quantity, %s, %s FROM adjusted''',
+            (amount, item_id, amount, reason, user_id)
         )
 
     @staticmethod
-    def adjust_quantity(db, item_id, amount):
-        InventoryModel._execute_update(
+    def adjust_quantities(db, user_id, adjustments):
+        """
+        Aplica varios ajustes (item_id, delta, reason) en una sola sentencia: bloquea los
+        ítems en orden de id y después las filas de inventory_stock_summary de sus apiarios
+        en orden de apiary_id (el trigger las actualiza en el orden en que el UPDATE visita
+        los ítems: sin este bloqueo previo dos lotes sobre apiarios A y B podían tomarlas
+        A->B y B->A), verifica que todos pertenezcan a apiarios del usuario,
+        actualiza las cantidades con UPDATE ... FROM (VALUES ...), registra cada
+        movimiento en inventory_movements y devuelve los ítems con stock bajo de los
+        apiarios afectados ya con las cantidades nuevas.
+
+        Es todo o nada: si algún ítem no existe o no es del usuario no se modifica
+        ninguno y retorna None. Si no, retorna {'adjusted': [...], 'low_stock': [...]}.
+        """
+        rows = [(item_id, delta, reason, user_id) for item_id, delta, reason in adjustments]
+        cursor = db.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+        try:
+            # Ítems y luego resúmenes, cada uno en orden: el mismo orden que un ajuste
+            # individual (ítem y después su resumen desde el trigger)
+            cursor.execute('''
+                WITH locked AS (
+                    SELECT id, apiary_id FROM inventory WHERE id = ANY(%s) ORDER BY id FOR UPDATE
+                )
+                SELECT apiary_id FROM inventory_stock_summary
+                WHERE apiary_id IN (SELECT apiary_id FROM locked)
+                ORDER BY apiary_id
+                FOR UPDATE
+            ''', ([item_id for item_id, _, _ in adjustments],))
+            result = psycopg2.extras.execute_values(cursor, '''
+                WITH input (item_id, delta, reason, user_id) AS (VALUES %s),
+                locked AS (
+                    SELECT inv.id, inv.apiary_id
+                    FROM inventory inv
+                    WHERE inv.id IN (SELECT item_id FROM input)
+                    ORDER BY inv.id
+                    FOR UPDATE
+                ),
+                denied AS (
+                    SELECT 1
+                    FROM input i
+                    LEFT JOIN locked l ON l.id = i.item_id
+                    LEFT JOIN apiaries a ON a.id = l.apiary_id AND a.user_id = i.user_id
+                    WHERE a.id IS NULL
+                    LIMIT 1
+                ),
+                adjusted AS (
+                    UPDATE inventory inv
+                    SET quantity = inv.quantity + i.delta, updated_at = CURRENT_TIMESTAMP
+                    FROM input i
+                    WHERE inv.id = i.item_id AND NOT EXISTS (SELECT 1 FROM denied)
+                    RETURNING inv.id, inv.apiary_id, inv.name, inv.quantity, inv.unit,
+                              inv.minimum_stock, i.delta, i.reason, i.user_id
+                ),
+                ledger AS (
+                    INSERT INTO inventory_movements (item_id, apiary_id, item_name, delta, quantity_after, reason, user_id)
+                    SELECT id, apiary_id, name, delta, quantity, reason, user_id FROM adjusted
+                )
+                SELECT 'adjusted' AS kind, id, apiary_id, name, quantity, unit, minimum_stock FROM adjusted
+                UNION ALL
+                SELECT 'low_stock', id, apiary_id, name, quantity, unit, minimum_stock
+                FROM adjusted WHERE quantity <= minimum_stock
+                UNION ALL
+                SELECT 'low_stock', inv.id, inv.apiary_id, inv.name, inv.quantity, inv.unit, inv.minimum_stock
+                FROM inventory inv
+                WHERE inv.apiary_id IN (SELECT apiary_id FROM adjusted)
+                  AND inv.id NOT IN (SELECT id FROM adjusted)
+                  AND inv.quantity <= inv.minimum_stock
+            ''', rows, template='(%s::integer, %s::integer, %s::varchar, %s::integer)',
+                page_size=len(rows), fetch=True)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise e
+        finally:
+            cursor.close()
+
+        if not result:
+            return None
+        adjusted, low_stock = [], []
+        for row in result:
+            row = dict(row)
+            (adjusted if row.pop('kind') == 'adjusted' else low_stock).append(row)
+        low_stock.sort(key=lambda item: (item['apiary_id'], item['name']))
+        return {'adjusted': adjusted, 'low_stock': low_stock}
+
+    @staticmethod
+    def get_movements(db, item_id, limit=50):
+        """Historial de movimientos de un ítem, del más reciente al más antiguo"""
+        return InventoryModel._execute_query(
             db,
-            'UPDATE inventory SET quantity = quantity + %s, updated_at = CURRENT_TIMESTAMP WHERE id = %s',
-            (amount, item_id)
+            '''SELECT id, item_id, item_name, delta, quantity_after, reason, user_id, created_at
+            FROM inventory_movements
+            WHERE item_id = %s
+            ORDER BY created_at DESC, id DESC
+            LIMIT %s''',
+            (item_id, limit)
         )
 
     @staticmethod
@@ -223,18 +560,31 @@ class InventoryModel:
 
     @staticmethod
     def get_apiary_summary(db, apiary_id):
-        """Obtiene un resumen del inventario del apiario"""
+        """Obtiene un resumen del inventario del apiario (contadores mantenidos por trigger)"""
         return InventoryModel._execute_single_query(
             db,
             '''SELECT 
-                COUNT(*) as total_items,
-                SUM(quantity) as total_quantity,
-                COUNT(CASE WHEN quantity <= minimum_stock THEN 1 END) as low_stock_items
-            FROM inventory 
-            WHERE apiary_id = %s''',
+                COALESCE(s.total_items, 0) as total_items,
+                CASE WHEN s.total_items > 0 THEN s.total_quantity END as total_quantity,
+                COALESCE(s.low_stock_items, 0) as low_stock_items
+            FROM (SELECT %s::integer AS apiary_id) a
+            LEFT JOIN inventory_stock_summary s ON s.apiary_id = a.apiary_id''',
             (apiary_id,)
         )
 
+    @staticmethod
+    def get_stock_alerts(db, apiary_id, limit=50):
+        """Últimas transiciones de stock bajo (low_stock / restocked) de un apiario"""
+        return InventoryModel._execute_query(
+            db,
+            '''SELECT id, item_id, item_name, event, quantity, minimum_stock, created_at
+            FROM inventory_stock_alerts
+            WHERE apiary_id = %s
+            ORDER BY created_at DESC, id DESC
+            LIMIT %s''',
+            (apiary_id, limit)
+        )
+
     @staticmethod
     def validate_apiary_access(db, item_id, user_id):
         """Valida que el usuario tenga acceso al item a través de su apiario"""
@@ -0,0 +1,242 @@
+import json
+import psycopg2.extras
+
+JOB_STATUSES = ('pending', 'running', 'done', 'failed')
+
+# Canal de NOTIFY con el que enqueue despierta a los workers (se entrega al confirmar)
+JOBS_CHANNEL = 'jobs'
+
+
+class JobModel:
+    """Cola de trabajos en segundo plano sobre PostgreSQL (FOR UPDATE SKIP LOCKED)"""
+
+    @staticmethod
+    def init_db(db):
+        """Crea la tabla de trabajos y el índice parcial de trabajos listos"""
+        cursor = db.cursor()
+        try:
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id BIGSERIAL PRIMARY KEY,
+                    kind VARCHAR(100) NOT NULL,
+                    payload JSONB NOT NULL DEFAULT '{}',
+                    priority SMALLINT NOT NULL DEFAULT 0,
+                    status VARCHAR(10) NOT NULL DEFAULT 'pending'
+                        CHECK (status IN ('pending', 'running', 'done', 'failed')),
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    max_attempts INTEGER NOT NULL DEFAULT 5,
+                    run_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                    user_id INTEGER,
+                    locked_by VARCHAR(100),
+                    locked_at TIMESTAMP,
+                    started_at TIMESTAMP,
+                    finished_at TIMESTAMP,
+                    last_error TEXT,
+                    result JSONB,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE SET NULL
+                )
+            ''')
+            # Solo los pendientes, en el orden en que se reclaman
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_jobs_ready
+                ON jobs (priority DESC, run_at, id) WHERE status = 'pending'
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_jobs_running
+                ON jobs (locked_at) WHERE status = 'running'
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_jobs_finished
+                ON jobs (finished_at) WHERE status IN ('done', 'failed')
+            ''')
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise e
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def enqueue(db, kind, payload=None, priority=0, run_at=None, delay_seconds=0, max_attempts=5, user_id=None):
+        """
+        Encola un trabajo y retorna su id. Dentro de una unidad de trabajo solo se
+        vuelve visible (y despierta a los workers) cuando la petición confirma.
+        """
+        cursor = db.cursor()
+        try:
+            cursor.execute('''
+                INSERT INTO jobs (kind, payload, priority, run_at, max_attempts, user_id)
+                VALUES (%s, %s::jsonb, %s,
+                        COALESCE(%s, LOCALTIMESTAMP) + make_interval(secs => %s), %s, %s)
+                RETURNING id
+            ''', (kind, json.dumps(payload or {}), priority, run_at, delay_seconds, max_attempts, user_id))
+            job_id = cursor.fetchone()[0]
+            cursor.execute('SELECT pg_notify(%s, %s)', (JOBS_CHANNEL, kind))
+            db.commit()
+            return job_id
+        except Exception as e:
+            db.rollback()
+            raise e
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def claim(db, worker_id, limit=1, kinds=None):
+        """
+        Reclama hasta `limit` trabajos listos (prioridad más alta y más antiguos
+        primero). SKIP LOCKED permite varios workers sin bloquearse entre sí.
+        """
+        cursor = db.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+        try:
+            cursor.execute('''
+                UPDATE jobs j
+                SET status = 'running', attempts = j.attempts + 1, locked_by = %(worker)s,
+                    locked_at = LOCALTIMESTAMP, started_at = LOCALTIMESTAMP
+                FROM (
+                    SELECT id FROM jobs
+                    WHERE status = 'pending' AND run_at <= LOCALTIMESTAMP
+                      AND (%(kinds)s::text[] IS NULL OR kind = ANY(%(kinds)s::text[]))
+                    ORDER BY priority DESC, run_at, id
+                    LIMIT %(limit)s
+                    FOR UPDATE SKIP LOCKED
+                ) ready
+                WHERE j.id = ready.id
+                RETURNING j.id, j.kind, j.payload, j.attempts, j.max_attempts, j.user_id
+            ''', {'worker': worker_id, 'kinds': list(kinds) if kinds else None, 'limit': limit})
+            jobs = [dict(row) for row in cursor.fetchall()]
+            db.commit()
+            return sorted(jobs, key=lambda job: job['id'])
+        except Exception as e:
+            db.rollback()
+            raise e
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def complete(db, job_id, result=None):
+        """Marca el trabajo como terminado (en la misma transacción que su efecto)"""
+        cursor = db.cursor()
+        try:
+            cursor.execute('''
+                UPDATE jobs
+                SET status = 'done', finished_at = LOCALTIMESTAMP, result = %s::jsonb,
+                    locked_by = NULL, last_error = NULL
+                WHERE id = %s
+            ''', (json.dumps(result) if result is not None else None, job_id))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise e
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def fail(db, job_id, error, retry_base_seconds):
+        """
+        Registra un fallo: reprograma con espera exponencial (base · 2^(intentos-1),
+        máximo una hora) o lo marca como fallido si agotó los intentos. Retorna el estado.
+        """
+        cursor = db.cursor()
+        try:
+            cursor.execute('''
+                UPDATE jobs
+                SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'pending' END,
+                    run_at = LOCALTIMESTAMP + make_interval(secs => LEAST(%s * 2 ^ (attempts - 1), 3600)),
+                    finished_at = CASE WHEN attempts >= max_attempts THEN LOCALTIMESTAMP END,
+                    last_error = %s, locked_by = NULL, locked_at = NULL
+                WHERE id = %s
+                RETURNING status
+            ''', (retry_base_seconds, str(error)[:2000], job_id))
+            row = cursor.fetchone()
+            db.commit()
+            return row[0] if row else None
+        except Exception as e:
+            db.rollback()
+            raise e
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def release_stale(db, lock_timeout_seconds, retry_base_seconds):
+        """Devuelve a la cola (o da por fallidos) los trabajos de workers que murieron a medias"""
+        cursor = db.cursor()
+        try:
+            cursor.execute('''
+                UPDATE jobs
+                SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'pending' END,
+                    run_at = LOCALTIMESTAMP + make_interval(secs => LEAST(%s * 2 ^ (attempts - 1), 3600)),
+                    finished_at = CASE WHEN attempts >= max_attempts THEN LOCALTIMESTAMP END,
+                    last_error = 'Tiempo de bloqueo agotado (worker ' || COALESCE(locked_by, '?') || ')',
+                    locked_by = NULL, locked_at = NULL
+                WHERE status = 'running' AND locked_at < LOCALTIMESTAMP - make_interval(secs => %s)
+            ''', (retry_base_seconds, lock_timeout_seconds))
+            released = cursor.rowcount
+            db.commit()
+            return released
+        except Exception as e:
+            db.rollback()
+            raise e
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def get(db, job_id):
+        """Estado de un trabajo (sin el payload, que puede contener datos sensibles)"""
+        cursor = db.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+        try:
+            cursor.execute('''
+                SELECT id, kind, status, priority, attempts, max_attempts, run_at, user_id,
+                       started_at, finished_at, last_error, result, created_at
+                FROM jobs WHERE id = %s
+            ''', (job_id,))
+            row = cursor.fetchone()
+            return dict(row) if row else None
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def metrics(db, window_hours=24):
+        """Por tipo: trabajos por estado, programados a futuro, espera del más antiguo y duración media"""
+        cursor = db.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+        try:
+            cursor.execute('''
+                SELECT kind,
+                       COUNT(*) FILTER (WHERE status = 'pending' AND run_at <= LOCALTIMESTAMP) AS ready,
+                       COUNT(*) FILTER (WHERE status = 'pending' AND run_at > LOCALTIMESTAMP) AS scheduled,
+                       COUNT(*) FILTER (WHERE status = 'running') AS running,
+                       COUNT(*) FILTER (WHERE status = 'done' AND finished_at >= LOCALTIMESTAMP - make_interval(hours => %(hours)s)) AS done,
+                       COUNT(*) FILTER (WHERE status = 'failed' AND finished_at >= LOCALTIMESTAMP - make_interval(hours => %(hours)s)) AS failed,
+                       COUNT(*) FILTER (WHERE status = 'pending' AND attempts > 0) AS retrying,
+                       ROUND(EXTRACT(EPOCH FROM LOCALTIMESTAMP - MIN(run_at) FILTER (
+                           WHERE status = 'pending' AND run_at <= LOCALTIMESTAMP)))::int AS oldest_ready_seconds,
+                       ROUND(AVG(EXTRACT(EPOCH FROM finished_at - started_at) * 1000) FILTER (
+                           WHERE status = 'done' AND finished_at >= LOCALTIMESTAMP - make_interval(hours => %(hours)s)))::int AS avg_duration_ms
+                FROM jobs
+                WHERE status IN ('pending', 'running')
+                   OR finished_at >= LOCALTIMESTAMP - make_interval(hours => %(hours)s)
+                GROUP BY kind
+                ORDER BY kind
+            ''', {'hours': window_hours})
+            return [dict(row) for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def purge(db, older_than_days):
+        """Elimina los trabajos terminados o fallidos más antiguos que N días"""
+        cursor = db.cursor()
+        try:
+            cursor.execute('''
+                DELETE FROM jobs
+                WHERE status IN ('done', 'failed')
+                  AND finished_at < LOCALTIMESTAMP - make_interval(days => %s)
+            ''', (older_than_days,))
+            deleted = cursor.rowcount
+            db.commit()
+            return deleted
+        except Exception as e:
+            db.rollback()
+            raise e
+        finally:
+            cursor.close()
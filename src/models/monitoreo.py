@@ -1,17 +1,130 @@
 import json
+import re
 from datetime import datetime
+from decimal import Decimal, InvalidOperation
+import psycopg2.errors
 import psycopg2.extras
 
+# Reconstruye la forma original de cada respuesta (pregunta_texto, tipo_respuesta)
+# a partir de la instantánea de la pregunta con un solo JOIN
+RESPUESTAS_SELECT = '''
+    SELECT r.id, r.monitoreo_id, r.pregunta_id,
+           qv.question_text AS pregunta_texto,
+           COALESCE(r.respuesta, r.respuesta_numero::text) AS respuesta,
+           qv.question_type AS tipo_respuesta,
+           r.created_at
+    FROM respuestas_monitoreo r
+    JOIN question_versions qv ON qv.id = r.question_version_id
+'''
+
+# Consultas compartidas con los manejadores asíncronos (src/asgi/handlers.py): usan
+# parámetros con nombre de psycopg2 y el modo ASGI los traduce a los de asyncpg
+RESPUESTAS_BY_MONITOREOS_SQL = RESPUESTAS_SELECT + '''
+    WHERE r.monitoreo_id = ANY(%(monitoreo_ids)s) AND r.fecha BETWEEN %(desde)s AND %(hasta)s
+    ORDER BY r.id
+'''
+
+MONITOREOS_WITH_DETAILS_SQL = '''
+    SELECT m.id, m.beehive_id, m.apiary_id, m.fecha, m.sincronizado,
+           a.name as apiario_nombre, h.hive_number
+    FROM monitoreos m
+    JOIN apiaries a ON m.apiary_id = a.id
+    JOIN hives h ON m.beehive_id = h.id
+    WHERE a.user_id = %(user_id)s
+    ORDER BY m.fecha DESC
+    LIMIT %(limit)s OFFSET %(offset)s
+'''
+
+# {date_clause} es el filtro de MonitoreoModel.date_range_clause
+MONITOREOS_BY_APIARIO_SQL = '''
+    SELECT m.*, h.hive_number
+    FROM monitoreos m
+    JOIN hives h ON m.beehive_id = h.id
+    WHERE m.apiary_id = %(apiary_id)s{date_clause}
+    ORDER BY m.fecha DESC
+'''
+
+MONITOREOS_BY_COLMENA_SQL = '''
+    SELECT m.*, a.name as apiario_nombre
+    FROM monitoreos m
+    JOIN apiaries a ON m.apiary_id = a.id
+    WHERE m.beehive_id = %(beehive_id)s{date_clause}
+    ORDER BY m.fecha DESC
+'''
+
+# Estadísticas de /api/stats (MonitoreoController.get_system_stats). Los conteos de
+# monitoreos en vivo solo se usan si los resúmenes diarios nunca se han refrescado
+USER_COUNTS_SQL = '''
+    SELECT (SELECT COUNT(*) FROM apiaries WHERE user_id = %(user_id)s) AS total_apiarios,
+           (SELECT COUNT(*) FROM hives
+            WHERE apiary_id IN (SELECT id FROM apiaries WHERE user_id = %(user_id)s)) AS total_colmenas
+'''
+
+# La fecha literal de `since` permite descartar las particiones anteriores al planificar
+LIVE_APIARY_TOTALS_SQL = '''
+    SELECT a.name,
+           (SELECT COUNT(*) FROM monitoreos m WHERE m.apiary_id = a.id) AS total,
+           (SELECT COUNT(*) FROM monitoreos m WHERE m.apiary_id = a.id AND m.sincronizado = FALSE) AS pending,
+           (SELECT COUNT(*) FROM monitoreos m WHERE m.apiary_id = a.id AND m.fecha >= %(since)s) AS recent
+    FROM apiaries a
+    WHERE a.user_id = %(user_id)s
+    ORDER BY total DESC
+'''
+
+NUMERIC_TYPES = ('numero', 'rango')
+_NUMERIC_PATTERN = re.compile(r'-?\d+(\.\d+)?')
+
+# Meses futuros cuyas particiones se mantienen creadas por adelantado
+PARTITION_MONTHS_AHEAD = 3
+
+# Crea (si faltan) las particiones mensuales de monitoreos y respuestas_monitoreo
+# entre dos fechas. El advisory lock serializa a procesos que creen el mismo mes
+PARTITION_FUNCTION_SQL = '''
+    CREATE OR REPLACE FUNCTION monitoreos_ensure_partitions(p_from DATE, p_to DATE)
+    RETURNS INTEGER AS $$
+    DECLARE
+        v_month DATE := date_trunc('month', p_from)::date;
+        v_next DATE;
+        v_suffix TEXT;
+        v_created INTEGER := 0;
+    BEGIN
+        PERFORM pg_advisory_xact_lock(hashtext('monitoreos_partitions'));
+        WHILE v_month <= p_to LOOP
+            v_next := (v_month + INTERVAL '1 month')::date;
+            v_suffix := to_char(v_month, 'YYYY_MM');
+            IF to_regclass('monitoreos_' || v_suffix) IS NULL THEN
+                EXECUTE format('CREATE TABLE %I PARTITION OF monitoreos FOR VALUES FROM (%L) TO (%L)',
+                               'monitoreos_' || v_suffix, v_month, v_next);
+                v_created := v_created + 1;
+            END IF;
+            IF to_regclass('respuestas_monitoreo_' || v_suffix) IS NULL THEN
+                EXECUTE format('CREATE TABLE %I PARTITION OF respuestas_monitoreo FOR VALUES FROM (%L) TO (%L)',
+                               'respuestas_monitoreo_' || v_suffix, v_month, v_next);
+                v_created := v_created + 1;
+            END IF;
+            v_month := v_next;
+        END LOOP;
+        RETURN v_created;
+    END;
+    $$ LANGUAGE plpgsql
+'''
+
+# Meses cuya partición ya se confirmó en este proceso (evita consultar en cada INSERT).
+# Otro proceso puede archivarla después (partition_manager.py): create() lo detecta
+# como fallo del INSERT, olvida el mes y reintenta una vez
+_known_partitions = set()
+
 class MonitoreoModel:
     @staticmethod
     def init_db(db):
         """Inicializa las tablas de monitoreo en PostgreSQL"""
         cursor = db.cursor()
         try:
-            # Tabla de monitoreos con tipos específicos de PostgreSQL
+            # Tabla de monitoreos particionada por mes sobre fecha: las consultas por rango
+            # de fechas solo leen las particiones necesarias y el archivado es un DETACH
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS monitoreos (
-                    id SERIAL PRIMARY KEY,
+                    id SERIAL,
                     beehive_id INTEGER NOT NULL,
                     apiary_id INTEGER NOT NULL,
                     fecha TIMESTAMP NOT NULL,
@@ -19,42 +132,60 @@ class MonitoreoModel:
                     sincronizado BOOLEAN DEFAULT FALSE,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (id, fecha),
                     FOREIGN KEY (beehive_id) REFERENCES hives(id) ON DELETE CASCADE,
                     FOREIGN KEY (apiary_id) REFERENCES apiaries(id) ON DELETE CASCADE
-                )
+                ) PARTITION BY RANGE (fecha)
             ''')
             
-            # Tabla de respuestas con tipos optimizados
+            # Tabla de respuestas: el texto y tipo de la pregunta viven en question_versions
+            # y las respuestas numéricas se guardan en una columna tipada. Copia la fecha
+            # del monitoreo para particionarse igual que él
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS respuestas_monitoreo (
-                    id SERIAL PRIMARY KEY,
+                    id SERIAL,
                     monitoreo_id INTEGER NOT NULL,
+                    fecha TIMESTAMP NOT NULL,
                     pregunta_id TEXT NOT NULL,
-                    pregunta_texto TEXT NOT NULL,
+                    question_version_id INTEGER NOT NULL,
                     respuesta TEXT,
-                    tipo_respuesta TEXT,
+                    respuesta_numero NUMERIC,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (monitoreo_id) REFERENCES monitoreos(id) ON DELETE CASCADE
-                )
+                    PRIMARY KEY (id, fecha),
+                    CONSTRAINT fk_respuestas_monitoreo FOREIGN KEY (monitoreo_id, fecha)
+                        REFERENCES monitoreos(id, fecha) ON DELETE CASCADE ON UPDATE CASCADE,
+                    CONSTRAINT fk_respuestas_question_version FOREIGN KEY (question_version_id)
+                        REFERENCES question_versions(id)
+                ) PARTITION BY RANGE (fecha)
             ''')
             
-            # Crear índices para mejor rendimiento
+            # Crear índices para mejor rendimiento (se propagan a cada partición)
             cursor.execute('''
                 CREATE INDEX IF NOT EXISTS idx_monitoreos_fecha 
                 ON monitoreos (fecha)
             ''')
             cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_monitoreos_apiario 
-                ON monitoreos (apiary_id)
+                CREATE INDEX IF NOT EXISTS idx_monitoreos_apiary_fecha 
+                ON monitoreos (apiary_id, fecha DESC)
             ''')
             cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_monitoreos_colmena 
-                ON monitoreos (beehive_id)
+                CREATE INDEX IF NOT EXISTS idx_monitoreos_colmena_fecha 
+                ON monitoreos (beehive_id, fecha DESC)
+            ''')
+            # Solo los pendientes de sincronizar (una fracción pequeña de la tabla)
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_monitoreos_pending 
+                ON monitoreos (apiary_id, fecha) WHERE sincronizado = FALSE
             ''')
             cursor.execute('''
                 CREATE INDEX IF NOT EXISTS idx_respuestas_monitoreo_id 
                 ON respuestas_monitoreo (monitoreo_id)
             ''')
+
+            cursor.execute(PARTITION_FUNCTION_SQL)
+            cursor.execute(
+                'SELECT monitoreos_ensure_partitions(CURRENT_DATE, (CURRENT_DATE + %s * INTERVAL \'1 month\')::date)',
+                (PARTITION_MONTHS_AHEAD,))
             
             db.commit()
         except Exception as e:
@@ -66,38 +197,59 @@ class MonitoreoModel:
     @staticmethod
     def create(db, beehive_id, apiary_id, fecha, respuestas=None, datos_adicionales=None):
         """Crea un nuevo monitoreo en PostgreSQL"""
+        month = MonitoreoModel._partition_month(fecha)
+        cached = month in _known_partitions
+        try:
+            return MonitoreoModel._create(db, beehive_id, apiary_id, fecha, respuestas, datos_adicionales)
+        except psycopg2.errors.CheckViolation as e:
+            # "no partition of relation ... found for row": la caché del mes estaba vencida
+            if not cached or 'no partition' not in str(e):
+                raise
+            _known_partitions.discard(month)
+            return MonitoreoModel._create(db, beehive_id, apiary_id, fecha, respuestas, datos_adicionales)
+
+    @staticmethod
+    def _create(db, beehive_id, apiary_id, fecha, respuestas, datos_adicionales):
         cursor = db.cursor()
         try:
             # Usar tipo JSONB nativo de PostgreSQL
             datos_json = json.dumps(datos_adicionales) if datos_adicionales else None
             
-            # Insertar monitoreo principal y obtener ID creado
+            MonitoreoModel._ensure_partition_for(cursor, fecha)
+
+            # Insertar monitoreo principal y obtener ID creado (la fecha ya convertida
+            # a TIMESTAMP es la clave de partición de sus respuestas)
             cursor.execute('''
                 INSERT INTO monitoreos (beehive_id, apiary_id, fecha, datos_json)
                 VALUES (%s, %s, %s, %s)
-                RETURNING id
+                RETURNING id, fecha
             ''', (beehive_id, apiary_id, fecha, datos_json))
             
-            monitoreo_id = cursor.fetchone()[0]
+            monitoreo_id, monitoreo_fecha = cursor.fetchone()
             
-            # Insertar respuestas usando ejecución múltiple si hay muchas
+            # Insertar respuestas en un solo INSERT multi-fila
             if respuestas:
-                respuestas_data = [
-                    (
+                normalized = MonitoreoModel._normalize_respuestas(cursor, apiary_id, respuestas)
+                versions = MonitoreoModel._resolve_question_versions(
+                    cursor, {(r['question_id'], r['tipo'], r['texto']) for r in normalized})
+
+                respuestas_data = []
+                for r in normalized:
+                    numero = MonitoreoModel._to_numeric(r['respuesta']) if r['tipo'] in NUMERIC_TYPES else None
+                    respuestas_data.append((
                         monitoreo_id,
-                        respuesta.get('pregunta_id'),
-                        respuesta.get('pregunta_texto'),
-                        str(respuesta.get('respuesta')),
-                        respuesta.get('tipo_respuesta', 'texto')
-                    )
-                    for respuesta in respuestas
-                ]
-                
-                cursor.executemany('''
-                    INSERT INTO respuestas_monitoreo 
-                    (monitoreo_id, pregunta_id, pregunta_texto, respuesta, tipo_respuesta)
-                    VALUES (%s, %s, %s, %s, %s)
-                ''', respuestas_data)
+                        monitoreo_fecha,
+                        r['pregunta_id'],
+                        versions[(r['question_id'], r['tipo'], r['texto'])],
+                        None if numero is not None else r['respuesta'],
+                        numero
+                    ))
+
+                psycopg2.extras.execute_values(cursor, '''
+                    INSERT INTO respuestas_monitoreo
+                    (monitoreo_id, fecha, pregunta_id, question_version_id, respuesta, respuesta_numero)
+                    VALUES %s
+                ''', respuestas_data, page_size=max(len(respuestas_data), 1))
             
             db.commit()
             return monitoreo_id
@@ -108,6 +260,198 @@ class MonitoreoModel:
         finally:
             cursor.close()
 
+    @staticmethod
+    def _partition_month(fecha):
+        """Primer día del mes de la fecha (None si no se puede interpretar)"""
+        if isinstance(fecha, datetime):
+            value = fecha
+        else:
+            try:
+                value = datetime.fromisoformat(str(fecha).replace('Z', '+00:00'))
+            except ValueError:
+                return None
+        # PostgreSQL descarta la zona horaria al convertir a TIMESTAMP: se usa la fecha local
+        return value.date().replace(day=1)
+
+    @staticmethod
+    def _ensure_partition_for(cursor, fecha):
+        """Crea la partición del mes de la fecha si aún no existe (p.ej. datos atrasados)"""
+        month = MonitoreoModel._partition_month(fecha)
+        if month is None or month in _known_partitions:
+            return
+        cursor.execute('SELECT monitoreos_ensure_partitions(%s, %s)', (month, month))
+        # Solo se recuerda si ya existía: si se creó ahora, depende del commit de esta transacción
+        if cursor.fetchone()[0] == 0:
+            _known_partitions.add(month)
+
+    @staticmethod
+    def ensure_partitions(db, months_ahead=PARTITION_MONTHS_AHEAD, start=None):
+        """Crea las particiones desde `start` (mes actual por defecto) hasta `months_ahead` meses adelante"""
+        cursor = db.cursor()
+        try:
+            cursor.execute('''
+                SELECT monitoreos_ensure_partitions(
+                    COALESCE(%s::date, CURRENT_DATE),
+                    (CURRENT_DATE + %s * INTERVAL '1 month')::date)
+            ''', (start, months_ahead))
+            created = cursor.fetchone()[0]
+            db.commit()
+            return created
+        except Exception as e:
+            db.rollback()
+            raise e
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def list_partitions(db):
+        """Lista las particiones de monitoreos con su rango y cantidad estimada de filas"""
+        cursor = db.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+        try:
+            cursor.execute('''
+                SELECT c.relname AS nombre,
+                       pg_get_expr(c.relpartbound, c.oid) AS rango,
+                       c.reltuples::bigint AS filas_estimadas
+                FROM pg_inherits i
+                JOIN pg_class c ON c.oid = i.inhrelid
+                WHERE i.inhparent = 'monitoreos'::regclass
+                ORDER BY c.relname
+            ''')
+            return [dict(row) for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def detach_partitions_before(db, cutoff, drop=False):
+        """
+        Archiva los meses anteriores a `cutoff` (date) separando sus particiones.
+        Las tablas separadas quedan como monitoreos_AAAA_MM / respuestas_monitoreo_AAAA_MM
+        fuera de la jerarquía (o se eliminan con drop=True). Retorna los meses archivados.
+        """
+        cursor = db.cursor()
+        try:
+            cursor.execute('''
+                SELECT c.relname
+                FROM pg_inherits i
+                JOIN pg_class c ON c.oid = i.inhrelid
+                WHERE i.inhparent = 'monitoreos'::regclass
+                ORDER BY c.relname
+            ''')
+            archived = []
+            for (name,) in cursor.fetchall():
+                suffix = name[len('monitoreos_'):]
+                try:
+                    month = datetime.strptime(suffix, '%Y_%m').date()
+                except ValueError:
+                    continue
+                if month >= cutoff.replace(day=1):
+                    continue
+
+                respuestas = f'respuestas_monitoreo_{suffix}'
+                # Primero las respuestas: su FK apunta a la partición de monitoreos
+                cursor.execute('SELECT to_regclass(%s)', (respuestas,))
+                if cursor.fetchone()[0] is not None:
+                    cursor.execute(f'ALTER TABLE respuestas_monitoreo DETACH PARTITION {respuestas}')
+                    cursor.execute(f'ALTER TABLE {respuestas} DROP CONSTRAINT IF EXISTS fk_respuestas_monitoreo')
+                cursor.execute(f'ALTER TABLE monitoreos DETACH PARTITION {name}')
+
+                if drop:
+                    cursor.execute(f'DROP TABLE IF EXISTS {respuestas}')
+                    cursor.execute(f'DROP TABLE {name}')
+                _known_partitions.discard(month)
+                archived.append(suffix)
+
+            db.commit()
+            return archived
+        except Exception as e:
+            db.rollback()
+            raise e
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def _to_numeric(text):
+        """Retorna Decimal solo si su representación en PostgreSQL reproduce el texto exacto"""
+        if text is None or not _NUMERIC_PATTERN.fullmatch(text):
+            return None
+        try:
+            value = Decimal(text)
+        except InvalidOperation:
+            return None
+        if str(value) != text or (value.is_zero() and text.startswith('-')):
+            return None
+        return value
+
+    @staticmethod
+    def _normalize_respuestas(cursor, apiary_id, respuestas):
+        """Asocia cada respuesta con la pregunta del apiario (por external_id o id)"""
+        cursor.execute(
+            'SELECT id, external_id, question_text, question_type FROM questions WHERE apiary_id = %s',
+            (apiary_id,))
+        by_external = {}
+        by_id = {}
+        for row in cursor.fetchall():
+            question = {'id': row[0], 'text': row[2], 'type': row[3]}
+            by_id[str(row[0])] = question
+            if row[1]:
+                by_external[row[1]] = question
+
+        normalized = []
+        for respuesta in respuestas:
+            pregunta_id = respuesta.get('pregunta_id')
+            question = by_external.get(pregunta_id) or by_id.get(str(pregunta_id))
+            texto = respuesta.get('pregunta_texto') or (question['text'] if question else None)
+            tipo = respuesta.get('tipo_respuesta') or 'texto'
+            normalized.append({
+                'pregunta_id': pregunta_id,
+                'question_id': question['id'] if question else None,
+                'texto': texto,
+                'tipo': tipo,
+                'respuesta': str(respuesta.get('respuesta'))
+            })
+        return normalized
+
+    @staticmethod
+    def _resolve_question_versions(cursor, keys):
+        """
+        Obtiene (o crea) la instantánea de cada (question_id, tipo, texto) en un solo viaje.
+        Retorna un diccionario clave -> question_version_id.
+        """
+        if not keys:
+            return {}
+
+        keys = list(keys)
+        rows = psycopg2.extras.execute_values(cursor, '''
+            WITH input (question_id, question_type, question_text) AS (VALUES %s),
+            inserted AS (
+                INSERT INTO question_versions (question_id, question_type, question_text)
+                SELECT question_id, question_type, question_text FROM input
+                ON CONFLICT DO NOTHING
+                RETURNING id, question_id, question_type, question_text
+            )
+            SELECT id, question_id, question_type, question_text FROM inserted
+            UNION ALL
+            SELECT qv.id, qv.question_id, qv.question_type, qv.question_text
+            FROM question_versions qv
+            JOIN input i
+              ON COALESCE(qv.question_id, 0) = COALESCE(i.question_id, 0)
+             AND qv.question_type = i.question_type
+             AND md5(qv.question_text) = md5(i.question_text)
+        ''', keys, template='(%s::integer, %s::text, %s::text)', page_size=len(keys), fetch=True)
+        versions = {(row[1], row[2], row[3]): row[0] for row in rows}
+
+        # Una instantánea creada por una transacción concurrente no es visible en la
+        # consulta anterior: se vuelve a leer solo lo que falte
+        missing = [key for key in keys if key not in versions]
+        for question_id, question_type, question_text in missing:
+            cursor.execute('''
+                SELECT id FROM question_versions
+                WHERE COALESCE(question_id, 0) = COALESCE(%s, 0)
+                  AND question_type = %s AND md5(question_text) = md5(%s)
+            ''', (question_id, question_type, question_text))
+            versions[(question_id, question_type, question_text)] = cursor.fetchone()[0]
+        return versions
+
     @staticmethod
     def get_by_id(db, monitoreo_id):
         """Obtiene un monitoreo por ID con sus respuestas"""
@@ -129,11 +473,10 @@ class MonitoreoModel:
             monitoreo_dict = dict(monitoreo)
             
             # Obtener respuestas
-            cursor.execute('''
-                SELECT * FROM respuestas_monitoreo 
-                WHERE monitoreo_id = %s
-                ORDER BY id
-            ''', (monitoreo_id,))
+            cursor.execute(RESPUESTAS_SELECT + '''
+                WHERE r.monitoreo_id = %s AND r.fecha = %s
+                ORDER BY r.id
+            ''', (monitoreo_id, monitoreo_dict['fecha']))
             
             respuestas = cursor.fetchall()
             monitoreo_dict['respuestas'] = [dict(r) for r in respuestas]
@@ -167,17 +510,13 @@ class MonitoreoModel:
             cursor.close()
 
     @staticmethod
-    def get_by_apiario(db, apiary_id):
-        """Obtiene monitoreos por apiario"""
+    def get_by_apiario(db, apiary_id, desde=None, hasta=None):
+        """Obtiene monitoreos por apiario, opcionalmente en un rango de fechas"""
         cursor = db.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
         try:
-            cursor.execute('''
-                SELECT m.*, h.hive_number
-                FROM monitoreos m
-                JOIN hives h ON m.beehive_id = h.id
-                WHERE m.apiary_id = %s
-                ORDER BY m.fecha DESC
-            ''', (apiary_id,))
+            date_clause, params = MonitoreoModel.date_range_clause(desde, hasta)
+            cursor.execute(MONITOREOS_BY_APIARIO_SQL.format(date_clause=date_clause),
+                           {'apiary_id': apiary_id, **params})
             
             rows = cursor.fetchall()
             return [dict(row) for row in rows]
@@ -185,39 +524,39 @@ class MonitoreoModel:
             cursor.close()
 
     @staticmethod
-    def get_by_colmena(db, beehive_id):
-        """Obtiene monitoreos por colmena"""
+    def get_by_colmena(db, beehive_id, desde=None, hasta=None):
+        """Obtiene monitoreos por colmena, opcionalmente en un rango de fechas"""
         cursor = db.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
         try:
-            cursor.execute('''
-                SELECT m.*, a.name as apiario_nombre
-                FROM monitoreos m
-                JOIN apiaries a ON m.apiary_id = a.id
-                WHERE m.beehive_id = %s
-                ORDER BY m.fecha DESC
-            ''', (beehive_id,))
+            date_clause, params = MonitoreoModel.date_range_clause(desde, hasta)
+            cursor.execute(MONITOREOS_BY_COLMENA_SQL.format(date_clause=date_clause),
+                           {'beehive_id': beehive_id, **params})
             
             rows = cursor.fetchall()
             return [dict(row) for row in rows]
         finally:
             cursor.close()
 
+    @staticmethod
+    def date_range_clause(desde, hasta):
+        """Filtro sobre m.fecha; con valores literales PostgreSQL descarta particiones al planificar"""
+        clause = ''
+        params = {}
+        if desde is not None:
+            clause += ' AND m.fecha >= %(desde)s'
+            params['desde'] = desde
+        if hasta is not None:
+            clause += ' AND m.fecha < %(hasta)s'
+            params['hasta'] = hasta
+        return clause, params
+
     @staticmethod
     def get_all_with_details(db, user_id, limit=100, offset=0):
         """Obtiene todos los monitoreos para un usuario con detalles completos."""
         cursor = db.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
         try:
             # Obtener monitoreos principales para el usuario
-            cursor.execute('''
-                SELECT m.id, m.beehive_id, m.apiary_id, m.fecha, m.sincronizado,
-                       a.name as apiario_nombre, h.hive_number
-                FROM monitoreos m
-                JOIN apiaries a ON m.apiary_id = a.id
-                JOIN hives h ON m.beehive_id = h.id
-                WHERE a.user_id = %s
-                ORDER BY m.fecha DESC
-                LIMIT %s OFFSET %s
-            ''', (user_id, limit, offset))
+            cursor.execute(MONITOREOS_WITH_DETAILS_SQL, {'user_id': user_id, 'limit': limit, 'offset': offset})
             
             monitoreos = cursor.fetchall()
             if not monitoreos:
@@ -229,11 +568,10 @@ class MonitoreoModel:
             # Obtener todas las respuestas para los monitoreos recuperados
             respuestas_all = []
             if monitoreo_ids:
-                cursor.execute('''
-                    SELECT * FROM respuestas_monitoreo 
-                    WHERE monitoreo_id = ANY(%s)
-                    ORDER BY id
-                ''', (monitoreo_ids,))
+                fechas = [m['fecha'] for m in monitoreos]
+                cursor.execute(RESPUESTAS_BY_MONITOREOS_SQL, {
+                    'monitoreo_ids': monitoreo_ids, 'desde': min(fechas), 'hasta': max(fechas)
+                })
                 respuestas_all = cursor.fetchall()
             
             # Agrupar respuestas por monitoreo_id
@@ -0,0 +1,318 @@
+from datetime import timedelta
+import psycopg2.extras
+
+ROLLUP_NAME = 'monitoring'
+
+# Margen para no adelantar la marca de agua sobre transacciones que aún no han
+# confirmado (updated_at es la hora de inicio de la transacción que escribe)
+ROLLUP_LAG = timedelta(minutes=5)
+
+# Agregados diarios por colmena y por apiario desde las tablas base. {filter} acota
+# los monitoreos; las fechas literales permiten descartar particiones al planificar.
+# Las distribuciones solo cuentan preguntas de tipo opciones: {pregunta_id: {opción: n}}
+ROLLUP_SOURCE_SQL = '''
+    WITH m AS (
+        SELECT m.id, m.fecha, m.fecha::date AS day, m.beehive_id, m.apiary_id, m.sincronizado
+        FROM monitoreos m
+        WHERE m.fecha >= %(desde)s AND m.fecha < %(hasta)s AND {filter}
+    ), option_counts AS (
+        SELECT m.apiary_id, m.beehive_id, m.day, r.pregunta_id, COALESCE(r.respuesta, '') AS opcion,
+               COUNT(*) AS total
+        FROM m
+        JOIN respuestas_monitoreo r ON r.monitoreo_id = m.id AND r.fecha = m.fecha
+        JOIN question_versions qv ON qv.id = r.question_version_id
+        WHERE r.fecha >= %(desde)s AND r.fecha < %(hasta)s AND qv.question_type = 'opciones'
+        GROUP BY 1, 2, 3, 4, 5
+    ), hive_answers AS (
+        SELECT beehive_id, day, jsonb_object_agg(pregunta_id, options) AS answers
+        FROM (
+            SELECT beehive_id, day, pregunta_id, jsonb_object_agg(opcion, total) AS options
+            FROM option_counts GROUP BY 1, 2, 3
+        ) q
+        GROUP BY 1, 2
+    ), apiary_answers AS (
+        SELECT apiary_id, day, jsonb_object_agg(pregunta_id, options) AS answers
+        FROM (
+            SELECT apiary_id, day, pregunta_id, jsonb_object_agg(opcion, total) AS options
+            FROM (
+                SELECT apiary_id, day, pregunta_id, opcion, SUM(total) AS total
+                FROM option_counts GROUP BY 1, 2, 3, 4
+            ) o
+            GROUP BY 1, 2, 3
+        ) q
+        GROUP BY 1, 2
+    ), hive_daily AS (
+        SELECT m.beehive_id AS hive_id, m.apiary_id, m.day, COUNT(*) AS inspections,
+               COUNT(*) FILTER (WHERE m.sincronizado = FALSE) AS pending_sync,
+               COALESCE(ha.answers, '{{}}') AS answers
+        FROM m
+        LEFT JOIN hive_answers ha ON ha.beehive_id = m.beehive_id AND ha.day = m.day
+        GROUP BY m.beehive_id, m.apiary_id, m.day, ha.answers
+    ), apiary_daily AS (
+        SELECT h.apiary_id, h.day, SUM(h.inspections)::int AS inspections, COUNT(*)::int AS hives_inspected,
+               SUM(h.pending_sync)::int AS pending_sync, COALESCE(aa.answers, '{{}}') AS answers
+        FROM hive_daily h
+        LEFT JOIN apiary_answers aa ON aa.apiary_id = h.apiary_id AND aa.day = h.day
+        GROUP BY h.apiary_id, h.day, aa.answers
+    )
+'''
+
+# Lo que los resúmenes aún no reflejan y se lee en vivo: días desde la marca de agua,
+# (apiario, día) con monitoreos escritos después de ella (p. ej. sincronizados con
+# fecha pasada) y apiarios con monitoreos borrados después de ella
+STALE_FILTER = '''(
+    m.fecha >= %(live_from)s::date
+    OR m.apiary_id IN (SELECT apiary_id FROM sync_tombstones
+                       WHERE entity = 'monitoreos' AND deleted_at > %(high_water)s)
+    OR (m.apiary_id, m.fecha::date) IN (SELECT apiary_id, fecha::date FROM monitoreos
+                                        WHERE updated_at > %(high_water)s)
+)'''
+
+# Complemento de STALE_FILTER sobre monitoring_rollup_apiary_daily
+ROLLED_FILTER = '''(
+    r.day < %(live_from)s::date
+    AND r.apiary_id NOT IN (SELECT apiary_id FROM sync_tombstones
+                            WHERE entity = 'monitoreos' AND deleted_at > %(high_water)s
+                              AND apiary_id IS NOT NULL)
+    AND (r.apiary_id, r.day) NOT IN (SELECT apiary_id, fecha::date FROM monitoreos
+                                     WHERE updated_at > %(high_water)s)
+)'''
+
+# Consultas compartidas con los manejadores asíncronos (src/asgi/handlers.py)
+HIGH_WATER_SQL = 'SELECT high_water FROM rollup_state WHERE name = %(name)s'
+
+APIARY_TOTALS_SQL = f'''
+    WITH user_apiaries AS (
+        SELECT id, name FROM apiaries WHERE user_id = %(user_id)s
+    ), rolled AS (
+        SELECT r.apiary_id, SUM(r.inspections) AS total, SUM(r.pending_sync) AS pending,
+               COALESCE(SUM(r.inspections) FILTER (WHERE r.day >= %(since)s::timestamp::date), 0) AS recent
+        FROM monitoring_rollup_apiary_daily r
+        WHERE r.apiary_id IN (SELECT id FROM user_apiaries) AND {ROLLED_FILTER}
+        GROUP BY r.apiary_id
+    ), live AS (
+        SELECT m.apiary_id, COUNT(*) AS total,
+               COUNT(*) FILTER (WHERE m.sincronizado = FALSE) AS pending,
+               COUNT(*) FILTER (WHERE m.fecha >= %(since)s) AS recent
+        FROM monitoreos m
+        WHERE m.apiary_id IN (SELECT id FROM user_apiaries) AND {STALE_FILTER}
+        GROUP BY m.apiary_id
+    )
+    SELECT a.id AS apiary_id, a.name,
+           (COALESCE(r.total, 0) + COALESCE(l.total, 0))::int AS total,
+           (COALESCE(r.pending, 0) + COALESCE(l.pending, 0))::int AS pending,
+           (COALESCE(r.recent, 0) + COALESCE(l.recent, 0))::int AS recent
+    FROM user_apiaries a
+    LEFT JOIN rolled r ON r.apiary_id = a.id
+    LEFT JOIN live l ON l.apiary_id = a.id
+    ORDER BY total DESC
+'''
+
+
+def apiary_totals_params(user_id, high_water, since):
+    return {'user_id': user_id, 'high_water': high_water, 'live_from': high_water.date(), 'since': since}
+
+
+class MonitoringRollupModel:
+    """Resúmenes diarios de monitoreos (por colmena y por apiario) para los reportes"""
+
+    @staticmethod
+    def init_db(db):
+        """Crea las tablas de resúmenes diarios y el estado (marca de agua) del proceso"""
+        cursor = db.cursor()
+        try:
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS monitoring_rollup_hive_daily (
+                    hive_id INTEGER NOT NULL,
+                    day DATE NOT NULL,
+                    apiary_id INTEGER NOT NULL,
+                    inspections INTEGER NOT NULL,
+                    pending_sync INTEGER NOT NULL,
+                    answers JSONB NOT NULL DEFAULT '{}',
+                    PRIMARY KEY (hive_id, day),
+                    FOREIGN KEY (hive_id) REFERENCES hives(id) ON DELETE CASCADE
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_rollup_hive_daily_apiary
+                ON monitoring_rollup_hive_daily (apiary_id, day)
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS monitoring_rollup_apiary_daily (
+                    apiary_id INTEGER NOT NULL,
+                    day DATE NOT NULL,
+                    inspections INTEGER NOT NULL,
+                    hives_inspected INTEGER NOT NULL,
+                    pending_sync INTEGER NOT NULL,
+                    answers JSONB NOT NULL DEFAULT '{}',
+                    PRIMARY KEY (apiary_id, day),
+                    FOREIGN KEY (apiary_id) REFERENCES apiaries(id) ON DELETE CASCADE
+                )
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS rollup_state (
+                    name VARCHAR(50) PRIMARY KEY,
+                    high_water TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            # Cambios desde la marca de agua sin recorrer todos los monitoreos
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_monitoreos_updated
+                ON monitoreos (updated_at)
+            ''')
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise e
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def _recompute(cursor, pairs):
+        """Reemplaza los resúmenes de los (apiario, día) indicados recalculándolos desde las tablas base"""
+        if not pairs:
+            return
+        apiary_ids = [apiary_id for apiary_id, _ in pairs]
+        days = [day for _, day in pairs]
+        params = {'apiaries': apiary_ids, 'days': days,
+                  'desde': min(days), 'hasta': max(days) + timedelta(days=1)}
+        targets = 'SELECT * FROM unnest(%(apiaries)s::int[], %(days)s::date[]) AS t(apiary_id, day)'
+
+        cursor.execute(f'''
+            DELETE FROM monitoring_rollup_hive_daily
+            WHERE (apiary_id, day) IN ({targets})
+        ''', params)
+        cursor.execute(f'''
+            DELETE FROM monitoring_rollup_apiary_daily
+            WHERE (apiary_id, day) IN ({targets})
+        ''', params)
+        cursor.execute(ROLLUP_SOURCE_SQL.format(filter=f'(m.apiary_id, m.fecha::date) IN ({targets})') + '''
+            , hive_rows AS (
+                INSERT INTO monitoring_rollup_hive_daily
+                (hive_id, day, apiary_id, inspections, pending_sync, answers)
+                SELECT hive_id, day, apiary_id, inspections, pending_sync, answers FROM hive_daily
+                RETURNING 1
+            )
+            INSERT INTO monitoring_rollup_apiary_daily
+            (apiary_id, day, inspections, hives_inspected, pending_sync, answers)
+            SELECT apiary_id, day, inspections, hives_inspected, pending_sync, answers FROM apiary_daily
+        ''', params)
+
+    @staticmethod
+    def refresh(db):
+        """
+        Actualiza los resúmenes de forma incremental: recalcula solo los (apiario, día)
+        con monitoreos creados o editados desde la marca de agua, y los de apiarios con
+        monitoreos borrados (lápidas de sincronización). Retorna (días recalculados, nueva marca).
+        """
+        cursor = db.cursor()
+        try:
+            cursor.execute('INSERT INTO rollup_state (name) VALUES (%s) ON CONFLICT DO NOTHING', (ROLLUP_NAME,))
+            # El bloqueo de la fila evita dos ejecuciones simultáneas
+            cursor.execute('''
+                SELECT COALESCE(high_water, '-infinity'::timestamp), LOCALTIMESTAMP - %s
+                FROM rollup_state WHERE name = %s FOR UPDATE
+            ''', (ROLLUP_LAG, ROLLUP_NAME))
+            high_water, cutoff = cursor.fetchone()
+
+            cursor.execute('''
+                SELECT DISTINCT apiary_id, fecha::date
+                FROM monitoreos
+                WHERE updated_at > %(high_water)s AND updated_at <= %(cutoff)s
+                UNION
+                SELECT r.apiary_id, r.day
+                FROM monitoring_rollup_apiary_daily r
+                WHERE r.apiary_id IN (
+                    SELECT apiary_id FROM sync_tombstones
+                    WHERE entity = 'monitoreos' AND deleted_at > %(high_water)s AND deleted_at <= %(cutoff)s
+                )
+            ''', {'high_water': high_water, 'cutoff': cutoff})
+            pairs = cursor.fetchall()
+
+            MonitoringRollupModel._recompute(cursor, pairs)
+            cursor.execute('''
+                UPDATE rollup_state SET high_water = %s, updated_at = CURRENT_TIMESTAMP WHERE name = %s
+            ''', (cutoff, ROLLUP_NAME))
+            db.commit()
+            return len(pairs), cutoff
+        except Exception as e:
+            db.rollback()
+            raise e
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def backfill(db, desde, hasta):
+        """Recalcula todos los resúmenes de los días en [desde, hasta) sin mover la marca de agua"""
+        cursor = db.cursor()
+        try:
+            cursor.execute('''
+                SELECT DISTINCT apiary_id, fecha::date FROM monitoreos
+                WHERE fecha >= %(desde)s AND fecha < %(hasta)s
+                UNION
+                SELECT apiary_id, day FROM monitoring_rollup_apiary_daily
+                WHERE day >= %(desde)s AND day < %(hasta)s
+            ''', {'desde': desde, 'hasta': hasta})
+            pairs = cursor.fetchall()
+            MonitoringRollupModel._recompute(cursor, pairs)
+            db.commit()
+            return len(pairs)
+        except Exception as e:
+            db.rollback()
+            raise e
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def get_high_water(db):
+        """Marca de agua del último refresco (None si nunca se ha ejecutado)"""
+        cursor = db.cursor()
+        try:
+            cursor.execute(HIGH_WATER_SQL, {'name': ROLLUP_NAME})
+            row = cursor.fetchone()
+            return row[0] if row else None
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def get_user_totals(db, user_id, high_water, since):
+        """
+        Totales por apiario del usuario: lo resumido hasta `high_water` desde los
+        resúmenes y el resto (ver STALE_FILTER) en vivo. `recent` cuenta los monitoreos desde `since`.
+        """
+        cursor = db.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+        try:
+            cursor.execute(APIARY_TOTALS_SQL, apiary_totals_params(user_id, high_water, since))
+            return [dict(row) for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def get_apiary_daily(db, user_id, desde, hasta, high_water):
+        """
+        Resumen diario por apiario del usuario en [desde, hasta): lo resumido hasta
+        `high_water` desde los resúmenes y el resto (ver STALE_FILTER) calculado en vivo.
+        """
+        params = {'user_id': user_id, 'desde': desde, 'hasta': hasta,
+                  'high_water': high_water, 'live_from': high_water.date()}
+        cursor = db.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+        try:
+            cursor.execute(f'''
+                SELECT r.apiary_id, r.day, r.inspections, r.hives_inspected, r.pending_sync, r.answers
+                FROM monitoring_rollup_apiary_daily r
+                JOIN apiaries a ON a.id = r.apiary_id
+                WHERE a.user_id = %(user_id)s AND r.day >= %(desde)s AND r.day < %(hasta)s AND {ROLLED_FILTER}
+            ''', params)
+            rows = [dict(row) for row in cursor.fetchall()]
+
+            cursor.execute(ROLLUP_SOURCE_SQL.format(
+                filter=f'm.apiary_id IN (SELECT id FROM apiaries WHERE user_id = %(user_id)s) AND {STALE_FILTER}'
+            ) + '''
+                SELECT apiary_id, day, inspections, hives_inspected, pending_sync, answers
+                FROM apiary_daily
+            ''', params)
+            rows.extend(dict(row) for row in cursor.fetchall())
+            return sorted(rows, key=lambda row: (row['day'], row['apiary_id']))
+        finally:
+            cursor.close()
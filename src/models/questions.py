@@ -1,6 +1,27 @@
 import json
 from datetime import datetime
 
+# Consultas compartidas con los manejadores asíncronos (src/asgi/handlers.py);
+# {active_filter} es "AND is_active = TRUE" o vacío
+QUESTIONS_BY_APIARY_SQL = '''
+    SELECT *
+    FROM questions
+    WHERE apiary_id = %(apiary_id)s
+    {active_filter}
+    ORDER BY display_order
+'''
+
+APIARY_VERSION_SQL = '''
+    SELECT MAX(updated_at) AS last_modified, COUNT(*) AS total
+    FROM questions
+    WHERE apiary_id = %(apiary_id)s
+'''
+
+
+def active_filter(active_only):
+    return "AND is_active = TRUE" if active_only else ""
+
+
 class QuestionModel:
     @staticmethod
     def init_db(db):
@@ -27,6 +48,32 @@ class QuestionModel:
             )
             ''')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_questions_apiary ON questions (apiary_id)')
+            # Cuestionario activo ya ordenado y búsqueda por external_id
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_questions_apiary_active_order
+                ON questions (apiary_id, display_order) WHERE is_active = TRUE
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_questions_apiary_external
+                ON questions (apiary_id, external_id) WHERE external_id IS NOT NULL
+            ''')
+
+            # Instantáneas del texto/tipo de cada pregunta tal como se respondió.
+            # question_id no tiene FK: el historial sobrevive al borrado de la pregunta
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS question_versions (
+                id SERIAL PRIMARY KEY,
+                question_id INTEGER,
+                question_text TEXT NOT NULL,
+                question_type TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            ''')
+            cursor.execute('''
+                CREATE UNIQUE INDEX IF NOT EXISTS uq_question_versions_content
+                ON question_versions ((COALESCE(question_id, 0)), question_type, (md5(question_text)))
+            ''')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_question_versions_question ON question_versions (question_id)')
             db.commit()
         except Exception as e:
             db.rollback()
@@ -94,14 +141,30 @@ class QuestionModel:
 
     @staticmethod
     def get_by_apiary(db, apiary_id, active_only=True):
-        query = '''
-            SELECT * 
-            FROM questions 
-            WHERE apiary_id = %s 
-            {}
-            ORDER BY display_order
-        '''.format("AND is_active = TRUE" if active_only else "")
-        return QuestionModel._execute_query(db, query, (apiary_id,))
+        query = QUESTIONS_BY_APIARY_SQL.format(active_filter=active_filter(active_only))
+        return QuestionModel._execute_query(db, query, {'apiary_id': apiary_id})
+
+    @staticmethod
+    def get_apiary_version(db, apiary_id):
+        """Versión del catálogo de preguntas de un apiario para respuestas condicionales"""
+        results = QuestionModel._execute_query(db, APIARY_VERSION_SQL, {'apiary_id': apiary_id})
+        return results[0] if results else None
+
+    @staticmethod
+    def get_hive_version(db, beehive_id):
+        """Versión del catálogo de preguntas del apiario al que pertenece una colmena"""
+        results = QuestionModel._execute_query(
+            db,
+            '''
+            SELECT MAX(q.updated_at) AS last_modified, COUNT(q.id) AS total, h.apiary_id
+            FROM hives h
+            LEFT JOIN questions q ON q.apiary_id = h.apiary_id
+            WHERE h.id = %s
+            GROUP BY h.apiary_id
+            ''',
+            (beehive_id,)
+        )
+        return results[0] if results else None
 
     @staticmethod
     def update(db, question_id, **kwargs):
@@ -152,7 +215,8 @@ class QuestionModel:
             UPDATE questions
             SET display_order = CASE id
                 {case_statements}
-            END
+            END,
+            updated_at = CURRENT_TIMESTAMP
             WHERE apiary_id = %s AND id IN %s
         """
         params = [item for pair in order_data for item in (pair[1], pair[0])]
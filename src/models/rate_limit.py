@@ -0,0 +1,78 @@
+# Tokens disponibles tras recargar la cubeta existente (b) hasta el inicio de la sentencia
+REFILL_SQL = '''LEAST(%(capacity)s::double precision,
+                     b.tokens + EXTRACT(EPOCH FROM statement_timestamp()::timestamp - b.updated_at) * %(rate)s)'''
+
+CONSUME_SQL = '''
+    INSERT INTO rate_limit_buckets AS b (key, tokens, allowed, updated_at)
+    VALUES (%(key)s, %(capacity)s - %(cost)s, TRUE, statement_timestamp())
+    ON CONFLICT (key) DO UPDATE
+    SET tokens = {refill} - CASE WHEN {refill} >= %(cost)s THEN %(cost)s ELSE 0 END,
+        allowed = {refill} >= %(cost)s,
+        updated_at = statement_timestamp()
+    RETURNING allowed, tokens
+'''
+
+
+class RateLimitModel:
+    """Cubetas de tokens compartidas entre workers (RATE_LIMIT_STORAGE=postgresql)"""
+
+    @staticmethod
+    def init_db(db):
+        """Crea la tabla de cubetas (una fila por clave limitada)"""
+        cursor = db.cursor()
+        try:
+            cursor.execute('''
+                CREATE UNLOGGED TABLE IF NOT EXISTS rate_limit_buckets (
+                    key VARCHAR(255) PRIMARY KEY,
+                    tokens DOUBLE PRECISION NOT NULL,
+                    allowed BOOLEAN NOT NULL,
+                    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_rate_limit_buckets_updated
+                ON rate_limit_buckets (updated_at)
+            ''')
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise e
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def consume(db, key, capacity, rate, cost=1):
+        """
+        Recarga la cubeta según el tiempo transcurrido y descuenta `cost` tokens si
+        alcanzan, en una sola sentencia atómica. Retorna (permitido, tokens restantes).
+        """
+        cursor = db.cursor()
+        try:
+            cursor.execute(CONSUME_SQL.format(refill=REFILL_SQL),
+                           {'key': key, 'capacity': capacity, 'rate': rate, 'cost': cost})
+            allowed, tokens = cursor.fetchone()
+            db.commit()
+            return allowed, tokens
+        except Exception as e:
+            db.rollback()
+            raise e
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def purge(db, idle_seconds):
+        """Elimina las cubetas sin uso desde hace más de N segundos (ya estarían llenas)"""
+        cursor = db.cursor()
+        try:
+            cursor.execute('''
+                DELETE FROM rate_limit_buckets
+                WHERE updated_at < LOCALTIMESTAMP - make_interval(secs => %s)
+            ''', (idle_seconds,))
+            deleted = cursor.rowcount
+            db.commit()
+            return deleted
+        except Exception as e:
+            db.rollback()
+            raise e
+        finally:
+            cursor.close()
@@ -0,0 +1,210 @@
+import base64
+from datetime import datetime, timedelta
+import psycopg2.extras
+from .monitoreo import RESPUESTAS_SELECT
+
+
+# Tablas que el cliente móvil mantiene sincronizadas
+SYNC_ENTITIES = ('apiaries', 'hives', 'inventory', 'questions', 'monitoreos')
+
+# updated_at y deleted_at guardan el inicio de la transacción que escribe, no su commit:
+# una transacción abierta ahora puede confirmar después filas más antiguas que este
+# instante. La marca de agua no puede pasar del inicio de la transacción abierta más
+# antigua de la base de datos. Sin permisos (pg_read_all_stats) las sesiones de otros
+# roles solo muestran su base de datos: `hidden` indica que hay alguna
+WATERMARK_SQL = '''
+    SELECT LOCALTIMESTAMP AS now,
+           MIN(xact_start)::timestamp AS oldest_xact,
+           COALESCE(bool_or(backend_type IS NULL), false) AS hidden
+    FROM pg_stat_activity
+    WHERE datname = current_database()
+      AND (backend_type = 'client backend' OR backend_type IS NULL)
+      AND pid <> pg_backend_pid()
+'''
+
+
+class SyncModel:
+    """Sincronización incremental: cambios desde una marca de agua y lápidas de borrado"""
+
+    @staticmethod
+    def init_db(db):
+        """Crea la tabla de lápidas, los triggers de borrado y los índices por updated_at"""
+        cursor = db.cursor()
+        try:
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS sync_tombstones (
+                    id BIGSERIAL PRIMARY KEY,
+                    entity VARCHAR(30) NOT NULL,
+                    entity_id INTEGER NOT NULL,
+                    user_id INTEGER,
+                    apiary_id INTEGER,
+                    deleted_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_sync_tombstones_user
+                ON sync_tombstones (user_id, deleted_at)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_sync_tombstones_apiary
+                ON sync_tombstones (apiary_id, deleted_at)
+            ''')
+
+            # Los hijos borrados en cascada ya no encuentran su apiario: quedan con user_id NULL
+            # y el cliente los descarta al recibir la lápida del apiario. En tablas
+            # particionadas el trigger corre en la partición: se registra la tabla raíz
+            cursor.execute('''
+                CREATE OR REPLACE FUNCTION sync_record_tombstone() RETURNS trigger AS $$
+                DECLARE
+                    v_user_id INTEGER;
+                    v_apiary_id INTEGER;
+                    v_entity TEXT := COALESCE(pg_partition_root(TG_RELID), TG_RELID)::regclass::text;
+                BEGIN
+                    IF TG_TABLE_NAME = 'apiaries' THEN
+                        v_apiary_id := OLD.id;
+                        v_user_id := OLD.user_id;
+                    ELSE
+                        v_apiary_id := OLD.apiary_id;
+                        SELECT user_id INTO v_user_id FROM apiaries WHERE id = OLD.apiary_id;
+                    END IF;
+
+                    INSERT INTO sync_tombstones (entity, entity_id, user_id, apiary_id)
+                    VALUES (v_entity, OLD.id, v_user_id, v_apiary_id);
+                    RETURN OLD;
+                END;
+                $$ LANGUAGE plpgsql
+            ''')
+
+            for table in SYNC_ENTITIES:
+                cursor.execute(f'DROP TRIGGER IF EXISTS trg_{table}_tombstone ON {table}')
+                cursor.execute(f'''
+                    CREATE TRIGGER trg_{table}_tombstone
+                    AFTER DELETE ON {table}
+                    FOR EACH ROW EXECUTE FUNCTION sync_record_tombstone()
+                ''')
+
+            # Índices para que una sincronización sin cambios cueste solo unas lecturas de índice
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_apiaries_user_updated ON apiaries (user_id, updated_at)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_hives_apiary_updated ON hives (apiary_id, updated_at)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_inventory_apiary_updated ON inventory (apiary_id, updated_at)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_questions_apiary_updated ON questions (apiary_id, updated_at)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_monitoreos_apiary_updated ON monitoreos (apiary_id, updated_at)')
+
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise e
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def encode_token(watermark):
+        """Convierte la marca de agua en un token opaco para el cliente"""
+        return base64.urlsafe_b64encode(watermark.isoformat().encode('utf-8')).decode('ascii').rstrip('=')
+
+    @staticmethod
+    def decode_token(token):
+        """Obtiene la marca de agua de un token; lanza ValueError si es inválido"""
+        try:
+            padded = token + '=' * (-len(token) % 4)
+            return datetime.fromisoformat(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+        except Exception:
+            raise ValueError("Token de sincronización inválido")
+
+    @staticmethod
+    def get_changes(db, user_id, since=None, safety_window_seconds=5, max_transaction_seconds=60):
+        """
+        Retorna las filas insertadas/actualizadas y las lápidas posteriores a `since`
+        para todos los apiarios del usuario. Con since=None retorna una instantánea completa.
+        max_transaction_seconds acota las transacciones que no se pueden ver en
+        pg_stat_activity (el plazo máximo de una petición).
+        """
+        cursor = db.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+        try:
+            # Antes de leer los datos: lo que confirme después una transacción ya abierta
+            # queda por encima de la marca de agua y llega en la próxima sincronización
+            cursor.execute(WATERMARK_SQL)
+            row = cursor.fetchone()
+            watermark = row['now']
+            if row['oldest_xact'] is not None:
+                watermark = min(watermark, row['oldest_xact'])
+            if row['hidden']:
+                watermark = min(watermark, row['now'] - timedelta(seconds=max_transaction_seconds))
+            # Margen para sesiones que empiezan mientras se lee pg_stat_activity
+            watermark -= timedelta(seconds=safety_window_seconds)
+
+            cursor.execute('SELECT id FROM apiaries WHERE user_id = %s', (user_id,))
+            apiary_ids = [row['id'] for row in cursor.fetchall()]
+
+            changes = {}
+            if since is None:
+                cursor.execute('SELECT * FROM apiaries WHERE user_id = %s ORDER BY id', (user_id,))
+            else:
+                cursor.execute(
+                    'SELECT * FROM apiaries WHERE user_id = %s AND updated_at > %s ORDER BY id',
+                    (user_id, since))
+            changes['apiaries'] = [dict(row) for row in cursor.fetchall()]
+
+            for table in ('hives', 'inventory', 'questions', 'monitoreos'):
+                if not apiary_ids:
+                    changes[table] = []
+                    continue
+                if since is None:
+                    cursor.execute(
+                        f'SELECT * FROM {table} WHERE apiary_id = ANY(%s) ORDER BY id',
+                        (apiary_ids,))
+                else:
+                    cursor.execute(
+                        f'SELECT * FROM {table} WHERE apiary_id = ANY(%s) AND updated_at > %s ORDER BY id',
+                        (apiary_ids, since))
+                changes[table] = [dict(row) for row in cursor.fetchall()]
+
+            # Las respuestas no cambian después de crearse: viajan con su monitoreo
+            monitoreo_ids = [m['id'] for m in changes['monitoreos']]
+            respuestas_map = {}
+            if monitoreo_ids:
+                fechas = [m['fecha'] for m in changes['monitoreos']]
+                cursor.execute(RESPUESTAS_SELECT + '''
+                    WHERE r.monitoreo_id = ANY(%s) AND r.fecha BETWEEN %s AND %s
+                    ORDER BY r.id
+                ''', (monitoreo_ids, min(fechas), max(fechas)))
+                for respuesta in cursor.fetchall():
+                    respuestas_map.setdefault(respuesta['monitoreo_id'], []).append(dict(respuesta))
+            for monitoreo in changes['monitoreos']:
+                monitoreo['respuestas'] = respuestas_map.get(monitoreo['id'], [])
+
+            deleted = {table: [] for table in SYNC_ENTITIES}
+            if since is not None:
+                cursor.execute('''
+                    SELECT entity, entity_id FROM sync_tombstones
+                    WHERE user_id = %s AND deleted_at > %s
+                    UNION
+                    SELECT entity, entity_id FROM sync_tombstones
+                    WHERE apiary_id = ANY(%s) AND deleted_at > %s
+                ''', (user_id, since, apiary_ids, since))
+                for row in cursor.fetchall():
+                    deleted.setdefault(row['entity'], []).append(row['entity_id'])
+
+            return {
+                'watermark': watermark,
+                'changes': changes,
+                'deleted': deleted
+            }
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def prune_tombstones(db, older_than_days=90):
+        """Elimina lápidas más antiguas que el período de retención"""
+        cursor = db.cursor()
+        try:
+            cursor.execute(
+                'DELETE FROM sync_tombstones WHERE deleted_at < LOCALTIMESTAMP - %s * INTERVAL \'1 day\'',
+                (older_than_days,))
+            db.commit()
+            return cursor.rowcount
+        except Exception as e:
+            db.rollback()
+            raise e
+        finally:
+            cursor.close()
@@ -0,0 +1,76 @@
+class UserShardModel:
+    """Directorio usuario -> fragmento (solo en el fragmento 'default')"""
+
+    @staticmethod
+    def init_db(db):
+        """Crea el directorio; los usuarios sin fila viven en 'default'"""
+        cursor = db.cursor()
+        try:
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS user_shards (
+                    user_id INTEGER PRIMARY KEY,
+                    shard VARCHAR(50) NOT NULL,
+                    status VARCHAR(10) NOT NULL DEFAULT 'active'
+                        CHECK (status IN ('active', 'frozen')),
+                    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_user_shards_shard
+                ON user_shards (shard)
+            ''')
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise e
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def get(db, user_id):
+        """(fragmento, estado) del usuario, o None si no tiene fila (fragmento 'default')"""
+        cursor = db.cursor()
+        try:
+            cursor.execute('SELECT shard, status FROM user_shards WHERE user_id = %s', (user_id,))
+            row = cursor.fetchone()
+            return tuple(row) if row else None
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def assign(db, user_id, shard, status='active'):
+        """Asigna (o congela con status='frozen') el fragmento del usuario"""
+        cursor = db.cursor()
+        try:
+            cursor.execute('''
+                INSERT INTO user_shards (user_id, shard, status)
+                VALUES (%s, %s, %s)
+                ON CONFLICT (user_id) DO UPDATE
+                SET shard = EXCLUDED.shard, status = EXCLUDED.status, updated_at = CURRENT_TIMESTAMP
+            ''', (user_id, shard, status))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise e
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def summary(db):
+        """Usuarios por fragmento y estado (los usuarios sin fila cuentan en 'default')"""
+        cursor = db.cursor()
+        try:
+            cursor.execute('''
+                SELECT COALESCE(s.shard, 'default') AS shard, COALESCE(s.status, 'active') AS status,
+                       COUNT(*) AS users,
+                       ARRAY_AGG(u.id ORDER BY u.id) FILTER (WHERE s.status = 'frozen') AS frozen
+                FROM users u
+                LEFT JOIN user_shards s ON s.user_id = u.id
+                GROUP BY 1, 2
+                ORDER BY 1, 2
+            ''')
+            columns = [desc[0] for desc in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        finally:
+            cursor.close()
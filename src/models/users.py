@@ -1,4 +1,5 @@
 import bcrypt
+import json
 from datetime import datetime, timedelta
 from flask import current_app
 
@@ -94,6 +95,67 @@ class UserModel:
         finally:
             cursor.close()
 
+    @staticmethod
+    def create_with_apiaries(db, nombre, username, email, phone, password, apiaries, profile_picture=None):
+        """
+        Registra usuario, apiarios e inventario inicial en una sola sentencia atómica.
+
+        `apiaries` es una lista de diccionarios con name, location, beehives_count y
+        treatments. Es idempotente: si el username o el email ya existen no se crea
+        nada y retorna None; si no, retorna {'user_id', 'profile_picture', 'apiaries'}.
+        """
+        from .inventory import InventoryModel, STARTER_INVENTORY_ROWS
+
+        if profile_picture is None:
+            profile_picture = 'profile_picture.png'
+        apiaries_json = json.dumps([{
+            'name': a['name'],
+            'location': a.get('location'),
+            'beehives_count': a.get('beehives_count', 0),
+            'treatments': a.get('treatments', False)
+        } for a in apiaries])
+
+        cursor = db.cursor()
+        try:
+            cursor.execute(f'''
+                WITH new_user AS (
+                    INSERT INTO users (nombre, username, email, phone, password, profile_picture)
+                    VALUES (%s, %s, %s, %s, %s, %s)
+                    ON CONFLICT DO NOTHING
+                    RETURNING id, profile_picture
+                ), new_apiaries AS (
+                    INSERT INTO apiaries (user_id, name, location, beehives_count, treatments)
+                    SELECT u.id, a.name, a.location, a.beehives_count, a.treatments
+                    FROM new_user u
+                    CROSS JOIN ROWS FROM (
+                        jsonb_to_recordset(%s::jsonb)
+                            AS (name TEXT, location TEXT, beehives_count INTEGER, treatments BOOLEAN)
+                    ) WITH ORDINALITY AS a(name, location, beehives_count, treatments, position)
+                    ORDER BY a.position
+                    RETURNING id, name, location
+                ), starter AS (
+                    INSERT INTO inventory (apiary_id, name, quantity, unit, description, minimum_stock)
+                    SELECT na.id, t.name, t.quantity, t.unit, t.description, t.minimum_stock
+                    FROM new_apiaries na CROSS JOIN {STARTER_INVENTORY_ROWS}
+                )
+                SELECT u.id, u.profile_picture,
+                       (SELECT json_agg(json_build_object('id', id, 'name', name, 'location', location) ORDER BY id)
+                        FROM new_apiaries) AS apiaries
+                FROM new_user u
+            ''', (nombre, username.lower(), email.lower(), phone, password, profile_picture,
+                  apiaries_json, InventoryModel.starter_inventory()))
+            row = cursor.fetchone()
+            db.commit()
+            if row is None:
+                return None
+            return {'user_id': row[0], 'profile_picture': row[1], 'apiaries': row[2] or []}
+        except Exception as e:
+            db.rollback()
+            current_app.logger.error(f"Error registrando usuario: {str(e)}")
+            raise e
+        finally:
+            cursor.close()
+
     @staticmethod
     def get_by_id(db, user_id):
         """Obtiene usuario por ID"""
@@ -104,6 +166,23 @@ class UserModel:
         )
         return results[0] if results else None
 
+    @staticmethod
+    def get_profile_version(db, user_id):
+        """Versión del perfil (usuario y sus apiarios) para respuestas condicionales"""
+        results = UserModel._execute_query(
+            db,
+            '''
+            SELECT GREATEST(u.updated_at, MAX(a.updated_at)) AS last_modified,
+                   COUNT(a.id) AS total
+            FROM users u
+            LEFT JOIN apiaries a ON a.user_id = u.id
+            WHERE u.id = %s
+            GROUP BY u.id
+            ''',
+            (user_id,)
+        )
+        return results[0] if results else None
+
     @staticmethod
     def get_by_username(db, username):
         """Obtiene usuario por username"""
@@ -3,11 +3,16 @@ from ..controllers.apiary import ApiaryController
 from src.database.db import get_db
 from src.models.users import UserModel
 from src.middleware.jwt import jwt_required
+from src.middleware.tenant import tenant_db
+from src.middleware.conditional import conditional_get
+from src.models.apiary import ApiaryModel
 
 def create_apiary_routes():
     apiary_bp = Blueprint('apiary_routes', __name__)
 
     @apiary_bp.route('/apiaries', methods=['POST'])
+    @jwt_required
+    @tenant_db
     def create_apiary():
         db = get_db()
         controller = ApiaryController(db)
@@ -16,6 +21,10 @@ def create_apiary_routes():
         if 'user_id' not in data or 'name' not in data:
             return jsonify({'error': 'User ID and name are required'}), 400
 
+        # El apiario se escribe en el fragmento del usuario autenticado
+        if int(data['user_id']) != int(g.current_user_id):
+            return jsonify({'error': 'Acceso no autorizado'}), 403
+
         # Validar existencia del usuario
         user = UserModel.get_by_id(db, data['user_id'])
         if not user:
@@ -31,12 +40,13 @@ def create_apiary_routes():
                 return jsonify({'error': 'Apiary could not be created'}), 400
             db.commit()
             # El inventario se crea vacío automáticamente al crear el apiario
-            return jsonify({'id': apiary_id, 'message': 'Apiario creado con inventario vacío'}), 201
+            return jsonify({'id': apiary_id, 'message': 'Apiario creado con inventario inicial'}), 201
         except Exception as e:
             db.rollback()
             return jsonify({'error': str(e)}), 500
 
     @apiary_bp.route('/apiaries/<int:apiary_id>', methods=['GET'])
+    @conditional_get(lambda apiary_id: ApiaryModel.get_version(get_db(), apiary_id))
     def get_apiary(apiary_id):
         db = get_db()
         controller = ApiaryController(db)
@@ -50,6 +60,7 @@ def create_apiary_routes():
 
     @apiary_bp.route('/users/<int:user_id>/apiaries', methods=['GET'])
     @jwt_required
+    @tenant_db
     def get_user_apiaries(user_id):
         # Acceso solo permitido al usuario autenticado
         if int(g.current_user_id) != user_id:
@@ -69,12 +80,17 @@ def create_apiary_routes():
             return jsonify({'error': str(e)}), 500
 
     @apiary_bp.route('/apiaries/<int:apiary_id>', methods=['PUT'])
+    @jwt_required
+    @tenant_db
     def update_apiary(apiary_id):
         db = get_db()
         controller = ApiaryController(db)
         data = request.get_json()
         if not data:
             return jsonify({'error': 'No data provided'}), 400
+        # Pasarlo a otro usuario lo dejaría en un fragmento que no es el suyo
+        if 'user_id' in data and int(data['user_id']) != int(g.current_user_id):
+            return jsonify({'error': 'Acceso no autorizado'}), 403
         try:
             updated = controller.update_apiary(apiary_id, **data)
             if not updated:
@@ -84,6 +100,8 @@ def create_apiary_routes():
             return jsonify({'error': str(e)}), 400
 
     @apiary_bp.route('/apiaries/<int:apiary_id>', methods=['DELETE'])
+    @jwt_required
+    @tenant_db
     def delete_apiary(apiary_id):
         db = get_db()
         controller = ApiaryController(db)
@@ -97,6 +115,8 @@ def create_apiary_routes():
 
     @apiary_bp.route('/apiaries', methods=['GET'])
     @jwt_required
+    @tenant_db
+    @conditional_get(lambda: ApiaryModel.get_user_version(get_db(), g.current_user_id))
     def get_authenticated_user_apiaries():
         db = get_db()
         controller = ApiaryController(db)
@@ -112,27 +132,4 @@ def create_apiary_routes():
         except Exception as e:
             return jsonify({'error':str(e)}),500
         
-    @apiary_bp.route('/health', methods=['GET'])
-    def health_check():
-        db = get_db()
-        try:
-            # Crear un cursor y verificar conexión a la base de datos
-            cursor = db.cursor()
-            cursor.execute("SELECT 1")
-            cursor.close()
-            
-            return jsonify({
-                'status': 'healthy',
-                'service': 'apiaries',
-                'message': 'Service is running normally',
-                'database': 'PostgreSQL connection successful'
-            }), 200
-        except Exception as e:
-            return jsonify({
-                'status': 'unhealthy',
-                'error': str(e),
-                'message': 'Database connection failed',
-                'database': 'PostgreSQL connection failed'
-            }),500
-
     return apiary_bp
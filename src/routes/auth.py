@@ -2,16 +2,13 @@ from flask import Blueprint, request, jsonify, current_app
 from src.models.users import UserModel
 from src.database.db import get_db
 from src.middleware.jwt import generate_token
+from src.middleware.rate_limit import rate_limit
 from src.controllers.auth import AuthController
 from src.utils.email_service import EmailService
-from src.models.apiary import ApiaryModel
 import bcrypt
 
 def create_auth_routes(get_db_func, email_service):
     auth_bp = Blueprint('auth_routes', __name__)
-    
-    # Usar get_db_func en lugar de get_db() directamente
-    auth_controller = AuthController(db=get_db_func(), mail_service=email_service)
 
     def clean_user_input(data):
         """Limpia y normaliza los datos de entrada de manera segura"""
@@ -101,85 +98,56 @@ def create_auth_routes(get_db_func, email_service):
             if not apiarios or not isinstance(apiarios, list) or len(apiarios) == 0:
                 return jsonify({'error': 'At least one apiary is required'}), 400
 
-            # Crear usuario
+            # Validar y normalizar los apiarios antes de escribir nada
+            apiaries_data = []
+            for apiario in apiarios:
+                # Validar campos mínimos
+                if 'apiary_name' not in apiario or not apiario['apiary_name'].strip():
+                    return jsonify({'error': 'Failed to create apiaries', 'details': 'Apiary name is required'}), 400
+                
+                # Convertir beehives_count
+                try:
+                    beehives_count = int(apiario.get('beehives_count', 0))
+                except (TypeError, ValueError):
+                    beehives_count = 0
+                
+                # Convertir treatments a booleano
+                treatments = apiario.get('treatments', False)
+                if isinstance(treatments, str):
+                    treatments = treatments.lower() in ['true', '1', 'yes', 'verdadero']
+                else:
+                    treatments = bool(treatments)
+                
+                apiaries_data.append({
+                    'name': apiario['apiary_name'].strip(),
+                    'location': apiario.get('location', 'Ubicación no especificada').strip(),
+                    'beehives_count': beehives_count,
+                    'treatments': treatments
+                })
+
+            # Crear usuario, apiarios e inventario inicial en una sola sentencia atómica
             hashed_password = bcrypt.hashpw(cleaned_data['password'].encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-            user_id = UserModel.create(
+            result = UserModel.create_with_apiaries(
                 db,
                 nombre=cleaned_data['nombre'],
                 username=cleaned_data['username'],
                 email=cleaned_data['email'],
                 phone=cleaned_data['phone'],
                 password=hashed_password,
+                apiaries=apiaries_data,
                 profile_picture=data.get('profile_pictures')
             )
 
-            if not user_id:
-                current_app.logger.error('User creation returned invalid ID')
-                return jsonify({'error': 'User creation failed'}), 500
+            if result is None:
+                current_app.logger.warning(f"Registration conflict for username {cleaned_data['username']}")
+                return jsonify({'error': 'Username or email already registered'}), 409
             
-            # Crear apiarios asociados
-            created_apiaries = []
-            try:
-                for apiario in apiarios:
-                    # Validar campos mínimos
-                    if 'apiary_name' not in apiario or not apiario['apiary_name'].strip():
-                        raise ValueError("Apiary name is required")
-                    
-                    # Procesar campos
-                    apiary_name = apiario['apiary_name'].strip()
-                    location = apiario.get('location', 'Ubicación no especificada').strip()
-                    
-                    # Convertir beehives_count
-                    try:
-                        beehives_count = int(apiario.get('beehives_count', 0))
-                    except (TypeError, ValueError):
-                        beehives_count = 0
-                    
-                    # Convertir treatments a booleano
-                    treatments = apiario.get('treatments', False)
-                    if isinstance(treatments, str):
-                        treatments = treatments.lower() in ['true', '1', 'yes', 'verdadero']
-                    else:
-                        treatments = bool(treatments)
-                    
-                    # Crear apiario
-                    apiary_id = ApiaryModel.create(
-                        db,
-                        user_id=user_id,
-                        name=apiary_name,
-                        location=location,
-                        beehives_count=beehives_count,
-                        treatments=treatments
-                    )
-                    
-                    if not apiary_id or apiary_id <= 0:
-                        current_app.logger.error(f'Apiary creation failed for: {apiary_name}')
-                        continue
-                    
-                    created_apiaries.append({
-                        'id': apiary_id,
-                        'name': apiary_name,
-                        'location': location
-                    })
-                    
-                    current_app.logger.debug(f"Apiary created: ID {apiary_id} - {apiary_name}")
-                
-                if len(created_apiaries) == 0:
-                    raise RuntimeError("No apiaries were created successfully")
-                    
-            except Exception as apiary_error:
-                current_app.logger.error(f"Apiary creation error: {str(apiary_error)}")
-                UserModel.delete(db, user_id)
-                return jsonify({'error': 'Failed to create apiaries', 'details': str(apiary_error)}), 500
-
-            # Obtener usuario creado
-            user_data = UserModel.get_by_id(db, user_id)
-            if not user_data:
-                current_app.logger.error(f'User not found after creation, ID: {user_id}')
-                return jsonify({'error': 'User retrieval failed'}), 500
+            user_id = result['user_id']
+            created_apiaries = result['apiaries']
+            current_app.logger.debug(f"User {user_id} created with apiaries: {created_apiaries}")
             
             # Añadir URL de la foto de perfil
-            user_data = get_user_with_profile(user_data)
+            user_data = get_user_with_profile({'profile_picture': result['profile_picture']})
             
             token = generate_token(user_id, {
                 'username': cleaned_data['username'],
@@ -208,6 +176,7 @@ def create_auth_routes(get_db_func, email_service):
 
 
     @auth_bp.route('/login', methods=['POST'])
+    @rate_limit('login')
     def auth_login():
         try:
             if not request.is_json:
@@ -314,6 +283,7 @@ def create_auth_routes(get_db_func, email_service):
         
     # Forgot Password    
     @auth_bp.route('/forgot-password', methods=['POST'])
+    @rate_limit('forgot_password', identifier_fields=('email',))
     def forgot_password():
         try:
             # Obtener conexión de base de datos
@@ -1,11 +1,19 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, g
 from ..controllers.beehive import HiveController
+from ..controllers.hive_health import HiveHealthController
 from ..database.db import get_db
+from ..middleware.conditional import conditional_get
+from ..middleware.deadline import deadline
+from ..middleware.jwt import jwt_required
+from ..middleware.tenant import tenant_db
+from ..models.hive import HiveModel
 
 def create_hive_routes():
     hive_bp = Blueprint('hive_routes', __name__)
 
     @hive_bp.route('/apiaries/<int:apiary_id>/hives', methods=['POST'])
+    @jwt_required
+    @tenant_db
     def create_hive(apiary_id):
         db = get_db()
         controller = HiveController(db)
@@ -28,6 +36,7 @@ def create_hive_routes():
             return jsonify({'error': str(e)}), 400
 
     @hive_bp.route('/hives/<int:hive_id>', methods=['GET'])
+    @conditional_get(lambda hive_id: HiveModel.get_version(get_db(), hive_id))
     def get_hive(hive_id):
         db = get_db()
         controller = HiveController(db)
@@ -46,6 +55,8 @@ def create_hive_routes():
         return jsonify(hives), 200
 
     @hive_bp.route('/hives/<int:hive_id>', methods=['PUT'])
+    @jwt_required
+    @tenant_db
     def update_hive(hive_id):
         db = get_db()
         controller = HiveController(db)
@@ -61,6 +72,8 @@ def create_hive_routes():
             return jsonify({'error': str(e)}), 400
 
     @hive_bp.route('/hives/<int:hive_id>', methods=['DELETE'])
+    @jwt_required
+    @tenant_db
     def delete_hive(hive_id):
         db = get_db()
         controller = HiveController(db)
@@ -81,4 +94,21 @@ def create_hive_routes():
             return jsonify({'error': 'Hive not found'}), 404
         return jsonify(hive), 200
 
+    @hive_bp.route('/hives/health', methods=['GET'])
+    @deadline('analytics')
+    @jwt_required
+    @tenant_db
+    def get_hives_health():
+        """Puntuación de salud y riesgos de las colmenas del usuario (?apiary_id=&refresh=true)"""
+        db = get_db()
+        controller = HiveHealthController(db)
+
+        apiary_id = request.args.get('apiary_id', type=int)
+        refresh = request.args.get('refresh', '').lower() in ('1', 'true')
+        try:
+            health = controller.get_user_health(g.current_user_id, refresh, apiary_id)
+            return jsonify(health), 200
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
     return hive_bp
@@ -3,12 +3,16 @@ from ..controllers.inventory import InventoryController
 from ..controllers.apiary import ApiaryController
 from src.database.db import get_db
 from src.middleware.jwt import jwt_required
+from src.middleware.tenant import tenant_db
+from src.middleware.conditional import conditional_get
+from src.models.inventory import InventoryModel
 
 def create_inventory_routes():
     inventory_bp = Blueprint('inventory_routes', __name__)
 
     @inventory_bp.route('/apiaries/<int:apiary_id>/inventory', methods=['POST'])
     @jwt_required
+    @tenant_db
     def create_item(apiary_id):
         db = get_db()
         inventory_controller = InventoryController(db)
@@ -41,6 +45,7 @@ def create_inventory_routes():
 
     @inventory_bp.route('/inventory/<int:item_id>', methods=['GET'])
     @jwt_required
+    @tenant_db
     def get_item(item_id):
         db = get_db()
         controller = InventoryController(db)
@@ -58,6 +63,8 @@ def create_inventory_routes():
 
     @inventory_bp.route('/apiaries/<int:apiary_id>/inventory', methods=['GET'])
     @jwt_required
+    @tenant_db
+    @conditional_get(lambda apiary_id: InventoryModel.get_apiary_version(get_db(), apiary_id, g.current_user_id))
     def get_apiary_items(apiary_id):
         db = get_db()
         inventory_controller = InventoryController(db)
@@ -74,6 +81,7 @@ def create_inventory_routes():
 
     @inventory_bp.route('/user/inventory', methods=['GET'])
     @jwt_required
+    @tenant_db
     def get_user_inventory():
         db = get_db()
         controller = InventoryController(db)
@@ -83,6 +91,7 @@ def create_inventory_routes():
 
     @inventory_bp.route('/apiaries/<int:apiary_id>/inventory/summary', methods=['GET'])
     @jwt_required
+    @tenant_db
     def get_apiary_summary(apiary_id):
         db = get_db()
         inventory_controller = InventoryController(db)
@@ -99,6 +108,7 @@ def create_inventory_routes():
 
     @inventory_bp.route('/apiaries/<int:apiary_id>/inventory/low-stock', methods=['GET'])
     @jwt_required
+    @tenant_db
     def get_low_stock_items(apiary_id):
         db = get_db()
         inventory_controller = InventoryController(db)
@@ -113,9 +123,26 @@ def create_inventory_routes():
         items = inventory_controller.get_low_stock_items(apiary_id)
         return jsonify(items), 200
 
+    @inventory_bp.route('/apiaries/<int:apiary_id>/inventory/alerts', methods=['GET'])
+    @jwt_required
+    @tenant_db
+    def get_stock_alerts(apiary_id):
+        db = get_db()
+        inventory_controller = InventoryController(db)
+        apiary_controller = ApiaryController(db)
+        user_id = g.current_user_id
+        
+        # Verificar que el usuario es propietario del apiario
+        apiary = apiary_controller.get_by_id(apiary_id)
+        if not apiary or apiary['user_id'] != user_id:
+            return jsonify({'error': 'Apiario no encontrado o acceso denegado'}), 404
+
+        limit = min(request.args.get('limit', 50, type=int), 500)
+        return jsonify(inventory_controller.get_stock_alerts(apiary_id, limit)), 200
 
     @inventory_bp.route('/inventory/<int:item_id>', methods=['PUT'])
     @jwt_required
+    @tenant_db
     def update_item(item_id):
         db = get_db()
         controller = InventoryController(db)
@@ -139,6 +166,7 @@ def create_inventory_routes():
 
     @inventory_bp.route('/inventory/<int:item_id>', methods=['DELETE'])
     @jwt_required
+    @tenant_db
     def delete_item(item_id):
         db = get_db()
         controller = InventoryController(db)
@@ -156,6 +184,7 @@ def create_inventory_routes():
 
     @inventory_bp.route('/apiaries/<int:apiary_id>/inventory/delete_by_name', methods=['DELETE'])
     @jwt_required
+    @tenant_db
     def delete_by_name(apiary_id):
         db = get_db()
         inventory_controller = InventoryController(db)
@@ -179,6 +208,7 @@ def create_inventory_routes():
 
     @inventory_bp.route('/apiaries/<int:apiary_id>/inventory/search', methods=['GET'])
     @jwt_required
+    @tenant_db
     def search_items(apiary_id):
         db = get_db()
         inventory_controller = InventoryController(db)
@@ -193,12 +223,37 @@ def create_inventory_routes():
         query = request.args.get('query')
         if not query:
             return jsonify({'error': 'Parámetro de búsqueda requerido'}), 400
-            
-        items = inventory_controller.search_items(apiary_id, query)
+
+        limit = max(1, min(request.args.get('limit', 20, type=int), 100))
+        try:
+            items = inventory_controller.search_items(user_id, query, apiary_id, limit)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        return jsonify(items), 200
+
+    @inventory_bp.route('/inventory/search', methods=['GET'])
+    @jwt_required
+    @tenant_db
+    def search_user_items():
+        """Búsqueda en el inventario de todos los apiarios del usuario"""
+        db = get_db()
+        controller = InventoryController(db)
+        user_id = g.current_user_id
+
+        query = request.args.get('query')
+        if not query:
+            return jsonify({'error': 'Parámetro de búsqueda requerido'}), 400
+
+        limit = max(1, min(request.args.get('limit', 20, type=int), 100))
+        try:
+            items = controller.search_items(user_id, query, limit=limit)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         return jsonify(items), 200
 
     @inventory_bp.route('/inventory/<int:item_id>/adjust', methods=['PUT'])
     @jwt_required   
+    @tenant_db
     def adjust_quantity(item_id):
         db = get_db()
         controller = InventoryController(db)
@@ -214,11 +269,53 @@ def create_inventory_routes():
 
         try:
             amount = int(data['amount'])
-            controller.adjust_quantity(item_id, amount)
+            controller.adjust_quantity(item_id, amount, user_id, data.get('reason'))
             return jsonify({'message': 'Cantidad ajustada exitosamente'}), 200
         except ValueError:
             return jsonify({'error': 'La cantidad debe ser un número entero'}), 400
         except Exception as e:
             return jsonify({'error': f'Error al ajustar cantidad: {str(e)}'}), 500
 
+    @inventory_bp.route('/inventory/adjust', methods=['POST'])
+    @jwt_required
+    @tenant_db
+    def adjust_quantities():
+        """
+        Ajuste por lotes: {"reason": "cosecha", "adjustments": [{"item_id": 1, "amount": -2}, ...]}.
+        Se aplica todo o nada y responde con los ítems ajustados y los que quedaron con stock bajo.
+        """
+        db = get_db()
+        controller = InventoryController(db)
+        user_id = g.current_user_id
+
+        data = request.get_json()
+        if not data or 'adjustments' not in data:
+            return jsonify({'error': 'Los ajustes son requeridos'}), 400
+
+        try:
+            result = controller.adjust_quantities(user_id, data['adjustments'], data.get('reason'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'error': f'Error al ajustar cantidades: {str(e)}'}), 500
+
+        if result is None:
+            return jsonify({'error': 'Item no encontrado o acceso denegado'}), 404
+        return jsonify(result), 200
+
+    @inventory_bp.route('/inventory/<int:item_id>/movements', methods=['GET'])
+    @jwt_required
+    @tenant_db
+    def get_movements(item_id):
+        db = get_db()
+        controller = InventoryController(db)
+        user_id = g.current_user_id
+
+        # Verificar acceso del usuario al item
+        if not controller.validate_user_access(item_id, user_id):
+            return jsonify({'error': 'Item no encontrado o acceso denegado'}), 404
+
+        limit = min(request.args.get('limit', 50, type=int), 500)
+        return jsonify(controller.get_movements(item_id, limit)), 200
+
     return inventory_bp
@@ -0,0 +1,25 @@
+from flask import Blueprint, jsonify, g
+from src.database.db import get_db
+from src.middleware.jwt import jwt_required
+from src.models.jobs import JobModel
+
+
+def create_job_routes():
+    job_bp = Blueprint('job_routes', __name__)
+
+    @job_bp.route('/jobs/<int:job_id>', methods=['GET'])
+    @jwt_required
+    def get_job(job_id):
+        """Estado de un trabajo encolado (las respuestas 202 incluyen su status_url)"""
+        db = get_db()
+
+        try:
+            job = JobModel.get(db, job_id)
+            if not job or job['user_id'] not in (None, g.current_user_id):
+                return jsonify({'error': 'Trabajo no encontrado'}), 404
+            job.pop('user_id')
+            return jsonify(job), 200
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
+    return job_bp
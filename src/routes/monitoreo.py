@@ -2,12 +2,32 @@ from flask import Blueprint, request, jsonify, g
 from datetime import datetime 
 from src.controllers.monitoreo import MonitoreoController
 from src.database.db import get_db
+from src.middleware.deadline import deadline
+from src.middleware.read_replica import read_replica
 from src.middleware.jwt import jwt_required
+from src.middleware.tenant import tenant_db
+
+
+def _parse_date_range():
+    """Lee ?desde=&hasta= (ISO 8601) para filtrar por fecha; lanza ValueError si son inválidos"""
+    bounds = []
+    for name in ('desde', 'hasta'):
+        value = request.args.get(name)
+        if not value:
+            bounds.append(None)
+            continue
+        try:
+            bounds.append(datetime.fromisoformat(value))
+        except ValueError:
+            raise ValueError(f"Parámetro '{name}' inválido, use formato ISO 8601")
+    return bounds
 
 def create_monitoreo_routes():
     monitoreo_bp = Blueprint('monitoreo_routes', __name__)
 
     @monitoreo_bp.route('/monitoreos', methods=['POST'])
+    @jwt_required
+    @tenant_db
     def create_monitoreo():
         db = get_db()
         controller = MonitoreoController(db)
@@ -33,6 +53,7 @@ def create_monitoreo_routes():
             return jsonify({'error': str(e)}), 400
 
     @monitoreo_bp.route('/monitoreos', methods=['GET'])
+    @read_replica
     def get_all_monitoreos():
         db = get_db()
         controller = MonitoreoController(db)
@@ -44,6 +65,7 @@ def create_monitoreo_routes():
             return jsonify({'error': str(e)}), 500
 
     @monitoreo_bp.route('/monitoreos/<int:monitoreo_id>', methods=['GET'])
+    @read_replica
     def get_monitoreo(monitoreo_id):
         db = get_db()
         controller = MonitoreoController(db)
@@ -57,24 +79,53 @@ def create_monitoreo_routes():
             return jsonify({'error': str(e)}), 500
 
     @monitoreo_bp.route('/apiarios/<int:apiario_id>/monitoreos', methods=['GET'])
+    @read_replica
     def get_monitoreos_by_apiario(apiario_id):
         db = get_db()
         controller = MonitoreoController(db)
         
         try:
-            monitoreos = controller.get_monitoreos_by_apiario(apiario_id)
+            desde, hasta = _parse_date_range()
+            monitoreos = controller.get_monitoreos_by_apiario(apiario_id, desde, hasta)
             return jsonify(monitoreos), 200
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         except Exception as e:
             return jsonify({'error': str(e)}), 500
 
     @monitoreo_bp.route('/colmenas/<int:colmena_id>/monitoreos', methods=['GET'])
+    @read_replica
     def get_monitoreos_by_colmena(colmena_id):
         db = get_db()
         controller = MonitoreoController(db)
         
         try:
-            monitoreos = controller.get_monitoreos_by_colmena(colmena_id)
+            desde, hasta = _parse_date_range()
+            monitoreos = controller.get_monitoreos_by_colmena(colmena_id, desde, hasta)
             return jsonify(monitoreos), 200
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
+    @monitoreo_bp.route('/colmenas/<int:colmena_id>/analytics', methods=['GET'])
+    @deadline('analytics')
+    @jwt_required
+    @tenant_db
+    def get_hive_analytics(colmena_id):
+        """Agregados por semana o mes (?granularity=week|month&desde=&hasta=) de una colmena"""
+        db = get_db()
+        controller = MonitoreoController(db)
+        
+        try:
+            desde, hasta = _parse_date_range()
+            analytics = controller.get_hive_analytics(
+                colmena_id, g.current_user_id, request.args.get('granularity', 'week'), desde, hasta)
+            if analytics is None:
+                return jsonify({'error': 'Colmena no encontrada o acceso denegado'}), 404
+            return jsonify(analytics), 200
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         except Exception as e:
             return jsonify({'error': str(e)}), 500
 
@@ -90,17 +141,11 @@ def create_monitoreo_routes():
         except Exception as e:
             return jsonify({'error': str(e)}), 500
 
-    @monitoreo_bp.route('/health', methods=['GET'])
-    def health_check():
-        """Endpoint para verificar el estado del servidor"""
-        return jsonify({
-            'status': 'healthy',
-            'timestamp': datetime.utcnow().isoformat(),
-            'service': 'beehive-monitoring-api'
-        }), 200
-
     @monitoreo_bp.route('/stats', methods=['GET'])
+    @deadline('analytics')
+    @read_replica
     @jwt_required
+    @tenant_db
     def get_stats():
         """Endpoint para obtener estadísticas del sistema"""
         db = get_db()
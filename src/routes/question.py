@@ -1,87 +1,51 @@
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify, current_app, g
 from ..controllers.questions import QuestionController
-from ..database.db import get_db
+from ..database.db import get_db, get_default_db
 from ..models.hive import HiveModel as BeehiveModel
+from ..models.questions import QuestionModel
+from ..middleware.conditional import conditional_get
+from ..middleware.jwt import jwt_required
+from ..middleware.tenant import tenant_db
+from ..middleware.read_replica import read_replica
+from ..utils.jobs import enqueue, jobs_enabled
 import json
 import os
 import traceback  # <- para mostrar errores completos
+from datetime import datetime
 
 def create_question_routes():
     question_bp = Blueprint('question_routes', __name__)
 
     @question_bp.route('/questions/load_defaults/<int:apiary_id>', methods=['POST'])
+    @jwt_required
+    @tenant_db
     def load_default_questions(apiary_id):
-        """Carga preguntas predeterminadas desde un archivo JSON"""
+        """Carga preguntas predeterminadas desde un archivo JSON (?async=true: en segundo plano, 202)"""
         db = get_db()
         controller = QuestionController(db)
 
-        config_path = os.path.join(current_app.root_path, 'config', 'preguntas_config.json')
-        if not os.path.exists(config_path):
-            return jsonify({'error': 'Archivo de configuración no encontrado'}), 404
-
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-
-            preguntas = config.get("preguntas", [])
-            if not isinstance(preguntas, list):
-                return jsonify({'error': 'Formato inválido en el archivo JSON'}), 400
-
-            preguntas_cargadas = []
-            from src.models.questions import QuestionModel
-
-            for i, pregunta_data in enumerate(preguntas):
-                external_id = pregunta_data.get('id')
-                if not external_id:
-                    continue
-
-                existing = QuestionModel.get_by_external_id(db, apiary_id, external_id)
-                if existing:
-                    continue
-
-                question_text = pregunta_data.get('pregunta')
-                question_type = pregunta_data.get('tipo')
-                category = pregunta_data.get('categoria')
-                is_required = pregunta_data.get('obligatoria', False)
-                display_order = i + 1
-                depends_on = pregunta_data.get('depende_de')
-
-                # Validación y limpieza de opciones
-                opciones = pregunta_data.get('opciones')
-                if question_type == 'opciones':
-                    if not opciones or not isinstance(opciones, list):
-                        raise ValueError(f"❌ Opciones inválidas en '{external_id}'")
-                    opciones = [str(op) for op in opciones]
-
-                # Validación para tipo número
-                min_value = pregunta_data.get("min")
-                max_value = pregunta_data.get("max")
-                if question_type == 'numero':
-                    if min_value is None or max_value is None:
-                        raise ValueError(f"❌ Pregunta '{external_id}' tipo número necesita min y max")
-
-                # Crear pregunta
-                question_id = controller.create_question(
-                    apiary_id=apiary_id,
-                    external_id=external_id,
-                    question_text=question_text,
-                    question_type=question_type,
-                    category=category,
-                    is_required=is_required,
-                    display_order=display_order,
-                    min_value=min_value,
-                    max_value=max_value,
-                    options=opciones,
-                    depends_on=depends_on,
-                    is_active=True
-                )
-                preguntas_cargadas.append(question_id)
-
+            if request.args.get('async', '').lower() in ('1', 'true') and jobs_enabled():
+                if not os.path.exists(controller.default_questions_path()):
+                    return jsonify({'error': 'Archivo de configuración no encontrado'}), 404
+                # La cola vive en 'default'; el worker ejecuta el trabajo en el fragmento del usuario
+                job_id = enqueue(get_default_db(), 'load_default_questions', {'apiary_id': apiary_id},
+                                 user_id=g.current_user_id)
+                return jsonify({
+                    'message': 'Carga de preguntas por defecto encolada',
+                    'job_id': job_id,
+                    'status_url': f'/api/jobs/{job_id}'
+                }), 202
+
+            preguntas_cargadas = controller.load_default_questions(apiary_id)
             return jsonify({
                 'message': f'Se cargaron {len(preguntas_cargadas)} preguntas por defecto',
                 'question_ids': preguntas_cargadas
             }), 200
 
+        except FileNotFoundError:
+            return jsonify({'error': 'Archivo de configuración no encontrado'}), 404
+
         except ValueError as ve:
             print("❌ ValueError en carga de preguntas:", ve)
             traceback.print_exc()
@@ -93,6 +57,8 @@ def create_question_routes():
             return jsonify({'error': str(e), 'type': 'Exception'}), 500
 
     @question_bp.route('/questions', methods=['POST'])
+    @jwt_required
+    @tenant_db
     def create_question():
         db = get_db()
         controller = QuestionController(db)
@@ -125,6 +91,7 @@ def create_question_routes():
             return jsonify({'error': str(e), 'type': 'Exception'}), 400
 
     @question_bp.route('/questions/<int:question_id>', methods=['GET'])
+    @read_replica
     def get_question(question_id):
         db = get_db()
         controller = QuestionController(db)
@@ -134,6 +101,8 @@ def create_question_routes():
         return jsonify({'error': 'Pregunta no encontrada'}), 404
 
     @question_bp.route('/apiaries/<int:apiary_id>/questions', methods=['GET'])
+    @read_replica
+    @conditional_get(lambda apiary_id: QuestionModel.get_apiary_version(get_db(), apiary_id))
     def get_apiary_questions(apiary_id):
         db = get_db()
         controller = QuestionController(db)
@@ -142,6 +111,8 @@ def create_question_routes():
         return jsonify(questions), 200
 
     @question_bp.route('/questions/<int:question_id>', methods=['PUT'])
+    @jwt_required
+    @tenant_db
     def update_question(question_id):
         db = get_db()
         controller = QuestionController(db)
@@ -154,6 +125,8 @@ def create_question_routes():
             return jsonify({'error': str(e)}), 400
 
     @question_bp.route('/questions/<int:question_id>', methods=['DELETE'])
+    @jwt_required
+    @tenant_db
     def delete_question(question_id):
         db = get_db()
         controller = QuestionController(db)
@@ -165,6 +138,8 @@ def create_question_routes():
             return jsonify({'error': str(e)}), 400
 
     @question_bp.route('/apiaries/<int:apiary_id>/questions/reorder', methods=['PUT'])
+    @jwt_required
+    @tenant_db
     def reorder_questions(apiary_id):
         db = get_db()
         controller = QuestionController(db)
@@ -178,7 +153,19 @@ def create_question_routes():
             traceback.print_exc()
             return jsonify({'error': str(e)}), 400
 
+    def _question_bank_version():
+        """El banco de preguntas es un archivo: su versión es la fecha y tamaño del archivo"""
+        config_path = os.path.join(current_app.root_path, 'config', 'preguntas_config.json')
+        if not os.path.exists(config_path):
+            return None
+        stat = os.stat(config_path)
+        return {
+            'last_modified': datetime.utcfromtimestamp(int(stat.st_mtime)),
+            'size': stat.st_size
+        }
+
     @question_bp.route('/questions/bank', methods=['GET'])
+    @conditional_get(_question_bank_version)
     def get_question_bank():
         try:
             config_path = os.path.join(current_app.root_path, 'config', 'preguntas_config.json')
@@ -194,6 +181,8 @@ def create_question_routes():
             return jsonify({'error': str(e)}), 500
 
     @question_bp.route('/beehives/<int:beehive_id>/questions', methods=['GET'])
+    @read_replica
+    @conditional_get(lambda beehive_id: QuestionModel.get_hive_version(get_db(), beehive_id))
     def get_beehive_questions(beehive_id):
         db = get_db()
         
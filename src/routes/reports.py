@@ -1,7 +1,11 @@
-from flask import Blueprint, jsonify, g
+from datetime import date
+from flask import Blueprint, request, jsonify, g
 from src.controllers.reports import ReportsController
 from src.database.db import get_db
+from src.middleware.deadline import deadline
+from src.middleware.read_replica import read_replica
 from src.middleware.jwt import jwt_required
+from src.middleware.tenant import tenant_db
 from flask_cors import CORS
 
 def create_reports_routes():
@@ -9,7 +13,10 @@ def create_reports_routes():
     CORS(reports_bp, resources={r"/reports/monitoring": {"origins": "*"}})
 
     @reports_bp.route('/reports/monitoring', methods=['GET'])
+    @deadline('reports')
+    @read_replica
     @jwt_required
+    @tenant_db
     def get_monitoring_reports():
         db = get_db()
         controller = ReportsController(db)
@@ -21,4 +28,29 @@ def create_reports_routes():
         except Exception as e:
             return jsonify({'error': str(e)}), 500
 
+    @reports_bp.route('/reports/monitoring/summary', methods=['GET'])
+    @deadline('reports')
+    @read_replica
+    @jwt_required
+    @tenant_db
+    def get_monitoring_summary():
+        """Resumen diario por apiario (?desde=AAAA-MM-DD&hasta=AAAA-MM-DD, por defecto 30 días)"""
+        db = get_db()
+        controller = ReportsController(db)
+
+        try:
+            bounds = []
+            for name in ('desde', 'hasta'):
+                value = request.args.get(name)
+                try:
+                    bounds.append(date.fromisoformat(value) if value else None)
+                except ValueError:
+                    raise ValueError(f"Parámetro '{name}' inválido, use formato AAAA-MM-DD")
+            summary = controller.get_monitoring_summary(g.current_user_id, *bounds)
+            return jsonify(summary), 200
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
     return reports_bp
\ No newline at end of file
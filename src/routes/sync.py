@@ -0,0 +1,32 @@
+from flask import Blueprint, request, jsonify, g, current_app
+from src.controllers.sync import SyncController
+from src.database.db import get_db
+from src.middleware.deadline import deadline
+from src.middleware.jwt import jwt_required
+from src.middleware.tenant import tenant_db
+
+def create_sync_routes():
+    sync_bp = Blueprint('sync_routes', __name__)
+
+    @sync_bp.route('/sync', methods=['GET'])
+    @deadline('sync')
+    @jwt_required
+    @tenant_db
+    def get_changes():
+        """Cambios (altas, modificaciones y borrados) desde el token `since` para la app móvil"""
+        db = get_db()
+        # Ninguna transacción de una petición dura más que el mayor plazo configurado
+        budgets = [current_app.config.get('REQUEST_DEADLINE_MS', 0),
+                   *current_app.config.get('REQUEST_DEADLINES', {}).values()]
+        controller = SyncController(db, current_app.config.get('SYNC_TOMBSTONE_RETENTION_DAYS', 90),
+                                    max_transaction_seconds=max(budgets) / 1000 or 60)
+
+        try:
+            changes = controller.get_changes(g.current_user_id, request.args.get('since'))
+            return jsonify(changes), 200
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
+    return sync_bp
@@ -2,6 +2,8 @@ from flask import Blueprint, request, jsonify, current_app, g, app, send_from_di
 from ..controllers.users import UserController
 from src.database.db import get_db
 from src.middleware.jwt import jwt_required
+from src.middleware.conditional import conditional_get
+from src.models.users import UserModel
 from src.models.apiary import ApiaryModel
 import os
 
@@ -12,6 +14,14 @@ def create_user_routes():
         db = get_db()
         return UserController(db)
 
+    def get_profile_version(user_id):
+        """Versión del perfil; con fragmentación los apiarios pueden estar en otro fragmento"""
+        version = UserModel.get_profile_version(get_db(), user_id)
+        tenant_db = get_db(shard_for=user_id)
+        if version is not None and tenant_db is not get_db():
+            version = dict(version, apiaries=ApiaryModel.get_user_version(tenant_db, user_id))
+        return version
+
     @user_bp.route('/users', methods=['POST'])
     def create_user():
         controller = get_controller()
@@ -30,8 +40,8 @@ def create_user_routes():
                 data['password'],
                 data.get('profile_picture')
             )
-            # El apiario y el inventario vacío se crean automáticamente
-            return jsonify({'id': user_id, 'message': 'Usuario, apiario e inventario vacío creados'}), 201
+            # El apiario y el inventario inicial se crean en la misma sentencia
+            return jsonify({'id': user_id, 'message': 'Usuario, apiario e inventario inicial creados'}), 201
         except Exception as e:
             return jsonify({'error': str(e)}), 400
 
@@ -78,7 +88,7 @@ def create_user_routes():
         )
 
         # Añadir apiarios asociados al usuario
-        user['apiaries'] = ApiaryModel.get_by_user(get_db(), user_id)
+        user['apiaries'] = ApiaryModel.get_by_user(get_db(shard_for=user_id), user_id)
 
         return jsonify(user), 200
 
@@ -134,6 +144,7 @@ def create_user_routes():
 
     @user_bp.route('/users/me', methods=['GET'])
     @jwt_required
+    @conditional_get(lambda: get_profile_version(g.current_user_id))
     def get_me():
         controller = get_controller()
         user_id = g.current_user_id
@@ -157,7 +168,7 @@ def create_user_routes():
             user.get('profile_picture', 'default_profile.jpg')
         )
 
-        user['apiaries'] = ApiaryModel.get_by_user(get_db(), user_id)
+        user['apiaries'] = ApiaryModel.get_by_user(get_db(shard_for=user_id), user_id)
 
         return jsonify(user), 200
     
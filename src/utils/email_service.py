@@ -2,6 +2,8 @@ from flask_mail import Message
 from flask import current_app
 import threading
 from datetime import datetime
+from src.database.db import get_db
+from src.utils.jobs import enqueue, jobs_enabled
 
 class EmailService:
     def __init__(self, mail):
@@ -13,9 +15,30 @@ class EmailService:
             self.mail.send(msg)
     
     def send_password_reset(self, email, token, reset_url):
-        """Envía el correo de recuperación de contraseña"""
+        """Envía el correo de recuperación de contraseña (en segundo plano)"""
         try:
-            msg = Message(
+            if jobs_enabled():
+                enqueue(get_db(), 'send_password_reset_email',
+                        {'email': email, 'reset_url': reset_url}, priority=10)
+                return True
+
+            thr = threading.Thread(
+                target=self.send_async_email,
+                args=(current_app._get_current_object(), self._password_reset_message(email, reset_url))
+            )
+            thr.start()
+            return True
+        except Exception as e:
+            current_app.logger.error(f'Error sending email: {str(e)}')
+            return False
+
+    def deliver_password_reset(self, email, reset_url):
+        """Envía el correo de recuperación de contraseña en el hilo actual (trabajo send_password_reset_email)"""
+        self.mail.send(self._password_reset_message(email, reset_url))
+
+    def _password_reset_message(self, email, reset_url):
+        """Construye el correo de recuperación de contraseña"""
+        return Message(
                 subject='Recuperación de Contraseña - SoftBee',
                 sender=current_app.config['MAIL_DEFAULT_SENDER'],
                 recipients=[email],
@@ -92,13 +115,3 @@ class EmailService:
                         </body>
                         </html>
             ''')
-            
-            thr = threading.Thread(
-                target=self.send_async_email,
-                args=(current_app._get_current_object(), msg)
-            )
-            thr.start()
-            return True
-        except Exception as e:
-            current_app.logger.error(f'Error sending email: {str(e)}')
-            return False
\ No newline at end of file
@@ -0,0 +1,159 @@
+"""
+Estado de la base de datos para las sondas (/api/health/ready, /api/health/db).
+
+Un hilo por proceso mide cada HEALTH_CHECK_INTERVAL_SECONDS si PostgreSQL responde
+(latencia de SELECT 1) y el retraso de replicación, y guarda el resultado. Las
+sondas solo leen esa muestra, así un kubelet consultando cada segundo no abre
+conexiones. La muestra usa una única conexión propia del monitor que se reutiliza:
+el pool queda entero para los hilos de las peticiones, porque getconn() no espera
+y una conexión prestada al monitor sería un PoolError para una petición.
+
+Si la muestra es más vieja que HEALTH_CACHE_TTL_SECONDS (el hilo murió o la base
+de datos no responde a tiempo) la sonda la considera inválida.
+"""
+
+import os
+import threading
+import time
+from datetime import datetime
+
+import psycopg2
+import psycopg2.extensions
+
+from src.database.db import resolve_database_url, pool_status
+
+# En una réplica: segundos desde la última transacción aplicada (0 si no hay WAL pendiente).
+# En el primario: mayor replay_lag de sus réplicas (NULL sin réplicas o sin permisos)
+REPLICATION_SQL = '''
+    SELECT pg_is_in_recovery(),
+           CASE WHEN pg_is_in_recovery() THEN
+                CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                     ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END
+           ELSE (SELECT EXTRACT(EPOCH FROM MAX(replay_lag)) FROM pg_stat_replication) END
+'''
+
+
+class HealthMonitor:
+    """Muestrea la base de datos en segundo plano y guarda la última muestra"""
+
+    def __init__(self, app):
+        self.database_url = app.config.get('DATABASE_URL')
+        self.interval = app.config.get('HEALTH_CHECK_INTERVAL_SECONDS', 5)
+        self.ttl = app.config.get('HEALTH_CACHE_TTL_SECONDS', 15)
+        self.timeout_ms = app.config.get('HEALTH_CHECK_TIMEOUT_MS', 1000)
+        self.logger = app.logger
+        self.pid = os.getpid()
+        self.stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._sampling = threading.Lock()
+        self._sample = None
+        self._conn = None
+        self._thread = None
+
+    def _own_connection(self):
+        """Conexión propia en autocommit, abierta una sola vez y reutilizada"""
+        if self._conn is None or self._conn.closed:
+            self._conn = psycopg2.connect(resolve_database_url(self.database_url),
+                                          connect_timeout=max(1, self.timeout_ms // 1000))
+            self._conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        return self._conn
+
+    def _query(self, conn):
+        cursor = conn.cursor()
+        try:
+            cursor.execute('SET statement_timeout = %s', (self.timeout_ms,))
+            started = time.perf_counter()
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+            latency_ms = (time.perf_counter() - started) * 1000
+            cursor.execute(REPLICATION_SQL)
+            in_recovery, lag = cursor.fetchone()
+            cursor.execute('RESET statement_timeout')
+            return latency_ms, in_recovery, float(lag) if lag is not None else None
+        finally:
+            cursor.close()
+
+    def sample(self):
+        """Toma una muestra ahora y la guarda"""
+        sample = {'checked_at': datetime.utcnow(), 'monotonic': time.monotonic(),
+                  'reachable': False, 'latency_ms': None, 'in_recovery': None,
+                  'replication_lag_seconds': None, 'error': None}
+        with self._sampling:
+            try:
+                result = self._query(self._own_connection())
+                sample['latency_ms'], sample['in_recovery'], sample['replication_lag_seconds'] = result
+                sample['latency_ms'] = round(sample['latency_ms'], 2)
+                sample['reachable'] = True
+            except Exception as e:
+                sample['error'] = str(e).strip()
+                if self._conn is not None and not self._conn.closed:
+                    self._conn.close()
+                self._conn = None
+        with self._lock:
+            self._sample = sample
+        return sample
+
+    def snapshot(self):
+        """Última muestra con su antigüedad y validez, más la ocupación actual del pool"""
+        with self._lock:
+            sample = dict(self._sample) if self._sample else None
+        if sample is None:
+            # Primera consulta del proceso: no hay nada en caché todavía
+            sample = dict(self.sample())
+        age = time.monotonic() - sample.pop('monotonic')
+        sample['age_seconds'] = round(age, 2)
+        sample['stale'] = age > self.ttl
+        return {'database': sample, 'pool': pool_status()}
+
+    def _run(self):
+        while not self.stop_event.is_set():
+            try:
+                self.sample()
+            except Exception as e:
+                self.logger.error(f"Monitor de salud: error al tomar la muestra: {str(e)}")
+            self.stop_event.wait(self.interval)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='health-monitor', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self.stop_event.set()
+        if self._conn is not None and not self._conn.closed:
+            self._conn.close()
+
+
+_monitor = None
+_monitor_lock = threading.Lock()
+
+
+def get_health_monitor(app):
+    """
+    Monitor del proceso actual, creado e iniciado en la primera sonda. Tras un fork
+    (workers de gunicorn) cada proceso crea el suyo: los hilos no sobreviven al fork.
+    """
+    global _monitor
+    with _monitor_lock:
+        if _monitor is None or _monitor.pid != os.getpid():
+            _monitor = HealthMonitor(app).start()
+    return _monitor
+
+
+def readiness(snapshot, max_replication_lag=None):
+    """Decide si el proceso puede recibir tráfico; retorna (listo, motivo)"""
+    database, pool = snapshot['database'], snapshot['pool']
+    if not database['reachable']:
+        return False, 'database_unreachable'
+    if database['stale']:
+        return False, 'health_sample_stale'
+    if pool is not None:
+        if pool['closed']:
+            return False, 'pool_closed'
+        if pool['idle'] == 0 and pool['in_use'] >= pool['max_size']:
+            return False, 'pool_exhausted'
+    lag = database['replication_lag_seconds']
+    if max_replication_lag and database['in_recovery'] and lag is not None and lag > max_replication_lag:
+        return False, 'replication_lag'
+    return True, None
@@ -0,0 +1,186 @@
+"""
+Puntuación de salud de colmenas y apiarios.
+
+La base de datos solo codifica cada dato en números (una fila por respuesta
+relevante: colmena, componente, valor en [0, 1] y antigüedad en días) y lo entrega
+por columnas. El cálculo es una sola pasada vectorizada con NumPy sobre todas las
+colmenas a la vez:
+
+    componente = promedio de las respuestas ponderado por recencia (vida media de
+                 HALF_LIFE_DAYS), combinado con el estado registrado en la colmena
+    puntuación = 100 × Σ peso·componente / Σ pesos disponibles − penalizaciones por riesgo
+
+Los riesgos (varroa, polilla, mortalidad) se marcan si la colmena los tiene
+registrados en health_status o si alguna inspección reciente los menciona.
+"""
+
+# Componentes positivos (0 = malo, 1 = óptimo) y su peso en la puntuación
+COMPONENTS = ('estado', 'poblacion', 'actividad', 'cria', 'alimento', 'reina')
+COMPONENT_WEIGHTS = (0.25, 0.20, 0.10, 0.20, 0.15, 0.10)
+
+# Riesgos y puntos que restan a la puntuación
+RISKS = ('varroa', 'polilla', 'mortalidad')
+RISK_PENALTIES = (25.0, 15.0, 30.0)
+
+# Índice de cada señal: componentes primero y luego riesgos
+SIGNAL_INDEX = {name: i for i, name in enumerate(COMPONENTS + RISKS)}
+
+# Respuestas de opción (config/preguntas_config.json) -> (componente, valor)
+OPTION_SIGNALS = {
+    ('estado_general', 'Excelente'): ('estado', 1.0),
+    ('estado_general', 'Bueno'): ('estado', 0.75),
+    ('estado_general', 'Regular'): ('estado', 0.4),
+    ('estado_general', 'Malo'): ('estado', 0.0),
+    ('poblacion', 'Alta'): ('poblacion', 1.0),
+    ('poblacion', 'Media'): ('poblacion', 0.6),
+    ('poblacion', 'Baja'): ('poblacion', 0.2),
+    ('presencia_reina', 'Sí'): ('reina', 1.0),
+    ('presencia_reina', 'No'): ('reina', 0.0),
+    ('necesita_alimentacion', 'Sí'): ('alimento', 0.2),
+    ('necesita_alimentacion', 'No'): ('alimento', 1.0),
+}
+
+# Respuestas numéricas -> (componente, cuadros que equivalen a 1.0)
+NUMERIC_SIGNALS = {
+    'cantidad_cria': ('cria', 10.0),
+    'cantidad_miel': ('alimento', 10.0),
+}
+
+# Respuestas de texto -> (riesgo, expresión regular sin distinguir mayúsculas)
+TEXT_SIGNALS = (
+    ('enfermedades', 'varroa', r'varr?oa|barr?oa'),
+    ('enfermedades', 'polilla', r'polilla'),
+    ('enfermedades', 'mortalidad', r'mortal|muert|malformaci'),
+)
+
+# Valores categóricos de hives (mismo orden que sus CHECK)
+LEVELS = ('Baja', 'Media', 'Alta')
+LEVEL_SCORES = (0.2, 0.6, 1.0)
+HEALTH_STATUSES = (
+    'Presencia barroa',
+    'Presencia de polilla',
+    'Presencia de curruncho',
+    'Mortalidad- malformación en nodrizas',
+    'Ninguno'
+)
+HEALTH_STATUS_RISKS = {1: 'varroa', 2: 'polilla', 4: 'mortalidad'}
+
+# Ventana de inspecciones consideradas y vida media de su peso
+WINDOW_DAYS = 60
+HALF_LIFE_DAYS = 14.0
+
+# Peso de las inspecciones frente al estado registrado en la colmena cuando hay ambos
+ANSWER_WEIGHT = 0.7
+
+
+def _numpy():
+    """NumPy se importa al calcular, no al arrancar el servidor"""
+    import numpy
+    return numpy
+
+
+def score_hives(hives, signals, half_life_days=HALF_LIFE_DAYS):
+    """
+    Calcula las puntuaciones de todas las colmenas en una pasada.
+
+    `hives`: columnas hive_id (ordenado), apiary_id, activity, population y health
+    (posición 1-based en LEVELS / HEALTH_STATUSES, 0 si no hay dato), food_frames y
+    brood_frames (NaN si no hay dato).
+    `signals`: columnas hive_id, signal (índice de SIGNAL_INDEX), value y age_days.
+
+    Retorna arreglos por colmena (score, components, flags) y por apiario
+    (apiary_id, apiary_score, hive_count, at_risk). Las colmenas sin ningún dato
+    tienen score NaN.
+    """
+    np = _numpy()
+    hive_ids = np.asarray(hives['hive_id'], dtype=np.int64)
+    n_hives, n_components, n_risks = len(hive_ids), len(COMPONENTS), len(RISKS)
+    n_signals = n_components + n_risks
+
+    # Promedio ponderado por recencia de cada (colmena, señal)
+    signal_hive = np.asarray(signals['hive_id'], dtype=np.int64)
+    position = np.searchsorted(hive_ids, signal_hive)
+    known = position < n_hives
+    known[known] = hive_ids[position[known]] == signal_hive[known]
+    flat = position[known] * n_signals + np.asarray(signals['signal'], dtype=np.int64)[known]
+    weight = 0.5 ** (np.asarray(signals['age_days'], dtype=np.float64)[known] / half_life_days)
+    value = np.asarray(signals['value'], dtype=np.float64)[known]
+
+    totals = np.bincount(flat, weights=weight * value, minlength=n_hives * n_signals)
+    weights = np.bincount(flat, weights=weight, minlength=n_hives * n_signals)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        observed = (totals / weights).reshape(n_hives, n_signals)
+    answered = observed[:, :n_components]
+
+    # Estado registrado en la colmena
+    level_scores = np.array((np.nan,) + LEVEL_SCORES)
+    recorded = np.full((n_hives, n_components), np.nan)
+    recorded[:, SIGNAL_INDEX['poblacion']] = level_scores[np.asarray(hives['population'], dtype=np.int64)]
+    recorded[:, SIGNAL_INDEX['actividad']] = level_scores[np.asarray(hives['activity'], dtype=np.int64)]
+    recorded[:, SIGNAL_INDEX['cria']] = np.minimum(np.asarray(hives['brood_frames'], dtype=np.float64) / 10, 1)
+    recorded[:, SIGNAL_INDEX['alimento']] = np.minimum(np.asarray(hives['food_frames'], dtype=np.float64) / 10, 1)
+
+    components = np.where(
+        np.isnan(answered), recorded,
+        np.where(np.isnan(recorded), answered, ANSWER_WEIGHT * answered + (1 - ANSWER_WEIGHT) * recorded))
+
+    # Riesgos: mencionados en inspecciones recientes o registrados en health_status
+    flags = weights.reshape(n_hives, n_signals)[:, n_components:] > 0
+    health = np.asarray(hives['health'], dtype=np.int64)
+    for code, risk in HEALTH_STATUS_RISKS.items():
+        flags[:, RISKS.index(risk)] |= health == code
+
+    component_weights = np.array(COMPONENT_WEIGHTS)
+    available = ~np.isnan(components)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        positive = np.nansum(components * component_weights, axis=1) / (available * component_weights).sum(axis=1)
+    score = np.clip(100 * positive - flags @ np.array(RISK_PENALTIES), 0, 100)
+
+    # Agregado por apiario: promedio de las colmenas con puntuación
+    apiary_ids, apiary_index = np.unique(np.asarray(hives['apiary_id'], dtype=np.int64), return_inverse=True)
+    scored = ~np.isnan(score)
+    scored_hives = np.bincount(apiary_index, weights=scored, minlength=len(apiary_ids))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        apiary_score = np.bincount(apiary_index, weights=np.where(scored, score, 0),
+                                   minlength=len(apiary_ids)) / scored_hives
+
+    return {
+        'hive_id': hive_ids,
+        'score': score,
+        'components': components,
+        'flags': flags,
+        'apiary_id': apiary_ids,
+        'apiary_score': apiary_score,
+        'hive_count': np.bincount(apiary_index, minlength=len(apiary_ids)),
+        'at_risk': np.bincount(apiary_index, weights=flags.any(axis=1), minlength=len(apiary_ids)).astype(int)
+    }
+
+
+def _rounded(value, digits=1):
+    return None if value != value else round(float(value), digits)
+
+
+def hive_records(hives, result):
+    """Una fila por colmena lista para JSON o para guardar"""
+    records = []
+    for i, hive_id in enumerate(result['hive_id']):
+        records.append({
+            'hive_id': int(hive_id),
+            'apiary_id': int(hives['apiary_id'][i]),
+            'hive_number': int(hives['hive_number'][i]),
+            'score': _rounded(result['score'][i]),
+            'flags': [risk for risk, flagged in zip(RISKS, result['flags'][i]) if flagged],
+            'components': {name: _rounded(value, 2) for name, value in zip(COMPONENTS, result['components'][i])}
+        })
+    return records
+
+
+def apiary_records(result):
+    """Una fila por apiario: puntuación media, colmenas y colmenas con algún riesgo"""
+    return [{
+        'apiary_id': int(apiary_id),
+        'score': _rounded(score),
+        'hives': int(count),
+        'at_risk': int(at_risk)
+    } for apiary_id, score, count, at_risk in zip(
+        result['apiary_id'], result['apiary_score'], result['hive_count'], result['at_risk'])]
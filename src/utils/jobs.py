@@ -0,0 +1,157 @@
+"""
+Trabajos en segundo plano.
+
+Los handlers encolan con `enqueue(db, tipo, payload)` (tabla jobs, ver
+src/models/jobs.py) y responden de inmediato; job_worker.py los ejecuta fuera del
+ciclo de la petición. Cada trabajo corre dentro de un contexto de la aplicación con
+su propia unidad de trabajo: sus escrituras y el paso a 'done' se confirman juntos,
+y si falla se revierten y se reintenta con espera exponencial.
+
+Para añadir un tipo de trabajo:
+
+    @job_handler('mi_trabajo')
+    def _mi_trabajo(db, payload):
+        ...
+        return {'resultado': ...}  # opcional, se guarda en jobs.result
+"""
+
+import os
+import select
+import socket
+import threading
+import psycopg2
+import psycopg2.extensions
+from psycopg2.extensions import TRANSACTION_STATUS_INERROR
+from flask import current_app
+from src.models.jobs import JobModel, JOBS_CHANNEL
+
+# tipo -> función(db, payload)
+JOB_HANDLERS = {}
+
+
+def job_handler(kind):
+    """Registra la función que ejecuta los trabajos de un tipo"""
+    def register(func):
+        JOB_HANDLERS[kind] = func
+        return func
+    return register
+
+
+def enqueue(db, kind, payload=None, **options):
+    """Encola un trabajo de un tipo registrado y retorna su id"""
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f"Tipo de trabajo desconocido: {kind}")
+    options.setdefault('max_attempts', current_app.config.get('JOB_MAX_ATTEMPTS', 5))
+    return JobModel.enqueue(db, kind, payload, **options)
+
+
+def jobs_enabled():
+    """False si JOB_QUEUE_ENABLED=false: los handlers hacen el trabajo en la petición, como antes"""
+    return current_app.config.get('JOB_QUEUE_ENABLED', True)
+
+
+class JobWorker:
+    """Reclama y ejecuta trabajos. Varios workers (hilos o procesos) pueden compartir la cola"""
+
+    def __init__(self, app, name=None, kinds=None, batch_size=1):
+        self.app = app
+        self.name = name or f'{socket.gethostname()}:{os.getpid()}:{threading.current_thread().name}'
+        self.kinds = kinds
+        self.batch_size = batch_size
+        self.poll_interval = app.config.get('JOB_POLL_INTERVAL_SECONDS', 5)
+        self.retry_base = app.config.get('JOB_RETRY_BASE_SECONDS', 30)
+        self.lock_timeout = app.config.get('JOB_LOCK_TIMEOUT_SECONDS', 600)
+        self.stop_event = threading.Event()
+        self._conn = None
+
+    def _connection(self):
+        """Conexión propia en autocommit para reclamar trabajos y escuchar NOTIFY"""
+        if self._conn is None or self._conn.closed:
+            from src.database.db import resolve_database_url
+            self._conn = psycopg2.connect(resolve_database_url(self.app.config.get('DATABASE_URL')))
+            self._conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+            cursor = self._conn.cursor()
+            cursor.execute(f'LISTEN {JOBS_CHANNEL}')
+            cursor.close()
+        return self._conn
+
+    def execute(self, job):
+        """Ejecuta un trabajo reclamado; retorna True si terminó bien"""
+        handler = JOB_HANDLERS.get(job['kind'])
+        try:
+            if handler is None:
+                raise LookupError(f"No hay handler para el tipo '{job['kind']}'")
+            with self.app.app_context():
+                from src.database.db import get_db, finish_request_unit
+                # Los datos del usuario del trabajo pueden vivir en otro fragmento; la cola siempre en 'default'
+                db = get_db(shard_for=job['user_id']) if job['user_id'] is not None else get_db()
+                result = handler(db, job['payload'])
+                if db.info.transaction_status == TRANSACTION_STATUS_INERROR:
+                    raise RuntimeError(f"El handler continuó tras un error de base de datos: {db.unit_error}")
+                queue_db = get_db()
+                JobModel.complete(queue_db, job['id'], result)
+                # Confirmar aquí para que un fallo del commit cuente como fallo del trabajo
+                if not finish_request_unit():
+                    # Sus escrituras y el 'done' se revirtieron: se registra por qué
+                    cause = db.unit_error or queue_db.unit_error or 'la unidad de trabajo no se confirmó'
+                    raise RuntimeError(f"La transacción del trabajo se revirtió: {cause}")
+            return True
+        except Exception as e:
+            status = JobModel.fail(self._connection(), job['id'], e, self.retry_base)
+            self.app.logger.error(f"Trabajo {job['id']} ({job['kind']}) falló en el intento "
+                                  f"{job['attempts']}/{job['max_attempts']}: {e} -> {status}")
+            return False
+
+    def run_once(self):
+        """Procesa lotes hasta vaciar la cola de trabajos listos; retorna (ok, fallidos)"""
+        conn = self._connection()
+        JobModel.release_stale(conn, self.lock_timeout, self.retry_base)
+        succeeded = failed = 0
+        while not self.stop_event.is_set():
+            jobs = JobModel.claim(conn, self.name, self.batch_size, self.kinds)
+            if not jobs:
+                break
+            for job in jobs:
+                if self.execute(job):
+                    succeeded += 1
+                else:
+                    failed += 1
+        return succeeded, failed
+
+    def run(self):
+        """Bucle principal: vacía la cola y espera un NOTIFY o el intervalo de sondeo"""
+        try:
+            while not self.stop_event.is_set():
+                self.run_once()
+                conn = self._connection()
+                if select.select([conn], [], [], self.poll_interval) != ([], [], []):
+                    conn.poll()
+                    conn.notifies.clear()
+        finally:
+            self.close()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def close(self):
+        if self._conn is not None and not self._conn.closed:
+            self._conn.close()
+        self._conn = None
+
+
+@job_handler('send_password_reset_email')
+def _send_password_reset_email(db, payload):
+    current_app.email_service.deliver_password_reset(payload['email'], payload['reset_url'])
+
+
+@job_handler('load_default_questions')
+def _load_default_questions(db, payload):
+    from src.controllers.questions import QuestionController
+    question_ids = QuestionController(db).load_default_questions(payload['apiary_id'])
+    return {'question_ids': question_ids}
+
+
+@job_handler('send_push_notification')
+def _send_push_notification(db, payload):
+    from src.utils.push_notifications import send_push_notification
+    send_push_notification(payload['token'], payload['title'], payload['body'], payload.get('data'))
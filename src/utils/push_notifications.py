@@ -0,0 +1,38 @@
+import os
+import requests
+
+FCM_URL = 'https://fcm.googleapis.com/fcm/send'
+FCM_KEY = os.getenv('FCM_SERVER_KEY')
+
+
+def send_push_notification(token, title, body, data=None):
+    """Envía una notificación push por FCM; lanza una excepción si FCM la rechaza (el trabajo se reintenta)"""
+    headers = {
+        'Authorization': f'key={FCM_KEY}',
+        'Content-Type': 'application/json'
+    }
+
+    payload = {
+        'to': token,
+        'notification': {
+            'title': title,
+            'body': body,
+            'sound': 'default'
+        },
+        'data': {
+            'click_action': 'FLUTTER_NOTIFICATION_CLICK',
+            **(data or {})
+        },
+        'android': {
+            'priority': 'high'
+        },
+        'apns': {
+            'headers': {
+                'apns-priority': '10'
+            }
+        }
+    }
+
+    response = requests.post(FCM_URL, json=payload, headers=headers, timeout=10)
+    if response.status_code != 200:
+        raise RuntimeError(f"Error al enviar notificación: {response.text}")
@@ -0,0 +1,91 @@
+"""
+Cálculo del número de workers del servidor de producción.
+
+Un worker síncrono pasa parte de cada petición esperando a PostgreSQL; mientras
+espera, el núcleo queda libre para otro worker. Con la latencia medida de la base
+de datos se estima cuántos workers mantienen ocupados los núcleos (ley de Little):
+
+    workers ≈ núcleos × (1 + espera_bd / cpu_por_petición) / hilos_por_worker
+
+El resultado se limita para no superar las conexiones disponibles en PostgreSQL.
+"""
+
+import math
+import os
+import statistics
+import time
+
+import psycopg2
+
+# Conexiones de PostgreSQL que se dejan libres para migraciones, psql y tareas
+RESERVED_DB_CONNECTIONS = 10
+
+
+def measure_database(database_url, samples=20, connect_timeout=5):
+    """Latencia mediana de un viaje de ida y vuelta (ms) y max_connections del servidor"""
+    conn = psycopg2.connect(database_url, connect_timeout=connect_timeout)
+    try:
+        cursor = conn.cursor()
+        cursor.execute('SHOW max_connections')
+        max_connections = int(cursor.fetchone()[0])
+        timings = []
+        for _ in range(samples):
+            start = time.perf_counter()
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+            timings.append((time.perf_counter() - start) * 1000)
+        cursor.close()
+        return {'latency_ms': statistics.median(timings), 'max_connections': max_connections}
+    finally:
+        conn.close()
+
+
+def recommend_workers(cpu_count, latency_ms=None, threads=1, request_cpu_ms=5.0,
+                      queries_per_request=6, max_connections=None, instances=1):
+    """Número de workers para `cpu_count` núcleos; sin medición usa la regla clásica 2n+1"""
+    if latency_ms is None:
+        workers = 2 * cpu_count + 1
+    else:
+        wait_ms = latency_ms * queries_per_request
+        workers = math.ceil(cpu_count * (1 + wait_ms / request_cpu_ms) / max(threads, 1))
+        workers = max(2, min(workers, 4 * cpu_count + 1))
+
+    if max_connections:
+        # Cada hilo de cada worker puede tener una conexión del pool abierta
+        available = max(max_connections - RESERVED_DB_CONNECTIONS, 1) // max(instances, 1)
+        workers = min(workers, max(available // max(threads, 1), 1))
+    return workers
+
+
+def autotune_workers(database_url, threads=1, logger=None):
+    """Mide la base de datos y recomienda workers; si no puede conectarse usa 2n+1"""
+    cpu_count = os.cpu_count() or 1
+    settings = dict(
+        threads=threads,
+        request_cpu_ms=float(os.getenv('WEB_REQUEST_CPU_MS', 5.0)),
+        queries_per_request=int(os.getenv('WEB_QUERIES_PER_REQUEST', 6)),
+        instances=int(os.getenv('WEB_INSTANCES', 1)),
+    )
+    measured = {}
+    if database_url:
+        try:
+            measured = measure_database(database_url)
+        except psycopg2.Error as e:
+            if logger:
+                logger(f"⚠️  No se pudo medir la base de datos ({str(e).strip()}); se usa 2n+1 workers")
+
+    workers = recommend_workers(cpu_count, measured.get('latency_ms'),
+                                max_connections=measured.get('max_connections'), **settings)
+    if logger:
+        latency = f"{measured['latency_ms']:.2f} ms" if measured else 'sin medir'
+        logger(f"🧮 {cpu_count} núcleos, latencia BD {latency}, {threads} hilos → {workers} workers")
+    return workers
+
+
+if __name__ == '__main__':
+    from dotenv import load_dotenv
+    from src.database.db import resolve_database_url
+
+    load_dotenv()
+    autotune_workers(resolve_database_url(os.getenv('DATABASE_URL')),
+                     threads=int(os.getenv('WEB_THREADS', 4)), logger=print)
@@ -0,0 +1,10 @@
+"""
+Punto de entrada WSGI de producción.
+
+Uso:
+   gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+from app import create_app
+
+app = create_app()